@@ -42,6 +42,7 @@ CREATE TABLE IF NOT EXISTS `knowledge_document`
     `questions`    TEXT NULL COMMENT 'document related questions',
     `vector_ids`   LONGTEXT NULL COMMENT 'vector_ids',
     `summary`      LONGTEXT NULL COMMENT 'knowledge summary',
+    `content_hash` varchar(64)  NULL COMMENT 'document content hash',
     `gmt_created`  TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT 'created time',
     `gmt_modified` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT 'update time',
     PRIMARY KEY (`id`),
@@ -57,12 +58,30 @@ CREATE TABLE IF NOT EXISTS `document_chunk`
     `content`      longtext     NOT NULL COMMENT 'chunk content',
     `questions`    text         NULL COMMENT 'chunk related questions',
     `meta_info`    text NOT NULL COMMENT 'metadata info',
+    `content_hash` varchar(64)  NULL COMMENT 'chunk content hash',
+    `vector_id`    varchar(255) NULL COMMENT 'chunk id in the vector store',
     `gmt_created`  timestamp NULL DEFAULT CURRENT_TIMESTAMP COMMENT 'created time',
     `gmt_modified` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT 'update time',
     PRIMARY KEY (`id`),
     KEY            `idx_document_id` (`document_id`) COMMENT 'index:document_id'
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT='knowledge document chunk detail';
 
+CREATE TABLE IF NOT EXISTS `knowledge_ingestion_job`
+(
+    `id`               int          NOT NULL AUTO_INCREMENT COMMENT 'auto increment id',
+    `document_id`      int          NOT NULL COMMENT 'document id',
+    `space_id`         varchar(100) NOT NULL COMMENT 'knowledge space id',
+    `chunk_parameters` text         NULL COMMENT 'chunk parameters json',
+    `content_hash`     varchar(64)  NULL COMMENT 'document content hash',
+    `doc_size`         bigint       NULL COMMENT 'document size in bytes, the smaller documents are synced first',
+    `status`           varchar(50)  NOT NULL COMMENT 'status QUEUED,RUNNING,FAILED,FINISHED',
+    `progress`         int          NULL COMMENT 'progress percentage',
+    `gmt_created`      timestamp NULL DEFAULT CURRENT_TIMESTAMP COMMENT 'created time',
+    `gmt_modified`     timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT 'update time',
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uk_document_id` (`document_id`)
+) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT='knowledge document ingestion job';
+
 
 CREATE TABLE IF NOT EXISTS `connect_config`
 (
@@ -75,6 +94,7 @@ CREATE TABLE IF NOT EXISTS `connect_config`
     `db_user`  varchar(255) DEFAULT NULL COMMENT 'db user',
     `db_pwd`   varchar(255) DEFAULT NULL COMMENT 'db password',
     `comment`  text COMMENT 'db comment',
+    `ext_config` text COMMENT 'Extended config of the datasource in json, e.g. the pool settings',
     `sys_code` varchar(128) DEFAULT NULL COMMENT 'System code',
     `user_name`  varchar(255) DEFAULT NULL COMMENT 'user name',
     `user_id`  varchar(255) DEFAULT NULL COMMENT 'user id',
@@ -206,6 +206,28 @@ class Config(metaclass=Singleton):
         self.LOCAL_DB_PASSWORD = os.getenv("LOCAL_DB_PASSWORD", "aa123456")
         self.LOCAL_DB_POOL_SIZE = int(os.getenv("LOCAL_DB_POOL_SIZE", 10))
         self.LOCAL_DB_POOL_OVERFLOW = int(os.getenv("LOCAL_DB_POOL_OVERFLOW", 20))
+        # The limits of the query results of the chat with datasource scenes, the
+        # rows are fetched in batches and the fetching stops at the limits
+        self.DB_QUERY_MAX_ROWS = int(os.getenv("DB_QUERY_MAX_ROWS", 50000))
+        self.DB_QUERY_MAX_BYTES = int(os.getenv("DB_QUERY_MAX_BYTES", 64 * 1024 * 1024))
+        # The maximum concurrent queries of each datasource and the query timeout
+        self.DB_QUERY_CONCURRENCY = int(os.getenv("DB_QUERY_CONCURRENCY", 4))
+        self.DB_QUERY_TIMEOUT = float(os.getenv("DB_QUERY_TIMEOUT", 300))
+        # The concurrency to summarize the datasources and the interval seconds to
+        # re-index the changed table summaries, 0 to disable the periodic refresh
+        self.DB_SUMMARY_CONCURRENCY = int(os.getenv("DB_SUMMARY_CONCURRENCY", 4))
+        self.DB_SUMMARY_REFRESH_INTERVAL = int(
+            os.getenv("DB_SUMMARY_REFRESH_INTERVAL", 3600)
+        )
+        # The result cache of the read only queries, it is stored in the model cache
+        self.DB_QUERY_CACHE_ENABLE: bool = (
+            os.getenv("DB_QUERY_CACHE_ENABLE", "True").lower() == "true"
+        )
+        self.DB_QUERY_CACHE_TTL = float(os.getenv("DB_QUERY_CACHE_TTL", 600))
+        self.DB_QUERY_CACHE_MAX_ROWS = int(os.getenv("DB_QUERY_CACHE_MAX_ROWS", 10000))
+        self.DB_QUERY_CACHE_MAX_BYTES = int(
+            os.getenv("DB_QUERY_CACHE_MAX_BYTES", 8 * 1024 * 1024)
+        )
 
         self.CHAT_HISTORY_STORE_TYPE = os.getenv("CHAT_HISTORY_STORE_TYPE", "db")
 
@@ -232,6 +254,12 @@ class Config(metaclass=Singleton):
         self.GRAPH_COMMUNITY_SUMMARY_ENABLED = (
             os.getenv("GRAPH_COMMUNITY_SUMMARY_ENABLED", "").lower() == "true"
         )
+        # Cache the LLM responses of the knowledge graph extraction with the model
+        # cache manager
+        self.KNOWLEDGE_GRAPH_EXTRACTION_CACHE_ENABLE = (
+            os.getenv("KNOWLEDGE_GRAPH_EXTRACTION_CACHE_ENABLE", "True").lower()
+            == "true"
+        )
         self.MILVUS_URL = os.getenv("MILVUS_URL", "127.0.0.1")
         self.MILVUS_PORT = os.getenv("MILVUS_PORT", "19530")
         self.MILVUS_USERNAME = os.getenv("MILVUS_USERNAME", None)
@@ -277,6 +305,19 @@ class Config(metaclass=Singleton):
         self.KNOWLEDGE_MAX_CHUNKS_ONCE_LOAD = int(
             os.getenv("KNOWLEDGE_MAX_CHUNKS_ONCE_LOAD", 10)
         )
+        # The maximum number of documents synced at the same time, globally and in
+        # each knowledge space
+        self.KNOWLEDGE_SYNC_MAX_CONCURRENCY = int(
+            os.getenv("KNOWLEDGE_SYNC_MAX_CONCURRENCY", 4)
+        )
+        self.KNOWLEDGE_SYNC_MAX_SPACE_CONCURRENCY = int(
+            os.getenv("KNOWLEDGE_SYNC_MAX_SPACE_CONCURRENCY", 2)
+        )
+        # The number of processes to parse the document files, 0 to parse them in
+        # the threads, default to the number of the CPU cores
+        self.KNOWLEDGE_SYNC_PARSE_PROCESSES = int(
+            os.getenv("KNOWLEDGE_SYNC_PARSE_PROCESSES", os.cpu_count() or 1)
+        )
         # default recall similarity score, between 0 and 1
         self.KNOWLEDGE_SEARCH_RECALL_SCORE = float(
             os.getenv("KNOWLEDGE_SEARCH_RECALL_SCORE", 0.3)
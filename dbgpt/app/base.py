@@ -30,6 +30,20 @@ def async_db_summary(system_app: SystemApp):
     thread = threading.Thread(target=client.init_db_summary)
     thread.start()
 
+    interval = Config().DB_SUMMARY_REFRESH_INTERVAL
+    if interval > 0:
+        import schedule
+
+        def _refresh_db_summary():
+            # Re-index the table summaries changed by the schema changes
+            threading.Thread(
+                target=client.init_db_summary,
+                kwargs={"refresh_schema": True},
+                daemon=True,
+            ).start()
+
+        schedule.every(interval).seconds.do(_refresh_db_summary)
+
 
 def server_init(param: "WebServerParameters", system_app: SystemApp):
     # logger.info(f"args: {args}")
@@ -279,6 +293,13 @@ class WebServerParameters(BaseServerParameters):
             "help": "The directories to search awel files, split by `,`",
         },
     )
+    awel_lazy_load: Optional[bool] = field(
+        default=False,
+        metadata={
+            "help": "Whether to import the unchanged awel files without triggers "
+            "lazily, the awel files index is stored in the data directory",
+        },
+    )
     default_thread_pool_size: Optional[int] = field(
         default=None,
         metadata={
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import logging
+import os
 from typing import Optional
 
 from dbgpt._private.config import Config
 from dbgpt.app.base import WebServerParameters
 from dbgpt.component import SystemApp
-from dbgpt.configs.model_config import MODEL_DISK_CACHE_DIR
+from dbgpt.configs.model_config import DATA_DIR, MODEL_DISK_CACHE_DIR
 from dbgpt.util.executor_utils import DefaultExecutorFactory
 
 logger = logging.getLogger(__name__)
@@ -38,7 +39,18 @@ def initialize_components(
     )
     system_app.register(DefaultScheduler, scheduler_enable=CFG.SCHEDULER_ENABLED)
     system_app.register_instance(controller)
-    system_app.register(ConnectorManager)
+    system_app.register(
+        ConnectorManager,
+        schema_cache_dir=os.path.join(DATA_DIR, "schema_cache"),
+        query_concurrency=CFG.DB_QUERY_CONCURRENCY,
+        query_timeout=CFG.DB_QUERY_TIMEOUT,
+        query_max_rows=CFG.DB_QUERY_MAX_ROWS,
+        query_max_bytes=CFG.DB_QUERY_MAX_BYTES,
+        query_cache_enable=CFG.DB_QUERY_CACHE_ENABLE,
+        query_cache_ttl=CFG.DB_QUERY_CACHE_TTL,
+        query_cache_max_rows=CFG.DB_QUERY_CACHE_MAX_ROWS,
+        query_cache_max_bytes=CFG.DB_QUERY_CACHE_MAX_BYTES,
+    )
 
     from dbgpt.serve.agent.hub.controller import module_plugin
 
@@ -89,7 +101,13 @@ def _initialize_awel(system_app: SystemApp, param: WebServerParameters):
         dag_dirs += param.awel_dirs.strip().split(",")
     dag_dirs = [x.strip() for x in dag_dirs]
 
-    initialize_awel(system_app, dag_dirs)
+    manifest_path = os.path.join(DATA_DIR, "awel_dag_manifest.json")
+    initialize_awel(
+        system_app,
+        dag_dirs,
+        lazy_load=bool(param.awel_lazy_load),
+        manifest_path=manifest_path,
+    )
 
 
 def _initialize_agent(system_app: SystemApp):
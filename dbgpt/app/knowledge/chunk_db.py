@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, func, not_
+from sqlalchemy import Column, DateTime, Integer, String, Text, func, insert, not_
 
 from dbgpt._private.config import Config
 from dbgpt.serve.rag.api.schemas import ChunkServeRequest, ChunkServeResponse
@@ -19,6 +19,10 @@ class DocumentChunkEntity(Model):
     content = Column(Text)
     questions = Column(Text)
     meta_info = Column(String(500))
+    # The hash of the chunk content and metadata, to re-sync incrementally
+    content_hash = Column(String(64))
+    # The id of the chunk in the vector store
+    vector_id = Column(String(255))
     gmt_created = Column(DateTime)
     gmt_modified = Column(DateTime)
 
@@ -34,35 +38,137 @@ class DocumentChunkEntity(Model):
             "content": self.content,
             "questions": self.questions,
             "meta_info": self.meta_info,
+            "content_hash": self.content_hash,
+            "vector_id": self.vector_id,
             "gmt_created": self.gmt_created,
             "gmt_modified": self.gmt_modified,
         }
 
 
 class DocumentChunkDao(BaseDao):
-    def create_documents_chunks(self, documents: List):
-        session = self.get_raw_session()
-        docs = [
-            DocumentChunkEntity(
-                doc_name=document.doc_name,
-                doc_type=document.doc_type,
-                document_id=document.document_id,
-                content=document.content or "",
-                meta_info=document.meta_info or "",
-                gmt_created=datetime.now(),
-                gmt_modified=datetime.now(),
-            )
+    def create_documents_chunks(self, documents: List, batch_size: int = 1000):
+        """Insert the chunks in batches.
+
+        Each batch is inserted by one executemany statement, the ORM objects are
+        not created, so the ids of the inserted chunks are not returned.
+        """
+        now = datetime.now()
+        rows = [
+            {
+                "doc_name": document.doc_name,
+                "doc_type": document.doc_type,
+                "document_id": document.document_id,
+                "content": document.content or "",
+                "meta_info": document.meta_info or "",
+                "content_hash": document.content_hash,
+                "vector_id": document.vector_id,
+                "gmt_created": now,
+                "gmt_modified": now,
+            }
             for document in documents
         ]
-        session.add_all(docs)
-        session.commit()
-        session.close()
+        session = self.get_raw_session()
+        try:
+            for i in range(0, len(rows), batch_size):
+                session.execute(insert(DocumentChunkEntity), rows[i : i + batch_size])
+            session.commit()
+        finally:
+            session.close()
 
     def get_document_chunks(
         self, query: DocumentChunkEntity, page=1, page_size=20, document_ids=None
     ):
         session = self.get_raw_session()
-        document_chunks = session.query(DocumentChunkEntity)
+        document_chunks = self._filter_chunks(
+            session.query(DocumentChunkEntity), query, document_ids
+        )
+        document_chunks = document_chunks.order_by(DocumentChunkEntity.id.asc())
+        document_chunks = document_chunks.offset((page - 1) * page_size).limit(
+            page_size
+        )
+        result = document_chunks.all()
+        session.close()
+        return result
+
+    def get_document_chunks_after(
+        self,
+        query: DocumentChunkEntity,
+        after_id: Optional[int] = None,
+        limit: int = 20,
+        document_ids=None,
+    ) -> List[DocumentChunkEntity]:
+        """Get the chunks after the chunk id with the keyset pagination.
+
+        Unlike the offset pagination, the cost of a page doesn't grow with the page
+        number, the chunks of a document are located by the index of the document id.
+
+        Args:
+            query (DocumentChunkEntity): The query conditions.
+            after_id (Optional[int]): The id of the last chunk of the previous page,
+                None for the first page.
+            limit (int): The maximum number of the chunks.
+            document_ids (Optional[List[int]]): The document ids.
+
+        Returns:
+            List[DocumentChunkEntity]: The chunks ordered by the id.
+        """
+        session = self.get_raw_session()
+        try:
+            document_chunks = self._filter_chunks(
+                session.query(DocumentChunkEntity), query, document_ids
+            )
+            if after_id is not None:
+                document_chunks = document_chunks.filter(
+                    DocumentChunkEntity.id > after_id
+                )
+            return (
+                document_chunks.order_by(DocumentChunkEntity.id.asc())
+                .limit(limit)
+                .all()
+            )
+        finally:
+            session.close()
+
+    def iter_document_chunks(
+        self, query: DocumentChunkEntity, batch_size: int = 500, document_ids=None
+    ) -> Iterator[DocumentChunkEntity]:
+        """Iterate all the chunks matching the query page by page."""
+        after_id = None
+        while True:
+            chunks = self.get_document_chunks_after(
+                query, after_id, batch_size, document_ids
+            )
+            yield from chunks
+            if len(chunks) < batch_size:
+                return
+            after_id = chunks[-1].id
+
+    def get_vector_ids(self, document_id: int) -> List[str]:
+        """Get the vector ids of the chunks of the document.
+
+        Args:
+            document_id (int): The document id.
+
+        Returns:
+            List[str]: The vector ids ordered by the chunk id, the chunk content is
+                not loaded.
+        """
+        session = self.get_raw_session()
+        try:
+            rows = (
+                session.query(DocumentChunkEntity.vector_id)
+                .filter(
+                    DocumentChunkEntity.document_id == document_id,
+                    DocumentChunkEntity.vector_id.isnot(None),
+                )
+                .order_by(DocumentChunkEntity.id.asc())
+                .all()
+            )
+            return [row[0] for row in rows]
+        finally:
+            session.close()
+
+    def _filter_chunks(self, document_chunks, query: DocumentChunkEntity, document_ids):
         if query.id is not None:
             document_chunks = document_chunks.filter(DocumentChunkEntity.id == query.id)
         if query.document_id is not None:
@@ -89,14 +195,7 @@ class DocumentChunkDao(BaseDao):
             document_chunks = document_chunks.filter(
                 DocumentChunkEntity.document_id.in_(document_ids)
             )
-
-        document_chunks = document_chunks.order_by(DocumentChunkEntity.id.asc())
-        document_chunks = document_chunks.offset((page - 1) * page_size).limit(
-            page_size
-        )
-        result = document_chunks.all()
-        session.close()
-        return result
+        return document_chunks
 
     def get_chunks_with_questions(self, query: DocumentChunkEntity, document_ids=None):
         session = self.get_raw_session()
@@ -157,6 +256,46 @@ class DocumentChunkDao(BaseDao):
         session.close()
         return count
 
+    def get_chunk_fingerprints(
+        self, document_id: int
+    ) -> List[Tuple[int, Optional[str], Optional[str]]]:
+        """Get the fingerprints of the chunks of the document.
+
+        Args:
+            document_id (int): The document id.
+
+        Returns:
+            List[Tuple[int, Optional[str], Optional[str]]]: The id, content hash and
+                vector id of each chunk, the chunk content is not loaded.
+        """
+        session = self.get_raw_session()
+        try:
+            rows = (
+                session.query(
+                    DocumentChunkEntity.id,
+                    DocumentChunkEntity.content_hash,
+                    DocumentChunkEntity.vector_id,
+                )
+                .filter(DocumentChunkEntity.document_id == document_id)
+                .order_by(DocumentChunkEntity.id.asc())
+                .all()
+            )
+            return [(row[0], row[1], row[2]) for row in rows]
+        finally:
+            session.close()
+
+    def delete_chunks(self, ids: List[int], batch_size: int = 500):
+        """Delete the chunks by ids in batches."""
+        session = self.get_raw_session()
+        try:
+            for i in range(0, len(ids), batch_size):
+                session.query(DocumentChunkEntity).filter(
+                    DocumentChunkEntity.id.in_(ids[i : i + batch_size])
+                ).delete(synchronize_session=False)
+            session.commit()
+        finally:
+            session.close()
+
     def raw_delete(self, document_id: int):
         session = self.get_raw_session()
         if document_id is None:
@@ -205,6 +344,8 @@ class DocumentChunkDao(BaseDao):
             content=entity.content,
             questions=entity.questions,
             meta_info=entity.meta_info,
+            content_hash=entity.content_hash,
+            vector_id=entity.vector_id,
             gmt_created=entity.gmt_created,
             gmt_modified=entity.gmt_modified,
         )
@@ -226,6 +367,8 @@ class DocumentChunkDao(BaseDao):
             content=entity.content,
             questions=entity.questions,
             meta_info=entity.meta_info,
+            content_hash=entity.content_hash,
+            vector_id=entity.vector_id,
             gmt_created=str(entity.gmt_created),
             gmt_modified=str(entity.gmt_modified),
         )
@@ -32,6 +32,8 @@ class KnowledgeDocumentEntity(Model):
     result = Column(Text)
     vector_ids = Column(Text)
     summary = Column(Text)
+    # The hash of the document content, to skip the re-sync of unchanged documents
+    content_hash = Column(String(64))
     gmt_created = Column(DateTime)
     gmt_modified = Column(DateTime)
     questions = Column(Text)
@@ -54,6 +56,7 @@ class KnowledgeDocumentEntity(Model):
             "result": self.result,
             "vector_ids": self.vector_ids,
             "summary": self.summary,
+            "content_hash": self.content_hash,
             "gmt_create": self.gmt_created,
             "gmt_modified": self.gmt_modified,
             "questions": self.questions,
@@ -374,6 +377,7 @@ class KnowledgeDocumentDao(BaseDao):
             vector_ids=entity.vector_ids,
             summary=entity.summary,
             questions=entity.questions,
+            content_hash=entity.content_hash,
             gmt_created=entity.gmt_created,
             gmt_modified=entity.gmt_modified,
         )
@@ -400,6 +404,7 @@ class KnowledgeDocumentDao(BaseDao):
             vector_ids=entity.vector_ids,
             summary=entity.summary,
             questions=entity.questions,
+            content_hash=entity.content_hash,
             gmt_created=str(entity.gmt_created),
             gmt_modified=str(entity.gmt_modified),
         )
@@ -454,8 +454,13 @@ class KnowledgeService:
             raise Exception(f"invalid space name:{space_name}")
         space = spaces[0]
 
-        vector_ids = documents[0].vector_ids
-        if vector_ids is not None:
+        # The vector ids are saved with the chunks, the ids can't be mapped to the
+        # chunks are kept in the document
+        vector_ids = document_chunk_dao.get_vector_ids(documents[0].id)
+        if documents[0].vector_ids:
+            vector_ids.extend(documents[0].vector_ids.split(","))
+        vector_ids = list(dict.fromkeys(vector_ids))
+        if vector_ids:
             embedding_factory = CFG.SYSTEM_APP.get_component(
                 "embedding_factory", EmbeddingFactory
             )
@@ -472,7 +477,8 @@ class KnowledgeService:
                 vector_store_type=space.vector_type, vector_store_config=config
             )
             # delete vector by ids
-            vector_store_connector.delete_by_ids(vector_ids)
+            for i in range(0, len(vector_ids), 1000):
+                vector_store_connector.delete_by_ids(",".join(vector_ids[i : i + 1000]))
         # delete chunks
         document_chunk_dao.raw_delete(documents[0].id)
         # delete document
@@ -518,8 +524,10 @@ class KnowledgeService:
                 vector_ids = assembler.persist()
             doc.status = SyncStatus.FINISHED.name
             doc.result = "document embedding success"
-            if vector_ids is not None:
-                doc.vector_ids = ",".join(vector_ids)
+            vector_ids = vector_ids or []
+            mapped = len(vector_ids) == len(chunk_docs)
+            # The vector ids are saved with the chunks if they can be mapped
+            doc.vector_ids = None if mapped or not vector_ids else ",".join(vector_ids)
             logger.info(f"async document embedding, success:{doc.doc_name}")
             # save chunk details
             chunk_entities = [
@@ -529,10 +537,11 @@ class KnowledgeService:
                     document_id=doc.id,
                     content=chunk_doc.content,
                     meta_info=str(chunk_doc.metadata),
+                    vector_id=vector_ids[i] if mapped else None,
                     gmt_created=datetime.now(),
                     gmt_modified=datetime.now(),
                 )
-                for chunk_doc in chunk_docs
+                for i, chunk_doc in enumerate(chunk_docs)
             ]
             document_chunk_dao.create_documents_chunks(chunk_entities)
         except Exception as e:
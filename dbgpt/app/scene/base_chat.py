@@ -255,6 +255,9 @@ class BaseChat(ABC):
     def stream_plugin_call(self, text):
         return text
 
+    async def astream_plugin_call(self, text):
+        return self.stream_plugin_call(text)
+
     def stream_call_reinforce_fn(self, text):
         return text
 
@@ -284,7 +287,7 @@ class BaseChat(ABC):
                 msg = self.prompt_template.output_parser.parse_model_stream_resp_ex(
                     output, 0
                 )
-                view_msg = self.stream_plugin_call(msg)
+                view_msg = await self.astream_plugin_call(msg)
                 view_msg = view_msg.replace("\n", "\\n")
                 yield view_msg
             self.current_message.add_ai_message(msg)
@@ -5,17 +5,32 @@ from typing import List
 
 from dbgpt._private.config import Config
 from dbgpt.app.scene.chat_dashboard.data_preparation.report_schma import ValueItem
+from dbgpt.datasource.rdbms.base import RDBMSConnector
 
 CFG = Config()
 logger = logging.getLogger(__name__)
 
 
+def _query_chart_data(db_conn, chart_sql: str):
+    if isinstance(db_conn, RDBMSConnector):
+        # Fetch the rows in batches within the limits, with the query timeout
+        return db_conn.query_executor.run(
+            db_conn,
+            "query_ex",
+            chart_sql,
+            max_rows=CFG.DB_QUERY_MAX_ROWS,
+            max_bytes=CFG.DB_QUERY_MAX_BYTES,
+            use_cache=True,
+        )
+    return db_conn.query_ex(chart_sql)
+
+
 class DashboardDataLoader:
     def get_sql_value(self, db_conn, chart_sql: str):
-        return db_conn.query_ex(chart_sql)
+        return _query_chart_data(db_conn, chart_sql)
 
     def get_chart_values_by_conn(self, db_conn, chart_sql: str):
-        field_names, datas = db_conn.query_ex(chart_sql)
+        field_names, datas = _query_chart_data(db_conn, chart_sql)
         return self.get_chart_values_by_data(field_names, datas, chart_sql)
 
     def get_chart_values_by_data(self, field_names, datas, chart_sql: str):
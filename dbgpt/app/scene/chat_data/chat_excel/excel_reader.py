@@ -1,11 +1,14 @@
-import io
+import hashlib
 import json
 import logging
 import os
+import re
+import threading
+from typing import List
+from typing import Optional as TypingOptional
 
 import chardet
 import duckdb
-import numpy as np
 import pandas as pd
 import sqlparse
 from pyparsing import (
@@ -19,8 +22,8 @@ from pyparsing import (
     delimitedList,
 )
 
-from dbgpt.util.file_client import FileClient
-from dbgpt.util.pd_utils import csv_colunm_foramt
+from dbgpt.configs.model_config import DATA_DIR
+from dbgpt.util.pd_utils import infer_column_types
 from dbgpt.util.string_utils import is_chinese_include_number
 
 logger = logging.getLogger(__name__)
@@ -229,118 +232,212 @@ def is_chinese(text):
     return False
 
 
+# The parsed and typed tables of the uploaded files are cached as DuckDB files, so
+# the follow-up questions of a conversation don't parse the file again
+_EXCEL_CACHE_DIR = os.path.join(DATA_DIR, "excel_cache")
+_EXCEL_CACHE_MAX_BYTES = 4 * 1024 * 1024 * 1024
+_EXCEL_CACHE_VERSION = 2
+_SOURCE_TABLE = "excel_source"
+# The columns without header, e.g. "Unnamed: 1" of pandas and "column1" of DuckDB
+_UNNAMED_COLUMN_PATTERN = re.compile(r"^(Unnamed: \d+|column\d+)$")
+_ENCODING_SAMPLE_BYTES = 1024 * 1024
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _dataset_cache_key(conv_uid: str, file_path: str) -> str:
+    """Return the cache key of the file of the conversation.
+
+    The key changes when the file is replaced, so the stale table is not used.
+    """
+    stat = os.stat(file_path)
+    content = json.dumps(
+        [
+            _EXCEL_CACHE_VERSION,
+            conv_uid,
+            os.path.abspath(file_path),
+            stat.st_size,
+            stat.st_mtime_ns,
+        ]
+    )
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def _detect_file_encoding(file_path: str, sample_size: TypingOptional[int] = None):
+    with open(file_path, "rb") as f:
+        data = f.read(sample_size) if sample_size else f.read()
+    result = chardet.detect(data)
+    return result["encoding"], result["confidence"]
+
+
+def _load_source_table(db, file_path: str, file_name: str) -> None:
+    """Load the file into the source table in a single pass.
+
+    The utf-8 csv files are read by DuckDB natively with `read_csv_auto` as text,
+    the other files are read by pandas once. The types of the text columns of all
+    the files are inferred by :func:`infer_column_types`, so the same values are
+    typed the same whatever the encoding of the file is.
+    """
+    df = None
+    if file_name.endswith(".xlsx") or file_name.endswith(".xls"):
+        df = pd.read_excel(file_path, index_col=False)
+    elif file_name.endswith(".csv"):
+        encoding, confidence = _detect_file_encoding(file_path, _ENCODING_SAMPLE_BYTES)
+        logger.info(f"Detected Encoding: {encoding} (Confidence: {confidence})")
+        if encoding and encoding.lower() in ("ascii", "utf-8", "utf-8-sig"):
+            try:
+                df = db.execute(
+                    "SELECT * FROM read_csv_auto(?, header = true, all_varchar = true)",
+                    [file_path],
+                ).df()
+            except duckdb.Error as e:
+                logger.info(f"Read csv with DuckDB error, read with pandas: {e}")
+                encoding, _ = _detect_file_encoding(file_path)
+        if df is None:
+            df = pd.read_csv(file_path, index_col=False, encoding=encoding)
+    else:
+        raise ValueError("Unsupported file format.")
+    # The dates are kept as text formatted as "%Y-%m-%d"
+    infer_column_types(df, date_format="%Y-%m-%d")
+    df.columns = [str(column) for column in df.columns]
+    db.register("excel_source_df", df)
+    db.execute(f"CREATE TABLE {_SOURCE_TABLE} AS SELECT * FROM excel_source_df")
+    db.unregister("excel_source_df")
+
+
+def _column_expressions(db, source: str) -> List[str]:
+    """Return the select expressions to format the columns of the source table.
+
+    The dates typed by the reader are formatted as "%Y-%m-%d", the same as the dates
+    inferred from text, and the empty columns without header are dropped.
+
+    Args:
+        db: The DuckDB connection.
+        source (str): The source table.
+    """
+    columns = db.execute(f"DESCRIBE {source}").fetchall()
+    counts = [f"count({_quote_identifier(name)})" for name, *_ in columns]
+    non_nulls = db.execute(f"SELECT {', '.join(counts)} FROM {source}").fetchone()
+
+    exprs = []
+    for (name, data_type, *_), non_null in zip(columns, non_nulls):
+        quoted = _quote_identifier(name)
+        alias = _quote_identifier(excel_colunm_format(name))
+        if non_null == 0 and _UNNAMED_COLUMN_PATTERN.match(name):
+            continue
+        if data_type.startswith("TIMESTAMP") or data_type == "DATE":
+            exprs.append(f"strftime({quoted}, '%Y-%m-%d') AS {alias}")
+        else:
+            exprs.append(f"{quoted} AS {alias}")
+    return exprs
+
+
+def _evict_dataset_cache(cache_dir: str, max_bytes: int, keep: str) -> None:
+    """Remove the least recently used cached tables when the cache is too large."""
+    try:
+        files = []
+        for file_name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, file_name)
+            if file_name.endswith(".duckdb") and path != keep:
+                stat = os.stat(path)
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files) + os.path.getsize(keep)
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            os.remove(path)
+            total -= size
+    except OSError as e:
+        logger.warning(f"Evict excel cache error: {e}")
+
+
 class ExcelReader:
-    def __init__(self, conv_uid: str, file_param: str):
+    def __init__(
+        self,
+        conv_uid: str,
+        file_param: str,
+        cache_dir: TypingOptional[str] = _EXCEL_CACHE_DIR,
+        cache_max_bytes: int = _EXCEL_CACHE_MAX_BYTES,
+    ):
+        """Create a new ExcelReader.
+
+        The file is parsed once per conversation, the typed table is cached as a
+        DuckDB file in `cache_dir`, and the following turns of the conversation
+        open the cached table directly.
+        """
         self.conv_uid = conv_uid
         self.file_param = file_param
         if isinstance(file_param, str) and os.path.isabs(file_param):
+            file_path = file_param
             file_name = os.path.basename(file_param)
-            self.file_name_without_extension = os.path.splitext(file_name)[0]
-            encoding, confidence = detect_encoding(file_param)
-
-            self.excel_file_name = file_name
-            self.extension = os.path.splitext(file_name)[1]
-
-            file_info = file_param
         else:
             if isinstance(file_param, dict):
                 file_path = file_param.get("file_path", None)
                 if not file_path:
                     raise ValueError("Not find file path!")
-                else:
-                    file_name = os.path.basename(file_path.replace(f"{conv_uid}_", ""))
-
             else:
                 temp_obj = json.loads(file_param)
                 file_path = temp_obj.get("file_path", None)
-                file_name = os.path.basename(file_path.replace(f"{conv_uid}_", ""))
+            file_name = os.path.basename(file_path.replace(f"{conv_uid}_", ""))
 
-            self.file_name_without_extension = os.path.splitext(file_name)[0]
-
-            self.excel_file_name = file_name
-            self.extension = os.path.splitext(file_name)[1]
+        self.file_name_without_extension = os.path.splitext(file_name)[0]
+        self.excel_file_name = file_name
+        self.extension = os.path.splitext(file_name)[1]
+        self.table_name = "excel_data"
 
-            file_client = FileClient()
-            file_info = file_client.read_file(
-                conv_uid=self.conv_uid, file_key=file_path
-            )
+        self.db = None
+        if cache_dir:
+            try:
+                self.db = self._open_cached_table(
+                    file_path, file_name, cache_dir, cache_max_bytes
+                )
+            except Exception as e:
+                logger.warning(f"Cache excel table error, load it in memory: {e}")
+        if self.db is None:
+            self.db = duckdb.connect(database=":memory:", read_only=False)
+            self._create_table(self.db, file_path, file_name)
 
-            result = chardet.detect(file_info)
-            encoding = result["encoding"]
-            confidence = result["confidence"]
+        result = self.db.execute(f"DESCRIBE {self.table_name}")
+        logger.info(f"Excel table columns: {result.fetchall()}")
 
-        logger.info(
-            f"File Info:{len(file_info)},Detected Encoding: {encoding} (Confidence: {confidence})"
+    def _open_cached_table(
+        self, file_path: str, file_name: str, cache_dir: str, cache_max_bytes: int
+    ):
+        cache_file = os.path.join(
+            cache_dir, f"{_dataset_cache_key(self.conv_uid, file_path)}.duckdb"
         )
-
-        # read excel file
-        if file_name.endswith(".xlsx") or file_name.endswith(".xls"):
-            df_tmp = pd.read_excel(file_info, index_col=False)
-            self.df = pd.read_excel(
-                file_info,
-                index_col=False,
-                converters={i: csv_colunm_foramt for i in range(df_tmp.shape[1])},
-            )
-        elif file_name.endswith(".csv"):
-            df_tmp = pd.read_csv(
-                file_info if isinstance(file_info, str) else io.BytesIO(file_info),
-                index_col=False,
-                encoding=encoding,
-            )
-            self.df = pd.read_csv(
-                file_info if isinstance(file_info, str) else io.BytesIO(file_info),
-                index_col=False,
-                encoding=encoding,
-                converters={i: csv_colunm_foramt for i in range(df_tmp.shape[1])},
-            )
+        if os.path.exists(cache_file):
+            logger.info(f"Use the cached table {cache_file} of {file_name}")
+            # Mark it as recently used
+            os.utime(cache_file)
         else:
-            raise ValueError("Unsupported file format.")
-
-        self.df.replace("", np.nan, inplace=True)
-
-        # 修改的部分
-
-        unnamed_columns_tmp = [
-            col
-            for col in df_tmp.columns
-            if col.startswith("Unnamed") and df_tmp[col].isnull().all()
-        ]
-        df_tmp.drop(columns=unnamed_columns_tmp, inplace=True)
-
-        self.df = self.df[df_tmp.columns.values]
-        #
-
-        self.columns_map = {}
-        for column_name in df_tmp.columns:
-            self.df[column_name] = self.df[column_name].astype(str)
-            self.columns_map.update({column_name: excel_colunm_format(column_name)})
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            db = duckdb.connect(database=tmp_file, read_only=False)
             try:
-                self.df[column_name] = pd.to_datetime(self.df[column_name]).dt.strftime(
-                    "%Y-%m-%d"
-                )
-            except ValueError:
-                try:
-                    self.df[column_name] = pd.to_numeric(self.df[column_name])
-                except ValueError:
-                    try:
-                        self.df[column_name] = self.df[column_name].astype(str)
-                    except Exception:
-                        print("Can't transform column: " + column_name)
-
-        self.df = self.df.rename(columns=lambda x: x.strip().replace(" ", "_"))
-
-        # connect DuckDB
-        self.db = duckdb.connect(database=":memory:", read_only=False)
-
-        self.table_name = "excel_data"
-        # write data in duckdb
-        self.db.register(self.table_name, self.df)
+                self._create_table(db, file_path, file_name)
+            finally:
+                db.close()
+            os.replace(tmp_file, cache_file)
+            _evict_dataset_cache(cache_dir, cache_max_bytes, keep=cache_file)
+        return duckdb.connect(database=cache_file, read_only=True)
+
+    def _create_table(self, db, file_path: str, file_name: str) -> None:
+        """Parse the file and create the typed table."""
+        _load_source_table(db, file_path, file_name)
+        exprs = _column_expressions(db, _SOURCE_TABLE)
+        db.execute(
+            f"CREATE TABLE {self.table_name} AS SELECT {', '.join(exprs)} "
+            f"FROM {_SOURCE_TABLE}"
+        )
+        db.execute(f"DROP TABLE {_SOURCE_TABLE}")
 
-        # 获取结果并打印表结构信息
-        result = self.db.execute(f"DESCRIBE {self.table_name}")
-        columns = result.fetchall()
-        for column in columns:
-            print(column)
+    @property
+    def df(self) -> pd.DataFrame:
+        """Return the whole table as a DataFrame."""
+        return self.db.execute(f"SELECT * FROM {self.table_name}").df()
 
     def run(self, sql):
         try:
@@ -0,0 +1,189 @@
+import os
+
+import pandas as pd
+import pytest
+
+from ..excel_reader import ExcelReader, _dataset_cache_key, _evict_dataset_cache
+
+_CSV_CONTENT = """id,amount,created,name,
+1,"$1,200",2024-01-02,Alice,
+2,$300,2024-02-03,Bob,
+3,$45.5,2024-03-04,Carol,
+"""
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text(_CSV_CONTENT, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def xlsx_file(tmp_path):
+    path = tmp_path / "sales.xlsx"
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "amount": ["$1,200", "$300", "$45.5"],
+            "created": pd.to_datetime(["2024-01-02", "2024-02-03", "2024-03-04"]),
+            "name": ["Alice", "Bob", "Carol"],
+            "note": [None, None, None],
+        }
+    )
+    df.to_excel(path, index=False)
+    return str(path)
+
+
+def _column_types(reader: ExcelReader):
+    rows = reader.db.execute(f"DESCRIBE {reader.table_name}").fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def _cache_files(cache_dir):
+    if not os.path.isdir(cache_dir):
+        return []
+    return sorted(f for f in os.listdir(cache_dir) if f.endswith(".duckdb"))
+
+
+def test_dataset_cache_key(csv_file):
+    key = _dataset_cache_key("conv_1", csv_file)
+    assert key == _dataset_cache_key("conv_1", csv_file)
+    assert len(key) == 40
+    assert key != _dataset_cache_key("conv_2", csv_file)
+
+    stat = os.stat(csv_file)
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert _dataset_cache_key("conv_1", csv_file) != key
+
+
+def test_cached_table_reused(csv_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    reader = ExcelReader("conv_1", csv_file, cache_dir=cache_dir)
+    files = _cache_files(cache_dir)
+    assert len(files) == 1
+    assert reader.get_sample_data()[1][0][0] == 1
+    reader.db.close()
+
+    reader = ExcelReader("conv_1", csv_file, cache_dir=cache_dir)
+    assert _cache_files(cache_dir) == files
+    assert len(reader.df) == 3
+    reader.db.close()
+
+    # Another conversation has its own table
+    ExcelReader("conv_2", csv_file, cache_dir=cache_dir).db.close()
+    assert len(_cache_files(cache_dir)) == 2
+
+
+@pytest.mark.parametrize("change", ["mtime", "size"])
+def test_cached_table_invalidated(csv_file, tmp_path, change):
+    cache_dir = str(tmp_path / "cache")
+    ExcelReader("conv_1", csv_file, cache_dir=cache_dir).db.close()
+    old_files = _cache_files(cache_dir)
+
+    stat = os.stat(csv_file)
+    if change == "mtime":
+        os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    else:
+        with open(csv_file, "a", encoding="utf-8") as f:
+            f.write("4,$10,2024-04-05,Dave,\n")
+        os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    reader = ExcelReader("conv_1", csv_file, cache_dir=cache_dir)
+    new_files = set(_cache_files(cache_dir)) - set(old_files)
+    assert len(new_files) == 1
+    assert len(reader.df) == (3 if change == "mtime" else 4)
+    reader.db.close()
+
+
+def test_evict_dataset_cache(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    for i, name in enumerate(["a", "b", "c", "d"]):
+        path = cache_dir / f"{name}.duckdb"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))
+    (cache_dir / "other.txt").write_bytes(b"x" * 1000)
+
+    # "a" is the least recently used, but it is kept as the new table
+    _evict_dataset_cache(str(cache_dir), 250, keep=str(cache_dir / "a.duckdb"))
+    assert sorted(os.listdir(cache_dir)) == ["a.duckdb", "d.duckdb", "other.txt"]
+
+
+def test_cached_tables_evicted(csv_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    ExcelReader("conv_1", csv_file, cache_dir=cache_dir).db.close()
+    first = _cache_files(cache_dir)
+    ExcelReader("conv_2", csv_file, cache_dir=cache_dir, cache_max_bytes=1).db.close()
+    files = _cache_files(cache_dir)
+    assert len(files) == 1 and files != first
+
+
+@pytest.mark.parametrize("cache", [True, False])
+def test_csv_typed_table(csv_file, tmp_path, cache):
+    cache_dir = str(tmp_path / "cache") if cache else None
+    reader = ExcelReader("conv_1", csv_file, cache_dir=cache_dir)
+    assert reader.table_name == "excel_data"
+    assert reader.excel_file_name == "sales.csv"
+    types = _column_types(reader)
+    # The empty column without header is dropped
+    assert list(types.keys()) == ["id", "amount", "created", "name"]
+    assert types["amount"] == "DOUBLE"
+    assert types["name"] == "VARCHAR"
+    df = reader.df
+    assert df["id"].tolist() == [1, 2, 3]
+    assert df["amount"].tolist() == [1200.0, 300.0, 45.5]
+    assert df["created"].astype(str).tolist() == [
+        "2024-01-02",
+        "2024-02-03",
+        "2024-03-04",
+    ]
+    columns, rows = reader.run("SELECT sum(amount) FROM excel_data")
+    assert rows == [(1545.5,)]
+    reader.db.close()
+
+
+def test_xlsx_typed_table(xlsx_file, tmp_path):
+    reader = ExcelReader("conv_1", xlsx_file, cache_dir=str(tmp_path / "cache"))
+    types = _column_types(reader)
+    assert list(types.keys()) == ["id", "amount", "created", "name", "note"]
+    assert types["id"] == "BIGINT"
+    assert types["amount"] == "DOUBLE"
+    assert types["name"] == "VARCHAR"
+    df = reader.df
+    assert df["amount"].tolist() == [1200.0, 300.0, 45.5]
+    assert df["created"].tolist() == ["2024-01-02", "2024-02-03", "2024-03-04"]
+    assert df["note"].isna().all()
+    reader.db.close()
+
+
+def test_file_param_of_conversation(csv_file, tmp_path):
+    renamed = tmp_path / "conv_1_sales.csv"
+    os.rename(csv_file, renamed)
+    reader = ExcelReader("conv_1", {"file_path": str(renamed)}, cache_dir=None)
+    assert reader.excel_file_name == "sales.csv"
+    assert reader.file_name_without_extension == "sales"
+    reader.db.close()
+
+
+def test_csv_typed_the_same_of_encodings(tmp_path):
+    # The dates in mixed formats and the numbers with thousands separators
+    content = "city,sales,created,amount\n" + "".join(
+        f'城市{i},"3,{i:03d}",'
+        f"\"{f'2024-01-{i % 9 + 1:02d}' if i % 2 else f'Jan {i % 9 + 1}, 2024'}\","
+        f"${i}.5\n"
+        for i in range(50)
+    )
+    tables = []
+    for encoding in ["utf-8", "gbk"]:
+        path = tmp_path / f"sales_{encoding}.csv"
+        path.write_bytes(content.encode(encoding))
+        reader = ExcelReader("conv_1", str(path), cache_dir=None)
+        tables.append((_column_types(reader), reader.df))
+        reader.db.close()
+    (utf8_types, utf8_df), (gbk_types, gbk_df) = tables
+    assert utf8_types == gbk_types
+    assert utf8_types["amount"] == "DOUBLE"
+    for column in ["sales", "created", "amount"]:
+        assert utf8_df[column].tolist() == gbk_df[column].tolist()
+    assert utf8_df["created"].tolist()[:2] == ["2024-01-01", "2024-01-02"]
@@ -1,8 +1,11 @@
-from typing import Dict
+import asyncio
+from typing import Dict, Set
 
 from dbgpt._private.config import Config
 from dbgpt.agent.util.api_call import ApiCall
 from dbgpt.app.scene import BaseChat, ChatScene
+from dbgpt.datasource.rdbms.base import RDBMSConnector
+from dbgpt.datasource.rdbms.query_executor import RunningQuery
 from dbgpt.util.executor_utils import blocking_func_to_async
 from dbgpt.util.tracer import root_tracer, trace
 
@@ -38,6 +41,7 @@ class ChatWithDbAutoExecute(BaseChat):
             "ChatWithDbAutoExecute.get_connect", metadata={"db_name": self.db_name}
         ):
             self.database = CFG.local_db_manager.get_connector(self.db_name)
+        self._running_queries: Set[RunningQuery] = set()
 
         self.top_k: int = 50
         self.api_call = ApiCall()
@@ -80,14 +84,48 @@ class ChatWithDbAutoExecute(BaseChat):
         }
         return input_values
 
+    async def astream_plugin_call(self, text):
+        """Run the SQL out of the event loop, cancel it if the client disconnects."""
+        try:
+            return await blocking_func_to_async(
+                self._executor, self.stream_plugin_call, text
+            )
+        except asyncio.CancelledError:
+            for query in list(self._running_queries):
+                query.cancel()
+            raise
+
     def stream_plugin_call(self, text):
         text = text.replace("\n", " ")
         print(f"stream_plugin_call:{text}")
-        return self.api_call.display_sql_llmvis(text, self.database.run_to_df)
+        return self.api_call.display_sql_llmvis(text, self._run_to_df())
 
     def do_action(self, prompt_response):
         print(f"do_action:{prompt_response}")
+        return self._run_to_df()
+
+    def _run_to_df(self):
+        """Return the function to run the sql within the result limits."""
+        if isinstance(self.database, RDBMSConnector):
+            return self._run_sql_to_df
         return self.database.run_to_df
+
+    def _run_sql_to_df(self, sql: str):
+        """Run the sql in the query executor of the datasource with timeout."""
+        executor = self.database.query_executor
+        future, query = executor.submit(
+            self.database,
+            "run_to_df",
+            sql,
+            max_rows=CFG.DB_QUERY_MAX_ROWS,
+            max_bytes=CFG.DB_QUERY_MAX_BYTES,
+            use_cache=True,
+        )
+        self._running_queries.add(query)
+        try:
+            return executor.wait(future, query)
+        finally:
+            self._running_queries.discard(query)
     
     def format_history_messages(self, messages):
         """格式化历史消息为易读的格式"""
@@ -56,7 +56,11 @@ from .trigger.http_trigger import (
     CommonLLMHttpResponseBody,
     HttpTrigger,
 )
-from .trigger.iterator_trigger import IteratorTrigger
+from .trigger.iterator_trigger import (
+    FileIteratorCheckpoint,
+    IteratorCheckpoint,
+    IteratorTrigger,
+)
 
 _request_http_trigger_available = False
 try:
@@ -105,6 +109,8 @@ __all__ = [
     "Trigger",
     "HttpTrigger",
     "IteratorTrigger",
+    "IteratorCheckpoint",
+    "FileIteratorCheckpoint",
     "CommonLLMHttpResponseBody",
     "CommonLLMHttpRequestBody",
     "setup_dev_environment",
@@ -115,7 +121,12 @@ if _request_http_trigger_available:
     __all__.append("RequestHttpTrigger")
 
 
-def initialize_awel(system_app: SystemApp, dag_dirs: List[str]):
+def initialize_awel(
+    system_app: SystemApp,
+    dag_dirs: List[str],
+    lazy_load: bool = False,
+    manifest_path: Optional[str] = None,
+):
     """Initialize AWEL."""
     from .dag.dag_manager import DAGManager
     from .operators.base import initialize_runner
@@ -124,7 +135,9 @@ def initialize_awel(system_app: SystemApp, dag_dirs: List[str]):
     DAGVar.set_current_system_app(system_app)
 
     system_app.register(DefaultTriggerManager)
-    dag_manager = DAGManager(system_app, dag_dirs)
+    dag_manager = DAGManager(
+        system_app, dag_dirs, lazy_load=lazy_load, manifest_path=manifest_path
+    )
     system_app.register_instance(dag_manager)
     initialize_runner(DefaultWorkflowRunner())
 
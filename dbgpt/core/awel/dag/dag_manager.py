@@ -2,6 +2,14 @@
 
 DAGManager will load DAGs from dag_dirs, and register the trigger nodes
 to TriggerManager.
+
+With lazy loading enabled, the files recorded in the DAG manifest which have not
+changed and have no trigger nodes or tags are not imported at startup, their DAGs
+are imported the first time they are requested. The trigger nodes must be mounted to
+the web app and the tags must be indexed at startup, so those files are always
+imported. The files failed to import are imported again at every startup, e.g. after
+their missing dependencies are installed. A DAG requested by an alias not registered
+yet imports the lazy files until the alias is found.
 """
 
 import logging
@@ -15,7 +23,7 @@ from dbgpt.component import BaseComponent, ComponentType, SystemApp
 from .. import BaseOperator
 from ..trigger.base import TriggerMetadata
 from .base import DAG
-from .loader import LocalFileDAGLoader
+from .loader import DAGManifest, LocalFileDAGLoader
 
 logger = logging.getLogger(__name__)
 
@@ -51,18 +59,33 @@ class DAGManager(BaseComponent):
 
     name = ComponentType.AWEL_DAG_MANAGER
 
-    def __init__(self, system_app: SystemApp, dag_dirs: List[str]):
+    def __init__(
+        self,
+        system_app: SystemApp,
+        dag_dirs: List[str],
+        lazy_load: bool = False,
+        manifest_path: Optional[str] = None,
+    ):
         """Initialize a DAGManager.
 
         Args:
             system_app (SystemApp): The system app.
             dag_dirs (List[str]): The directories to load DAGs.
+            lazy_load (bool, optional): Whether to import the unchanged DAG files
+                without trigger nodes or tags lazily. Defaults to False.
+            manifest_path (Optional[str], optional): The path to persist the DAG
+                manifest. Defaults to None.
         """
         from ..trigger.trigger_manager import DefaultTriggerManager
 
         super().__init__(system_app)
-        self.lock = threading.Lock()
-        self.dag_loader = LocalFileDAGLoader(dag_dirs)
+        self.lock = threading.RLock()
+        self.dag_loader = LocalFileDAGLoader(dag_dirs, DAGManifest(manifest_path))
+        self._lazy_load = lazy_load
+        # DAG file path -> DAG ids registered from the file
+        self._file_dag_ids: Dict[str, List[str]] = {}
+        # DAG id -> DAG file path, the DAGs which are not imported yet
+        self._lazy_dag_files: Dict[str, str] = {}
         self.system_app = system_app
         self.dag_map: Dict[str, DAG] = {}
         self.dag_alias_map: Dict[str, str] = {}
@@ -76,9 +99,96 @@ class DAGManager(BaseComponent):
 
     def load_dags(self):
         """Load DAGs from dag_dirs."""
-        dags = self.dag_loader.load_dags()
+        manifest = self.dag_loader.manifest
+        for filepath in self.dag_loader.list_files():
+            record = manifest.get(filepath)
+            if (
+                self._lazy_load
+                and record
+                and not record.has_trigger
+                and not record.has_tags
+                and not record.failed
+                and not manifest.is_changed(filepath)
+            ):
+                with self.lock:
+                    for dag_id in record.dag_ids:
+                        self._lazy_dag_files[dag_id] = filepath
+                continue
+            self._load_file(filepath)
+        manifest.save()
+
+    def reload_dags(self) -> List[str]:
+        """Reload the changed DAG files in dag_dirs.
+
+        Only the new, changed and removed files are touched, the DAGs of the
+        unchanged files keep running. The unchanged files failed to import are not
+        imported again until the next startup.
+
+        Returns:
+            List[str]: The reloaded file paths.
+        """
+        manifest = self.dag_loader.manifest
+        files = self.dag_loader.list_files()
+        reloaded = []
+        for filepath in set(manifest.filepaths()) - set(files):
+            self._unload_file(filepath)
+            manifest.remove(filepath)
+            reloaded.append(filepath)
+        for filepath in files:
+            if not manifest.is_changed(filepath):
+                continue
+            self._unload_file(filepath)
+            self._load_file(filepath)
+            reloaded.append(filepath)
+        manifest.save()
+        return reloaded
+
+    def _load_file(self, filepath: str):
+        dags = self.dag_loader.load_file(filepath)
+        registered = []
         for dag in dags:
-            self.register_dag(dag)
+            try:
+                self.register_dag(dag)
+                registered.append(dag.dag_id)
+            except Exception as e:
+                logger.error(f"Register DAG {dag.dag_id} from {filepath} error: {e}")
+        with self.lock:
+            self._file_dag_ids[filepath] = registered
+
+    def _unload_file(self, filepath: str):
+        with self.lock:
+            dag_ids = self._file_dag_ids.pop(filepath, [])
+            for dag_id, lazy_file in list(self._lazy_dag_files.items()):
+                if lazy_file == filepath:
+                    del self._lazy_dag_files[dag_id]
+        for dag_id in dag_ids:
+            if dag_id in self.dag_map:
+                self.unregister_dag(dag_id)
+
+    def _load_lazy_dag(self, dag_id: str) -> Optional[DAG]:
+        with self.lock:
+            filepath = self._lazy_dag_files.get(dag_id)
+            if not filepath:
+                return self.dag_map.get(dag_id)
+            for _dag_id, lazy_file in list(self._lazy_dag_files.items()):
+                if lazy_file == filepath:
+                    del self._lazy_dag_files[_dag_id]
+            logger.info(f"Lazy load DAG {dag_id} from {filepath}")
+            self._load_file(filepath)
+            self.dag_loader.manifest.save()
+            return self.dag_map.get(dag_id)
+
+    def _load_lazy_alias(self, alias_name: str) -> Optional[DAG]:
+        """Import the lazy DAG files until the alias is registered.
+
+        The aliases are registered when the DAGs are imported, so the lazy files are
+        imported one by one until the alias is found.
+        """
+        with self.lock:
+            while alias_name not in self.dag_alias_map and self._lazy_dag_files:
+                self._load_lazy_dag(next(iter(self._lazy_dag_files)))
+            dag_id = self.dag_alias_map.get(alias_name)
+            return self.dag_map.get(dag_id) if dag_id else None
 
     def before_start(self):
         """Execute before the application starts."""
@@ -162,12 +272,18 @@ class DAGManager(BaseComponent):
     def get_dag(
         self, dag_id: Optional[str] = None, alias_name: Optional[str] = None
     ) -> Optional[DAG]:
-        """Get a DAG by dag_id or alias_name."""
+        """Get a DAG by dag_id or alias_name, the lazy DAG is imported here."""
         # Not lock, because it is read only and need to be fast
         if dag_id and dag_id in self.dag_map:
             return self.dag_map[dag_id]
         if alias_name in self.dag_alias_map:
-            return self.dag_map.get(self.dag_alias_map[alias_name])
+            dag_id = self.dag_alias_map[alias_name]
+            if dag_id in self.dag_map:
+                return self.dag_map[dag_id]
+        if dag_id and dag_id in self._lazy_dag_files:
+            return self._load_lazy_dag(dag_id)
+        if alias_name and self._lazy_dag_files:
+            return self._load_lazy_alias(alias_name)
         return None
 
     def get_dags_by_tag(self, tag_key: str, tag_value) -> List[DAG]:
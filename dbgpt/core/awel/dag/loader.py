@@ -4,13 +4,16 @@ DAGLoader will load DAGs from dag_dirs or other sources.
 Now only support load DAGs from local files.
 """
 
+import dataclasses
 import hashlib
+import json
 import logging
 import os
 import sys
+import threading
 import traceback
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Optional
 
 from .base import DAG
 
@@ -25,37 +28,170 @@ class DAGLoader(ABC):
         """Load dags."""
 
 
+@dataclasses.dataclass
+class DAGFileRecord:
+    """The record of a DAG file in the manifest."""
+
+    filepath: str
+    mtime: float
+    size: int
+    file_hash: str
+    dag_ids: List[str] = dataclasses.field(default_factory=list)
+    has_trigger: bool = False
+    has_tags: bool = False
+    failed: bool = False
+
+
+class DAGManifest:
+    """The index of the DAG files which have been imported.
+
+    It records the stat, the content hash and the DAGs of every file, so unchanged
+    files can be detected without importing them again. The manifest can be
+    persisted to a JSON file to be reused after restart.
+    """
+
+    def __init__(self, manifest_path: Optional[str] = None):
+        """Create a DAGManifest.
+
+        Args:
+            manifest_path (Optional[str], optional): The path to persist the
+                manifest, None means keep it in memory only. Defaults to None.
+        """
+        self._manifest_path = manifest_path
+        self._records: Dict[str, DAGFileRecord] = {}
+        self._lock = threading.Lock()
+        if manifest_path and os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    for item in json.load(f):
+                        record = DAGFileRecord(**item)
+                        self._records[record.filepath] = record
+            except Exception as e:
+                logger.warning(f"Load DAG manifest {manifest_path} error: {e}")
+                self._records = {}
+
+    def get(self, filepath: str) -> Optional[DAGFileRecord]:
+        """Get the record of the file."""
+        return self._records.get(filepath)
+
+    def put(self, record: DAGFileRecord) -> None:
+        """Put the record of the file."""
+        with self._lock:
+            self._records[record.filepath] = record
+
+    def remove(self, filepath: str) -> Optional[DAGFileRecord]:
+        """Remove the record of the file."""
+        with self._lock:
+            return self._records.pop(filepath, None)
+
+    def filepaths(self) -> List[str]:
+        """Return all the files in the manifest."""
+        return list(self._records.keys())
+
+    def is_changed(self, filepath: str) -> bool:
+        """Check whether the file has changed since it was recorded.
+
+        The file stat is checked first, the content hash is computed only if the
+        stat has changed.
+        """
+        record = self._records.get(filepath)
+        if not record or not os.path.exists(filepath):
+            return True
+        stat = os.stat(filepath)
+        if stat.st_mtime == record.mtime and stat.st_size == record.size:
+            return False
+        if _file_hash(filepath) != record.file_hash:
+            return True
+        # Just touched, update the stat to skip the hash next time
+        record.mtime = stat.st_mtime
+        record.size = stat.st_size
+        return False
+
+    def save(self) -> None:
+        """Persist the manifest to the file."""
+        if not self._manifest_path:
+            return
+        with self._lock:
+            data = [dataclasses.asdict(r) for r in self._records.values()]
+        dir_name = os.path.dirname(self._manifest_path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        tmp_path = self._manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self._manifest_path)
+
+
 class LocalFileDAGLoader(DAGLoader):
     """DAG loader for loading DAGs from local files."""
 
-    def __init__(self, dag_dirs: List[str]) -> None:
+    def __init__(
+        self, dag_dirs: List[str], manifest: Optional[DAGManifest] = None
+    ) -> None:
         """Initialize a LocalFileDAGLoader.
 
         Args:
             dag_dirs (List[str]): The directories to load DAGs.
+            manifest (Optional[DAGManifest], optional): The manifest of the loaded
+                DAG files. Defaults to None.
         """
         self._dag_dirs = dag_dirs
+        self._manifest = manifest or DAGManifest()
+
+    @property
+    def manifest(self) -> DAGManifest:
+        """Return the manifest of the loaded DAG files."""
+        return self._manifest
 
     def load_dags(self) -> List[DAG]:
         """Load dags from local files."""
         dags = []
+        for filepath in self.list_files():
+            dags += self.load_file(filepath)
+        return dags
+
+    def list_files(self) -> List[str]:
+        """List all the DAG files in the DAG directories."""
+        files = []
         for filepath in self._dag_dirs:
             if not os.path.exists(filepath):
                 continue
             if os.path.isdir(filepath):
-                dags += _process_directory(filepath)
+                for file in sorted(os.listdir(filepath)):
+                    if file.endswith(".py"):
+                        files.append(os.path.join(filepath, file))
             else:
-                dags += _process_file(filepath)
+                files.append(filepath)
+        return files
+
+    def load_file(self, filepath: str) -> List[DAG]:
+        """Import the file and load the DAGs in it.
+
+        The manifest record of the file is updated after importing, a file failed to
+        import is recorded as failed, so it is never loaded lazily.
+        """
+        stat = os.stat(filepath)
+        file_hash = _file_hash(filepath)
+        mods = _load_modules_from_file(filepath)
+        dags = _process_modules(mods)
+        self._manifest.put(
+            DAGFileRecord(
+                filepath=filepath,
+                mtime=stat.st_mtime,
+                size=stat.st_size,
+                file_hash=file_hash,
+                dag_ids=[dag.dag_id for dag in dags],
+                has_trigger=any(dag.trigger_nodes for dag in dags),
+                has_tags=any(dag.tags for dag in dags),
+                failed=not mods,
+            )
+        )
         return dags
 
 
-def _process_directory(directory: str) -> List[DAG]:
-    dags = []
-    for file in os.listdir(directory):
-        if file.endswith(".py"):
-            filepath = os.path.join(directory, file)
-            dags += _process_file(filepath)
-    return dags
+def _file_hash(filepath: str) -> str:
+    with open(filepath, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
 
 
 def _process_file(filepath) -> List[DAG]:
@@ -0,0 +1,122 @@
+import os
+import textwrap
+
+import pytest
+
+from dbgpt.component import SystemApp
+
+from ..dag_manager import DAGManager
+
+_DAG_TEMPLATE = """
+from dbgpt.core.awel import DAG, MapOperator
+
+with DAG("{dag_id}") as dag:
+    task = MapOperator(lambda x: x + {value})
+"""
+
+
+def _write_dag(path, dag_id: str, value: int = 1):
+    with open(path, "w") as f:
+        f.write(textwrap.dedent(_DAG_TEMPLATE.format(dag_id=dag_id, value=value)))
+
+
+@pytest.fixture
+def dag_dir(tmp_path):
+    dag_dir = tmp_path / "dags"
+    dag_dir.mkdir()
+    _write_dag(dag_dir / "dag_a.py", "dag_a")
+    _write_dag(dag_dir / "dag_b.py", "dag_b")
+    return dag_dir
+
+
+def _create_manager(dag_dir, tmp_path, lazy_load: bool = False) -> DAGManager:
+    return DAGManager(
+        SystemApp(),
+        [str(dag_dir)],
+        lazy_load=lazy_load,
+        manifest_path=str(tmp_path / "manifest.json"),
+    )
+
+
+def test_load_dags(dag_dir, tmp_path):
+    manager = _create_manager(dag_dir, tmp_path)
+    manager.load_dags()
+    assert set(manager.dag_map.keys()) == {"dag_a", "dag_b"}
+    assert os.path.exists(tmp_path / "manifest.json")
+
+
+def test_lazy_load_dags(dag_dir, tmp_path):
+    # The first run builds the manifest
+    _create_manager(dag_dir, tmp_path).load_dags()
+
+    manager = _create_manager(dag_dir, tmp_path, lazy_load=True)
+    manager.load_dags()
+    assert manager.dag_map == {}
+    dag = manager.get_dag("dag_a")
+    assert dag is not None and dag.dag_id == "dag_a"
+    assert set(manager.dag_map.keys()) == {"dag_a"}
+
+
+def test_lazy_load_dag_by_alias(dag_dir, tmp_path, monkeypatch):
+    _create_manager(dag_dir, tmp_path).load_dags()
+
+    manager = _create_manager(dag_dir, tmp_path, lazy_load=True)
+    register_dag = manager.register_dag
+    monkeypatch.setattr(
+        manager,
+        "register_dag",
+        lambda dag, alias_name=None: register_dag(dag, f"alias_{dag.dag_id}"),
+    )
+    manager.load_dags()
+    assert manager.dag_map == {}
+    dag = manager.get_dag(alias_name="alias_dag_b")
+    assert dag is not None and dag.dag_id == "dag_b"
+    assert manager.get_dag(alias_name="unknown") is None
+    assert set(manager.dag_map.keys()) == {"dag_a", "dag_b"}
+
+
+def test_lazy_load_changed_file(dag_dir, tmp_path):
+    _create_manager(dag_dir, tmp_path).load_dags()
+    _write_dag(dag_dir / "dag_b.py", "dag_b", value=100)
+
+    manager = _create_manager(dag_dir, tmp_path, lazy_load=True)
+    manager.load_dags()
+    # The changed file is imported at startup
+    assert set(manager.dag_map.keys()) == {"dag_b"}
+
+
+def test_reload_dags(dag_dir, tmp_path):
+    manager = _create_manager(dag_dir, tmp_path)
+    manager.load_dags()
+    dag_a = manager.get_dag("dag_a")
+    assert manager.reload_dags() == []
+
+    _write_dag(dag_dir / "dag_b.py", "dag_b_new")
+    _write_dag(dag_dir / "dag_c.py", "dag_c")
+    reloaded = manager.reload_dags()
+    assert set(reloaded) == {str(dag_dir / "dag_b.py"), str(dag_dir / "dag_c.py")}
+    assert set(manager.dag_map.keys()) == {"dag_a", "dag_b_new", "dag_c"}
+    # The unchanged file is not imported again
+    assert manager.get_dag("dag_a") is dag_a
+
+    os.remove(dag_dir / "dag_c.py")
+    assert manager.reload_dags() == [str(dag_dir / "dag_c.py")]
+    assert set(manager.dag_map.keys()) == {"dag_a", "dag_b_new"}
+
+
+def test_failed_file_imported_again(dag_dir, tmp_path, monkeypatch):
+    with open(dag_dir / "dag_c.py", "w") as f:
+        f.write(
+            "import dag_c_dependency\n" + _DAG_TEMPLATE.format(dag_id="dag_c", value=1)
+        )
+    _create_manager(dag_dir, tmp_path).load_dags()
+
+    # The missing dependency is installed, the unchanged file is not loaded lazily
+    site_dir = tmp_path / "site"
+    site_dir.mkdir()
+    (site_dir / "dag_c_dependency.py").write_text("")
+    monkeypatch.syspath_prepend(str(site_dir))
+    manager = _create_manager(dag_dir, tmp_path, lazy_load=True)
+    manager.load_dags()
+    assert set(manager.dag_map.keys()) == {"dag_c"}
+    assert manager.get_dag("dag_a").dag_id == "dag_a"
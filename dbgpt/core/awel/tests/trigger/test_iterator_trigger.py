@@ -1,3 +1,4 @@
+import asyncio
 from typing import AsyncIterator
 
 import pytest
@@ -9,7 +10,10 @@ from dbgpt.core.awel import (
     StreamifyAbsOperator,
     TransformStreamAbsOperator,
 )
-from dbgpt.core.awel.trigger.iterator_trigger import IteratorTrigger
+from dbgpt.core.awel.trigger.iterator_trigger import (
+    FileIteratorCheckpoint,
+    IteratorTrigger,
+)
 
 
 class NumberProducerOperator(StreamifyAbsOperator[int, int]):
@@ -138,3 +142,102 @@ async def test_parallel_safe():
         trigger_task >> number_task >> task
     stream_results = await trigger_task.trigger(parallel_num=3)
     await _check_stream_results(stream_results, 4)
+
+
+@pytest.mark.asyncio
+async def test_unordered_results():
+    async def slow_square(x: int) -> int:
+        await asyncio.sleep(0.05 if x == 0 else 0)
+        return x * x
+
+    with DAG("test_unordered_results"):
+        trigger_task = IteratorTrigger(data=[0, 1, 2, 3], parallel_num=4, ordered=False)
+        task = MapOperator(slow_square)
+        trigger_task >> task
+    results = await trigger_task.trigger()
+    assert sorted(results) == [(0, 0), (1, 1), (2, 4), (3, 9)]
+    assert results[-1] == (0, 0)
+
+    # The same dag keeps the input order by default
+    trigger_task._ordered = True
+    results = await trigger_task.trigger()
+    assert results == [(0, 0), (1, 1), (2, 4), (3, 9)]
+
+
+@pytest.mark.asyncio
+async def test_lazy_input():
+    consumed = []
+
+    def gen():
+        for i in range(10):
+            consumed.append(i)
+            yield i
+
+    with DAG("test_lazy_input"):
+        trigger_task = IteratorTrigger(data=gen(), parallel_num=2)
+        task = MapOperator(lambda x: x * x)
+        trigger_task >> task
+    stream = trigger_task.trigger_stream()
+    first = await stream.__anext__()
+    assert first == (0, 0)
+    assert len(consumed) < 10
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_retry():
+    attempts = {}
+
+    def flaky(x: int) -> int:
+        attempts[x] = attempts.get(x, 0) + 1
+        if attempts[x] < 3:
+            raise ValueError("flaky")
+        return x * x
+
+    with DAG("test_retry"):
+        trigger_task = IteratorTrigger(
+            data=[0, 1, 2], max_retries=2, retry_backoff=0.001
+        )
+        task = MapOperator(flaky)
+        trigger_task >> task
+    results = await trigger_task.trigger()
+    assert results == [(0, 0), (1, 1), (2, 4)]
+    assert attempts == {0: 3, 1: 3, 2: 3}
+
+    attempts.clear()
+    trigger_task._max_retries = 1
+    with pytest.raises(ValueError):
+        await trigger_task.trigger()
+
+
+@pytest.mark.asyncio
+async def test_checkpoint(tmp_path):
+    checkpoint_file = str(tmp_path / "checkpoint.jsonl")
+    called = []
+    crash = {"enabled": True}
+
+    def square(x: int) -> int:
+        called.append(x)
+        if x == 2 and crash["enabled"]:
+            raise ValueError("crash")
+        return x * x
+
+    with DAG("test_checkpoint"):
+        trigger_task = IteratorTrigger(data=[0, 1, 2, 3], checkpoint=checkpoint_file)
+        task = MapOperator(square)
+        trigger_task >> task
+    with pytest.raises(ValueError):
+        await trigger_task.trigger()
+    assert called == [0, 1, 2]
+
+    called.clear()
+    crash["enabled"] = False
+    results = await trigger_task.trigger()
+    assert results == [(0, 0), (1, 1), (2, 4), (3, 9)]
+    assert called == [2, 3]
+    assert FileIteratorCheckpoint(checkpoint_file).load() == {}
+
+    # The checkpoint is cleared after the full run, so all the items run again
+    called.clear()
+    assert await trigger_task.trigger() == results
+    assert called == [0, 1, 2, 3]
@@ -1,15 +1,37 @@
 """Trigger for iterator data."""
 
 import asyncio
-from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple, Union, cast
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 from ..operators.base import BaseOperator
 from ..task.base import InputSource, TaskState
 from ..task.task_impl import DefaultTaskContext, _is_async_iterator, _is_iterable
 from .base import Trigger
 
+logger = logging.getLogger(__name__)
+
 IterDataType = Union[InputSource, Iterator, AsyncIterator, Any]
 
+# In ordered mode, how many finished results (per parallel slot) can wait for a
+# slower earlier item before we stop pulling new input.
+_ORDERED_BUFFER_FACTOR = 4
+
 
 async def _to_async_iterator(iter_data: IterDataType, task_id: str) -> AsyncIterator:
     """Convert iter_data to an async iterator."""
@@ -33,12 +55,95 @@ async def _to_async_iterator(iter_data: IterDataType, task_id: str) -> AsyncIter
         yield iter_data
 
 
+class IteratorCheckpoint(ABC):
+    """Checkpoint of an iterator trigger run.
+
+    It records the output of every finished item by its position in the input
+    data, so a crashed run can resume from where it stopped.
+    """
+
+    @abstractmethod
+    def load(self) -> Dict[int, Any]:
+        """Load the finished items.
+
+        Returns:
+            Dict[int, Any]: The output of the finished items, keyed by the index of
+                the item in the input data.
+        """
+
+    @abstractmethod
+    def save(self, index: int, output: Any) -> None:
+        """Save the output of a finished item.
+
+        Args:
+            index (int): The index of the item in the input data.
+            output (Any): The output of the leaf node.
+        """
+
+    def clear(self) -> None:
+        """Clear the checkpoint."""
+
+
+class FileIteratorCheckpoint(IteratorCheckpoint):
+    """Checkpoint stored in a local JSON lines file.
+
+    Every finished item is appended as one line, the outputs must be JSON
+    serializable.
+    """
+
+    def __init__(self, file_path: str):
+        """Create a FileIteratorCheckpoint.
+
+        Args:
+            file_path (str): The path of the checkpoint file.
+        """
+        self._file_path = file_path
+
+    def load(self) -> Dict[int, Any]:
+        """Load the finished items from the checkpoint file."""
+        finished: Dict[int, Any] = {}
+        if not os.path.exists(self._file_path):
+            return finished
+        with open(self._file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be truncated if the process crashed while
+                    # writing it, just run that item again.
+                    logger.warning(f"Skip broken checkpoint line: {line[:100]}")
+                    continue
+                finished[record["index"]] = record["output"]
+        return finished
+
+    def save(self, index: int, output: Any) -> None:
+        """Append the output of a finished item to the checkpoint file."""
+        dir_name = os.path.dirname(self._file_path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        line = json.dumps({"index": index, "output": output}, ensure_ascii=False)
+        with open(self._file_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+
+    def clear(self) -> None:
+        """Remove the checkpoint file."""
+        if os.path.exists(self._file_path):
+            os.remove(self._file_path)
+
+
 class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
     """Trigger for iterator data.
 
     Trigger the dag with iterator data.
     Return the list of results of the leaf nodes in the dag.
     The times of dag running is the length of the iterator data.
+
+    The input data is consumed lazily, at most `parallel_num` items are running at
+    the same time, so large iterables are never materialized in memory.
     """
 
     def __init__(
@@ -47,7 +152,12 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
         parallel_num: int = 1,
         streaming_call: bool = False,
         show_progress: bool = True,
-        **kwargs
+        ordered: bool = True,
+        max_retries: int = 0,
+        retry_backoff: float = 1.0,
+        retry_exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+        checkpoint: Optional[Union[str, IteratorCheckpoint]] = None,
+        **kwargs,
     ):
         """Create a IteratorTrigger.
 
@@ -57,11 +167,36 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
                 Defaults to 1.
             streaming_call (bool, optional): Whether the dag is a streaming call.
                 Defaults to False.
+            show_progress (bool, optional): Whether to show the progress bar.
+                Defaults to True.
+            ordered (bool, optional): Whether to yield the results in the order of
+                the input data, otherwise yield them as they complete. Defaults to
+                True.
+            max_retries (int, optional): The max retry times of each item, just for
+                non-streaming call. Defaults to 0.
+            retry_backoff (float, optional): The base delay in seconds before
+                retrying, doubled after each failed attempt. Defaults to 1.0.
+            retry_exceptions (Tuple[Type[BaseException], ...], optional): The
+                exceptions to retry. Defaults to (Exception,).
+            checkpoint (Optional[Union[str, IteratorCheckpoint]], optional): The
+                checkpoint to resume a crashed run, a file path means a
+                :class:`FileIteratorCheckpoint`. It is cleared after all the items
+                are finished, so the next run starts over. Just for non-streaming
+                call. Defaults to None.
         """
+        if isinstance(checkpoint, str):
+            checkpoint = FileIteratorCheckpoint(checkpoint)
+        if checkpoint and streaming_call:
+            raise ValueError("Checkpoint is not supported for streaming call")
         self._iter_data = data
         self._parallel_num = parallel_num
         self._streaming_call = streaming_call
         self._show_progress = show_progress
+        self._ordered = ordered
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._retry_exceptions = retry_exceptions
+        self._checkpoint: Optional[IteratorCheckpoint] = checkpoint
         super().__init__(**kwargs)
 
     async def trigger(
@@ -120,6 +255,49 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
                 The first element of the tuple is the input data, the second element is
                 the output data of the leaf node.
         """
+        results: List[Tuple[Any, Any]] = []
+        async for result in self.trigger_stream(parallel_num=parallel_num, **kwargs):
+            results.append(result)
+        return results
+
+    async def trigger_stream(
+        self,
+        parallel_num: Optional[int] = None,
+        ordered: Optional[bool] = None,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[Any, Any]]:
+        """Trigger the dag with iterator data and yield the results one by one.
+
+        Examples:
+            .. code-block:: python
+
+                import asyncio
+                from dbgpt.core.awel import DAG, IteratorTrigger, MapOperator
+
+
+                async def run():
+                    with DAG("test_dag") as dag:
+                        trigger_task = IteratorTrigger(
+                            range(100_000), parallel_num=8, checkpoint="ckpt.jsonl"
+                        )
+                        task = MapOperator(lambda x: x * x)
+                        trigger_task >> task
+                    async for data, output in trigger_task.trigger_stream():
+                        print(data, output)
+
+
+                asyncio.run(run())
+
+        Args:
+            parallel_num (Optional[int], optional): The parallel number of the dag
+                running. Defaults to None.
+            ordered (Optional[bool], optional): Whether to yield the results in the
+                order of the input data, None means use the value passed to the
+                constructor. Defaults to None.
+
+        Yields:
+            Tuple[Any, Any]: The input data and the output data of the leaf node.
+        """
         dag = self.dag
         if not dag:
             raise ValueError("DAG is not set for IteratorTrigger")
@@ -128,7 +306,11 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
             raise ValueError("IteratorTrigger just support one leaf node in dag")
         end_node = cast(BaseOperator, leaf_nodes[0])
         streaming_call = self._streaming_call
-        semaphore = asyncio.Semaphore(parallel_num or self._parallel_num)
+        max_parallel = max(parallel_num or self._parallel_num, 1)
+        ordered = self._ordered if ordered is None else ordered
+        max_buffered = max_parallel * _ORDERED_BUFFER_FACTOR
+        checkpoint = self._checkpoint
+        finished = checkpoint.load() if checkpoint else {}
         task_id = self.node_id
 
         async def call_stream(call_data: Any):
@@ -138,26 +320,90 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
             finally:
                 await dag._after_dag_end(end_node.current_event_loop_task_id)
 
-        async def run_node(call_data: Any) -> Tuple[Any, Any]:
-            async with semaphore:
-                if streaming_call:
-                    task_output = call_stream(call_data)
-                else:
+        async def run_node(index: int, call_data: Any) -> Tuple[int, Any, Any]:
+            if streaming_call:
+                return index, call_data, call_stream(call_data)
+            attempt = 0
+            while True:
+                try:
+                    # No streaming call, not need call dag._after_dag_end(), it will
+                    # be called in workflow runner
                     task_output = await end_node.call(call_data)
-                    # No streaming call, not need call dag._after_dag_end(), it will be
-                    # called in workflow runner
-                return call_data, task_output
-
-        tasks = []
+                    return index, call_data, task_output
+                except self._retry_exceptions as e:
+                    if attempt >= self._max_retries:
+                        raise
+                    delay = self._retry_backoff * (2**attempt)
+                    attempt += 1
+                    logger.warning(
+                        f"Run item {index} failed: {e}, retry {attempt}/"
+                        f"{self._max_retries} after {delay:.2f}s"
+                    )
+                    await asyncio.sleep(delay)
 
+        progress = None
         if self._show_progress:
             from tqdm.asyncio import tqdm_asyncio
 
-            async_module = tqdm_asyncio
-        else:
-            async_module = asyncio  # type: ignore
+            progress = tqdm_asyncio(total=None, initial=len(finished))
 
-        async for data in _to_async_iterator(self._iter_data, task_id):
-            tasks.append(run_node(data))
-        results: List[Tuple[Any, Any]] = await async_module.gather(*tasks)
-        return results
+        data_iter = _to_async_iterator(self._iter_data, task_id).__aiter__()
+        exhausted = False
+        next_index = 0
+        next_yield_index = 0
+        running: Set[asyncio.Task] = set()
+        buffered: Dict[int, Tuple[Any, Any]] = {}
+
+        try:
+            while True:
+                completed: List[Tuple[int, Any, Any]] = []
+                # Pull new input only when there is a free slot, so the input data is
+                # never materialized.
+                while (
+                    not exhausted
+                    and len(running) < max_parallel
+                    and len(buffered) < max_buffered
+                ):
+                    try:
+                        call_data = await data_iter.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    index = next_index
+                    next_index += 1
+                    if index in finished:
+                        completed.append((index, call_data, finished.pop(index)))
+                        break
+                    running.add(asyncio.create_task(run_node(index, call_data)))
+
+                if not completed:
+                    if not running:
+                        break
+                    done, _ = await asyncio.wait(
+                        running, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        running.discard(task)
+                        index, call_data, task_output = task.result()
+                        if checkpoint:
+                            checkpoint.save(index, task_output)
+                        if progress is not None:
+                            progress.update(1)
+                        completed.append((index, call_data, task_output))
+
+                for index, call_data, task_output in completed:
+                    if ordered:
+                        buffered[index] = (call_data, task_output)
+                    else:
+                        yield call_data, task_output
+                while next_yield_index in buffered:
+                    yield buffered.pop(next_yield_index)
+                    next_yield_index += 1
+            if checkpoint:
+                # All the items are finished, the next run starts over
+                checkpoint.clear()
+        finally:
+            for task in running:
+                task.cancel()
+            if progress is not None:
+                progress.close()
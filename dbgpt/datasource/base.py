@@ -108,6 +108,20 @@ class BaseConnector(ABC):
             "Current connector does not support get_column_comments"
         )
 
+    def new_session(self) -> "BaseConnector":
+        """Return a connector for a new request, sharing the connection pool.
+
+        The connector cached by the connector manager is shared by all requests,
+        every request gets a new session from it.
+
+        Returns:
+            BaseConnector: The connector, default is the current connector.
+        """
+        return self
+
+    def dispose(self) -> None:
+        """Release the connection pool of the connector."""
+
     @abstractmethod
     def run(self, command: str, fetch: str = "all") -> List:
         """Execute sql command.
@@ -95,6 +95,10 @@ class TuGraphConnector(BaseConnector):
         """Close the Neo4j driver."""
         self._driver.close()
 
+    def dispose(self) -> None:
+        """Close the Neo4j driver."""
+        self.close()
+
     def run(self, query: str, fetch: str = "all") -> List:
         """Run query."""
         with self._driver.session(database=self._graph) as session:
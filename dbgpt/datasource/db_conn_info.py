@@ -1,4 +1,6 @@
 """Configuration for database connection."""
+from typing import Any, Dict, Optional
+
 from dbgpt._private.pydantic import BaseModel, Field
 
 
@@ -13,6 +15,11 @@ class DBConfig(BaseModel):
     db_user: str = Field("", description="Database user.")
     db_pwd: str = Field("", description="Database password.")
     comment: str = Field("", description="Comment for the database.")
+    ext_config: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Extended config of the database, e.g. the connection pool "
+        "settings pool_size, max_overflow and pool_recycle.",
+    )
 
 
 class DbTypeInfo(BaseModel):
@@ -1,5 +1,6 @@
 """DB Model for connect_config."""
 
+import json
 import logging
 from typing import Any, Dict, Optional, Union
 
@@ -30,6 +31,11 @@ class ConnectConfigEntity(Model):
     db_user = Column(String(255), nullable=True, comment="db user")
     db_pwd = Column(String(255), nullable=True, comment="db password")
     comment = Column(Text, nullable=True, comment="db comment")
+    ext_config = Column(
+        Text,
+        nullable=True,
+        comment="Extended config of the datasource in json, e.g. the pool settings",
+    )
     sys_code = Column(String(128), index=True, nullable=True, comment="System code")
     user_id = Column(String(128), index=True, nullable=True, comment="User id")
     user_name = Column(String(128), index=True, nullable=True, comment="User name")
@@ -62,6 +68,7 @@ class ConnectConfigDao(BaseDao):
         db_pwd: str,
         comment: Optional[str] = None,
         user_id: Optional[str] = None,
+        ext_config: Optional[str] = None,
     ):
         """Add db connect info.
 
@@ -73,22 +80,13 @@ class ConnectConfigDao(BaseDao):
             db_user: db user
             db_pwd: db password
             comment: comment
+            ext_config: the extended config in json
         """
         try:
             session = self.get_raw_session()
 
             from sqlalchemy import text
 
-            insert_statement = text(
-                """
-                INSERT INTO connect_config (
-                    db_name, db_type, db_path, db_host, db_port, db_user, db_pwd,
-                    comment, user_id) VALUES (:db_name, :db_type, :db_path, :db_host,
-                    :db_port, :db_user, :db_pwd, :comment, :user_id
-                )
-            """
-            )
-
             params = {
                 "db_name": db_name,
                 "db_type": db_type,
@@ -100,6 +98,14 @@ class ConnectConfigDao(BaseDao):
                 "comment": comment if comment else "",
                 "user_id": user_id if user_id else "",
             }
+            if ext_config:
+                # Only written if provided, the old tables may not have the column
+                params["ext_config"] = ext_config
+            columns = ", ".join(params.keys())
+            values = ", ".join(f":{k}" for k in params.keys())
+            insert_statement = text(
+                f"INSERT INTO connect_config ({columns}) VALUES ({values})"
+            )
             session.execute(insert_statement, params)
             session.commit()
             session.close()
@@ -156,18 +162,25 @@ class ConnectConfigDao(BaseDao):
         db_user: str = "",
         db_pwd: str = "",
         comment: str = "",
+        ext_config: Optional[str] = None,
     ):
         """Update db connect info."""
         old_db_conf = self.get_db_config(db_name)
         if old_db_conf:
             try:
                 session = self.get_raw_session()
+                params = {}
                 if not db_path:
+                    ext_config_set = ""
+                    if ext_config is not None:
+                        # Keep the stored ext config if it is not provided
+                        ext_config_set = "ext_config=:ext_config, "
+                        params["ext_config"] = ext_config
                     update_statement = text(
                         f"UPDATE connect_config set db_type='{db_type}', "
                         f"db_host='{db_host}', db_port={db_port}, db_user='{db_user}', "
-                        f"db_pwd='{db_pwd}', comment='{comment}' where "
-                        f"db_name='{db_name}'"
+                        f"db_pwd='{db_pwd}', {ext_config_set}comment='{comment}' "
+                        f"where db_name='{db_name}'"
                     )
                 else:
                     update_statement = text(
@@ -175,7 +188,7 @@ class ConnectConfigDao(BaseDao):
                         f"db_path='{db_path}', comment='{comment}' where "
                         f"db_name='{db_name}'"
                     )
-                session.execute(update_statement)
+                session.execute(update_statement, params)
                 session.commit()
                 session.close()
             except Exception as e:
@@ -255,8 +268,13 @@ class ConnectConfigDao(BaseDao):
             T: The entity
         """
         request_dict = (
-            request.dict() if isinstance(request, DatasourceServeRequest) else request
+            request.dict()
+            if isinstance(request, DatasourceServeRequest)
+            else dict(request)
         )
+        ext_config = request_dict.get("ext_config")
+        if isinstance(ext_config, dict):
+            request_dict["ext_config"] = json.dumps(ext_config, ensure_ascii=False)
         entity = ConnectConfigEntity(**request_dict)
         return entity
 
@@ -279,6 +297,7 @@ class ConnectConfigDao(BaseDao):
             db_user=entity.db_user,
             db_pwd=entity.db_pwd,
             comment=entity.comment,
+            ext_config=_load_ext_config(entity.ext_config),
         )
 
     def to_response(self, entity: ConnectConfigEntity) -> DatasourceServeResponse:
@@ -300,4 +319,17 @@ class ConnectConfigDao(BaseDao):
             db_user=entity.db_user,
             db_pwd=entity.db_pwd,
             comment=entity.comment,
+            ext_config=_load_ext_config(entity.ext_config),
         )
+
+
+def _load_ext_config(ext_config: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Parse the extended config in json, the invalid config is ignored."""
+    if not ext_config:
+        return None
+    try:
+        value = json.loads(ext_config)
+    except ValueError:
+        logger.warning(f"Invalid datasource ext config: {ext_config}")
+        return None
+    return value if isinstance(value, dict) else None
@@ -1,6 +1,10 @@
 """Connection manager."""
+import hashlib
+import json
 import logging
-from typing import TYPE_CHECKING, List, Optional, Type
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, Union
 
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
 from dbgpt.storage.schema import DBType
@@ -13,20 +17,100 @@ from .connect_config_db import ConnectConfigDao
 if TYPE_CHECKING:
     # TODO: Don't depend on the rag module.
     from dbgpt.rag.summary.db_summary_client import DBSummaryClient
+    from dbgpt.storage.cache import SQLResultCache
 
 logger = logging.getLogger(__name__)
 
+# The default engine arguments for the connection pool of the network databases.
+_DEFAULT_ENGINE_ARGS: Dict[str, Any] = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_recycle": 3600,
+    "pool_pre_ping": True,
+}
+# The engine arguments can be overridden by the ext config of each datasource.
+_POOL_ARG_KEYS = ("pool_size", "max_overflow", "pool_recycle", "pool_timeout")
+# The config which changes the schema, the password and the pool settings don't.
+_SCHEMA_CONFIG_KEYS = ("db_type", "db_path", "db_host", "db_port", "db_user")
+
 
 class ConnectorManager(BaseComponent):
-    """Connector manager."""
+    """Connector manager.
+
+    The connector of each datasource is created once and cached, so its engine,
+    connection pool and reflected schema are reused by all requests. The cache entry
+    is invalidated when the datasource is edited or deleted.
+
+    The schema metadata of the RDBMS datasources is persisted in `schema_cache_dir`
+    if provided, keyed by the datasource name and its connection config.
+    """
 
     name = ComponentType.CONNECTOR_MANAGER
 
-    def __init__(self, system_app: SystemApp):
-        """Create a new ConnectorManager."""
+    def __init__(
+        self,
+        system_app: SystemApp,
+        default_engine_args: Optional[Dict[str, Any]] = None,
+        schema_cache_dir: Optional[str] = None,
+        schema_cache_ttl: Optional[float] = 3600,
+        query_concurrency: int = 4,
+        query_timeout: Optional[float] = None,
+        query_max_rows: Optional[int] = None,
+        query_max_bytes: Optional[int] = None,
+        query_cache_enable: bool = False,
+        query_cache_ttl: Optional[float] = 600,
+        query_cache_max_rows: Optional[int] = 10000,
+        query_cache_max_bytes: Optional[int] = 8 * 1024 * 1024,
+    ):
+        """Create a new ConnectorManager.
+
+        Args:
+            system_app (SystemApp): The system app.
+            default_engine_args (Optional[Dict[str, Any]]): The default SQLAlchemy
+                engine arguments for the network databases, such as pool_size and
+                pool_recycle.
+            schema_cache_dir (Optional[str]): The directory to persist the schema
+                metadata cache, the cache is kept in memory if it is None.
+            schema_cache_ttl (Optional[float]): The seconds after which the schema
+                metadata cache is refreshed from the database.
+            query_concurrency (int): The maximum number of concurrent asynchronous
+                queries of each RDBMS datasource.
+            query_timeout (Optional[float]): The default timeout seconds of the
+                asynchronous queries.
+            query_max_rows (Optional[int]): The maximum number of rows fetched by the
+                queries of `run`, None means no limit.
+            query_max_bytes (Optional[int]): The maximum estimated bytes of the rows
+                fetched by the queries of `run`, None means no limit.
+            query_cache_enable (bool): Whether to cache the results of the read only
+                queries in the cache manager, the cache manager must be registered.
+            query_cache_ttl (Optional[float]): The seconds the cached results are
+                valid.
+            query_cache_max_rows (Optional[int]): The results with more rows are not
+                cached.
+            query_cache_max_bytes (Optional[int]): The results with more bytes are
+                not cached.
+        """
         self.storage = ConnectConfigDao()
         self.system_app = system_app
         self._db_summary_client: Optional["DBSummaryClient"] = None
+        self._default_engine_args = (
+            default_engine_args
+            if default_engine_args is not None
+            else dict(_DEFAULT_ENGINE_ARGS)
+        )
+        # db name -> (config fingerprint, connector)
+        self._connectors: Dict[str, Tuple[Tuple, BaseConnector]] = {}
+        self._connector_lock = threading.Lock()
+        self._schema_cache_dir = schema_cache_dir
+        self._schema_cache_ttl = schema_cache_ttl
+        self._query_concurrency = query_concurrency
+        self._query_timeout = query_timeout
+        self._query_max_rows = query_max_rows
+        self._query_max_bytes = query_max_bytes
+        self._query_cache_enable = query_cache_enable
+        self._query_cache_ttl = query_cache_ttl
+        self._query_cache_max_rows = query_cache_max_rows
+        self._query_cache_max_bytes = query_cache_max_bytes
         super().__init__(system_app)
 
     def init_app(self, system_app: SystemApp):
@@ -108,13 +192,129 @@ class ConnectorManager(BaseComponent):
             raise ValueError("Unsupported Db Type！" + db_type)
         return result
 
-    def get_connector(self, db_name: str):
-        """Create a new connection instance.
+    def get_connector(self, db_name: str) -> BaseConnector:
+        """Get the connector of the datasource.
+
+        The connector is created at the first time and cached, every call returns a
+        connector with a new session sharing the cached connection pool.
 
         Args:
             db_name (str): database name
         """
         db_config = self.storage.get_db_config(db_name)
+        fingerprint = tuple(
+            db_config.get(k) for k in _SCHEMA_CONFIG_KEYS + ("ext_config", "db_pwd")
+        )
+        with self._connector_lock:
+            cached = self._connectors.get(db_name)
+        if cached and cached[0] == fingerprint:
+            return cached[1].new_session()
+
+        connector = self._create_connector(db_name, db_config)
+        self._setup_connector(db_name, fingerprint, connector)
+        with self._connector_lock:
+            old = self._connectors.get(db_name)
+            if old and old[0] == fingerprint:
+                # Created by another thread at the same time
+                winner = old[1]
+            else:
+                self._connectors[db_name] = (fingerprint, connector)
+                winner = connector
+        if winner is not connector:
+            connector.dispose()
+        elif old:
+            # The config has been changed by other instance
+            old[1].dispose()
+        return winner.new_session()
+
+    def _schema_cache_prefix(self, db_name: str) -> str:
+        return hashlib.md5(db_name.encode("utf-8")).hexdigest() + "_"
+
+    def _setup_connector(
+        self, db_name: str, fingerprint: Tuple, connector: BaseConnector
+    ) -> None:
+        """Set the schema cache, query executor and result cache of the connector."""
+        from dbgpt.datasource.rdbms.base import RDBMSConnector
+        from dbgpt.datasource.rdbms.query_executor import QueryExecutor
+        from dbgpt.datasource.rdbms.schema_cache import SchemaMetadataCache
+
+        if not isinstance(connector, RDBMSConnector):
+            return
+        cache_path = None
+        if self._schema_cache_dir:
+            # The password and the pool settings are not a part of the key
+            config = str(fingerprint[: len(_SCHEMA_CONFIG_KEYS)]).encode("utf-8")
+            config_hash = hashlib.md5(config).hexdigest()
+            cache_path = os.path.join(
+                self._schema_cache_dir,
+                f"{self._schema_cache_prefix(db_name)}{config_hash}.json",
+            )
+        connector.set_schema_cache(
+            SchemaMetadataCache(cache_path, ttl=self._schema_cache_ttl)
+        )
+        connector.set_query_executor(
+            QueryExecutor(
+                db_name,
+                max_workers=self._query_concurrency,
+                timeout=self._query_timeout,
+            )
+        )
+        connector.set_result_cache(self._create_result_cache(db_name))
+        connector.set_query_limits(self._query_max_rows, self._query_max_bytes)
+
+    def _create_result_cache(self, db_name: str) -> Optional["SQLResultCache"]:
+        """Create the query result cache of the datasource with the cache manager."""
+        if not self._query_cache_enable:
+            return None
+        from dbgpt.storage.cache import CacheManager, SQLResultCache
+
+        cache_manager = self.system_app.get_component(
+            ComponentType.MODEL_CACHE_MANAGER, CacheManager, default_component=None
+        )
+        if not cache_manager:
+            logger.info("Cache manager is not registered, disable the query cache")
+            return None
+        return SQLResultCache(
+            cache_manager,
+            db_name,
+            ttl=self._query_cache_ttl,
+            max_rows=self._query_cache_max_rows,
+            max_bytes=self._query_cache_max_bytes,
+        )
+
+    def clear_schema_cache(self, db_name: str) -> None:
+        """Remove the persisted schema metadata cache of the datasource.
+
+        Args:
+            db_name (str): database name
+        """
+        if not self._schema_cache_dir or not os.path.isdir(self._schema_cache_dir):
+            return
+        prefix = self._schema_cache_prefix(db_name)
+        for filename in os.listdir(self._schema_cache_dir):
+            if filename.startswith(prefix):
+                try:
+                    os.remove(os.path.join(self._schema_cache_dir, filename))
+                except OSError as e:
+                    logger.warning(f"Remove schema cache {filename} error: {e}")
+
+    def invalidate_connector(self, db_name: str) -> None:
+        """Remove the cached connector of the datasource and release its pool.
+
+        Args:
+            db_name (str): database name
+        """
+        with self._connector_lock:
+            cached = self._connectors.pop(db_name, None)
+        if cached:
+            try:
+                cached[1].dispose()
+            except Exception as e:
+                logger.warning(f"Dispose connector of {db_name} error: {e}")
+
+    def _create_connector(
+        self, db_name: str, db_config: Dict[str, Any]
+    ) -> BaseConnector:
         db_type = DBType.of_db_type(db_config.get("db_type"))
         if not db_type:
             raise ValueError("Unsupported Db Type！" + db_config.get("db_type"))
@@ -128,9 +328,41 @@ class ConnectorManager(BaseComponent):
             db_user = db_config.get("db_user")
             db_pwd = db_config.get("db_pwd")
             return connect_instance.from_uri_db(  # type: ignore
-                host=db_host, port=db_port, user=db_user, pwd=db_pwd, db_name=db_name
+                host=db_host,
+                port=db_port,
+                user=db_user,
+                pwd=db_pwd,
+                db_name=db_name,
+                **self._connector_kwargs(connect_instance, db_config.get("ext_config")),
             )
 
+    def _connector_kwargs(
+        self,
+        connect_instance: Type[BaseConnector],
+        ext_config: Optional[Union[str, Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Return the kwargs to create the connector of the network database.
+
+        Just the SQLAlchemy based connectors support engine arguments, the pool
+        settings in the ext config override the default engine arguments.
+        """
+        from dbgpt.datasource.rdbms.base import RDBMSConnector
+
+        if not issubclass(connect_instance, RDBMSConnector):
+            return {}
+        engine_args = dict(self._default_engine_args)
+        if isinstance(ext_config, str):
+            try:
+                ext_config = json.loads(ext_config) if ext_config else None
+            except ValueError:
+                logger.warning(f"Invalid datasource ext config: {ext_config}")
+                ext_config = None
+        if isinstance(ext_config, dict):
+            for key in _POOL_ARG_KEYS:
+                if ext_config.get(key) is not None:
+                    engine_args[key] = ext_config[key]
+        return {"engine_args": engine_args}
+
     def test_connect(self, db_info: DBConfig) -> BaseConnector:
         """Test connectivity.
 
@@ -163,6 +395,7 @@ class ConnectorManager(BaseComponent):
                     user=db_user,
                     pwd=db_pwd,
                     db_name=db_name,
+                    **self._connector_kwargs(connect_instance, db_info.ext_config),
                 )
         except Exception as e:
             logger.error(f"{db_info.db_name} Test connect Failure!{str(e)}")
@@ -174,10 +407,14 @@ class ConnectorManager(BaseComponent):
 
     def delete_db(self, db_name: str):
         """Delete db connect info."""
+        self.invalidate_connector(db_name)
+        self.clear_schema_cache(db_name)
         return self.storage.delete_db(db_name)
 
     def edit_db(self, db_info: DBConfig):
         """Edit db connect info."""
+        self.invalidate_connector(db_info.db_name)
+        self.clear_schema_cache(db_info.db_name)
         return self.storage.update_db_info(
             db_info.db_name,
             db_info.db_type,
@@ -187,6 +424,7 @@ class ConnectorManager(BaseComponent):
             db_info.db_user,
             db_info.db_pwd,
             db_info.comment,
+            _dump_ext_config(db_info.ext_config),
         )
 
     async def async_db_summary_embedding(self, db_name, db_type):
@@ -226,6 +464,7 @@ class ConnectorManager(BaseComponent):
                     db_info.db_pwd,
                     db_info.comment,
                     user_id,
+                    _dump_ext_config(db_info.ext_config),
                 )
             # async embedding
             executor = self.system_app.get_component(
@@ -240,3 +479,7 @@ class ConnectorManager(BaseComponent):
             raise ValueError("Add db connect info error!" + str(e))
 
         return True
+
+
+def _dump_ext_config(ext_config: Optional[Dict[str, Any]]) -> Optional[str]:
+    return json.dumps(ext_config, ensure_ascii=False) if ext_config else None
@@ -0,0 +1,123 @@
+import json
+from typing import Any, Dict
+from unittest.mock import Mock
+
+import pytest
+
+from dbgpt.component import SystemApp
+from dbgpt.datasource.manages.connector_manager import ConnectorManager
+
+
+class _MemoryConnectConfigDao:
+    def __init__(self):
+        self.configs: Dict[str, Dict[str, Any]] = {}
+
+    def get_db_config(self, db_name: str) -> Dict[str, Any]:
+        return dict(self.configs[db_name])
+
+    def delete_db(self, db_name: str):
+        self.configs.pop(db_name, None)
+        return True
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ConnectorManager(SystemApp())
+    manager.on_init()
+    storage = _MemoryConnectConfigDao()
+    for name in ["db1", "db2"]:
+        storage.configs[name] = {
+            "db_type": "sqlite",
+            "db_path": str(tmp_path / f"{name}.db"),
+        }
+    manager.storage = storage
+    return manager
+
+
+def test_get_connector_cached(manager):
+    conn1 = manager.get_connector("db1")
+    conn2 = manager.get_connector("db1")
+    assert conn1 is not conn2
+    assert conn1._engine is conn2._engine
+    assert conn1.session is not conn2.session
+    assert manager.get_connector("db2")._engine is not conn1._engine
+
+
+def test_invalidate_connector(manager, tmp_path):
+    conn1 = manager.get_connector("db1")
+    manager.delete_db("db1")
+    manager.storage.configs["db1"] = {
+        "db_type": "sqlite",
+        "db_path": str(tmp_path / "db1.db"),
+    }
+    assert manager.get_connector("db1")._engine is not conn1._engine
+
+
+def test_config_changed(manager, tmp_path):
+    conn1 = manager.get_connector("db1")
+    manager.storage.configs["db1"]["db_path"] = str(tmp_path / "db1_new.db")
+    conn2 = manager.get_connector("db1")
+    assert conn2._engine is not conn1._engine
+    assert str(conn2._engine.url).endswith("db1_new.db")
+
+
+def test_schema_cache_persisted(manager, tmp_path):
+    cache_dir = tmp_path / "schema_cache"
+    manager._schema_cache_dir = str(cache_dir)
+    conn = manager.get_connector("db1")
+    conn.run("CREATE TABLE test (id INTEGER);")
+    table = conn.get_table_metadata("test")
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # The new connector loads the schema cache from disk
+    manager.invalidate_connector("db1")
+    conn = manager.get_connector("db1")
+    assert conn.schema_cache.get("test") == table
+
+    manager.delete_db("db1")
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_pool_settings_from_ext_config(manager, monkeypatch):
+    from dbgpt.datasource.db_conn_info import DBConfig
+    from dbgpt.datasource.rdbms.base import RDBMSConnector
+
+    created = []
+
+    class _FakeConnector(RDBMSConnector):
+        @classmethod
+        def from_uri_db(cls, **kwargs):
+            created.append(kwargs)
+            return Mock()
+
+    monkeypatch.setattr(manager, "get_cls_by_dbtype", lambda db_type: _FakeConnector)
+    manager.storage.configs["mysql_db"] = {
+        "db_type": "mysql",
+        "db_host": "localhost",
+        "db_port": 3306,
+        "ext_config": json.dumps({"pool_size": 20, "pool_recycle": 60}),
+    }
+    manager._create_connector("mysql_db", manager.storage.get_db_config("mysql_db"))
+    assert created[-1]["engine_args"] == {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_recycle": 60,
+        "pool_pre_ping": True,
+    }
+
+    # The invalid ext config falls back to the defaults
+    manager.storage.configs["mysql_db"]["ext_config"] = "{invalid"
+    manager._create_connector("mysql_db", manager.storage.get_db_config("mysql_db"))
+    assert created[-1]["engine_args"] == manager._default_engine_args
+
+    manager.test_connect(
+        DBConfig(
+            db_type="mysql",
+            db_name="mysql_db",
+            db_host="localhost",
+            db_port=3306,
+            ext_config={"max_overflow": 0},
+        )
+    )
+    assert created[-1]["engine_args"]["max_overflow"] == 0
+    assert created[-1]["engine_args"]["pool_size"] == 5
@@ -2,9 +2,25 @@
 
 from __future__ import annotations
 
+import copy
+import functools
+import inspect as py_inspect
 import logging
 import re
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, cast
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    cast,
+)
 from urllib.parse import quote
 from urllib.parse import quote_plus as urlquote
 
@@ -12,15 +28,29 @@ import sqlalchemy
 import sqlparse
 from sqlalchemy import MetaData, Table, create_engine, inspect, select, text
 from sqlalchemy.engine import CursorResult
-from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
+from sqlalchemy.exc import NoSuchTableError, ProgrammingError, SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.schema import CreateTable
 
 from dbgpt.datasource.base import BaseConnector
 from dbgpt.storage.schema import DBType
 
+from .query_executor import QueryExecutor
+from .query_stream import QueryResultStream, rows_to_df
+from .schema_cache import SchemaMetadataCache, TableMetadata
+
+if TYPE_CHECKING:
+    from dbgpt.storage.cache.sql_cache import SQLResultCache
+
 logger = logging.getLogger(__name__)
 
+# The statement types which change the schema of the database
+_DDL_TYPES = {"CREATE", "DROP", "ALTER"}
+_INDEX_DDL_PATTERN = re.compile(
+    r"^\s*(create|drop)\s+(unique\s+)?index\b", re.IGNORECASE
+)
+_INDEX_TABLE_PATTERN = re.compile(r"\bon\s+([`\"\[\]\w]+)", re.IGNORECASE)
+
 
 def _format_index(index: sqlalchemy.engine.interfaces.ReflectedIndex) -> str:
     return (
@@ -29,9 +59,48 @@ def _format_index(index: sqlalchemy.engine.interfaces.ReflectedIndex) -> str:
     )
 
 
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _release_session(func: _F) -> _F:
+    """Return the connection of the session to the pool after the call.
+
+    The connectors of a datasource share one connection pool, a session holds its
+    connection until the transaction ends, so the statements must not leave the
+    transaction open. The nested calls release the connection when the outermost
+    call returns. The overrides of the decorated methods in the subclasses are
+    decorated automatically.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self: "RDBMSConnector", *args, **kwargs):
+        self._session_depth += 1
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self._session_depth -= 1
+            self._end_session_call()
+
+    wrapper._release_session = True  # type: ignore
+    return cast(_F, wrapper)
+
+
 class RDBMSConnector(BaseConnector):
     """SQLAlchemy wrapper around a database."""
 
+    # The depth of the calls which release the session, see `_release_session`
+    _session_depth: int = 0
+
+    def __init_subclass__(cls, **kwargs):
+        """Decorate the overrides of the methods which release the session."""
+        super().__init_subclass__(**kwargs)
+        for name, attr in list(cls.__dict__.items()):
+            if not py_inspect.isfunction(attr) or hasattr(attr, "_release_session"):
+                continue
+            base_attr = getattr(RDBMSConnector, name, None)
+            if getattr(base_attr, "_release_session", False):
+                setattr(cls, name, _release_session(attr))
+
     def __init__(
         self,
         engine,
@@ -79,8 +148,17 @@ class RDBMSConnector(BaseConnector):
         self._sample_rows_in_table_info = sample_rows_in_table_info
         self._indexes_in_table_info = indexes_in_table_info
 
+        # The tables are reflected lazily when their information is needed
         self._metadata = metadata or MetaData()
-        self._metadata.reflect(bind=self._engine)
+        self._reflect_lock = threading.Lock()
+        self._schema_cache = SchemaMetadataCache()
+        self._schema_refresh_lock = threading.Lock()
+        self._query_executor = QueryExecutor(
+            name=str(engine.url.database or engine.dialect.name)
+        )
+        self._result_cache: Optional[SQLResultCache] = None
+        self._query_max_rows: Optional[int] = None
+        self._query_max_bytes: Optional[int] = None
 
         self._all_tables: Set[str] = cast(Set[str], self._sync_tables_from_db())
 
@@ -118,11 +196,373 @@ class RDBMSConnector(BaseConnector):
         _engine_args = engine_args or {}
         return cls(create_engine(database_uri, **_engine_args), **kwargs)
 
+    def new_session(self) -> "RDBMSConnector":
+        """Return a connector with a new session.
+
+        The new connector shares the engine (and its connection pool), the table
+        names and the reflected metadata with the current connector.
+        """
+        conn = copy.copy(self)
+        conn._db_sessions = scoped_session(sessionmaker(bind=self._engine))
+        conn.session = conn.get_session()
+        return conn
+
+    def dispose(self) -> None:
+        """Dispose the engine and release the connection pool."""
+        self._query_executor.shutdown()
+        self._db_sessions.remove()
+        self._engine.dispose()
+
+    def close_session(self) -> None:
+        """Close the session and return its connection to the pool."""
+        self.session.close()
+        self._db_sessions.remove()
+
+    def _end_session_call(self) -> None:
+        """Return the connection to the pool if no call is using the session."""
+        if not self._session_depth:
+            self.close_session()
+
+    @property
+    def query_executor(self) -> QueryExecutor:
+        """Return the executor to run the queries asynchronously."""
+        return self._query_executor
+
+    def set_query_executor(self, query_executor: QueryExecutor) -> None:
+        """Set the executor to run the queries asynchronously.
+
+        The executor is shared by all the connectors created by :meth:`new_session`.
+
+        Args:
+            query_executor (QueryExecutor): The query executor.
+        """
+        old = self._query_executor
+        self._query_executor = query_executor
+        if old is not query_executor:
+            old.shutdown()
+
+    @property
+    def result_cache(self) -> Optional[SQLResultCache]:
+        """Return the cache of the query results."""
+        return self._result_cache
+
+    def set_result_cache(self, result_cache: Optional[SQLResultCache]) -> None:
+        """Set the cache of the query results.
+
+        The cache is shared by all the connectors created by :meth:`new_session`, it
+        is used by the queries called with `use_cache=True`.
+
+        Args:
+            result_cache (Optional[SQLResultCache]): The result cache, None to
+                disable the cache.
+        """
+        self._result_cache = result_cache
+
+    def set_query_limits(
+        self, max_rows: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> None:
+        """Set the limits of the query results fetched by :meth:`run`.
+
+        The limits are shared by all the connectors created by :meth:`new_session`
+        after they are set.
+
+        Args:
+            max_rows (Optional[int]): The maximum number of rows, None means no limit.
+            max_bytes (Optional[int]): The maximum estimated bytes of the rows, None
+                means no limit.
+        """
+        self._query_max_rows = max_rows
+        self._query_max_bytes = max_bytes
+
+    def _is_cacheable_query(self, query: str) -> bool:
+        """Whether the results of the query can be cached.
+
+        Only the single SELECT statements are cached.
+        """
+        if not self._result_cache or not query:
+            return False
+        if len(sqlparse.split(query)) != 1:
+            return False
+        _, ttype, sql_type, _ = self.__sql_parse(query)
+        return ttype == sqlparse.tokens.DML and sql_type == "SELECT"
+
+    def _invalidate_result_cache(self) -> None:
+        if self._result_cache:
+            self._result_cache.invalidate()
+
+    async def arun(
+        self, command: str, fetch: str = "all", timeout: Optional[float] = None
+    ) -> List:
+        """Execute a SQL command asynchronously, see :meth:`run`.
+
+        The command runs in the thread pool of the datasource with a new session,
+        it is cancelled in the database when it times out or the task is cancelled.
+
+        Args:
+            command (str): SQL command to run
+            fetch (str): fetch type
+            timeout (Optional[float]): The timeout seconds, the default timeout of
+                the query executor if it is None
+
+        Raises:
+            QueryTimeoutError: If the command doesn't finish in time.
+        """
+        return await self._query_executor.arun(
+            self, "run", command, fetch, timeout=timeout
+        )
+
+    async def aquery_ex(
+        self,
+        query: str,
+        fetch: str = "all",
+        timeout: Optional[float] = None,
+        **kwargs,
+    ):
+        """Execute a SQL query asynchronously, see :meth:`query_ex`."""
+        return await self._query_executor.arun(
+            self, "query_ex", query, fetch, timeout=timeout, **kwargs
+        )
+
+    async def arun_to_df(
+        self,
+        command: str,
+        fetch: str = "all",
+        timeout: Optional[float] = None,
+        **kwargs,
+    ):
+        """Execute a SQL command asynchronously, see :meth:`run_to_df`."""
+        return await self._query_executor.arun(
+            self, "run_to_df", command, fetch, timeout=timeout, **kwargs
+        )
+
+    def _get_dbapi_connection(self) -> Any:
+        """Return the DBAPI connection of the session, used to cancel queries."""
+        return self.session.connection().connection.dbapi_connection
+
+    def _cancel_query(self, dbapi_connection: Any) -> None:
+        """Cancel the statement running on the DBAPI connection.
+
+        It is called from another thread, the dialects whose driver can't cancel a
+        statement should override it.
+        """
+        if hasattr(dbapi_connection, "interrupt"):
+            # sqlite3 and duckdb
+            dbapi_connection.interrupt()
+        elif hasattr(dbapi_connection, "cancel"):
+            # psycopg2
+            dbapi_connection.cancel()
+        else:
+            logger.warning(f"Cancel query is not supported by {self.dialect}")
+
+    def _reflect_tables(self, table_names: Iterable[str]) -> None:
+        """Reflect the tables which have not been reflected yet."""
+        missing = set(table_names) - set(self._metadata.tables.keys())
+        if not missing:
+            return
+        with self._reflect_lock:
+            missing -= set(self._metadata.tables.keys())
+            if missing:
+                self._metadata.reflect(
+                    bind=self._engine, only=lambda name, _: name in missing
+                )
+
+    def _forget_reflected_tables(self, table_names: Iterable[str]) -> None:
+        """Remove the reflected tables, they will be reflected again when needed."""
+        with self._reflect_lock:
+            for name in table_names:
+                table = self._metadata.tables.get(name)
+                if table is not None:
+                    self._metadata.remove(table)
+
+    @property
+    def schema_cache(self) -> SchemaMetadataCache:
+        """Return the schema metadata cache."""
+        return self._schema_cache
+
+    def set_schema_cache(self, schema_cache: SchemaMetadataCache) -> None:
+        """Set the schema metadata cache.
+
+        The cache is shared by all the connectors created by :meth:`new_session`.
+
+        Args:
+            schema_cache (SchemaMetadataCache): The schema metadata cache.
+        """
+        self._schema_cache = schema_cache
+
+    def get_table_metadata(self, table_name: str) -> TableMetadata:
+        """Get the columns, indexes and comment of the table from the cache.
+
+        Args:
+            table_name (str): table name
+
+        Returns:
+            TableMetadata: The metadata of the table.
+        """
+        tables = self.get_tables_metadata([table_name])
+        if table_name not in tables:
+            raise ValueError(f"Table {table_name} not found in database")
+        return tables[table_name]
+
+    def get_tables_metadata(
+        self, table_names: Optional[Iterable[str]] = None
+    ) -> Dict[str, TableMetadata]:
+        """Get the metadata of the tables from the cache.
+
+        The cache is refreshed when it is expired, and the tables which are not in
+        the cache are loaded lazily.
+
+        Args:
+            table_names (Optional[Iterable[str]]): The table names, all the usable
+                tables if it is None.
+
+        Returns:
+            Dict[str, TableMetadata]: The table name to its metadata.
+        """
+        cache = self._schema_cache
+        if cache.is_expired():
+            self.refresh_schema_cache()
+        names = list(
+            table_names if table_names is not None else self.get_usable_table_names()
+        )
+        missing = [name for name in names if self._get_cached_table(name) is None]
+        if missing:
+            for table in self._load_tables_metadata(missing).values():
+                cache.put(table)
+            cache.save()
+        result = {}
+        for name in names:
+            table = self._get_cached_table(name)
+            if table is not None:
+                result[name] = table
+        return result
+
+    @property
+    def _default_schema(self) -> Optional[str]:
+        """Return the schema of the table names without a schema."""
+        return None
+
+    def _get_cached_table(self, table_name: str) -> Optional[TableMetadata]:
+        """Get the cached table of the name, in the default schema if possible."""
+        table = None
+        if self._default_schema is not None:
+            table = self._schema_cache.get(table_name, self._default_schema)
+        return table or self._schema_cache.get(table_name)
+
+    def refresh_schema_cache(
+        self, table_names: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """Refresh the schema metadata cache from the database.
+
+        Just the tables whose metadata changed are replaced, and their reflected
+        SQLAlchemy tables are discarded.
+
+        Args:
+            table_names (Optional[Iterable[str]]): Just refresh these tables if
+                provided, otherwise refresh the whole cache. If the dialect can't
+                load the metadata of all tables in bulk, just the cached tables are
+                refreshed.
+
+        Returns:
+            List[str]: The tables which are added, changed or removed.
+        """
+        cache = self._schema_cache
+        with self._schema_refresh_lock:
+            if hasattr(self, "_inspector"):
+                # The inspector caches the reflected results
+                self._inspector.clear_cache()
+            current = self._sync_shared_table_names()
+            if table_names is None:
+                loaded = self._bulk_load_table_metadata(None)
+                complete = loaded is not None
+                if loaded is None:
+                    cached = [name for name in cache.table_names() if name in current]
+                    loaded = self._load_tables_metadata(cached)
+                    removed = [key for key in cache.keys() if key[1] not in current]
+                else:
+                    # All the tables are loaded, the others are removed
+                    keys = {table.key for table in loaded.values()}
+                    removed = [key for key in cache.keys() if key not in keys]
+            else:
+                targets = set(table_names)
+                loaded = self._load_tables_metadata(sorted(targets & current))
+                keys = {table.key for table in loaded.values()}
+                removed = [
+                    key for key in cache.keys() if key[1] in targets and key not in keys
+                ]
+
+            changed = [name for schema, name in removed if cache.remove(name, schema)]
+            changed += [table.name for table in loaded.values() if cache.put(table)]
+            changed = list(dict.fromkeys(changed))
+            if table_names is None:
+                cache.mark_refreshed(complete)
+            self._forget_reflected_tables(changed)
+            cache.save()
+        if changed:
+            logger.info(f"Schema of tables {changed} changed")
+        return changed
+
+    def _sync_shared_table_names(self) -> Set[str]:
+        """Read the table names from database and update them in place.
+
+        The set of the table names is shared by the connectors created by
+        :meth:`new_session`, so all of them see the new tables.
+        """
+        shared = self._all_tables
+        current = set(self._sync_tables_from_db())
+        shared.intersection_update(current)
+        shared.update(current)
+        self._all_tables = shared
+        return current
+
+    def _load_tables_metadata(self, table_names: List[str]) -> Dict[str, TableMetadata]:
+        """Load the metadata of the tables from database."""
+        if not table_names:
+            return {}
+        tables = self._bulk_load_table_metadata(set(table_names))
+        if tables is not None:
+            return tables
+        tables = {}
+        for name in table_names:
+            try:
+                columns = self.get_columns(name)
+            except NoSuchTableError:
+                continue
+            try:
+                comment = self.get_table_comment(name)
+            except Exception:
+                comment = {"text": None}
+            tables[name] = TableMetadata(
+                name=name,
+                columns=columns,
+                indexes=self.get_indexes(name),
+                comment=comment,
+            )
+        return tables
+
+    @_release_session
+    def _bulk_load_table_metadata(
+        self, table_names: Optional[Set[str]] = None
+    ) -> Optional[Dict[str, TableMetadata]]:
+        """Load the metadata of many tables with a few catalog queries.
+
+        Args:
+            table_names (Optional[Set[str]]): The tables to load, all tables if it is
+                None.
+
+        Returns:
+            Optional[Dict[str, TableMetadata]]: The metadata of the tables keyed by
+                their names, qualified by the schemas if the dialect has schemas.
+                None if the dialect doesn't support bulk loading, then the tables
+                are reflected one by one.
+        """
+        return None
+
     @property
     def dialect(self) -> str:
         """Return string representation of dialect to use."""
         return self._engine.dialect.name
 
+    @_release_session
     def _sync_tables_from_db(self) -> Iterable[str]:
         """Read table information from database."""
         # TODO Use a background thread to refresh periodically
@@ -159,6 +599,7 @@ class RDBMSConnector(BaseConnector):
 
         return session
 
+    @_release_session
     def get_current_db_name(self) -> str:
         """Get current database name.
 
@@ -167,6 +608,7 @@ class RDBMSConnector(BaseConnector):
         """
         return self.session.execute(text("SELECT DATABASE()")).scalar()
 
+    @_release_session
     def table_simple_info(self):
         """Return table simple info."""
         _sql = f"""
@@ -200,6 +642,7 @@ class RDBMSConnector(BaseConnector):
                 raise ValueError(f"table_names {missing_tables} not found in database")
             all_table_names = table_names
 
+        self._reflect_tables(all_table_names)
         meta_tables = [
             tbl
             for tbl in self._metadata.sorted_tables
@@ -288,6 +731,7 @@ class RDBMSConnector(BaseConnector):
             """Format the error message"""
             return f"Error: {e}"
 
+    @_release_session
     def _write(self, write_sql: str):
         """Run a SQL write command and return the results as a list of tuples.
 
@@ -304,9 +748,12 @@ class RDBMSConnector(BaseConnector):
         logger.info(f"SQL[{write_sql}], result:{result.rowcount}")
         return result.rowcount
 
+    @_release_session
     def _query(self, query: str, fetch: str = "all"):
         """Run a SQL query and return the results as a list of tuples.
 
+        The rows are streamed within the query limits, see :meth:`set_query_limits`.
+
         Args:
             query (str): SQL query to run
             fetch (str): fetch type
@@ -316,11 +763,23 @@ class RDBMSConnector(BaseConnector):
         logger.info(f"Query[{query}]")
         if not query:
             return result
+        if fetch == "all":
+            with self.query_stream(
+                query, max_rows=self._query_max_rows, max_bytes=self._query_max_bytes
+            ) as stream:
+                if not stream.columns:
+                    return None
+                result = stream.fetch_all()
+                if stream.truncated:
+                    logger.warning(
+                        f"Query result is truncated to {stream.row_count} rows"
+                    )
+                field_names = tuple(stream.columns)
+            result.insert(0, field_names)
+            return result
         cursor = self.session.execute(text(query))
         if cursor.returns_rows:
-            if fetch == "all":
-                result = cursor.fetchall()
-            elif fetch == "one":
+            if fetch == "one":
                 result = [cursor.fetchone()]
             else:
                 raise ValueError("Fetch parameter must be either 'one' or 'all'")
@@ -338,7 +797,57 @@ class RDBMSConnector(BaseConnector):
         sql = f"select * from {table_name} limit 1"
         return self._query(sql)
 
-    def query_ex(self, query: str, fetch: str = "all"):
+    def query_stream(
+        self,
+        query: str,
+        batch_size: int = 1000,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> QueryResultStream:
+        """Execute a query and stream the results with a server side cursor.
+
+        The rows are fetched batch by batch with `fetchmany`, and the fetching stops
+        when the row or byte limit is reached. The session can't execute other
+        statements until the stream is closed.
+
+        Examples:
+            .. code-block:: python
+
+                with conn.query_stream(sql, max_rows=10000) as stream:
+                    async for rows in stream:
+                        print(stream.columns, rows)
+
+        Args:
+            query (str): SQL query to run
+            batch_size (int): The number of rows to fetch each time
+            max_rows (Optional[int]): The maximum number of rows to fetch
+            max_bytes (Optional[int]): The maximum estimated bytes of the rows
+
+        Returns:
+            QueryResultStream: The streaming result.
+        """
+        logger.info(f"Query stream[{query}]")
+        result = self.session.execute(
+            text(query),
+            execution_options={"stream_results": True, "max_row_buffer": batch_size},
+        )
+        return QueryResultStream(
+            result,
+            batch_size=batch_size,
+            max_rows=max_rows,
+            max_bytes=max_bytes,
+            on_close=self._end_session_call,
+        )
+
+    @_release_session
+    def query_ex(
+        self,
+        query: str,
+        fetch: str = "all",
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        use_cache: bool = False,
+    ):
         """Execute a SQL command and return the results.
 
         Only for query command.
@@ -346,6 +855,12 @@ class RDBMSConnector(BaseConnector):
         Args:
             query (str): SQL query to run
             fetch (str): fetch type
+            max_rows (Optional[int]): The maximum number of rows to fetch, just for
+                fetch type "all"
+            max_bytes (Optional[int]): The maximum estimated bytes of the rows, just
+                for fetch type "all"
+            use_cache (bool): Whether to use the result cache, just for the SELECT
+                statements with fetch type "all"
 
         Returns:
             List: result list
@@ -353,11 +868,14 @@ class RDBMSConnector(BaseConnector):
         logger.info(f"Query[{query}]")
         if not query:
             return [], None
+        if fetch == "all":
+            columns, result, _ = self._query_all(query, max_rows, max_bytes, use_cache)
+            if not columns:
+                return [], None
+            return columns, result
         cursor = self.session.execute(text(query))
         if cursor.returns_rows:
-            if fetch == "all":
-                result = cursor.fetchall()
-            elif fetch == "one":
+            if fetch == "one":
                 result = cursor.fetchone()  # type: ignore
             else:
                 raise ValueError("Fetch parameter must be either 'one' or 'all'")
@@ -367,6 +885,47 @@ class RDBMSConnector(BaseConnector):
             return field_names, result
         return [], None
 
+    def _query_all(
+        self,
+        query: str,
+        max_rows: Optional[int],
+        max_bytes: Optional[int],
+        use_cache: bool,
+    ) -> Tuple[List[str], List[Any], bool]:
+        """Fetch all the rows within the limits, from the result cache if possible.
+
+        Returns:
+            Tuple[List[str], List[Any], bool]: The columns, the rows and whether the
+                rows are truncated by the limits.
+        """
+        cacheable = use_cache and self._is_cacheable_query(query)
+        if cacheable:
+            cached = self._result_cache.get(  # type: ignore
+                query,
+                self._schema_cache.fingerprint,
+                max_rows=max_rows,
+                max_bytes=max_bytes,
+            )
+            if cached is not None:
+                return cached.columns, cached.rows, cached.truncated
+        with self.query_stream(query, max_rows=max_rows, max_bytes=max_bytes) as stream:
+            rows = stream.fetch_all()
+            if stream.truncated:
+                logger.warning(f"Query result is truncated to {stream.row_count} rows")
+            columns, truncated = stream.columns, stream.truncated
+        if cacheable and columns:
+            self._result_cache.set(  # type: ignore
+                query,
+                columns,
+                rows,
+                self._schema_cache.fingerprint,
+                truncated=truncated,
+                max_rows=max_rows,
+                max_bytes=max_bytes,
+            )
+        return columns, rows, truncated
+
+    @_release_session
     def run(self, command: str, fetch: str = "all") -> List:
         """Execute a SQL command and return a string representing the results."""
         logger.info("SQL:" + command)
@@ -378,6 +937,7 @@ class RDBMSConnector(BaseConnector):
                 return self._query(command, fetch)
             else:
                 self._write(command)
+                self._invalidate_result_cache()
                 select_sql = self.convert_sql_write_to_select(command)
                 logger.info(f"write result query:{select_sql}")
                 return self._query(select_sql)
@@ -388,6 +948,9 @@ class RDBMSConnector(BaseConnector):
             )
             cursor = self.session.execute(text(command))
             self.session.commit()
+            self._invalidate_result_cache()
+            if sql_type in _DDL_TYPES:
+                self._on_schema_changed(command, table_name)
             if cursor.returns_rows:
                 result = cursor.fetchall()
                 field_names = tuple(i[0:] for i in cursor.keys())
@@ -401,12 +964,59 @@ class RDBMSConnector(BaseConnector):
             else:
                 return self.get_simple_fields(table_name)
 
-    def run_to_df(self, command: str, fetch: str = "all"):
-        """Execute sql command and return result as dataframe."""
+    def _on_schema_changed(self, command: str, table_name: Optional[str]) -> None:
+        """Refresh the cached schema after a DDL statement."""
+        if _INDEX_DDL_PATTERN.match(command):
+            # The name parsed from the index statements is the index name
+            match = _INDEX_TABLE_PATTERN.search(command)
+            table_name = match.group(1).strip('`"[]') if match else None
+        try:
+            self.refresh_schema_cache([table_name] if table_name else None)
+        except Exception as e:
+            logger.warning(f"Refresh schema cache of table {table_name} error: {e}")
+
+    @_release_session
+    def run_to_df(
+        self,
+        command: str,
+        fetch: str = "all",
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        use_cache: bool = False,
+    ):
+        """Execute sql command and return result as dataframe.
+
+        The results of the queries are streamed into the dataframe column by column,
+        `df.attrs["truncated"]` is True if the result is truncated by the limits.
+
+        Args:
+            command (str): sql command
+            fetch (str): fetch type
+            max_rows (Optional[int]): The maximum number of rows of the queries
+            max_bytes (Optional[int]): The maximum estimated bytes of the queries
+            use_cache (bool): Whether to use the result cache for the queries, the
+                other statements bypass the cache
+        """
         import pandas as pd
 
         # Pandas has too much dependence and the import time is too long
         # TODO: Remove the dependency on pandas
+        if command and fetch == "all":
+            _, ttype, sql_type, _ = self.__sql_parse(command)
+            if ttype == sqlparse.tokens.DML and sql_type == "SELECT":
+                if use_cache and self._is_cacheable_query(command):
+                    columns, rows, truncated = self._query_all(
+                        command, max_rows, max_bytes, use_cache=True
+                    )
+                    df = rows_to_df(columns, rows)
+                    df.attrs["truncated"] = truncated
+                    return df
+                with self.query_stream(
+                    command, max_rows=max_rows, max_bytes=max_bytes
+                ) as stream:
+                    df = stream.to_df()
+                    df.attrs["truncated"] = stream.truncated
+                    return df
         result_lst = self.run(command, fetch)
         colunms = result_lst[0]
         values = result_lst[1:]
@@ -514,6 +1124,7 @@ class RDBMSConnector(BaseConnector):
                 return token.get_real_name()
         return None
 
+    @_release_session
     def get_indexes(self, table_name: str) -> List[Dict]:
         """Get table indexes about specified table.
 
@@ -525,6 +1136,7 @@ class RDBMSConnector(BaseConnector):
         """
         return self._inspector.get_indexes(table_name)
 
+    @_release_session
     def get_show_create_table(self, table_name):
         """Get table show create table about specified table."""
         session = self._db_sessions()
@@ -532,6 +1144,7 @@ class RDBMSConnector(BaseConnector):
         ans = cursor.fetchall()
         return ans[0][1]
 
+    @_release_session
     def get_fields(self, table_name, db_name=None) -> List[Tuple]:
         """Get column fields about specified table."""
         session = self._db_sessions()
@@ -550,6 +1163,7 @@ class RDBMSConnector(BaseConnector):
         """Get column fields about specified table."""
         return self._query(f"SHOW COLUMNS FROM {table_name}")
 
+    @_release_session
     def get_charset(self) -> str:
         """Get character_set."""
         session = self._db_sessions()
@@ -557,6 +1171,7 @@ class RDBMSConnector(BaseConnector):
         character_set = cursor.fetchone()[0]  # type: ignore
         return character_set
 
+    @_release_session
     def get_collation(self):
         """Get collation."""
         session = self._db_sessions()
@@ -564,6 +1179,7 @@ class RDBMSConnector(BaseConnector):
         collation = cursor.fetchone()[0]
         return collation
 
+    @_release_session
     def get_grants(self):
         """Get grant info."""
         session = self._db_sessions()
@@ -571,6 +1187,7 @@ class RDBMSConnector(BaseConnector):
         grants = cursor.fetchall()
         return grants
 
+    @_release_session
     def get_users(self):
         """Get user info."""
         try:
@@ -580,6 +1197,7 @@ class RDBMSConnector(BaseConnector):
         except Exception:
             return []
 
+    @_release_session
     def get_table_comments(self, db_name: str):
         """Return table comments."""
         cursor = self.session.execute(
@@ -595,6 +1213,7 @@ class RDBMSConnector(BaseConnector):
             (table_comment[0], table_comment[1]) for table_comment in table_comments
         ]
 
+    @_release_session
     def get_table_comment(self, table_name: str) -> Dict:
         """Get table comments.
 
@@ -605,6 +1224,7 @@ class RDBMSConnector(BaseConnector):
         """
         return self._inspector.get_table_comment(table_name)
 
+    @_release_session
     def get_column_comments(self, db_name: str, table_name: str):
         """Return column comments."""
         cursor = self.session.execute(
@@ -621,6 +1241,7 @@ class RDBMSConnector(BaseConnector):
             (column_comment[0], column_comment[1]) for column_comment in column_comments
         ]
 
+    @_release_session
     def get_database_names(self) -> List[str]:
         """Return a list of database names available in the database.
 
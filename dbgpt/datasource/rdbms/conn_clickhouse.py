@@ -1,6 +1,7 @@
 """Clickhouse connector."""
 import logging
 import re
+import threading
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import sqlparse
@@ -9,6 +10,8 @@ from sqlalchemy import MetaData, text
 from dbgpt.storage.schema import DBType
 
 from .base import RDBMSConnector
+from .query_executor import QueryExecutor
+from .schema_cache import SchemaMetadataCache
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +44,11 @@ class ClickhouseConnector(RDBMSConnector):
         self._sample_rows_in_table_info = set()
 
         self._metadata = MetaData()
+        self._reflect_lock = threading.Lock()
+        self._schema_cache = SchemaMetadataCache()
+        self._schema_refresh_lock = threading.Lock()
+        self._query_executor = QueryExecutor(name="clickhouse")
+        self._result_cache = None
 
     @classmethod
     def from_uri_db(
@@ -74,6 +82,22 @@ class ClickhouseConnector(RDBMSConnector):
         cls.client = client
         return cls(client, **kwargs)
 
+    def new_session(self) -> "ClickhouseConnector":
+        """Return the current connector, the client is shared by all requests."""
+        return self
+
+    def dispose(self) -> None:
+        """Close the client."""
+        self._query_executor.shutdown()
+        self.client.close()
+
+    def close_session(self) -> None:
+        """Do nothing, the client is shared by all requests."""
+
+    def _get_dbapi_connection(self) -> Any:
+        """Return None, the queries of the http client can't be cancelled."""
+        return None
+
     def get_table_names(self):
         """Get all table names."""
         session = self.client
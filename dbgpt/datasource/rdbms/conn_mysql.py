@@ -1,6 +1,12 @@
 """MySQL connector."""
 
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import bindparam, text
+
 from .base import RDBMSConnector
+from .schema_cache import TableMetadata
 
 
 class MySQLConnector(RDBMSConnector):
@@ -11,3 +17,74 @@ class MySQLConnector(RDBMSConnector):
     driver: str = "mysql+pymysql"
 
     default_db = ["information_schema", "performance_schema", "sys", "mysql"]
+
+    def _cancel_query(self, dbapi_connection: Any) -> None:
+        """Kill the running statement with another connection."""
+        thread_id = int(dbapi_connection.thread_id())
+        with self._engine.connect() as connection:
+            connection.execute(text(f"KILL QUERY {thread_id}"))
+
+    def _bulk_load_table_metadata(
+        self, table_names: Optional[Set[str]] = None
+    ) -> Optional[Dict[str, TableMetadata]]:
+        """Load the metadata of the tables from information_schema.
+
+        Three queries for all tables instead of three reflections per table.
+        """
+        table_filter = " AND TABLE_NAME IN :table_names" if table_names else ""
+
+        def _execute(sql: str):
+            stmt = text(sql + table_filter)
+            params = {}
+            if table_names:
+                stmt = stmt.bindparams(bindparam("table_names", expanding=True))
+                params["table_names"] = list(table_names)
+            return self.session.execute(stmt, params).fetchall()
+
+        columns: Dict[str, List[Dict]] = defaultdict(list)
+        for row in _execute(
+            "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, "
+            "COLUMN_DEFAULT, COLUMN_COMMENT, ORDINAL_POSITION "
+            "FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE()"
+        ):
+            columns[row[0]].append(
+                {
+                    "name": row[1],
+                    "type": row[2],
+                    "nullable": row[3] == "YES",
+                    "default": row[4],
+                    "comment": row[5] or None,
+                    "position": row[6],
+                }
+            )
+
+        indexes: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+        for row in _execute(
+            "SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SEQ_IN_INDEX "
+            "FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() "
+            "AND INDEX_NAME != 'PRIMARY'"
+        ):
+            index = indexes[row[0]].setdefault(
+                row[1], {"name": row[1], "column_names": [], "unique": not row[2]}
+            )
+            index["column_names"].append((row[4], row[3]))
+
+        tables = {}
+        for row in _execute(
+            "SELECT TABLE_NAME, TABLE_COMMENT FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE()"
+        ):
+            table_columns = sorted(columns.get(row[0], []), key=lambda c: c["position"])
+            for column in table_columns:
+                column.pop("position")
+            table_indexes = []
+            for _, index in sorted(indexes.get(row[0], {}).items()):
+                index["column_names"] = [c for _, c in sorted(index["column_names"])]
+                table_indexes.append(index)
+            tables[row[0]] = TableMetadata(
+                name=row[0],
+                columns=table_columns,
+                indexes=table_indexes,
+                comment={"text": row[1] or None},
+            )
+        return tables
@@ -85,7 +85,6 @@ class OracleConnector(RDBMSConnector):
             )
         )
         self._all_tables = {row[0] for row in table_results}
-        self._metadata.reflect(bind=self._engine)
         return self._all_tables
 
     def get_fields(self, table_name, db_name=None) -> List[Tuple]:
@@ -1,12 +1,14 @@
 """PostgreSQL connector."""
 import logging
-from typing import Any, Iterable, List, Optional, Tuple, cast
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, cast
 from urllib.parse import quote
 from urllib.parse import quote_plus as urlquote
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
 from .base import RDBMSConnector
+from .schema_cache import TableMetadata
 
 logger = logging.getLogger(__name__)
 
@@ -51,9 +53,88 @@ class PostgreSQLConnector(RDBMSConnector):
         table_results = set(row[0] for row in table_results)  # noqa: C401
         view_results = set(row[0] for row in view_results)  # noqa: C401
         self._all_tables = table_results.union(view_results)
-        self._metadata.reflect(bind=self._engine)
         return self._all_tables
 
+    @property
+    def _default_schema(self) -> Optional[str]:
+        """Return the schema of the table names without a schema."""
+        return self._schema or "public"
+
+    def _bulk_load_table_metadata(
+        self, table_names: Optional[Set[str]] = None
+    ) -> Optional[Dict[str, TableMetadata]]:
+        """Load the metadata of the tables of all the schemas from the catalogs.
+
+        The tables are grouped by their schemas and names, the same name may be used
+        by the tables of different schemas.
+        """
+        table_filter = " AND {column} IN :table_names" if table_names else ""
+
+        def _execute(sql: str, column: str):
+            stmt = text(sql + table_filter.format(column=column))
+            params = {}
+            if table_names:
+                stmt = stmt.bindparams(bindparam("table_names", expanding=True))
+                params["table_names"] = list(table_names)
+            return self.session.execute(stmt, params).fetchall()
+
+        columns: Dict[Tuple[str, str], List[Tuple]] = defaultdict(list)
+        for row in _execute(
+            """
+            SELECT c.table_schema, c.table_name, c.column_name, c.data_type,
+             c.is_nullable, c.column_default, d.description, c.ordinal_position
+            FROM information_schema.columns c
+            LEFT JOIN pg_catalog.pg_namespace n ON n.nspname = c.table_schema
+            LEFT JOIN pg_catalog.pg_class cls
+             ON cls.relname = c.table_name AND cls.relnamespace = n.oid
+            LEFT JOIN pg_catalog.pg_description d
+             ON d.objoid = cls.oid AND d.objsubid = c.ordinal_position
+            WHERE c.table_schema NOT IN ('pg_catalog', 'information_schema')
+            """,
+            "c.table_name",
+        ):
+            columns[(row[0], row[1])].append(row[2:])
+
+        indexes: Dict[Tuple[str, str], List[Tuple]] = defaultdict(list)
+        for row in _execute(
+            "SELECT schemaname, tablename, indexname, indexdef FROM pg_indexes WHERE "
+            "schemaname NOT IN ('pg_catalog', 'information_schema')",
+            "tablename",
+        ):
+            # The same format as get_indexes
+            indexes[(row[0], row[1])].append((row[2], row[3]))
+
+        tables = {}
+        for row in _execute(
+            """
+            SELECT n.nspname, c.relname, obj_description(c.oid, 'pg_class')
+            FROM pg_catalog.pg_class c
+            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind IN ('r', 'v', 'm', 'p')
+             AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+            """,
+            "c.relname",
+        ):
+            key = (row[0], row[1])
+            table_columns = [
+                {
+                    "name": column[0],
+                    "type": column[1],
+                    "nullable": column[2] == "YES",
+                    "default": column[3],
+                    "comment": column[4],
+                }
+                for column in sorted(columns.get(key, []), key=lambda c: c[5])
+            ]
+            tables[f"{row[0]}.{row[1]}"] = TableMetadata(
+                name=row[1],
+                columns=table_columns,
+                indexes=sorted(indexes.get(key, [])),
+                comment={"text": row[2]},
+                schema=row[0],
+            )
+        return tables
+
     def get_grants(self):
         """Get grants."""
         session = self._db_sessions()
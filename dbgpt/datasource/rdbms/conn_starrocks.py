@@ -46,7 +46,6 @@ class StarRocksConnector(RDBMSConnector):
         table_results = set(row[0] for row in table_results)  # noqa: C401
         # view_results = set(row[0] for row in view_results)
         self._all_tables = table_results
-        self._metadata.reflect(bind=self._engine)
         return self._all_tables
 
     def get_grants(self):
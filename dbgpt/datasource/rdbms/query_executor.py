@@ -0,0 +1,216 @@
+"""Execute the queries of a datasource in its own bounded thread pool.
+
+The calls of the RDBMS connectors are blocking. Running them in a thread pool per
+datasource keeps a slow datasource from occupying the shared executors, and the
+queries can be cancelled in the database when they time out or the caller is
+cancelled (e.g. the client disconnected).
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Any, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .base import RDBMSConnector
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTimeoutError(TimeoutError):
+    """The query is cancelled because of timeout."""
+
+
+class QueryCancelledError(Exception):
+    """The query is cancelled before it is executed."""
+
+
+class RunningQuery:
+    """A query submitted to the executor, it can be cancelled in the database."""
+
+    def __init__(self, connector: "RDBMSConnector"):
+        """Create a new RunningQuery."""
+        self._connector = connector
+        self._dbapi_connection: Any = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the query is cancelled."""
+        return self._cancelled
+
+    def _attach(self, dbapi_connection: Any) -> None:
+        with self._lock:
+            self._dbapi_connection = dbapi_connection
+            cancelled = self._cancelled
+        if cancelled:
+            # Cancelled between the submission and the execution
+            self.cancel()
+
+    def _detach(self) -> None:
+        with self._lock:
+            self._dbapi_connection = None
+
+    def cancel(self) -> None:
+        """Cancel the query, the running statement is cancelled in the database."""
+        with self._lock:
+            self._cancelled = True
+            dbapi_connection = self._dbapi_connection
+        if dbapi_connection is None:
+            return
+        try:
+            self._connector._cancel_query(dbapi_connection)
+        except Exception as e:
+            logger.warning(f"Cancel query error: {e}")
+
+
+class QueryExecutor:
+    """Run the connector calls in a bounded thread pool.
+
+    Every call runs with a new session of the connector, so the concurrent calls
+    don't share a session.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 4,
+        timeout: Optional[float] = None,
+    ):
+        """Create a new QueryExecutor.
+
+        Args:
+            name (str): The name of the datasource.
+            max_workers (int): The maximum number of concurrent queries.
+            timeout (Optional[float]): The default timeout seconds of the queries.
+        """
+        self._name = name
+        self._timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"datasource-{name}"
+        )
+        self._running: Set[RunningQuery] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """Return the default timeout seconds."""
+        return self._timeout
+
+    def submit(
+        self, connector: "RDBMSConnector", method: str, *args, **kwargs
+    ) -> Tuple[Future, RunningQuery]:
+        """Submit a method call of the connector.
+
+        Args:
+            connector (RDBMSConnector): The connector.
+            method (str): The method name of the connector, e.g. "run_to_df".
+
+        Returns:
+            Tuple[Future, RunningQuery]: The future of the result and the handle to
+                cancel the query.
+        """
+        query = RunningQuery(connector)
+
+        def _execute():
+            if query.cancelled:
+                raise QueryCancelledError(f"Query of {self._name} is cancelled")
+            conn = connector.new_session()
+            try:
+                query._attach(conn._get_dbapi_connection())
+                return getattr(conn, method)(*args, **kwargs)
+            finally:
+                query._detach()
+                conn.close_session()
+
+        with self._lock:
+            self._running.add(query)
+        ctx = contextvars.copy_context()
+        future = self._executor.submit(ctx.run, _execute)
+        future.add_done_callback(lambda _: self._discard(query))
+        return future, query
+
+    def _discard(self, query: RunningQuery) -> None:
+        with self._lock:
+            self._running.discard(query)
+
+    def run(
+        self,
+        connector: "RDBMSConnector",
+        method: str,
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """Call the method of the connector and wait for the result.
+
+        Raises:
+            QueryTimeoutError: If the query doesn't finish in time, the query is
+                cancelled.
+        """
+        future, query = self.submit(connector, method, *args, **kwargs)
+        return self.wait(future, query, timeout=timeout)
+
+    def wait(
+        self, future: Future, query: RunningQuery, timeout: Optional[float] = None
+    ) -> Any:
+        """Wait for the result of a submitted query.
+
+        Raises:
+            QueryTimeoutError: If the query doesn't finish in time, the query is
+                cancelled.
+        """
+        timeout = timeout if timeout is not None else self._timeout
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            query.cancel()
+            future.cancel()
+            raise QueryTimeoutError(
+                f"Query of {self._name} timed out after {timeout} seconds"
+            )
+
+    async def arun(
+        self,
+        connector: "RDBMSConnector",
+        method: str,
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """Call the method of the connector asynchronously.
+
+        The query is cancelled in the database if it times out or the awaiting task
+        is cancelled.
+
+        Raises:
+            QueryTimeoutError: If the query doesn't finish in time.
+        """
+        timeout = timeout if timeout is not None else self._timeout
+        future, query = self.submit(connector, method, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            query.cancel()
+            raise QueryTimeoutError(
+                f"Query of {self._name} timed out after {timeout} seconds"
+            )
+        except asyncio.CancelledError:
+            query.cancel()
+            raise
+
+    def cancel_all(self) -> None:
+        """Cancel all the running queries."""
+        with self._lock:
+            running = list(self._running)
+        for query in running:
+            query.cancel()
+
+    def shutdown(self) -> None:
+        """Cancel the running queries and shutdown the thread pool."""
+        self.cancel_all()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,228 @@
+"""Streaming query results with bounded memory.
+
+The rows are fetched from a server side cursor batch by batch, and the row and byte
+limits are enforced while fetching, so an accidental `SELECT *` on a big table can't
+load the whole table into memory.
+"""
+
+import datetime
+import decimal
+import logging
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Sequence
+
+from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_BATCH_SIZE = 1000
+_FIXED_SIZE_TYPES = (
+    int,
+    float,
+    bool,
+    decimal.Decimal,
+    datetime.date,
+    datetime.datetime,
+    datetime.time,
+    datetime.timedelta,
+)
+
+
+def _estimate_row_bytes(row: Sequence[Any]) -> int:
+    """Estimate the memory of a row cheaply."""
+    size = 0
+    for value in row:
+        if value is None or isinstance(value, _FIXED_SIZE_TYPES):
+            size += 8
+        elif isinstance(value, (str, bytes, bytearray)):
+            size += len(value)
+        else:
+            size += len(str(value))
+    return size
+
+
+class QueryResultStream:
+    """The streaming result of a query.
+
+    Iterate it to get the rows batch by batch, the cursor is closed when the
+    iteration finished or the limits are reached.
+
+    Examples:
+        .. code-block:: python
+
+            with conn.query_stream("SELECT * FROM user", max_rows=10000) as stream:
+                for rows in stream:
+                    print(stream.columns, len(rows))
+                print(stream.truncated)
+    """
+
+    def __init__(
+        self,
+        result: Any,
+        batch_size: int = _DEFAULT_BATCH_SIZE,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        """Create a new QueryResultStream.
+
+        Args:
+            result (Any): The SQLAlchemy result with a server side cursor.
+            batch_size (int): The number of rows to fetch each time.
+            max_rows (Optional[int]): The maximum number of rows to fetch.
+            max_bytes (Optional[int]): The maximum estimated bytes of the rows.
+            on_close (Optional[Callable[[], None]]): Called after the cursor is
+                closed, e.g. to return the connection to the pool.
+        """
+        self._result = result
+        self._on_close = on_close
+        self._batch_size = batch_size
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        self._columns: List[str] = list(result.keys()) if result.returns_rows else []
+        self._row_count = 0
+        self._byte_count = 0
+        self._truncated = False
+        self._closed = False
+        if not result.returns_rows:
+            self.close()
+
+    @property
+    def columns(self) -> List[str]:
+        """Return the column names."""
+        return self._columns
+
+    @property
+    def row_count(self) -> int:
+        """Return the number of rows fetched."""
+        return self._row_count
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the result was truncated by the limits."""
+        return self._truncated
+
+    def fetch_batch(self) -> Optional[List[Any]]:
+        """Fetch the next batch of rows.
+
+        Returns:
+            Optional[List[Any]]: The rows, None if there are no more rows.
+        """
+        if self._closed:
+            return None
+        size = self._batch_size
+        if self._max_rows is not None:
+            remaining = self._max_rows - self._row_count
+            if remaining <= 0:
+                self._truncated = self._result.fetchone() is not None
+                self.close()
+                return None
+            size = min(size, remaining)
+        rows = list(self._result.fetchmany(size))
+        if not rows:
+            self.close()
+            return None
+        if self._max_bytes is not None:
+            for i, row in enumerate(rows):
+                self._byte_count += _estimate_row_bytes(row)
+                if self._byte_count > self._max_bytes:
+                    rows = rows[:i]
+                    self._truncated = True
+                    self.close()
+                    break
+        self._row_count += len(rows)
+        return rows
+
+    def close(self) -> None:
+        """Close the cursor."""
+        if not self._closed:
+            self._closed = True
+            self._result.close()
+            if self._on_close:
+                self._on_close()
+
+    def __iter__(self) -> Iterator[List[Any]]:
+        """Iterate the batches of rows."""
+        while True:
+            rows = self.fetch_batch()
+            if rows is None:
+                return
+            if rows:
+                yield rows
+
+    async def __aiter__(self) -> AsyncIterator[List[Any]]:
+        """Iterate the batches of rows, the rows are fetched in a thread."""
+        try:
+            while True:
+                rows = await blocking_func_to_async_no_executor(self.fetch_batch)
+                if rows is None:
+                    return
+                if rows:
+                    yield rows
+        finally:
+            self.close()
+
+    def __enter__(self) -> "QueryResultStream":
+        """Enter the context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the cursor when exit the context."""
+        self.close()
+
+    def fetch_all(self) -> List[Any]:
+        """Fetch all the remaining rows within the limits."""
+        rows: List[Any] = []
+        for batch in self:
+            rows.extend(batch)
+        return rows
+
+    def to_df(self):
+        """Fetch the remaining rows within the limits to a pandas DataFrame.
+
+        The rows are collected column by column, see :func:`columns_to_df`.
+        """
+        columns: List[List[Any]] = [[] for _ in self._columns]
+        for batch in self:
+            for values, column in zip(zip(*batch), columns):
+                column.extend(values)
+        return columns_to_df(self._columns, columns)
+
+
+def columns_to_df(names: List[str], columns: List[List[Any]]):
+    """Create a pandas DataFrame from the values of the columns.
+
+    The columns are converted with pyarrow if it is installed, which avoids creating a
+    Python object per cell in pandas.
+
+    Args:
+        names (List[str]): The column names.
+        columns (List[List[Any]]): The values of each column.
+    """
+    import pandas as pd
+
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pa = None
+    if pa is not None:
+        try:
+            arrays = [pa.array(column) for column in columns]
+            return pa.Table.from_arrays(arrays, names=names).to_pandas()
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.debug(f"Convert result with pyarrow error: {e}")
+    df = pd.DataFrame(dict(enumerate(columns)), columns=range(len(columns)))
+    df.columns = names
+    return df
+
+
+def rows_to_df(names: List[str], rows: Sequence[Sequence[Any]]):
+    """Create a pandas DataFrame from the rows.
+
+    Args:
+        names (List[str]): The column names.
+        rows (Sequence[Sequence[Any]]): The rows.
+    """
+    columns: List[List[Any]] = [[] for _ in names]
+    for values, column in zip(zip(*rows), columns):
+        column.extend(values)
+    return columns_to_df(names, columns)
@@ -0,0 +1,277 @@
+"""Schema metadata cache for the RDBMS connectors.
+
+Reflecting the columns, indexes and comment of every table one by one costs several
+round trips per table, it is slow for the databases with thousands of tables. The
+metadata of the tables is cached here, and it can be persisted to disk so that it
+survives the restart of the server.
+
+Every table has a fingerprint computed from its DDL related metadata, so the cache
+can be refreshed incrementally: just the tables whose fingerprint changed are
+replaced.
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_CACHE_VERSION = 2
+
+
+def _to_serializable(value: Any) -> Any:
+    """Convert the reflected metadata to the JSON serializable value.
+
+    The SQLAlchemy column types are converted to their string representation.
+    """
+    if isinstance(value, dict):
+        return {str(k): _to_serializable(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return tuple(_to_serializable(v) for v in value)
+    if isinstance(value, list):
+        return [_to_serializable(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _hash_metadata(columns: List[Dict], indexes: List[Any], comment: Dict) -> str:
+    content = json.dumps(
+        {"columns": columns, "indexes": indexes, "comment": comment},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+@dataclasses.dataclass
+class TableMetadata:
+    """The metadata of a table.
+
+    The columns, indexes and comment have the same format as the results of
+    get_columns, get_indexes and get_table_comment of the connector. The schema is
+    None for the databases without schemas in the table names.
+    """
+
+    name: str
+    columns: List[Dict[str, Any]]
+    indexes: List[Any]
+    comment: Dict[str, Any]
+    fingerprint: str = ""
+    schema: Optional[str] = None
+
+    def __post_init__(self):
+        """Normalize the metadata and compute the fingerprint."""
+        self.columns = _to_serializable(self.columns or [])
+        self.indexes = _to_serializable(self.indexes or [])
+        self.comment = _to_serializable(self.comment or {"text": None})
+        if not self.fingerprint:
+            self.fingerprint = _hash_metadata(self.columns, self.indexes, self.comment)
+
+    @property
+    def key(self) -> Tuple[Optional[str], str]:
+        """Return the key of the table in the cache, the schema and the name."""
+        return self.schema, self.name
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dict."""
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TableMetadata":
+        """Create a TableMetadata from a dict.
+
+        The tuple indexes (e.g. (index_name, index_definition)) are stored as lists in
+        JSON, they are converted back to tuples.
+        """
+        indexes = [
+            tuple(index) if isinstance(index, list) else index
+            for index in data.get("indexes") or []
+        ]
+        return cls(
+            name=data["name"],
+            columns=data.get("columns") or [],
+            indexes=indexes,
+            comment=data.get("comment") or {"text": None},
+            fingerprint=data.get("fingerprint", ""),
+            schema=data.get("schema"),
+        )
+
+
+class SchemaMetadataCache:
+    """The cache of the table metadata of a database.
+
+    The tables are keyed by their schema and name, so the tables with the same name
+    in different schemas don't overwrite each other. The cache is thread safe and
+    shared by all the sessions of a connector.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, ttl: Optional[float] = None):
+        """Create a new SchemaMetadataCache.
+
+        Args:
+            cache_path (Optional[str]): The file to persist the cache, the cache is
+                just kept in memory if it is None.
+            ttl (Optional[float]): The seconds after which the whole cache should be
+                refreshed from the database, never expired if it is None.
+        """
+        self._cache_path = cache_path
+        self._ttl = ttl
+        self._tables: Dict[Tuple[Optional[str], str], TableMetadata] = {}
+        self._complete = False
+        self._updated_at: Optional[float] = None
+        self._fingerprint: Optional[str] = None
+        self._lock = threading.RLock()
+        if cache_path:
+            self._load()
+
+    @property
+    def cache_path(self) -> Optional[str]:
+        """Return the file path to persist the cache."""
+        return self._cache_path
+
+    @property
+    def complete(self) -> bool:
+        """Whether the metadata of all tables has been loaded."""
+        return self._complete
+
+    @property
+    def fingerprint(self) -> str:
+        """Return the fingerprint of the whole schema."""
+        with self._lock:
+            if self._fingerprint is None:
+                items = sorted(
+                    (t.schema or "", t.name, t.fingerprint)
+                    for t in self._tables.values()
+                )
+                content = json.dumps(items).encode("utf-8")
+                self._fingerprint = hashlib.sha1(content).hexdigest()
+            return self._fingerprint
+
+    def is_expired(self) -> bool:
+        """Whether the cache should be refreshed from the database."""
+        if self._updated_at is None:
+            return True
+        return self._ttl is not None and time.time() - self._updated_at > self._ttl
+
+    def get(
+        self, table_name: str, schema: Optional[str] = None
+    ) -> Optional[TableMetadata]:
+        """Get the metadata of the table.
+
+        Args:
+            table_name (str): The table name.
+            schema (Optional[str]): The schema of the table. If it is None and the
+                table is not cached without a schema, the table of the name in the
+                first schema by name is returned.
+        """
+        with self._lock:
+            table = self._tables.get((schema, table_name))
+            if table is not None or schema is not None:
+                return table
+            schemas = [k[0] for k in self._tables if k[1] == table_name]
+            if not schemas:
+                return None
+            return self._tables[(min(schemas, key=lambda s: s or ""), table_name)]
+
+    def keys(self) -> List[Tuple[Optional[str], str]]:
+        """Return the schemas and names of the cached tables."""
+        with self._lock:
+            return list(self._tables.keys())
+
+    def table_names(self) -> List[str]:
+        """Return the names of the cached tables."""
+        with self._lock:
+            return list(dict.fromkeys(k[1] for k in self._tables))
+
+    def put(self, table: TableMetadata) -> bool:
+        """Put the metadata of the table.
+
+        Returns:
+            bool: True if the metadata of the table is new or changed.
+        """
+        with self._lock:
+            old = self._tables.get(table.key)
+            self._tables[table.key] = table
+            changed = old is None or old.fingerprint != table.fingerprint
+            if changed:
+                self._fingerprint = None
+        return changed
+
+    def remove(self, table_name: str, schema: Optional[str] = None) -> bool:
+        """Remove the metadata of the table in the schema.
+
+        Returns:
+            bool: True if the table was cached.
+        """
+        with self._lock:
+            self._fingerprint = None
+            return self._tables.pop((schema, table_name), None) is not None
+
+    def mark_refreshed(self, complete: bool) -> None:
+        """Mark the cache as refreshed from the database.
+
+        Args:
+            complete (bool): Whether the metadata of all tables has been loaded.
+        """
+        with self._lock:
+            self._complete = complete
+            self._updated_at = time.time()
+
+    def clear(self) -> None:
+        """Clear the cache, the persisted file is removed as well."""
+        with self._lock:
+            self._tables.clear()
+            self._fingerprint = None
+            self._complete = False
+            self._updated_at = None
+        if self._cache_path and os.path.exists(self._cache_path):
+            os.remove(self._cache_path)
+
+    def save(self) -> None:
+        """Persist the cache to disk."""
+        if not self._cache_path:
+            return
+        with self._lock:
+            data = {
+                "version": _CACHE_VERSION,
+                "fingerprint": self.fingerprint,
+                "complete": self._complete,
+                "updated_at": self._updated_at,
+                "tables": [t.to_dict() for t in self._tables.values()],
+            }
+        directory = os.path.dirname(self._cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self._cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self._cache_path)
+
+    def _load(self) -> None:
+        if not self._cache_path or not os.path.exists(self._cache_path):
+            return
+        try:
+            with open(self._cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != _CACHE_VERSION:
+                return
+            tables = [TableMetadata.from_dict(t) for t in data.get("tables", [])]
+        except Exception as e:
+            logger.warning(f"Load schema cache from {self._cache_path} error: {e}")
+            return
+        self._tables = {t.key: t for t in tables}
+        self._fingerprint = None
+        if self.fingerprint != data.get("fingerprint"):
+            logger.warning(f"Schema cache {self._cache_path} is broken, ignore it")
+            self._tables = {}
+            self._fingerprint = None
+            return
+        self._complete = bool(data.get("complete"))
+        self._updated_at = data.get("updated_at")
@@ -1,10 +1,12 @@
 """
 Run unit test with command: pytest dbgpt/datasource/rdbms/tests/test_conn_sqlite.py
 """
+import asyncio
 import os
 import tempfile
 
 import pytest
+from sqlalchemy import text
 
 from dbgpt.datasource.rdbms.conn_sqlite import SQLiteConnector
 
@@ -138,3 +140,298 @@ def test_db_dir_exist_dir():
         db = SQLiteConnector.from_file_path(file_path)
         assert os.path.exists(existing_dir) == True
         assert list(db.get_table_names()) == []
+
+
+def test_lazy_reflect_tables(db):
+    db.run("CREATE TABLE test1 (id INTEGER);")
+    db.run("CREATE TABLE test2 (id INTEGER);")
+    db._sync_tables_from_db()
+    assert len(db._metadata.tables) == 0
+    assert "CREATE TABLE test1" in db.get_table_info(["test1"])
+    assert set(db._metadata.tables.keys()) == {"test1"}
+
+
+def test_new_session(db):
+    db.run("CREATE TABLE test (id INTEGER);")
+    db.run("insert into test(id) values (1)")
+    conn = db.new_session()
+    assert conn is not db
+    assert conn._engine is db._engine
+    assert conn._metadata is db._metadata
+    assert conn.session is not db.session
+    assert conn.run("select * from test") == [("id",), (1,)]
+
+
+def test_get_table_metadata(db):
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);")
+    db.run("CREATE INDEX idx_name ON test(name);")
+    table = db.get_table_metadata("test")
+    assert [c["name"] for c in table.columns] == ["id", "name"]
+    assert table.indexes == [{"name": "idx_name", "column_names": ["name"]}]
+    assert table.fingerprint
+    with pytest.raises(ValueError):
+        db.get_table_metadata("not_exist")
+
+
+def test_schema_cache_refresh_changed_tables(db):
+    db.run("CREATE TABLE a (id INTEGER);")
+    db.run("CREATE TABLE b (id INTEGER);")
+    tables = db.get_tables_metadata()
+    assert set(tables.keys()) == {"a", "b"}
+    old_fingerprint = tables["a"].fingerprint
+
+    # Run the DDL with another session, the shared cache is refreshed
+    other = db.new_session()
+    other.run("ALTER TABLE a ADD COLUMN name TEXT;")
+    table_a = db.get_table_metadata("a")
+    assert table_a.fingerprint != old_fingerprint
+    assert [c["name"] for c in table_a.columns] == ["id", "name"]
+    assert db.refresh_schema_cache() == []
+
+    other.run("DROP TABLE b;")
+    assert "b" not in db.get_table_names()
+    assert db.schema_cache.get("b") is None
+
+
+def test_schema_cache_persistence(db, tmp_path):
+    from dbgpt.datasource.rdbms.schema_cache import SchemaMetadataCache
+
+    cache_path = str(tmp_path / "schema.json")
+    db.set_schema_cache(SchemaMetadataCache(cache_path))
+    db.run("CREATE TABLE test (id INTEGER, name TEXT);")
+    table = db.get_table_metadata("test")
+
+    cache = SchemaMetadataCache(cache_path)
+    assert cache.get("test") == table
+    assert cache.fingerprint == db.schema_cache.fingerprint
+    assert not cache.is_expired()
+
+
+def test_schema_cache_tables_of_schemas(db, tmp_path):
+    from dbgpt.datasource.rdbms.schema_cache import SchemaMetadataCache, TableMetadata
+
+    def _table(schema, column):
+        return TableMetadata("orders", [{"name": column}], [], {}, schema=schema)
+
+    cache_path = str(tmp_path / "schema.json")
+    cache = SchemaMetadataCache(cache_path)
+    cache.put(_table("sales", "amount"))
+    cache.put(_table("public", "id"))
+    assert cache.get("orders", "sales").columns == [{"name": "amount"}]
+    assert cache.get("orders", "public").columns == [{"name": "id"}]
+    assert cache.get("orders").schema == "public"
+    assert cache.table_names() == ["orders"]
+    cache.save()
+    assert SchemaMetadataCache(cache_path).keys() == cache.keys()
+
+    # The table names without a schema resolve to the default schema first
+    db.run("CREATE TABLE orders (id INTEGER);")
+    db.set_schema_cache(SchemaMetadataCache())
+    loaded = {"sales.orders": _table("sales", "amount")}
+    loaded["public.orders"] = _table("public", "id")
+    db._bulk_load_table_metadata = lambda table_names=None: loaded
+    db.refresh_schema_cache()
+    assert db.get_table_metadata("orders").schema == "public"
+    db.__class__._default_schema = "sales"
+    try:
+        assert db.get_table_metadata("orders").schema == "sales"
+    finally:
+        del db.__class__._default_schema
+
+    # The tables of the other schemas are removed by a full refresh
+    del loaded["sales.orders"]
+    assert db.refresh_schema_cache() == ["orders"]
+    assert db.schema_cache.keys() == [("public", "orders")]
+
+
+def _insert_rows(db, count: int):
+    db.run("CREATE TABLE test (id INTEGER, name TEXT);")
+    db.session.execute(
+        text("INSERT INTO test VALUES (:id, :name)"),
+        [{"id": i, "name": f"name_{i}"} for i in range(count)],
+    )
+    db.session.commit()
+
+
+def test_query_stream(db):
+    _insert_rows(db, 25)
+    with db.query_stream("SELECT * FROM test", batch_size=10) as stream:
+        batches = list(stream)
+    assert stream.columns == ["id", "name"]
+    assert [len(rows) for rows in batches] == [10, 10, 5]
+    assert not stream.truncated
+
+
+def test_query_stream_limits(db):
+    _insert_rows(db, 25)
+    with db.query_stream("SELECT * FROM test", batch_size=10, max_rows=15) as stream:
+        assert len(stream.fetch_all()) == 15
+    assert stream.truncated
+
+    with db.query_stream("SELECT * FROM test", max_rows=25) as stream:
+        assert len(stream.fetch_all()) == 25
+    assert not stream.truncated
+
+    # Each row is about 8 + 6 bytes
+    with db.query_stream("SELECT * FROM test", max_bytes=100) as stream:
+        rows = stream.fetch_all()
+    assert 0 < len(rows) < 25
+    assert stream.truncated
+
+
+@pytest.mark.asyncio
+async def test_query_stream_async(db):
+    _insert_rows(db, 25)
+    stream = db.query_stream("SELECT id FROM test", batch_size=10)
+    ids = []
+    async for rows in stream:
+        ids.extend(row[0] for row in rows)
+    assert ids == list(range(25))
+
+
+def test_query_ex_and_run_to_df_with_limits(db):
+    _insert_rows(db, 25)
+    field_names, rows = db.query_ex("SELECT * FROM test", max_rows=5)
+    assert field_names == ["id", "name"]
+    assert len(rows) == 5
+
+    df = db.run_to_df("SELECT * FROM test", max_rows=20)
+    assert list(df.columns) == ["id", "name"]
+    assert len(df) == 20
+    assert df.attrs["truncated"]
+    assert df["id"].tolist() == list(range(20))
+
+    df = db.run_to_df("SELECT * FROM test WHERE id < 0")
+    assert list(df.columns) == ["id", "name"]
+    assert len(df) == 0
+
+
+def test_run_with_query_limits(db):
+    _insert_rows(db, 25)
+    assert len(db.run("SELECT * FROM test")) == 26
+
+    db.set_query_limits(max_rows=10)
+    result = db.run("SELECT * FROM test")
+    assert result[0] == ("id", "name")
+    assert [row[0] for row in result[1:]] == list(range(10))
+    # The new sessions share the limits
+    assert len(db.new_session().run("SELECT * FROM test")) == 11
+
+    db.set_query_limits(max_bytes=100)
+    assert 1 < len(db.run("SELECT * FROM test")) < 26
+    assert db.run("SELECT * FROM test WHERE id < 0") == [("id", "name")]
+
+
+_ENDLESS_SQL = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+    "SELECT count(*) FROM c"
+)
+
+
+@pytest.mark.asyncio
+async def test_arun(db):
+    _insert_rows(db, 5)
+    result = await db.arun("SELECT id FROM test ORDER BY id")
+    assert result[0] == ("id",)
+    assert [row[0] for row in result[1:]] == list(range(5))
+    field_names, rows = await db.aquery_ex("SELECT * FROM test", max_rows=2)
+    assert field_names == ["id", "name"]
+    assert len(rows) == 2
+    df = await db.arun_to_df("SELECT * FROM test")
+    assert len(df) == 5
+
+
+@pytest.mark.asyncio
+async def test_arun_timeout_cancel_query(db):
+    from dbgpt.datasource.rdbms.query_executor import QueryTimeoutError
+
+    with pytest.raises(QueryTimeoutError):
+        await db.arun(_ENDLESS_SQL, timeout=0.2)
+    # The query is interrupted in the database, the executor is available again
+    assert (await db.arun("SELECT 1", timeout=5))[1][0] == 1
+
+
+def test_query_executor_run_timeout(db):
+    from dbgpt.datasource.rdbms.query_executor import QueryTimeoutError
+
+    with pytest.raises(QueryTimeoutError):
+        db.query_executor.run(db, "run", _ENDLESS_SQL, timeout=0.2)
+    assert db.query_executor.run(db, "run", "SELECT 1", timeout=5)[1][0] == 1
+
+
+@pytest.mark.asyncio
+async def test_arun_task_cancelled(db):
+    task = asyncio.create_task(db.arun(_ENDLESS_SQL))
+    await asyncio.sleep(0.2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert (await db.arun("SELECT 1", timeout=5))[1][0] == 1
+
+
+@pytest.fixture
+def result_cache():
+    from dbgpt.storage.cache import MemoryCacheStorage, SQLResultCache
+    from dbgpt.storage.cache.manager import LocalCacheManager
+    from dbgpt.util.serialization.json_serialization import JsonSerializer
+
+    cache_manager = LocalCacheManager(None, JsonSerializer(), MemoryCacheStorage())
+    return SQLResultCache(cache_manager, "test_db")
+
+
+def test_query_result_cache(db, result_cache):
+    db.set_result_cache(result_cache)
+    _insert_rows(db, 3)
+    field_names, rows = db.query_ex("SELECT * FROM test", use_cache=True)
+    assert len(rows) == 3
+    db.session.execute(text("DELETE FROM test WHERE id = 0"))
+    db.session.commit()
+    # The write is not executed by `run`, the cached result is returned
+    field_names, cached_rows = db.query_ex("SELECT * FROM test", use_cache=True)
+    assert field_names == ["id", "name"]
+    assert [tuple(row) for row in cached_rows] == [tuple(row) for row in rows]
+    assert len(db.query_ex("SELECT * FROM test")[1]) == 2
+    df = db.run_to_df("SELECT * FROM test", use_cache=True)
+    assert len(df) == 3
+    assert list(df.columns) == ["id", "name"]
+
+
+def test_query_result_cache_invalidated(db, result_cache):
+    db.set_result_cache(result_cache)
+    _insert_rows(db, 3)
+    assert len(db.run_to_df("SELECT * FROM test", use_cache=True)) == 3
+    db.run("DELETE FROM test WHERE id = 0")
+    assert len(db.run_to_df("SELECT * FROM test", use_cache=True)) == 2
+    db.run("ALTER TABLE test ADD COLUMN age INTEGER")
+    df = db.run_to_df("SELECT * FROM test", use_cache=True)
+    assert list(df.columns) == ["id", "name", "age"]
+
+
+def test_query_result_cache_bypass(db, result_cache):
+    db.set_result_cache(result_cache)
+    _insert_rows(db, 3)
+    assert not db._is_cacheable_query("DELETE FROM test")
+    assert not db._is_cacheable_query("SELECT 1; SELECT 2")
+    assert db._is_cacheable_query("SELECT * FROM test")
+
+
+def test_sessions_return_connections(tmp_path):
+    db = SQLiteConnector.from_file_path(
+        str(tmp_path / "pool.db"),
+        engine_args={"pool_size": 2, "max_overflow": 0, "pool_timeout": 1},
+    )
+    db.run("CREATE TABLE test (id INTEGER);")
+    db.run("INSERT INTO test (id) VALUES (1)")
+
+    # More live connectors than the pool size, each ran some statements
+    conns = [db.new_session() for _ in range(5)]
+    for conn in conns:
+        assert conn.run("SELECT * FROM test") == [("id",), (1,)]
+        assert conn.query_ex("SELECT * FROM test", fetch="one") == (["id"], [1])
+        assert len(conn.run_to_df("SELECT * FROM test")) == 1
+        with conn.query_stream("SELECT * FROM test") as stream:
+            assert stream.fetch_all() == [(1,)]
+        # The override of the subclass
+        assert conn.get_fields("test")
+    assert db.new_session().run("SELECT * FROM test") == [("id",), (1,)]
+    assert db._engine.pool.checkedout() == 0
@@ -1,7 +1,8 @@
 """Base Assembler."""
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from itertools import islice
+from typing import Any, Iterator, List, Optional
 
 from dbgpt.core import Chunk
 from dbgpt.util.tracer import root_tracer
@@ -11,6 +12,9 @@ from ..extractor.base import Extractor
 from ..knowledge.base import Knowledge
 from ..retriever.base import BaseRetriever
 
+# The number of the chunks persisted at once in the streaming mode
+DEFAULT_PERSIST_BATCH_SIZE = 100
+
 
 class BaseAssembler(ABC):
     """Base Assembler."""
@@ -20,6 +24,8 @@ class BaseAssembler(ABC):
         knowledge: Knowledge,
         chunk_parameters: Optional[ChunkParameters] = None,
         extractor: Optional[Extractor] = None,
+        streaming: bool = False,
+        persist_batch_size: int = DEFAULT_PERSIST_BATCH_SIZE,
         **kwargs: Any,
     ) -> None:
         """Initialize with Assembler arguments.
@@ -29,8 +35,17 @@ class BaseAssembler(ABC):
             chunk_parameters: (Optional[ChunkParameters]) ChunkManager to use for
                 chunking.
             extractor(Optional[Extractor]):  Extractor to use for summarization.
+            streaming(bool): Whether to load and split the knowledge lazily. If
+                True, the knowledge is not loaded when the assembler is created,
+                the chunks are produced and persisted in batches of
+                `persist_batch_size` chunks, so the memory is bounded by the batch
+                size instead of the size of the knowledge.
+            persist_batch_size(int): The number of the chunks persisted at once in
+                the streaming mode.
         """
         self._knowledge = knowledge
+        self._streaming = streaming
+        self._persist_batch_size = max(1, persist_batch_size)
         self._chunk_parameters = chunk_parameters or ChunkParameters()
         self._extractor = extractor
         self._chunk_manager = ChunkManager(
@@ -49,6 +64,8 @@ class BaseAssembler(ABC):
             ),
             "chunk_parameters": self._chunk_parameters.dict(),
         }
+        if streaming:
+            return
         with root_tracer.start_span("BaseAssembler.load_knowledge", metadata=metadata):
             self.load_knowledge(self._knowledge)
 
@@ -82,5 +99,32 @@ class BaseAssembler(ABC):
         raise NotImplementedError
 
     def get_chunks(self) -> List[Chunk]:
-        """Return chunks."""
+        """Return chunks.
+
+        In the streaming mode, all the chunks are produced and returned, use
+        :meth:`iter_chunks` to consume them lazily.
+        """
+        if self._streaming:
+            return list(self.iter_chunks())
         return self._chunks
+
+    def iter_chunks(self) -> Iterator[Chunk]:
+        """Return the iterator of the chunks.
+
+        In the streaming mode, the knowledge is loaded and split lazily every time
+        it is called.
+        """
+        if not self._streaming:
+            return iter(self._chunks)
+        if not self._knowledge:
+            raise ValueError("knowledge must be provided.")
+        return self._chunk_manager.iter_split(self._knowledge.iter_load())
+
+    def iter_chunk_batches(self) -> Iterator[List[Chunk]]:
+        """Return the iterator of the chunk batches to persist."""
+        chunks = self.iter_chunks()
+        while True:
+            batch = list(islice(chunks, self._persist_batch_size))
+            if not batch:
+                return
+            yield batch
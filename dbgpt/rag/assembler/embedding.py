@@ -4,7 +4,10 @@ from typing import Any, List, Optional
 
 from dbgpt.core import Chunk, Embeddings
 
-from ...util.executor_utils import blocking_func_to_async
+from ...util.executor_utils import (
+    blocking_func_to_async,
+    blocking_func_to_async_no_executor,
+)
 from ..assembler.base import BaseAssembler
 from ..chunk_manager import ChunkParameters
 from ..index.base import IndexStoreBase
@@ -68,6 +71,7 @@ class EmbeddingAssembler(BaseAssembler):
         embedding_model: Optional[str] = None,
         embeddings: Optional[Embeddings] = None,
         retrieve_strategy: Optional[RetrieverStrategy] = RetrieverStrategy.EMBEDDING,
+        streaming: bool = False,
     ) -> "EmbeddingAssembler":
         """Load document embedding into vector store from path.
 
@@ -79,6 +83,8 @@ class EmbeddingAssembler(BaseAssembler):
             embedding_model: (Optional[str]) Embedding model to use.
             embeddings: (Optional[Embeddings]) Embeddings to use.
             retrieve_strategy: (Optional[RetrieverStrategy]) Retriever strategy.
+            streaming: (bool) Whether to load, split and persist the knowledge in
+                batches lazily.
 
         Returns:
              EmbeddingAssembler
@@ -90,6 +96,7 @@ class EmbeddingAssembler(BaseAssembler):
             embedding_model=embedding_model,
             embeddings=embeddings,
             retrieve_strategy=retrieve_strategy,
+            streaming=streaming,
         )
 
     @classmethod
@@ -100,6 +107,7 @@ class EmbeddingAssembler(BaseAssembler):
         chunk_parameters: Optional[ChunkParameters] = None,
         executor: Optional[ThreadPoolExecutor] = None,
         retrieve_strategy: Optional[RetrieverStrategy] = RetrieverStrategy.EMBEDDING,
+        streaming: bool = False,
     ) -> "EmbeddingAssembler":
         """Load document embedding into vector store from path.
 
@@ -108,38 +116,62 @@ class EmbeddingAssembler(BaseAssembler):
             chunk_parameters: (Optional[ChunkParameters]) ChunkManager to use for
                 chunking.
             index_store: (IndexStoreBase) Index store to use.
-            executor: (Optional[ThreadPoolExecutor) ThreadPoolExecutor to use.
+            executor: (Optional[ThreadPoolExecutor) ThreadPoolExecutor to use, the
+                default executor of the event loop is shared if not provided.
             retrieve_strategy: (Optional[RetrieverStrategy]) Retriever strategy.
+            streaming: (bool) Whether to load, split and persist the knowledge in
+                batches lazily.
 
         Returns:
              EmbeddingAssembler
         """
-        executor = executor or ThreadPoolExecutor()
         return await blocking_func_to_async(
-            executor,
+            executor,  # type: ignore
             cls,
             knowledge,
             index_store,
             chunk_parameters,
             retrieve_strategy,
+            streaming=streaming,
         )
 
     def persist(self, **kwargs) -> List[str]:
         """Persist chunks into store.
 
+        In the streaming mode, the chunks are persisted batch by batch as they are
+        produced.
+
         Returns:
             List[str]: List of chunk ids.
         """
-        return self._index_store.load_document(self._chunks)
+        if not self._streaming:
+            return self._index_store.load_document(self._chunks)
+        ids = []
+        for batch in self.iter_chunk_batches():
+            ids.extend(self._index_store.load_document(batch))
+        return ids
 
     async def apersist(self, **kwargs) -> List[str]:
         """Persist chunks into store.
 
+        In the streaming mode, the chunks are persisted batch by batch, each batch is
+        produced in the default executor of the event loop, so loading and
+        splitting the knowledge doesn't block the event loop.
+
         Returns:
             List[str]: List of chunk ids.
         """
-        # persist chunks into vector store
-        return await self._index_store.aload_document(self._chunks)
+        if not self._streaming:
+            # persist chunks into vector store
+            return await self._index_store.aload_document(self._chunks)
+        ids = []
+        batches = self.iter_chunk_batches()
+        while True:
+            batch = await blocking_func_to_async_no_executor(next, batches, None)
+            if batch is None:
+                break
+            ids.extend(await self._index_store.aload_document(batch))
+        return ids
 
     def _extract_info(self, chunks) -> List[Chunk]:
         """Extract info from chunks."""
@@ -0,0 +1,84 @@
+from typing import Iterator, List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from dbgpt.core import Chunk, Document
+from dbgpt.rag.assembler.embedding import EmbeddingAssembler
+from dbgpt.rag.chunk_manager import ChunkParameters
+from dbgpt.rag.index.base import IndexStoreBase
+from dbgpt.rag.knowledge.base import Knowledge, KnowledgeType
+
+
+class _LazyKnowledge(Knowledge):
+    def __init__(self, num_docs: int):
+        super().__init__()
+        self.num_docs = num_docs
+        self.loaded = 0
+
+    def _load(self) -> List[Document]:
+        return list(self._iter_load())
+
+    def _iter_load(self) -> Iterator[Document]:
+        for i in range(self.num_docs):
+            self.loaded += 1
+            yield Document(content=f"line {i}\nnext {i}", metadata={"doc": i})
+
+    @classmethod
+    def type(cls) -> KnowledgeType:
+        return KnowledgeType.TEXT
+
+
+@pytest.fixture
+def index_store():
+    store = MagicMock(spec=IndexStoreBase)
+    store.load_document.side_effect = lambda chunks: [c.chunk_id for c in chunks]
+    store.aload_document = AsyncMock(
+        side_effect=lambda chunks: [c.chunk_id for c in chunks]
+    )
+    return store
+
+
+def _create(knowledge: Knowledge, index_store) -> EmbeddingAssembler:
+    return EmbeddingAssembler(
+        knowledge=knowledge,
+        index_store=index_store,
+        chunk_parameters=ChunkParameters(
+            chunk_strategy="CHUNK_BY_SEPARATOR", separator="\n", enable_merge=False
+        ),
+        streaming=True,
+        persist_batch_size=3,
+    )
+
+
+def test_persist_in_batches(index_store):
+    knowledge = _LazyKnowledge(5)
+    assembler = _create(knowledge, index_store)
+    # The knowledge is not loaded until the chunks are persisted
+    assert knowledge.loaded == 0
+
+    ids = assembler.persist()
+    assert len(ids) == 10
+    batches = [call.args[0] for call in index_store.load_document.call_args_list]
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+    assert [c.content for c in batches[0]] == ["line 0", "next 0", "line 1"]
+    assert batches[-1][0].metadata["doc"] == 4
+
+
+def test_chunks_are_produced_lazily(index_store):
+    knowledge = _LazyKnowledge(100)
+    assembler = _create(knowledge, index_store)
+    batches = assembler.iter_chunk_batches()
+    assert len(next(batches)) == 3
+    # Only the documents of the first batch are loaded
+    assert knowledge.loaded == 2
+    assert len(assembler.get_chunks()) == 200
+
+
+@pytest.mark.asyncio
+async def test_apersist_in_batches(index_store):
+    assembler = _create(_LazyKnowledge(4), index_store)
+    ids = await assembler.apersist()
+    assert len(ids) == 8
+    assert index_store.aload_document.await_count == 3
+    index_store.load_document.assert_not_called()
@@ -1,7 +1,7 @@
 """Module for ChunkManager."""
 
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, Iterable, Iterator, List, Optional
 
 from dbgpt._private.pydantic import BaseModel, Field
 from dbgpt.core import Chunk, Document
@@ -151,6 +151,26 @@ class ChunkManager:
     def split(self, documents: List[Document]) -> List[Chunk]:
         """Split a document into chunks."""
         text_splitter = self._select_text_splitter()
+        return self._split(text_splitter, documents)
+
+    def iter_split(self, documents: Iterable[Document]) -> Iterator[Chunk]:
+        """Split the documents into chunks lazily.
+
+        The documents are split one by one and the chunks of each document are yielded
+        as soon as it is split, so the documents can be consumed from a generator like
+        :meth:`Knowledge.iter_load` without keeping them all in memory.
+
+        Args:
+            documents (Iterable[Document]): The documents.
+
+        Returns:
+            Iterator[Chunk]: The chunks of the documents.
+        """
+        text_splitter = self._select_text_splitter()
+        for document in documents:
+            yield from self._split(text_splitter, [document])
+
+    def _split(self, text_splitter: Any, documents: List[Document]) -> List[Chunk]:
         if SplitterType.LANGCHAIN == self._splitter_type:
             documents = text_splitter.split_documents(documents)
             return [Chunk.langchain2chunk(document) for document in documents]
@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 from dbgpt.core import Document
 from dbgpt.rag.text_splitter.text_splitter import (
@@ -165,6 +165,15 @@ class Knowledge(ABC):
         documents = self._load()
         return self._postprocess(documents)
 
+    def iter_load(self) -> Iterator[Document]:
+        """Load knowledge from data loader lazily.
+
+        The documents are post processed and yielded one by one, so the whole
+        knowledge is not kept in memory if the knowledge supports the lazy loading.
+        """
+        for document in self._iter_load():
+            yield from self._postprocess([document])
+
     def extract(self, documents: List[Document]) -> List[Document]:
         """Extract knowledge from text."""
         return documents
@@ -192,6 +201,14 @@ class Knowledge(ABC):
     def _load(self) -> List[Document]:
         """Preprocess knowledge from data loader."""
 
+    def _iter_load(self) -> Iterator[Document]:
+        """Preprocess knowledge from data loader lazily.
+
+        All the documents are loaded at once by default, override it to load the
+        documents one by one.
+        """
+        return iter(self._load())
+
     @classmethod
     def support_chunk_strategy(cls) -> List[ChunkStrategy]:
         """Return supported chunk strategy."""
@@ -1,6 +1,9 @@
 """CSV Knowledge."""
 import csv
-from typing import Any, Dict, List, Optional, Union
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
 
 from dbgpt.core import Document
 from dbgpt.rag.knowledge.base import (
@@ -9,6 +12,10 @@ from dbgpt.rag.knowledge.base import (
     Knowledge,
     KnowledgeType,
 )
+from dbgpt.util.pd_utils import format_text_rows
+
+# The number of the rows formatted at once when loading lazily
+_ROWS_BATCH_SIZE = 1000
 
 
 class CSVKnowledge(Knowledge):
@@ -47,38 +54,46 @@ class CSVKnowledge(Knowledge):
         """Load csv document from loader."""
         if self._loader:
             documents = self._loader.load()
-        else:
-            docs = []
-            if not self._path:
-                raise ValueError("file path is required")
-            with open(self._path, newline="", encoding=self._encoding) as csvfile:
-                csv_reader = csv.DictReader(csvfile)
-                for i, row in enumerate(csv_reader):
-                    strs = []
-                    for k, v in row.items():
-                        if k is None or v is None:
-                            continue
-                        strs.append(f"{k.strip()}: {v.strip()}")
-                    content = "\n".join(strs)
-                    try:
-                        source = (
-                            row[self._source_column]
-                            if self._source_column is not None
-                            else self._path
-                        )
-                    except KeyError:
-                        raise ValueError(
-                            f"Source column '{self._source_column}' not in CSV "
-                            f"file."
-                        )
-                    metadata = {"source": source, "row": i}
-                    if self._metadata:
-                        metadata.update(self._metadata)  # type: ignore
-                    doc = Document(content=content, metadata=metadata)
-                    docs.append(doc)
+            return [Document.langchain2doc(lc_document) for lc_document in documents]
+        return list(self._iter_load())
+
+    def _iter_load(self) -> Iterator[Document]:
+        """Load csv document row by row.
+
+        The rows are read and formatted in batches, so the whole file is not kept in
+        memory.
+        """
+        if self._loader:
+            yield from self._load()
+            return
+        if not self._path:
+            raise ValueError("file path is required")
+        with open(self._path, newline="", encoding=self._encoding) as csvfile:
+            csv_reader = csv.DictReader(csvfile)
+            i = 0
+            while True:
+                rows = list(islice(csv_reader, _ROWS_BATCH_SIZE))
+                if not rows:
+                    break
+                # Format the rows column by column, the missing cells are skipped
+                contents = format_text_rows(pd.DataFrame(rows))
+                for row, content in zip(rows, contents):
+                    yield self._row_document(row, content, i)
+                    i += 1
 
-            return docs
-        return [Document.langchain2doc(lc_document) for lc_document in documents]
+    def _row_document(self, row: Dict[str, str], content: str, i: int) -> Document:
+        try:
+            source = (
+                row[self._source_column]
+                if self._source_column is not None
+                else self._path
+            )
+        except KeyError:
+            raise ValueError(f"Source column '{self._source_column}' not in CSV file.")
+        metadata = {"source": source, "row": i}
+        if self._metadata:
+            metadata.update(self._metadata)  # type: ignore
+        return Document(content=content, metadata=metadata)
 
     @classmethod
     def support_chunk_strategy(cls) -> List[ChunkStrategy]:
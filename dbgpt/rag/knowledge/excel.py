@@ -10,6 +10,7 @@ from dbgpt.rag.knowledge.base import (
     Knowledge,
     KnowledgeType,
 )
+from dbgpt.util.pd_utils import format_text_rows
 
 
 class ExcelKnowledge(Knowledge):
@@ -57,29 +58,18 @@ class ExcelKnowledge(Knowledge):
             sheet_names = excel_file.sheet_names
             for sheet_name in sheet_names:
                 df = excel_file.parse(sheet_name)
-                for index, row in df.iterrows():
-                    strs = []
-                    for column_name, column_value in row.items():
-                        if column_name is None or column_value is None:
-                            continue
-
-                        column_name = str(column_name)
-                        column_value = str(column_value)
-                        strs.append(f"{column_name.strip()}: {column_value.strip()}")
-
-                    content = "\n".join(strs)
-                    try:
-                        source = (
-                            row[self._source_column]
-                            if self._source_column is not None
-                            else self._path
-                        )
-                    except KeyError:
+                if self._source_column is not None:
+                    if self._source_column not in df.columns:
                         raise ValueError(
-                            f"Source column '{self._source_column}' not in CSV "
+                            f"Source column '{self._source_column}' not in Excel "
                             f"file."
                         )
-
+                    sources = df[self._source_column].tolist()
+                else:
+                    sources = [self._path] * len(df)
+                # Format the rows column by column, the null cells are skipped
+                contents = format_text_rows(df)
+                for index, content, source in zip(df.index, contents, sources):
                     metadata = {"source": source, "row": index}
                     if self._metadata:
                         metadata.update(self._metadata)  # type: ignore
@@ -2,8 +2,9 @@
 import json
 import os
 import re
-from collections import defaultdict
-from typing import Any, Dict, List, Optional, Union
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Union
 from PIL import Image
 import pytesseract
 from pdf2image import convert_from_path
@@ -18,6 +19,34 @@ from dbgpt.rag.knowledge.base import (
     KnowledgeType,
 )
 
+# The documents with fewer pages are extracted in the current process
+_PARALLEL_MIN_PAGES = 16
+_DEFAULT_MAX_WORKERS = 8
+# The processors opened in the worker process, file path -> processor
+_worker_processors: Dict[str, "PDFProcessor"] = {}
+
+
+def _extract_pdf_page(
+    filepath: str, page_index: int, is_scanned_pdf: Optional[bool]
+) -> List[dict]:
+    """Extract a page in the worker process, the PDF is opened once per process."""
+    processor = _worker_processors.get(filepath)
+    if processor is None:
+        processor = PDFProcessor(filepath)
+        _worker_processors[filepath] = processor
+    processor.is_scanned_pdf = is_scanned_pdf
+    return processor.extract_page(page_index)
+
+
+def _table_to_markdown(table: List[List[str]]) -> str:
+    """Convert the table rows to markdown, the first row is the header."""
+    header = table[0]
+    markdown_output = "| " + " | ".join(header) + " |\n"
+    markdown_output += "| " + " | ".join(["---"] * len(header)) + " |\n"
+    for row in table[1:]:
+        markdown_output += "| " + " | ".join(row) + " |\n"
+    return markdown_output
+
 # PDF 知识处理类
 class PDFKnowledge(Knowledge):
     """PDF Knowledge."""
@@ -29,6 +58,7 @@ class PDFKnowledge(Knowledge):
         loader: Optional[Any] = None,
         language: Optional[str] = "zh",
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
+        max_workers: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
         """Create PDF Knowledge with Knowledge arguments.
@@ -38,6 +68,8 @@ class PDFKnowledge(Knowledge):
             knowledge_type(KnowledgeType, optional): knowledge type
             loader(Any, optional): loader
             language(str, optional): language
+            max_workers(int, optional): the maximum number of processes to extract
+                the pages, 1 to extract in the current process
         """
         super().__init__(
             path=file_path,
@@ -47,225 +79,212 @@ class PDFKnowledge(Knowledge):
             **kwargs,
         )
         self._language = language
+        self._max_workers = max_workers
         self._pdf_processor = PDFProcessor(filepath=self._path)
         self.all_title: List[dict] = []
+        self.all_table: List[dict] = []
         self.all_text: List[dict] = []
+
     # 处理文本数据，提取一级和二级标题
     def process_text_data(self):
         """Text data processing to level 1 and level 2 titles."""
         for i, data in enumerate(self.all_text):
-            # data = self.all_text[i]
-            inside_content = data.get("inside") # 获取文本内容
-            content_type = data.get("type") # 获取文本类型      
-            if content_type == "text":
-                # use regex to match the first level title
-                # 使用正则表达式匹配一级标题
-                first_level_match = re.match(
-                    r"§(\d+)+([\u4e00-\u9fa5]+)", inside_content.strip()
-                )
-                # 使用正则表达式匹配二级标题
-                second_level_match = re.match(
-                    r"(\d+\.\d+)([\u4e00-\u9fa5]+)", inside_content.strip()
+            next_data = self.all_text[i + 1] if i + 1 < len(self.all_text) else None
+            self._process_title(data, next_data)
+
+    def _process_title(self, data: dict, next_data: Optional[dict]) -> None:
+        """Extract the level 1 and level 2 title of a text row.
+
+        Args:
+            data(dict): the text row
+            next_data(dict, optional): the next row, the title number and the title
+                text may be split into two rows
+        """
+        inside_content = data.get("inside")  # 获取文本内容
+        content_type = data.get("type")  # 获取文本类型
+        if content_type != "text":
+            return
+        # use regex to match the first level title
+        # 使用正则表达式匹配一级标题
+        first_level_match = re.match(
+            r"§(\d+)+([\u4e00-\u9fa5]+)", inside_content.strip()
+        )
+        # 使用正则表达式匹配二级标题
+        second_level_match = re.match(
+            r"(\d+\.\d+)([\u4e00-\u9fa5]+)", inside_content.strip()
+        )
+        # 使用正则表达式匹配纯数字标题
+        first_num_match = re.match(r"^§(\d+)$", inside_content.strip())
+        # get all level 1 titles
+        title_name = [
+            dictionary["first_title"]
+            for dictionary in self.all_title
+            if "first_title" in dictionary
+        ]
+        if first_level_match:
+            first_title_text = first_level_match.group(2)
+            first_title_num = first_level_match.group(1)
+            first_title = first_title_num + first_title_text
+            # the title does not contain "..." and is not in the title list
+            # , add it to the title list
+            if first_title not in title_name and self._is_next_title(first_title_num):
+                current_entry = {
+                    "id": first_title_num,
+                    "first_title": first_title,
+                    "second_title": [],
+                    "table": [],
+                }
+                self.all_title.append(current_entry)
+
+        elif second_level_match:
+            second_title_name = second_level_match.group(0)
+            second_title = second_level_match.group(1)
+            first_title = second_title.split(".")[0]
+            title_index = int(first_title) - 1
+            if title_index >= len(self.all_title) or title_index < 0:
+                return
+            titles = [
+                sub_item["title"]
+                for sub_item in self.all_title[int(first_title) - 1]["second_title"]
+            ]
+            if second_title_name not in titles:
+                self.all_title[int(first_title) - 1]["second_title"].append(
+                    {"title": second_title_name, "table": []}
                 )
-                # 使用正则表达式匹配纯数字标题
-                first_num_match = re.match(r"^§(\d+)$", inside_content.strip())
-                # get all level 1 titles
-                title_name = [
-                    dictionary["first_title"]
-                    for dictionary in self.all_title
-                    if "first_title" in dictionary
-                ]
-                if first_level_match:
-                    first_title_text = first_level_match.group(2)
-                    first_title_num = first_level_match.group(1)
-                    first_title = first_title_num + first_title_text
-                    # the title does not contain "..." and is not in the title list
-                    # , add it to the title list
-                    if first_title not in title_name and (
-                        int(first_title_num) == 1
-                        or int(first_title_num) - int(self.all_title[-1]["id"]) == 1
-                    ):
-                        current_entry = {
-                            "id": first_title_num,
-                            "first_title": first_title,
-                            "second_title": [],
-                            "table": [],
-                        }
-                        self.all_title.append(current_entry)
-
-                elif second_level_match:
-                    second_title_name = second_level_match.group(0)
-                    second_title = second_level_match.group(1)
-                    first_title = second_title.split(".")[0]
-                    if (int(first_title) - 1 >= len(self.all_title)) or int(
-                        first_title
-                    ) - 1 < 0:
-                        continue
-                    else:
-                        titles = [
-                            sub_item["title"]
-                            for sub_item in self.all_title[int(first_title) - 1][
-                                "second_title"
-                            ]
-                        ]
-                        if second_title_name not in titles:
-                            self.all_title[int(first_title) - 1]["second_title"].append(
-                                {"title": second_title_name, "table": []}
-                            )
-                elif first_num_match:
-                    first_num = first_num_match.group(1)
-                    first_text = self.all_text[i + 1].get("inside")
-                    first_title = first_num_match.group(1) + first_text
-                    # if the title does not contain "..." and is not in the title list
-                    if (
-                        "..." not in first_text
-                        and first_title not in title_name
-                        and (
-                            int(first_num) == 1
-                            or int(first_num) - int(self.all_title[-1]["id"]) == 1
-                        )
-                    ):
-                        current_entry = {
-                            "id": first_num,
-                            "first_title": first_title,
-                            "second_title": [],
-                            "table": [],
-                        }
-                        self.all_title.append(current_entry)
+        elif first_num_match and next_data is not None:
+            first_num = first_num_match.group(1)
+            first_text = next_data.get("inside")
+            first_title = first_num_match.group(1) + first_text
+            # if the title does not contain "..." and is not in the title list
+            if (
+                "..." not in first_text
+                and first_title not in title_name
+                and self._is_next_title(first_num)
+            ):
+                current_entry = {
+                    "id": first_num,
+                    "first_title": first_title,
+                    "second_title": [],
+                    "table": [],
+                }
+                self.all_title.append(current_entry)
+
+    def _is_next_title(self, title_num: str) -> bool:
+        """Whether the level 1 title follows the last level 1 title."""
+        if int(title_num) == 1:
+            return True
+        return bool(self.all_title) and (
+            int(title_num) - int(self.all_title[-1]["id"]) == 1
+        )
+
     # 加载PDF文档
     def _load(self) -> List[Document]:
         """Load pdf document from loader."""
         if self._loader:
             # 使用自定义加载器
             documents = self._loader.load()
-        else:
-            # 使用默认处理流程
-            self._pdf_processor.pdf_to_json()   # 将PDF文档转换为JSON格式   
-            file_title = self.file_path.rsplit("/", 1)[-1].replace(".pdf", "")  # 获取文件名
-            self.all_text = list(self._pdf_processor.all_text.values())  # 获取所有文本
-            self.process_text_data()  # 处理文本数据
-            temp_table = []  # 临时表格
-            temp_title = None  # 临时标题
-            page_documents = []  # 页面文档
-            merged_data = {}  # type: ignore # noqa
-            for i, data in enumerate(self.all_text):
+            return [Document.langchain2doc(lc_document) for lc_document in documents]
+        return list(self._iter_load())
+
+    def _iter_load(self) -> Iterator[Document]:
+        """Load the pdf documents page by page.
+
+        The pages are extracted in parallel and reassembled in order, see
+        :meth:`PDFProcessor.iter_pages`. The text of a page is yielded as soon as
+        the page is processed, so the intermediate text of the whole PDF is never
+        kept in memory.
+
+        The tables are attached to the page of the text that follows them.
+        """
+        if self._loader:
+            yield from self._load()
+            return
+        file_title = self.file_path.rsplit("/", 1)[-1].replace(".pdf", "")  # 获取文件名
+        temp_table: List[List[str]] = []  # 临时表格
+        temp_title = None  # 临时标题
+        last_text: Optional[str] = None  # 上一个表格之后的最后一行文本
+        # The page being merged, it is yielded when the text of the next page comes
+        current: Optional[dict] = None
+        prev_data: Optional[dict] = None
+        page = None
+
+        for rows in self._pdf_processor.iter_pages(self._max_workers):
+            for data in rows:
+                if prev_data is not None:
+                    self._process_title(prev_data, data)
+                prev_data = data
                 content_type = data.get("type")
                 inside_content = data.get("inside")
                 page = data.get("page")
                 # 处理表格数据
                 if content_type == "excel":
-                    temp_table.append(inside_content)
-                    if temp_title is None:
+                    if not temp_table:
                         # 查找表格标题
-                        for j in range(i - 1, -1, -1):
-                            if self.all_text[j]["type"] == "excel":
-                                break
-                            if self.all_text[j]["type"] == "text":
-                                content = self.all_text[j]["inside"]
-                                if re.match(
-                                    r"^\d+\.\d+", content
-                                ) or content.startswith("§"):
-                                    temp_title = content.strip()
-                                    break
-                                else:
-                                    temp_title = content.strip()
-                                    break
+                        temp_title = last_text.strip() if last_text else None
+                    temp_table.append(data["cells"])
+                    last_text = None
                 elif content_type == "text":
-                    # 合并表格数据
-                    if page in merged_data:
+                    last_text = inside_content
+                    # 合并同一页的文本
+                    if current is not None and current["page"] == page:
                         # page merge
-                        # 合并同一页的文本
-                        merged_data[page]["inside_content"] += " " + inside_content
+                        current["inside_content"] += " " + inside_content
                     else:
+                        if current is not None:
+                            yield self._page_document(current, file_title)
                         # 创建新的页面数据
-                        merged_data[page] = {
+                        current = {
+                            "page": page,
                             "inside_content": inside_content,
-                            "type": "text",
+                            "markdown_output": [],
                         }
 
                     # merge excel table
                     if temp_table:
-                        table_meta = {
-                            "title": temp_title or temp_table[0],
-                            "type": "excel",
-                        }
-                        self.all_title.append(table_meta)
                         # 转换表格为markdown格式
-                        # markdown format
-                        markdown_tables = []
-                        if temp_table:
-                            header = eval(temp_table[0])
-                            markdown_tables.append(header)
-                            for entry in temp_table[1:]:
-                                row = eval(entry)
-                                markdown_tables.append(row)
-                            markdown_output = "| " + " | ".join(header) + " |\n"
-                            markdown_output += (
-                                "| " + " | ".join(["---"] * len(header)) + " |\n"
-                            )
-                            for row in markdown_tables[1:]:
-                                markdown_output += "| " + " | ".join(row) + " |\n"
-
-                            #  merged content
-                            merged_data[page]["excel_content"] = temp_table
-                            merged_data[page]["markdown_output"] = markdown_output
-
+                        current["markdown_output"].append(
+                            self._merge_table(temp_title, temp_table)
+                        )
                         temp_title = None
                         temp_table = []
+        if prev_data is not None:
+            self._process_title(prev_data, None)
 
-            # deal last excel
-            if temp_table:
-                table_meta = {
-                    "title": temp_title or temp_table[0],
-                    "table": temp_table,
-                    "type": "excel",
+        # deal last excel
+        if temp_table:
+            markdown_output = self._merge_table(temp_title, temp_table)
+            if current is not None and current["page"] == page:
+                current["markdown_output"].append(markdown_output)
+            else:
+                # No text in the page of the last table
+                if current is not None:
+                    yield self._page_document(current, file_title)
+                current = {
+                    "page": page,
+                    "inside_content": "",
+                    "markdown_output": [markdown_output],
                 }
-                self.all_title.append(table_meta)
-                # markdown format
-                markdown_tables = []
-                if temp_table:
-                    header = eval(temp_table[0])
-                    markdown_tables.append(header)
-                    for entry in temp_table[1:]:
-                        row = eval(entry)
-                        markdown_tables.append(row)
-                    markdown_output = "| " + " | ".join(header) + " |\n"
-                    markdown_output += "| " + " | ".join(["---"] * len(header)) + " |\n"
-                    for row in markdown_tables[1:]:
-                        markdown_output += "| " + " | ".join(row) + " |\n"
-                    #  merged content
-                    merged_data[page]["excel_content"] = temp_table
-                    merged_data[page]["markdown_output"] = markdown_output
-
-            for page, content in merged_data.items():
-                inside_content = content["inside_content"]
-                if "markdown_output" in content:
-                    markdown_content = content["markdown_output"]
-                    content_metadata = {
-                        "page": page,
-                        "type": "excel",
-                        "title": file_title,
-                        "source": self.file_path,
-                    }
-                    page_documents.append(
-                        Document(
-                            content=inside_content + "\n" + markdown_content,
-                            metadata=content_metadata,
-                        )
-                    )
-                else:
-                    content_metadata = {
-                        "page": page,
-                        "type": "text",
-                        "title": file_title,
-                        "source": self.file_path,
-                    }
-                    page_documents.append(
-                        Document(content=inside_content, metadata=content_metadata)
-                    )
-
-            return page_documents
-        return [Document.langchain2doc(lc_document) for lc_document in documents]
+        if current is not None:
+            yield self._page_document(current, file_title)
+
+    def _merge_table(self, title: Optional[str], table: List[List[str]]) -> str:
+        """Record the table meta and convert the table to markdown."""
+        self.all_table.append({"title": title or str(table[0]), "type": "excel"})
+        return _table_to_markdown(table)
+
+    def _page_document(self, content: dict, file_title: str) -> Document:
+        """Create the document of a page."""
+        inside_content = content["inside_content"]
+        content_metadata = {
+            "page": content["page"],
+            "type": "excel" if content["markdown_output"] else "text",
+            "title": file_title,
+            "source": self.file_path,
+        }
+        if content["markdown_output"]:
+            markdown_content = "\n".join(content["markdown_output"])
+            inside_content = inside_content + "\n" + markdown_content
+        return Document(content=inside_content, metadata=content_metadata)
 
     # 返回支持的分割策略
     @classmethod
@@ -294,7 +313,13 @@ class PDFKnowledge(Knowledge):
 
 # PDF 处理器
 class PDFProcessor:
-    """PDFProcessor class."""
+    """PDFProcessor class.
+
+    The pages are extracted independently of each other, so they can be extracted
+    in parallel by :meth:`iter_pages`. Each page is extracted into a list of rows,
+    a row is a dict with the keys "page", "allrow", "type" and "inside", and the
+    table rows ("type" is "excel") also have the cells in "cells".
+    """
     # 初始化PDF处理器
     def __init__(self, filepath):
         """Initialize PDFProcessor class."""
@@ -306,7 +331,6 @@ class PDFProcessor:
         self.pdf = pdfplumber.open(filepath)
         self.all_text = defaultdict(dict)
         self.allrow = 0
-        self.last_num = 0
 
         # 添加OCR配置
         self.tesseract_cmd = r'D:\Tesseract-OCR\tesseract.exe'
@@ -356,11 +380,18 @@ class PDFProcessor:
             logger.warning(f"OCR处理失败: {str(e)}")
             return ""
     
-    def process_scanned_page(self, page, page_number):
+    def process_scanned_page(self, page, page_number) -> List[dict]:
         """处理扫描页面."""
+        rows: List[dict] = []
         try:
-            # 将页面转换为图片
-            images = convert_from_path(self.filepath, dpi=300, poppler_path=r'E:\poppler-23.07.0\Library\bin')
+            # 只将当前页面转换为图片
+            images = convert_from_path(
+                self.filepath,
+                dpi=300,
+                first_page=page_number,
+                last_page=page_number,
+                poppler_path=r'E:\poppler-23.07.0\Library\bin',
+            )
             for i, image in enumerate(images):
                 # OCR处理
                 ocr_text = self.process_image_ocr(image)
@@ -369,18 +400,18 @@ class PDFProcessor:
                     text_lines = ocr_text.split('\n')
                     for line in text_lines:
                         if line.strip():  # 只添加非空行
-                            self.all_text[self.allrow] = {
-                                "page": page_number,
-                                "allrow": self.allrow,
-                                "type": "text",  # 使用统一的text类型
-                                "inside": line.strip(),
-                            }
-                            self.allrow += 1
+                            # 使用统一的text类型
+                            self._add_row(rows, page_number, "text", line.strip())
         except Exception as e:
             logger.error(f"扫描页面处理失败: {str(e)}")
             # 记录更详细的错误信息
             import traceback
             logger.error(f"详细错误: {traceback.format_exc()}")
+        return rows
+
+    @staticmethod
+    def _add_row(rows: List[dict], page_number: int, row_type: str, inside: str):
+        rows.append({"page": page_number, "type": row_type, "inside": inside})
 
     # 检查并处理页面中的文本行
     def check_lines(self, page, top, buttom):
@@ -439,15 +470,20 @@ class PDFProcessor:
         result = list(map(list, zip(*filtered_data)))
         return result
     # 提取文本和表格
-    def extract_text_and_tables(self, page):
-        """Extract text and tables."""
-         # 首先判断是否为扫描件
+    def extract_text_and_tables(self, page) -> List[dict]:
+        """Extract text and tables.
+
+        Returns:
+            List[dict]: The rows of the page, without the "allrow" numbers.
+        """
+        rows: List[dict] = []
+        # 首先判断是否为扫描件
         if self.is_scanned_pdf is None:
             self.is_scanned_pdf = self.is_scanned_document(page)
 
         if self.is_scanned_pdf:
             # 扫描件使用OCR处理
-            self.process_scanned_page(page, page.page_number)
+            rows = self.process_scanned_page(page, page.page_number)
         else:
             # 原有的文本和表格提取逻辑
             buttom = 0
@@ -468,13 +504,9 @@ class PDFProcessor:
                         text = self.check_lines(page, top, buttom)
                         text_list = text.split("\n")
                         for _t in range(len(text_list)):
-                            self.all_text[self.allrow] = {
-                                "page": page.page_number,
-                                "allrow": self.allrow,
-                                "type": "text",
-                                "inside": text_list[_t],
-                            }
-                            self.allrow += 1
+                            self._add_row(
+                                rows, page.page_number, "text", text_list[_t]
+                            )
                         
 
                         # process table
@@ -542,37 +574,28 @@ class PDFProcessor:
                                     end_table[i][j] = end_table[i][j - 1]
 
                         for row in end_table:
-                            self.all_text[self.allrow] = {
-                                "page": page.page_number,
-                                "allrow": self.allrow,
-                                "type": "excel",
-                                "inside": str(row),
-                            }
-                            self.allrow += 1
+                            rows.append(
+                                {
+                                    "page": page.page_number,
+                                    "type": "excel",
+                                    "inside": str(row),
+                                    "cells": row,
+                                }
+                            )
 
                         if count == 0:
                             text = self.check_lines(page, "", buttom)
                             text_list = text.split("\n")
                             for _t in range(len(text_list)):
-                                self.all_text[self.allrow] = {
-                                    "page": page.page_number,
-                                    "allrow": self.allrow,
-                                    "type": "text",
-                                    "inside": text_list[_t],
-                                }
-                                self.allrow += 1
+                                self._add_row(
+                                    rows, page.page_number, "text", text_list[_t]
+                                )
 
             else:
                 text = self.check_lines(page, "", "")
                 text_list = text.split("\n")
                 for _t in range(len(text_list)):
-                    self.all_text[self.allrow] = {
-                        "page": page.page_number,
-                        "allrow": self.allrow,
-                        "type": "text",
-                        "inside": text_list[_t],
-                    }
-                    self.allrow += 1
+                    self._add_row(rows, page.page_number, "text", text_list[_t])
 
         # # 在提取完常规文本和表格后，检查是否需要OCR处理
         # if self.use_ocr:
@@ -596,37 +619,109 @@ class PDFProcessor:
         #         logger.warning(f"页面OCR处理失败: {str(e)}")
 
         # 处理页眉和页脚
+        self._mark_header_footer(rows, page.page_number)
+        return rows
+
+    def _mark_header_footer(self, rows: List[dict], page_number: int) -> None:
+        """Mark the header and the footer rows of the page."""
         first_re = "[^计](?:报告(?:全文)?(?:（修订版）|（修订稿）|（更正后）)?)$"
-        end_re = "^(?:\d|\\|\/|第|共|页|-|_| ){1,}"
-        if self.last_num == 0:
-            try:
-                first_text = str(self.all_text[1]["inside"])
-                end_text = str(self.all_text[len(self.all_text) - 1]["inside"])
-                if re.search(first_re, first_text) and "[" not in end_text:
-                    self.all_text[1]["type"] = "页眉"
-                    if re.search(end_re, end_text) and "[" not in end_text:
-                        self.all_text[len(self.all_text) - 1]["type"] = "页脚"
-            except Exception:
-                print(page.page_number)
-        else:
+        end_re = r"^(?:\d|\|\/|第|共|页|-|_| ){1,}"
+        try:
+            first_text = str(rows[1]["inside"])
+            end_text = str(rows[-1]["inside"])
+        except IndexError:
+            logger.debug(f"{self.filepath} page {page_number} has less than 2 rows")
+            return
+        is_header = re.search(first_re, first_text) and "[" not in end_text
+        if is_header:
+            rows[1]["type"] = "页眉"
+        if page_number == 1 and not is_header:
+            # The footer of the first page is only checked with the header
+            return
+        if re.search(end_re, end_text) and "[" not in end_text:
+            rows[-1]["type"] = "页脚"
+
+    def extract_page(self, page_index: int) -> List[dict]:
+        """Extract the rows of a page, the cached layout of the page is released."""
+        page = self.pdf.pages[page_index]
+        try:
+            return self.extract_text_and_tables(page)
+        finally:
+            page.close()
+
+    def iter_pages(self, max_workers: Optional[int] = None) -> Iterator[List[dict]]:
+        """Extract the pages in parallel and yield the rows of each page in order.
+
+        The pages are extracted in a process pool, at most ``2 * max_workers`` pages
+        are in flight, so the memory is bounded however large the PDF is.
+
+        Args:
+            max_workers(int, optional): the maximum number of processes, 1 to extract
+                in the current process. Defaults to the number of CPUs (at most 8),
+                the small PDFs are always extracted in the current process.
+        """
+        page_count = len(self.pdf.pages)
+        if page_count == 0:
+            return
+        if self.is_scanned_pdf is None:
+            # Decide once for the whole document, the same as the serial extraction
+            self.is_scanned_pdf = self.is_scanned_document(self.pdf.pages[0])
+        if max_workers is None:
+            max_workers = (
+                min(os.cpu_count() or 1, _DEFAULT_MAX_WORKERS)
+                if page_count >= _PARALLEL_MIN_PAGES
+                else 1
+            )
+        max_workers = min(max_workers, page_count)
+        if max_workers <= 1:
+            for i in range(page_count):
+                rows = self.extract_page(i)
+                logger.info(f"{self.filepath} page {i} extract text success")
+                yield self._number_rows(rows)
+            return
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures: deque = deque()
+            next_page = 0
             try:
-                first_text = str(self.all_text[self.last_num + 2]["inside"])
-                end_text = str(self.all_text[len(self.all_text) - 1]["inside"])
-                if re.search(first_re, first_text) and "[" not in end_text:
-                    self.all_text[self.last_num + 2]["type"] = "页眉"
-                if re.search(end_re, end_text) and "[" not in end_text:
-                    self.all_text[len(self.all_text) - 1]["type"] = "页脚"
-            except Exception:
-                print(page.page_number)
-
-        self.last_num = len(self.all_text) - 1
-                
+                while futures or next_page < page_count:
+                    while next_page < page_count and len(futures) < max_workers * 2:
+                        future = executor.submit(
+                            _extract_pdf_page,
+                            self.filepath,
+                            next_page,
+                            self.is_scanned_pdf,
+                        )
+                        futures.append((next_page, future))
+                        next_page += 1
+                    i, future = futures.popleft()
+                    try:
+                        rows = future.result()
+                    except Exception as e:
+                        logger.warning(
+                            f"Extract {self.filepath} page {i} in process pool error:"
+                            f" {e}, extract it in the current process"
+                        )
+                        rows = self.extract_page(i)
+                    logger.info(f"{self.filepath} page {i} extract text success")
+                    yield self._number_rows(rows)
+            finally:
+                for _, future in futures:
+                    future.cancel()
+
+    def _number_rows(self, rows: List[dict]) -> List[dict]:
+        """Set the row numbers of the page in the whole document."""
+        for row in rows:
+            row["allrow"] = self.allrow
+            self.allrow += 1
+        return rows
+
     # 将PDF转换为JSON格式
-    def pdf_to_json(self):
+    def pdf_to_json(self, max_workers: Optional[int] = None):
         """Process pdf."""
-        for i in range(len(self.pdf.pages)):
-            self.extract_text_and_tables(self.pdf.pages[i])
-            logger.info(f"{self.filepath} page {i} extract text success")
+        for rows in self.iter_pages(max_workers):
+            for row in rows:
+                self.all_text[row["allrow"]] = row
 
     # 保存所有文本  
     def save_all_text(self, path):
@@ -30,3 +30,21 @@ def test_load_from_csv(mock_file_open, mock_csv_dict_reader):
     knowledge = CSVKnowledge(file_path="test_data.csv", source_column="name")
     documents = knowledge._load()
     assert len(documents) == 3
+
+
+def test_iter_load_from_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr("dbgpt.rag.knowledge.csv._ROWS_BATCH_SIZE", 2)
+    path = tmp_path / "test_data.csv"
+    path.write_text(MOCK_CSV_DATA, encoding="utf-8")
+    knowledge = CSVKnowledge(file_path=str(path), source_column="name")
+
+    documents = knowledge.iter_load()
+    first = next(documents)
+    assert first.content == "id: 1\nname: John Doe\nage: 30"
+    assert first.metadata == {"source": "John Doe", "row": 0}
+    rest = list(documents)
+    assert [doc.metadata["row"] for doc in rest] == [1, 2]
+    assert rest[-1].content == "id: 3\nname: Bob Johnson\nage: 40"
+    assert [doc.content for doc in knowledge.load()] == [first.content] + [
+        doc.content for doc in rest
+    ]
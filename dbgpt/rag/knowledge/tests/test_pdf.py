@@ -35,3 +35,96 @@ def test_load_from_pdf(mock_pdf_open_and_reader):
         assert document.metadata["type"] == "text"
 
     #
+
+
+def _make_pdf(path, pages):
+    """Write a minimal PDF with a line of text in each page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None]
+    font_id = 3
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (font_id, len(objects))
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(kids),
+        len(kids),
+    )
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(content))
+        content += b"%d 0 obj\n%s\nendobj\n" % (i + 1, obj)
+    xref = len(content)
+    content += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    content += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    content += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def test_load_pages_in_process_pool(tmp_path):
+    file_path = str(tmp_path / "manual.pdf")
+    pages = [f"Page number {i} of the manual text" for i in range(6)]
+    _make_pdf(file_path, pages)
+
+    serial = PDFKnowledge(file_path=file_path, max_workers=1)._load()
+    parallel = PDFKnowledge(file_path=file_path, max_workers=3)._load()
+
+    assert [doc.metadata["page"] for doc in parallel] == list(range(1, 7))
+    for text, document in zip(pages, parallel):
+        # The words of a line are joined without spaces
+        assert text.replace(" ", "") in document.content
+        assert document.metadata["title"] == "manual"
+    assert [doc.content for doc in parallel] == [doc.content for doc in serial]
+
+
+def _row(page, row_type, inside, cells=None):
+    row = {"page": page, "type": row_type, "inside": inside}
+    if cells is not None:
+        row["cells"] = cells
+    return row
+
+
+def test_load_tables(mock_pdf_open_and_reader):
+    pages = [
+        [
+            _row(1, "text", "Prices"),
+            _row(1, "excel", "", ["name", "price"]),
+            _row(1, "excel", "", ["a|b'), __import__('os", "1"]),
+            _row(1, "text", "Footnote"),
+            _row(1, "excel", "", ["id", "size"]),
+        ],
+        [_row(2, "excel", "", ["1", "2"]), _row(2, "text", "Next page")],
+        [_row(3, "text", "Last page"), _row(3, "excel", "", ["k", "v"])],
+    ]
+    knowledge = PDFKnowledge(file_path="test_document")
+    with patch.object(knowledge._pdf_processor, "iter_pages", return_value=iter(pages)):
+        documents = knowledge._load()
+
+    assert [doc.metadata["page"] for doc in documents] == [1, 2, 3]
+    assert documents[0].metadata["type"] == "excel"
+    assert documents[0].content == (
+        "Prices Footnote\n| name | price |\n| --- | --- |\n"
+        "| a|b'), __import__('os | 1 |\n"
+    )
+    assert (
+        documents[1].content == "Next page\n| id | size |\n| --- | --- |\n| 1 | 2 |\n"
+    )
+    assert documents[2].content == "Last page\n| k | v |\n| --- | --- |\n"
+    assert [table["title"] for table in knowledge.all_table] == [
+        "Prices",
+        "Footnote",
+        "Last page",
+    ]
@@ -1,14 +1,19 @@
 """DBSummaryClient class."""
 
 import logging
+import os
+import threading
 import traceback
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional
 
 from dbgpt._private.config import Config
 from dbgpt.component import SystemApp
-from dbgpt.configs.model_config import EMBEDDING_MODEL_CONFIG
+from dbgpt.configs.model_config import DATA_DIR, EMBEDDING_MODEL_CONFIG
+from dbgpt.core import Chunk
 from dbgpt.rag.summary.gdbms_db_summary import GdbmsSummary
 from dbgpt.rag.summary.rdbms_db_summary import RdbmsSummary
+from dbgpt.rag.summary.summary_index import SummaryIndexManifest, hash_summary
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +27,24 @@ class DBSummaryClient:
     summary into vector store), get_similar_tables method(get user query related tables
     info)
 
+    The table summaries of the datasources are indexed incrementally, the hash of
+    every indexed summary is recorded in a manifest, and only the tables whose
+    summary changed are embedded again.
+
     Args:
         system_app (SystemApp): Main System Application class that manages the
             lifecycle and registration of components..
+        max_workers (Optional[int]): The maximum number of datasources to summarize
+            concurrently.
+        manifest_path (Optional[str]): The file to record the indexed summaries.
     """
 
-    def __init__(self, system_app: SystemApp):
+    def __init__(
+        self,
+        system_app: SystemApp,
+        max_workers: Optional[int] = None,
+        manifest_path: Optional[str] = None,
+    ):
         """Create a new DBSummaryClient."""
         self.system_app = system_app
         from dbgpt.rag.embedding.embedding_factory import EmbeddingFactory
@@ -38,12 +55,24 @@ class DBSummaryClient:
         self.embeddings = embedding_factory.create(
             model_name=EMBEDDING_MODEL_CONFIG[CFG.EMBEDDING_MODEL]
         )
+        self._max_workers = max_workers or CFG.DB_SUMMARY_CONCURRENCY
+        self._manifest = SummaryIndexManifest.get_instance(
+            manifest_path or os.path.join(DATA_DIR, "db_summary_index.json")
+        )
+        self._refresh_lock = threading.Lock()
+
+    def db_summary_embedding(self, dbname, db_type, refresh_schema: bool = False):
+        """Put db profile and table profile summary into vector store.
 
-    def db_summary_embedding(self, dbname, db_type):
-        """Put db profile and table profile summary into vector store."""
+        Args:
+            dbname (str): The datasource name.
+            db_type (str): The datasource type.
+            refresh_schema (bool): Whether to refresh the cached schema of the
+                datasource before summarizing, to pick up the schema changes.
+        """
         db_summary_client = self.create_summary_client(dbname, db_type)
 
-        self.init_db_profile(db_summary_client, dbname)
+        self.init_db_profile(db_summary_client, dbname, refresh_schema=refresh_schema)
 
         logger.info("db summary embedding success")
 
@@ -67,38 +96,71 @@ class DBSummaryClient:
         ans = [d.content for d in table_docs]
         return ans
 
-    def init_db_summary(self):
-        """Initialize db summary profile."""
-        db_mange = CFG.local_db_manager
-        dbs = db_mange.get_db_list()
-        for item in dbs:
-            try:
-                self.db_summary_embedding(item["db_name"], item["db_type"])
-            except Exception as e:
-                message = traceback.format_exc()
-                logger.warn(
-                    f'{item["db_name"]}, {item["db_type"]} summary error!{str(e)}, '
-                    f"detail: {message}"
-                )
-
-    def init_db_profile(self, db_summary_client, dbname):
-        """Initialize db summary profile.
+    def init_db_summary(self, refresh_schema: bool = False):
+        """Initialize db summary profile of all datasources concurrently.
 
         Args:
-        db_summary_client(DBSummaryClient): DB Summary Client
-        dbname(str): dbname
+            refresh_schema (bool): Whether to refresh the cached schema of the
+                datasources, it is skipped if the last refresh is still running.
         """
-        vector_store_name = dbname + "_profile"
+        if not self._refresh_lock.acquire(blocking=not refresh_schema):
+            logger.info("DB summary refresh is running, skip this round")
+            return
+        try:
+            db_mange = CFG.local_db_manager
+            dbs = db_mange.get_db_list()
+            with ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="db-summary"
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        self.db_summary_embedding,
+                        item["db_name"],
+                        item["db_type"],
+                        refresh_schema,
+                    ): item
+                    for item in dbs
+                }
+                for future in as_completed(futures):
+                    item = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        message = traceback.format_exc()
+                        logger.warn(
+                            f'{item["db_name"]}, {item["db_type"]} summary error!'
+                            f"{str(e)}, detail: {message}"
+                        )
+        finally:
+            self._refresh_lock.release()
+
+    def _new_vector_connector(self, dbname: str):
         from dbgpt.serve.rag.connector import VectorStoreConnector
         from dbgpt.storage.vector_store.base import VectorStoreConfig
 
-        vector_store_config = VectorStoreConfig(name=vector_store_name)
-        vector_connector = VectorStoreConnector.from_default(
+        vector_store_config = VectorStoreConfig(name=dbname + "_profile")
+        return VectorStoreConnector.from_default(
             CFG.VECTOR_STORE_TYPE,
             self.embeddings,
             vector_store_config=vector_store_config,
         )
-        if not vector_connector.vector_name_exists():
+
+    def init_db_profile(self, db_summary_client, dbname, refresh_schema: bool = False):
+        """Initialize db summary profile.
+
+        Args:
+        db_summary_client(DBSummaryClient): DB Summary Client
+        dbname(str): dbname
+        refresh_schema(bool): Whether to refresh the cached schema first
+        """
+        vector_store_name = dbname + "_profile"
+        vector_connector = self._new_vector_connector(dbname)
+        if isinstance(db_summary_client, RdbmsSummary):
+            with self._manifest.db_lock(dbname):
+                self._sync_table_summaries(
+                    db_summary_client, dbname, vector_connector, refresh_schema
+                )
+        elif not vector_connector.vector_name_exists():
             from dbgpt.rag.assembler.db_schema import DBSchemaAssembler
 
             db_assembler = DBSchemaAssembler.load_from_connection(
@@ -112,19 +174,84 @@ class DBSummaryClient:
             logger.info(f"Vector store name {vector_store_name} exist")
         logger.info("initialize db summary profile success...")
 
+    def _sync_table_summaries(
+        self,
+        db_summary_client: RdbmsSummary,
+        dbname: str,
+        vector_connector,
+        refresh_schema: bool = False,
+    ) -> None:
+        """Index the changed table summaries and delete the dropped tables."""
+        from dbgpt.datasource.rdbms.base import RDBMSConnector
+
+        if refresh_schema and isinstance(db_summary_client.db, RDBMSConnector):
+            db_summary_client.db.refresh_schema_cache()
+        summaries = db_summary_client.table_summaries_dict()
+        indexed = self._manifest.get(dbname)
+        if indexed is None:
+            indexed = {}
+            if vector_connector.vector_name_exists():
+                # Indexed before the manifest is recorded, rebuild it
+                logger.info(f"Rebuild the table summaries of {dbname}")
+                vector_connector.truncate()
+
+        hashes = {name: hash_summary(summary) for name, summary in summaries.items()}
+        changed = [
+            name
+            for name in summaries
+            if indexed.get(name, {}).get("hash") != hashes[name]
+        ]
+        removed = [name for name in indexed if name not in summaries]
+        stale_ids = [
+            chunk_id
+            for name in changed + removed
+            for chunk_id in indexed.get(name, {}).get("ids", [])
+        ]
+        if not changed and not removed:
+            logger.info(f"Table summaries of {dbname} are up to date")
+            return
+        logger.info(
+            f"Index table summaries of {dbname}, {len(changed)} changed, "
+            f"{len(removed)} removed, {len(summaries) - len(changed)} unchanged"
+        )
+        # Forget the stale tables first, they are re-indexed next time if failed
+        self._manifest.update(dbname, {}, removed=changed + removed)
+        if stale_ids:
+            vector_connector.delete_by_ids(",".join(stale_ids))
+        chunks = [
+            Chunk(
+                content=summaries[name],
+                metadata={"source": "database", "table_name": name},
+            )
+            for name in changed
+        ]
+        ids = vector_connector.index_client.load_document_with_limit(
+            chunks,
+            max_chunks_once_load=CFG.KNOWLEDGE_MAX_CHUNKS_ONCE_LOAD,
+            max_threads=self._max_workers,
+        )
+        if len(ids) != len(chunks):
+            # Can't map the chunks to the tables, rebuild the index next time
+            logger.warning(
+                f"Got {len(ids)} ids of {len(chunks)} table summaries of {dbname}"
+            )
+            self._manifest.remove(dbname)
+            return
+        self._manifest.update(
+            dbname,
+            {
+                name: {"hash": hashes[name], "ids": [chunk_id]}
+                for name, chunk_id in zip(changed, ids)
+            },
+        )
+
     def delete_db_profile(self, dbname):
         """Delete db profile."""
         vector_store_name = dbname + "_profile"
-        from dbgpt.serve.rag.connector import VectorStoreConnector
-        from dbgpt.storage.vector_store.base import VectorStoreConfig
-
-        vector_store_config = VectorStoreConfig(name=vector_store_name)
-        vector_connector = VectorStoreConnector.from_default(
-            CFG.VECTOR_STORE_TYPE,
-            self.embeddings,
-            vector_store_config=vector_store_config,
-        )
-        vector_connector.delete_vector_name(vector_store_name)
+        vector_connector = self._new_vector_connector(dbname)
+        with self._manifest.db_lock(dbname):
+            vector_connector.delete_vector_name(vector_store_name)
+            self._manifest.remove(dbname)
         logger.info(f"delete db profile {dbname} success")
 
     @staticmethod
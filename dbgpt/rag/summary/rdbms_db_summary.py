@@ -1,9 +1,10 @@
 """Summary for rdbms database."""
 import re
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from dbgpt._private.config import Config
 from dbgpt.datasource import BaseConnector
+from dbgpt.datasource.rdbms.base import RDBMSConnector
 from dbgpt.rag.summary.db_summary import DBSummary
 
 if TYPE_CHECKING:
@@ -36,18 +37,23 @@ class RdbmsSummary(DBSummary):
         if not db_manager:
             raise ValueError("Local db manage is not initialized.")
         self.db = db_manager.get_connector(name)
-
-        self.metadata = """user info :{users}, grant info:{grant}, charset:{charset},
-        collation:{collation}""".format(
-            users=self.db.get_users(),
-            grant=self.db.get_grants(),
-            charset=self.db.get_charset(),
-            collation=self.db.get_collation(),
-        )
-        tables = self.db.get_table_names()
-        self.table_info_summaries = [
-            self.get_table_summary(table_name) for table_name in tables
-        ]
+        # The metadata and the summaries are built when they are used
+        self._metadata: Optional[str] = None
+        self._table_summaries: Optional[Dict[str, str]] = None
+
+    @property
+    def metadata(self) -> str:
+        """Return the metadata of the database."""
+        if self._metadata is None:
+            template = """user info :{users}, grant info:{grant}, charset:{charset},
+        collation:{collation}"""
+            self._metadata = template.format(
+                users=self.db.get_users(),
+                grant=self.db.get_grants(),
+                charset=self.db.get_charset(),
+                collation=self.db.get_collation(),
+            )
+        return self._metadata
 
     def get_table_summary(self, table_name):
         """Get table summary for table.
@@ -60,7 +66,15 @@ class RdbmsSummary(DBSummary):
 
     def table_summaries(self):
         """Get table summaries."""
-        return self.table_info_summaries
+        return list(self.table_summaries_dict().values())
+
+    def table_summaries_dict(self) -> Dict[str, str]:
+        """Get the summaries of the tables, keyed by the table name."""
+        if self._table_summaries is None:
+            self._table_summaries = _parse_db_table_summaries(
+                self.db, self.summary_template
+            )
+        return self._table_summaries
 
 
 def _parse_db_summary(
@@ -68,16 +82,30 @@ def _parse_db_summary(
 ) -> List[str]:
     """Get db summary for database.
 
+    Args:
+        conn (BaseConnector): database connection
+        summary_template (str): summary template
+    """
+    return list(_parse_db_table_summaries(conn, summary_template).values())
+
+
+def _parse_db_table_summaries(
+    conn: BaseConnector, summary_template: str = "{table_name}({columns})"
+) -> Dict[str, str]:
+    """Get the summaries of all tables, keyed by the table name.
+
     Args:
         conn (BaseConnector): database connection
         summary_template (str): summary template
     """
     tables = conn.get_table_names()
-    table_info_summaries = [
-        _parse_table_summary(conn, summary_template, table_name)
+    if isinstance(conn, RDBMSConnector):
+        # Load the metadata of all tables in bulk
+        conn.get_tables_metadata(tables)
+    return {
+        table_name: _parse_table_summary(conn, summary_template, table_name)
         for table_name in tables
-    ]
-    return table_info_summaries
+    }
 
 
 def _parse_table_summary(
@@ -94,8 +122,9 @@ def _parse_table_summary(
         table_name(column1(column1 comment),column2(column2 comment),
         column3(column3 comment) and index keys, and table comment: {table_comment})
     """
+    raw_columns, raw_indexes, comment = _get_table_metadata(conn, table_name)
     columns = []
-    for column in conn.get_columns(table_name):
+    for column in raw_columns:
         if column.get("comment"):
             columns.append(f"{column['name']} ({column.get('comment')})")
         else:
@@ -104,7 +133,6 @@ def _parse_table_summary(
     column_str = ", ".join(columns)
     # Obtain index information
     index_keys = []
-    raw_indexes = conn.get_indexes(table_name)
     for index in raw_indexes:
         if isinstance(index, tuple):  # Process tuple type index information
             index_name, index_creation_command = index
@@ -120,10 +148,23 @@ def _parse_table_summary(
     if len(index_keys) > 0:
         index_key_str = ", ".join(index_keys)
         table_str += f", and index keys: {index_key_str}"
+    if comment.get("text"):
+        table_str += f", and table comment: {comment.get('text')}"
+    return table_str
+
+
+def _get_table_metadata(
+    conn: BaseConnector, table_name: str
+) -> Tuple[List[Dict], List[Any], Dict]:
+    """Get the columns, indexes and comment of the table.
+
+    The metadata of the RDBMS tables is read from the schema cache of the connector.
+    """
+    if isinstance(conn, RDBMSConnector):
+        table = conn.get_table_metadata(table_name)
+        return table.columns, table.indexes, table.comment
     try:
         comment = conn.get_table_comment(table_name)
     except Exception:
         comment = dict(text=None)
-    if comment.get("text"):
-        table_str += f", and table comment: {comment.get('text')}"
-    return table_str
+    return conn.get_columns(table_name), conn.get_indexes(table_name), comment
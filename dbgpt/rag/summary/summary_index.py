@@ -0,0 +1,125 @@
+"""The index state of the table summaries of the datasources.
+
+The hash of the summary and the chunk ids of every indexed table are recorded, so
+the summaries can be re-indexed incrementally: just the tables whose summary changed
+are embedded again, and the chunks of the dropped tables are deleted.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST_VERSION = 1
+_manifests: Dict[str, "SummaryIndexManifest"] = {}
+_manifests_lock = threading.Lock()
+
+
+def hash_summary(summary: str) -> str:
+    """Return the hash of the table summary."""
+    return hashlib.sha1(summary.encode("utf-8")).hexdigest()
+
+
+class SummaryIndexManifest:
+    """The indexed table summaries of the datasources, persisted in a JSON file.
+
+    Use :meth:`get_instance` to get the manifest of a file, so that all the clients
+    in the process share the same manifest and lock.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Create a new SummaryIndexManifest.
+
+        Args:
+            path (Optional[str]): The file to persist the manifest, the manifest is
+                just kept in memory if it is None.
+        """
+        self._path = path
+        # db name -> table name -> {"hash": summary hash, "ids": chunk ids}
+        self._dbs: Dict[str, Dict[str, Dict]] = {}
+        self._lock = threading.RLock()
+        self._db_locks: Dict[str, threading.Lock] = {}
+        self._load()
+
+    @classmethod
+    def get_instance(cls, path: str) -> "SummaryIndexManifest":
+        """Get the shared manifest of the file."""
+        path = os.path.abspath(path)
+        with _manifests_lock:
+            if path not in _manifests:
+                _manifests[path] = cls(path)
+            return _manifests[path]
+
+    def db_lock(self, db_name: str) -> threading.Lock:
+        """Return the lock to index the summaries of the datasource."""
+        with self._lock:
+            if db_name not in self._db_locks:
+                self._db_locks[db_name] = threading.Lock()
+            return self._db_locks[db_name]
+
+    def get(self, db_name: str) -> Optional[Dict[str, Dict]]:
+        """Get the indexed tables of the datasource.
+
+        Returns:
+            Optional[Dict[str, Dict]]: The hash and chunk ids of the indexed tables,
+                None if the datasource is not recorded.
+        """
+        with self._lock:
+            tables = self._dbs.get(db_name)
+            return (
+                {k: dict(v) for k, v in tables.items()} if tables is not None else None
+            )
+
+    def update(
+        self,
+        db_name: str,
+        indexed: Dict[str, Dict],
+        removed: Optional[List[str]] = None,
+    ) -> None:
+        """Update the indexed tables of the datasource and persist the manifest.
+
+        Args:
+            db_name (str): The datasource name.
+            indexed (Dict[str, Dict]): The hash and chunk ids of the (re-)indexed
+                tables.
+            removed (Optional[List[str]]): The tables removed from the index.
+        """
+        with self._lock:
+            tables = self._dbs.setdefault(db_name, {})
+            tables.update(indexed)
+            for table_name in removed or []:
+                tables.pop(table_name, None)
+            self._save()
+
+    def remove(self, db_name: str) -> None:
+        """Remove the datasource from the manifest."""
+        with self._lock:
+            if self._dbs.pop(db_name, None) is not None:
+                self._save()
+
+    def _save(self) -> None:
+        if not self._path:
+            return
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self._path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": _MANIFEST_VERSION, "dbs": self._dbs}, f)
+        os.replace(tmp_path, self._path)
+
+    def _load(self) -> None:
+        if not self._path or not os.path.exists(self._path):
+            return
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Load summary index manifest {self._path} error: {e}")
+            return
+        if data.get("version") == _MANIFEST_VERSION:
+            self._dbs = data.get("dbs") or {}
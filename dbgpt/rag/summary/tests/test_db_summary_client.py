@@ -0,0 +1,99 @@
+from typing import Dict, List
+from unittest.mock import Mock
+
+import pytest
+
+from dbgpt.rag.summary.db_summary_client import DBSummaryClient
+from dbgpt.rag.summary.rdbms_db_summary import RdbmsSummary
+from dbgpt.rag.summary.summary_index import SummaryIndexManifest
+
+
+class MockConnector:
+    def __init__(self, tables: Dict[str, List[str]]):
+        self.tables = tables
+
+    def get_table_names(self):
+        return list(self.tables.keys())
+
+    def get_columns(self, table_name):
+        return [{"name": name} for name in self.tables[table_name]]
+
+    def get_indexes(self, table_name):
+        return []
+
+    def get_table_comment(self, table_name):
+        return {"text": None}
+
+
+class MockVectorConnector:
+    def __init__(self):
+        self.chunks = {}
+        self._next_id = 0
+        self.index_client = self
+
+    def vector_name_exists(self):
+        return bool(self.chunks)
+
+    def truncate(self):
+        self.chunks.clear()
+
+    def delete_vector_name(self, vector_name: str):
+        self.chunks.clear()
+
+    def delete_by_ids(self, ids: str):
+        for chunk_id in ids.split(","):
+            self.chunks.pop(chunk_id)
+
+    def load_document_with_limit(self, chunks, max_chunks_once_load, max_threads):
+        ids = []
+        for chunk in chunks:
+            self._next_id += 1
+            self.chunks[str(self._next_id)] = chunk.content
+            ids.append(str(self._next_id))
+        return ids
+
+
+@pytest.fixture
+def client(tmp_path):
+    return DBSummaryClient(
+        Mock(), manifest_path=str(tmp_path / "db_summary_index.json")
+    )
+
+
+def _sync(client, connector, vector_connector):
+    manager = Mock()
+    manager.get_connector.return_value = connector
+    summary = RdbmsSummary("test_db", "sqlite", manager=manager)
+    client._sync_table_summaries(summary, "test_db", vector_connector)
+
+
+def test_sync_table_summaries_incrementally(client, tmp_path):
+    connector = MockConnector({"user": ["id", "name"], "order": ["id"]})
+    vector_connector = MockVectorConnector()
+    _sync(client, connector, vector_connector)
+    assert sorted(vector_connector.chunks.values()) == ["order(id)", "user(id, name)"]
+
+    # Unchanged
+    vector_connector.load_document_with_limit = Mock()
+    _sync(client, connector, vector_connector)
+    vector_connector.load_document_with_limit.assert_not_called()
+    del vector_connector.load_document_with_limit
+
+    # Changed, added and dropped tables
+    connector.tables = {"user": ["id", "name", "age"], "item": ["id"]}
+    _sync(client, connector, vector_connector)
+    assert sorted(vector_connector.chunks.values()) == [
+        "item(id)",
+        "user(id, name, age)",
+    ]
+    indexed = SummaryIndexManifest(str(tmp_path / "db_summary_index.json"))
+    assert set(indexed.get("test_db").keys()) == {"user", "item"}
+
+
+def test_rebuild_without_manifest(client):
+    connector = MockConnector({"user": ["id"]})
+    vector_connector = MockVectorConnector()
+    vector_connector.chunks["legacy"] = "user(id)"
+    _sync(client, connector, vector_connector)
+    assert list(vector_connector.chunks.values()) == ["user(id)"]
+    assert "legacy" not in vector_connector.chunks
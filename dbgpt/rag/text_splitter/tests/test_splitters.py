@@ -2,6 +2,7 @@ from dbgpt.core import Chunk
 from dbgpt.rag.text_splitter.text_splitter import (
     CharacterTextSplitter,
     MarkdownHeaderTextSplitter,
+    RecursiveCharacterTextSplitter,
 )
 
 
@@ -63,3 +64,46 @@ def test_character_text_splitter_empty_doc() -> None:
     output = splitter.split_text(text)
     expected_output = ["db", "gpt"]
     assert output == expected_output
+
+
+def test_merge_splits_with_overlap() -> None:
+    """Test merging splits keeps the overlap of the previous chunk."""
+    splitter = CharacterTextSplitter(separator=" ", chunk_size=11, chunk_overlap=7)
+    splits = ["a", "bb", "ccc", "dddd", "e", "ff", "ggg"]
+    output = splitter._merge_splits(splits, separator=" ")
+    assert output == ["a bb ccc", "bb ccc dddd", "dddd e ff", "e ff ggg"]
+
+
+def test_recursive_character_text_splitter() -> None:
+    """Test splitting the long pieces with the next separators."""
+    text = "aaa bbb\nccc ddd eee\n\nfff"
+    splitter = RecursiveCharacterTextSplitter(
+        separators=["\n\n", "\n", " "], chunk_size=8, chunk_overlap=0
+    )
+    output = splitter.split_text(text)
+    assert output == ["aaa bbb", "ccc ddd", "eee", "fff"]
+
+
+def test_recursive_character_text_splitter_unsplittable() -> None:
+    """Test the pieces which can't be split anymore are kept."""
+    splitter = RecursiveCharacterTextSplitter(
+        separators=["\n", " "], chunk_size=3, chunk_overlap=0
+    )
+    assert splitter.split_text("abcdef gh") == ["abcdef", "gh"]
+
+
+def test_md_header_text_splitter_aggregates_lines() -> None:
+    """Test the lines with the same headers are aggregated into one chunk."""
+    markdown_document = "# dbgpt\n\nline 1\n\nline 2\n\n# rag\n\nline 3"
+    markdown_splitter = MarkdownHeaderTextSplitter(
+        headers_to_split_on=[("#", "Header 1")]
+    )
+    output = markdown_splitter.split_text(markdown_document)
+    assert [chunk.content for chunk in output] == [
+        '"dbgpt": line 1  \nline 2',
+        '"rag": line 3',
+    ]
+    assert [chunk.metadata for chunk in output] == [
+        {"Header 1": "dbgpt"},
+        {"Header 1": "rag"},
+    ]
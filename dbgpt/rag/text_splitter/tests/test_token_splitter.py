@@ -0,0 +1,150 @@
+import pytest
+import tiktoken
+
+from dbgpt.rag.text_splitter.text_splitter import CharacterTextSplitter
+from dbgpt.rag.text_splitter.token_splitter import TokenTextSplitter
+from dbgpt.rag.text_splitter.token_utils import (
+    CharTokenOffsets,
+    TokenLengthFunction,
+    TokenOffsets,
+)
+from dbgpt.util.global_helper import globals_helper
+
+_TEXT = (
+    "the data model of the knowledge graph.\n"
+    "the vector index of the chunks, 向量索引 and the table schema.\n"
+) * 20
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    """A small byte-level BPE encoding, so the tests don't download the gpt2."""
+    ranks = {bytes([i]): i for i in range(256)}
+    for merge in [b"th", b"the", b" t", b" the", b"at", b"ata", b" d", b" data"]:
+        ranks[merge] = len(ranks)
+    enc = tiktoken.Encoding(
+        name="test_bytes",
+        pat_str=r" ?\w+| ?[^\w\s]+|\s+",
+        mergeable_ranks=ranks,
+        special_tokens={},
+    )
+    monkeypatch.setattr(globals_helper, "_encoding", enc)
+    monkeypatch.setattr(globals_helper, "_tokenizer", None)
+    return enc
+
+
+@pytest.fixture
+def gpt2_like_encoding(monkeypatch):
+    """A byte-level BPE encoding with the pre-tokenization pattern of the gpt2."""
+    ranks = {bytes([i]): i for i in range(256)}
+    merges = [b"th", b"the", b"sc", b"sch", b"he", b"ma", b"hema", b"schema"]
+    merges += [b"at", b"ata", b"gr", b"ap", b"aph", b"in", b"de", b"ex", b"dex"]
+    merges += [b" t", b" the", b" d", b" data"]
+    for merge in merges:
+        ranks[merge] = len(ranks)
+    enc = tiktoken.Encoding(
+        name="test_gpt2_like",
+        pat_str=r"""'(?:[sdmt]|ll|ve|re)| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+"""
+        r"""|\s+(?!\S)|\s+""",
+        mergeable_ranks=ranks,
+        special_tokens={},
+    )
+    monkeypatch.setattr(globals_helper, "_encoding", enc)
+    monkeypatch.setattr(globals_helper, "_tokenizer", None)
+    return enc
+
+
+@pytest.mark.parametrize("tokenizer", [False, True])
+def test_token_splitter_splits_tokens(gpt2_like_encoding, tokenizer) -> None:
+    text = "theschemadatagraphindex" * 2
+    kwargs = {"tokenizer": gpt2_like_encoding.encode} if tokenizer else {}
+
+    # The pieces of the split tokens are not repeated without the overlap
+    chunks = TokenTextSplitter(chunk_size=4, chunk_overlap=0, **kwargs).split_text(text)
+    assert "".join(chunks) == text
+
+    for chunk_size, chunk_overlap in [(4, 0), (4, 2), (5, 1), (7, 3), (16, 4)]:
+        splitter = TokenTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap, **kwargs
+        )
+        for t in [text, _TEXT]:
+            chunks = splitter.split_text(t)
+            for chunk in chunks:
+                assert len(gpt2_like_encoding.encode(chunk)) <= chunk_size
+            if not chunk_overlap:
+                # The chunks are stripped
+                assert "".join("".join(chunks).split()) == "".join(t.split())
+
+
+def test_token_offsets(encoding) -> None:
+    offsets = TokenOffsets(_TEXT)
+    total = len(encoding.encode(_TEXT))
+    size = TokenOffsets.unit_length(_TEXT)
+    assert offsets.count(0, size) == total
+    middle = TokenOffsets.unit_length(_TEXT[: len(_TEXT) // 3])
+    assert offsets.count(0, middle) + offsets.count(middle, size) == total
+    # The token split by the ranges is counted in both
+    assert offsets.count(0, 1) + offsets.count(1, size) == total + 1
+    assert offsets.count(1, 1) == 0
+
+    chars = CharTokenOffsets(_TEXT, chars_per_token=4)
+    assert chars.count(0, 10) + chars.count(10, 21) == 5
+
+
+def test_token_splitter_counts_from_offsets(encoding) -> None:
+    splitter = TokenTextSplitter(chunk_size=30, chunk_overlap=5)
+    assert splitter.tokenizer is None
+    # Tokenize each piece by the tokenizer
+    legacy = TokenTextSplitter(
+        chunk_size=30, chunk_overlap=5, tokenizer=encoding.encode
+    )
+
+    chunks = splitter.split_text(_TEXT)
+    assert chunks == legacy.split_text(_TEXT)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(encoding.encode(chunk)) <= 30
+    assert splitter.split_text("") == []
+
+
+def test_token_splitter_default_tokenizer(encoding) -> None:
+    # The cached tokenizer is counted from the offsets too
+    splitter = TokenTextSplitter(tokenizer=globals_helper.tokenizer)
+    assert splitter.tokenizer is None
+    assert splitter.split_text_metadata_aware("the data", "the") == ["the data"]
+
+
+def test_token_splitter_fast_mode() -> None:
+    splitter = TokenTextSplitter(chunk_size=20, chunk_overlap=0, fast=True)
+    chunks = splitter.split_text(_TEXT)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        # A token is estimated every 4 characters
+        assert len(chunk) < (20 + 1) * 4
+
+
+def test_token_length_function_batch() -> None:
+    calls = []
+
+    def tokenizer(text):
+        calls.append(text)
+        return text.split()
+
+    length_function = TokenLengthFunction(tokenizer=tokenizer)
+    assert length_function.batch(["a b", "c", "a b"]) == [2, 1, 2]
+    assert length_function("a b") == 2
+    assert sorted(calls) == ["a b", "c"]
+
+    splitter = CharacterTextSplitter(
+        separator="\n", chunk_size=20, chunk_overlap=0, length_function=length_function
+    )
+    reference = CharacterTextSplitter(
+        separator="\n",
+        chunk_size=20,
+        chunk_overlap=0,
+        length_function=lambda text: len(text.split()),
+    )
+    assert splitter.split_text(_TEXT) == reference.split_text(_TEXT)
+
+    fast = TokenLengthFunction(fast=True, chars_per_token=4)
+    assert fast.batch(["abcde", ""]) == [2, 0]
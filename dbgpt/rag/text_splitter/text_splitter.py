@@ -3,7 +3,21 @@
 import copy
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Iterable, List, Optional, TypedDict, Union, cast
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+)
 
 from dbgpt.core import Chunk, Document
 from dbgpt.core.awel.flow import Parameter, ResourceCategory, register_resource
@@ -96,6 +110,25 @@ class TextSplitter(ABC):
     ) -> List[str]:
         # We now want to combine these smaller pieces into medium size
         # chunks to send to the LLM.
+        return self._merge_pieces(
+            cast(Iterable[str], splits), separator, chunk_size, chunk_overlap
+        )
+
+    def _merge_pieces(
+        self,
+        pieces: Iterable[str],
+        separator: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+    ) -> List[str]:
+        """Merge the pieces into chunks with a sliding window.
+
+        The window is a deque and the length of each piece is computed once, so the
+        merging is linear in the number of pieces. If the length function has a
+        ``batch`` method (like
+        :class:`~dbgpt.rag.text_splitter.token_utils.TokenLengthFunction`), the
+        lengths of all the pieces are computed in one batch.
+        """
         if chunk_size is None:
             chunk_size = self._chunk_size
         if chunk_overlap is None:
@@ -103,13 +136,19 @@ class TextSplitter(ABC):
         if separator is None:
             separator = self._separator
         separator_len = self._length_function(separator)
+        lengths: Optional[Iterator[int]] = None
+        batch = getattr(self._length_function, "batch", None)
+        if batch is not None:
+            pieces = list(pieces)
+            lengths = iter(batch(pieces))
 
         docs = []
-        current_doc: List[str] = []
+        # The pieces in the window and their lengths
+        current_doc: Deque[str] = deque()
+        current_lens: Deque[int] = deque()
         total = 0
-        for s in splits:
-            d = cast(str, s)
-            _len = self._length_function(d)
+        for d in pieces:
+            _len = next(lengths) if lengths is not None else self._length_function(d)
             if (
                 total + _len + (separator_len if len(current_doc) > 0 else 0)
                 > chunk_size
@@ -120,7 +159,7 @@ class TextSplitter(ABC):
                         f"which is longer than the specified {chunk_size}"
                     )
                 if len(current_doc) > 0:
-                    doc = self._join_docs(current_doc, separator)
+                    doc = self._join_docs(list(current_doc), separator)
                     if doc is not None:
                         docs.append(doc)
                     # Keep on popping if:
@@ -131,13 +170,14 @@ class TextSplitter(ABC):
                         > chunk_size
                         and total > 0
                     ):
-                        total -= self._length_function(current_doc[0]) + (
-                            separator_len if len(current_doc) > 1 else 0
+                        current_doc.popleft()
+                        total -= current_lens.popleft() + (
+                            separator_len if len(current_doc) > 0 else 0
                         )
-                        current_doc = current_doc[1:]
             current_doc.append(d)
+            current_lens.append(_len)
             total += _len + (separator_len if len(current_doc) > 1 else 0)
-        doc = self._join_docs(current_doc, separator)
+        doc = self._join_docs(list(current_doc), separator)
         if doc is not None:
             docs.append(doc)
         return docs
@@ -289,15 +329,26 @@ class RecursiveCharacterTextSplitter(TextSplitter):
         self, text: str, separator: Optional[str] = None, **kwargs
     ) -> List[str]:
         """Split incoming text and return chunks."""
+        return self._split_text(text, self._separators, **kwargs)
+
+    def _split_text(self, text: str, separators: List[str], **kwargs) -> List[str]:
+        """Split the text with the first separator found in it.
+
+        The pieces don't contain the separators before the found one, so they are
+        split recursively with just the remaining separators, the text is not
+        scanned again for the separators not found.
+        """
         final_chunks = []
         # Get appropriate separator to use
-        separator = self._separators[-1]
-        for _s in self._separators:
+        separator = separators[-1]
+        remaining: List[str] = []
+        for i, _s in enumerate(separators):
             if _s == "":
                 separator = _s
                 break
             if _s in text:
                 separator = _s
+                remaining = separators[i + 1 :]
                 break
         # Now that we have the separator, split the text
         if separator:
@@ -307,7 +358,7 @@ class RecursiveCharacterTextSplitter(TextSplitter):
         # Now go merging things, recursively splitting longer texts.
         _good_splits = []
         for s in splits:
-            if self._length_function(s) < self._chunk_size:
+            if self._length_function(s) < self._chunk_size or not remaining:
                 _good_splits.append(s)
             else:
                 if _good_splits:
@@ -319,7 +370,7 @@ class RecursiveCharacterTextSplitter(TextSplitter):
                     )
                     final_chunks.extend(merged_text)
                     _good_splits = []
-                other_info = self.split_text(s)
+                other_info = self._split_text(s, remaining)
                 final_chunks.extend(other_info)
         if _good_splits:
             merged_text = self._merge_splits(
@@ -512,26 +563,26 @@ class MarkdownHeaderTextSplitter(TextSplitter):
         Args:
             lines: Line of text / associated header metadata
         """
-        aggregated_chunks: List[LineType] = []
+        # The metadata and the contents of the lines of each chunk, the contents are
+        # joined once instead of concatenating the text line by line
+        aggregated_chunks: List[Tuple[Dict[str, str], List[str]]] = []
 
         for line in lines:
-            if (
-                aggregated_chunks
-                and aggregated_chunks[-1]["metadata"] == line["metadata"]
-            ):
+            if aggregated_chunks and aggregated_chunks[-1][0] == line["metadata"]:
                 # If the last line in the aggregated list
                 # has the same metadata as the current line,
                 # append the current content to the last lines's content
-                aggregated_chunks[-1]["content"] += "  \n" + line["content"]
+                aggregated_chunks[-1][1].append(line["content"])
             else:
                 # Otherwise, append the current line to the aggregated list
                 subtitles = "-".join((list(line["metadata"].values())))
-                line["content"] = f'"{subtitles}": ' + line["content"]
-                aggregated_chunks.append(line)
+                aggregated_chunks.append(
+                    (line["metadata"], [f'"{subtitles}": ' + line["content"]])
+                )
 
         return [
-            Chunk(content=chunk["content"], metadata=chunk["metadata"])
-            for chunk in aggregated_chunks
+            Chunk(content="  \n".join(contents), metadata=metadata)
+            for metadata, contents in aggregated_chunks
         ]
 
     def split_text(  # type: ignore
@@ -691,58 +742,19 @@ class MarkdownHeaderTextSplitter(TextSplitter):
     ) -> List[str]:
         # We now want to combine these smaller pieces into medium size
         # chunks to send to the LLM.
-        if chunk_size is None:
-            chunk_size = self._chunk_size
-        if chunk_overlap is None:
-            chunk_overlap = self._chunk_overlap
         if separator is None:
             separator = self._separator
-        separator_len = self._length_function(separator)
 
-        docs = []
-        current_doc: List[str] = []
-        total = 0
-        for _doc in documents:
-            dict_doc = cast(dict, _doc)
-            if dict_doc["metadata"] != {}:
-                head = sorted(
-                    dict_doc["metadata"].items(), key=lambda x: x[0], reverse=True
-                )[0][1]
-                d = head + separator + dict_doc["page_content"]
-            else:
-                d = dict_doc["page_content"]
-            _len = self._length_function(d)
-            if (
-                total + _len + (separator_len if len(current_doc) > 0 else 0)
-                > chunk_size
-            ):
-                if total > chunk_size:
-                    logger.warning(
-                        f"Created a chunk of size {total}, "
-                        f"which is longer than the specified {chunk_size}"
-                    )
-                if len(current_doc) > 0:
-                    doc = self._join_docs(current_doc, separator)
-                    if doc is not None:
-                        docs.append(doc)
-                    # Keep on popping if:
-                    # - we have a larger chunk than in the chunk overlap
-                    # - or if we still have any chunks and the length is long
-                    while total > chunk_overlap or (
-                        total + _len + (separator_len if len(current_doc) > 0 else 0)
-                        > chunk_size
-                        and total > 0
-                    ):
-                        total -= self._length_function(current_doc[0]) + (
-                            separator_len if len(current_doc) > 1 else 0
-                        )
-                        current_doc = current_doc[1:]
-            current_doc.append(d)
-            total += _len + (separator_len if len(current_doc) > 1 else 0)
-        doc = self._join_docs(current_doc, separator)
-        if doc is not None:
-            docs.append(doc)
-        return docs
+        def _pieces():
+            for _doc in documents:
+                dict_doc = cast(dict, _doc)
+                if dict_doc["metadata"] != {}:
+                    head = max(dict_doc["metadata"].items(), key=lambda x: x[0])[1]
+                    yield head + separator + dict_doc["page_content"]
+                else:
+                    yield dict_doc["page_content"]
+
+        return self._merge_pieces(_pieces(), separator, chunk_size, chunk_overlap)
 
     def run(
         self,
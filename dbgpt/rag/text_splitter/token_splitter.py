@@ -1,10 +1,13 @@
 """Token splitter."""
-from typing import Callable, List, Optional
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple, Union
 
 from dbgpt._private.pydantic import BaseModel, Field, PrivateAttr
 from dbgpt.util.global_helper import globals_helper
 from dbgpt.util.splitter_utils import split_by_char, split_by_sep
 
+from .token_utils import DEFAULT_CHARS_PER_TOKEN, CharTokenOffsets, TokenOffsets
+
 DEFAULT_METADATA_FORMAT_LEN = 2
 DEFAULT_CHUNK_OVERLAP = 20
 DEFAULT_CHUNK_SIZE = 1024
@@ -29,11 +32,21 @@ class TokenTextSplitter(BaseModel):
     # callback_manager: CallbackManager = Field(
     #     default_factory=CallbackManager, exclude=True
     # )
-    tokenizer: Callable = Field(
-        default_factory=globals_helper.tokenizer,  # type: ignore
-        description="Tokenizer for splitting words into tokens.",
+    tokenizer: Optional[Callable] = Field(
+        default=None,
+        description="Tokenizer for splitting words into tokens, the text is "
+        "tokenized once by the cached gpt2 encoding if not provided.",
         exclude=True,
     )
+    fast: bool = Field(
+        default=False,
+        description="Estimate the tokens by the characters instead of the "
+        "tokenization.",
+    )
+    chars_per_token: float = Field(
+        default=DEFAULT_CHARS_PER_TOKEN,
+        description="The average number of characters of a token in the fast mode.",
+    )
 
     _split_fns: List[Callable] = PrivateAttr()
 
@@ -45,8 +58,25 @@ class TokenTextSplitter(BaseModel):
         # callback_manager: Optional[CallbackManager] = None,
         separator: str = " ",
         backup_separators=None,
+        fast: bool = False,
+        chars_per_token: float = DEFAULT_CHARS_PER_TOKEN,
     ):
-        """Initialize with parameters."""
+        """Initialize with parameters.
+
+        Args:
+            chunk_size (int): The token chunk size for each chunk.
+            chunk_overlap (int): The token overlap of each chunk when splitting.
+            tokenizer (Optional[Callable]): The tokenizer, each piece of the text is
+                tokenized by it. If not provided, the text is tokenized once by the
+                cached gpt2 encoding, and the tokens of the pieces are counted from
+                the token offsets.
+            separator (str): The separator for splitting into words.
+            backup_separators (Optional[List[str]]): The additional separators.
+            fast (bool): Estimate the tokens by the characters instead of the
+                tokenization.
+            chars_per_token (float): The average number of characters of a token
+                in the fast mode.
+        """
         if backup_separators is None:
             backup_separators = ["\n"]
         if chunk_overlap > chunk_size:
@@ -55,7 +85,9 @@ class TokenTextSplitter(BaseModel):
                 f"({chunk_size}), should be smaller."
             )
         # callback_manager = callback_manager or CallbackManager([])
-        tokenizer = tokenizer or globals_helper.tokenizer
+        if tokenizer is globals_helper._tokenizer:
+            # The tokens of the default tokenizer are counted from the offsets
+            tokenizer = None
 
         all_seps = [separator] + (backup_separators or [])
 
@@ -66,6 +98,8 @@ class TokenTextSplitter(BaseModel):
             backup_separators=backup_separators,
             # callback_manager=callback_manager,
             tokenizer=tokenizer,
+            fast=fast,
+            chars_per_token=chars_per_token,
         )
         self._split_fns = [split_by_sep(sep) for sep in all_seps] + [split_by_char()]
 
@@ -76,7 +110,7 @@ class TokenTextSplitter(BaseModel):
 
     def split_text_metadata_aware(self, text: str, metadata_str: str) -> List[str]:
         """Split text into chunks, reserving space required for metadata str."""
-        metadata_len = len(self.tokenizer(metadata_str)) + DEFAULT_METADATA_FORMAT_LEN
+        metadata_len = self._count_tokens(metadata_str) + DEFAULT_METADATA_FORMAT_LEN
         effective_chunk_size = self.chunk_size - metadata_len
         if effective_chunk_size <= 0:
             raise ValueError(
@@ -99,16 +133,40 @@ class TokenTextSplitter(BaseModel):
         """Split text into chunks."""
         return self._split_text(text, chunk_size=self.chunk_size)
 
+    def _count_tokens(self, text: str) -> int:
+        if self.fast:
+            return CharTokenOffsets(text, self.chars_per_token).count(0, len(text))
+        if self.tokenizer is not None:
+            return len(self.tokenizer(text))
+        return len(globals_helper.tokenizer(text))
+
     def _split_text(self, text: str, chunk_size: int) -> List[str]:
         """Split text into chunks up to chunk_size."""
         if text == "":
             return []
 
-        splits = self._split(text, chunk_size)
-        chunks = self._merge(splits, chunk_size)
+        counter: _Counter
+        if self.fast:
+            counter = CharTokenOffsets(text, self.chars_per_token)
+        elif self.tokenizer is not None:
+            counter = _TokenizerCounter(text, self.tokenizer)
+        else:
+            # Tokenize the text once
+            counter = TokenOffsets(text)
+        splits = self._split(text, 0, counter.unit_length(text), chunk_size, counter)
+        # The estimated tokens are not counted again
+        count = None if self.fast else self._count_tokens
+        chunks = self._merge(splits, chunk_size, count)
         return chunks
 
-    def _split(self, text: str, chunk_size: int) -> List[str]:
+    def _split(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        chunk_size: int,
+        counter: "_Counter",
+    ) -> List[Tuple[str, int]]:
         """Break text into splits that are smaller than chunk size.
 
         The order of splitting is:
@@ -116,27 +174,45 @@ class TokenTextSplitter(BaseModel):
         2. split by backup separators (if any)
         3. split by characters
 
-        NOTE: the splits contain the separators.
+        NOTE: the splits contain the separators, so the splits are contiguous and
+        the tokens of each split are counted from its offsets in the whole text.
+
+        Returns:
+            List[Tuple[str, int]]: The splits and their numbers of tokens.
         """
-        if len(self.tokenizer(text)) <= chunk_size:
-            return [text]
+        text_len = counter.count(start, end)
+        if text_len <= chunk_size:
+            return [(text, text_len)]
 
         for split_fn in self._split_fns:
             splits = split_fn(text)
             if len(splits) > 1:
                 break
+        else:
+            # Can't split anymore
+            return [(text, text_len)]
 
         new_splits = []
+        split_start = start
         for split in splits:
-            split_len = len(self.tokenizer(split))
+            split_end = split_start + counter.unit_length(split)
+            split_len = counter.count(split_start, split_end)
             if split_len <= chunk_size:
-                new_splits.append(split)
+                new_splits.append((split, split_len))
             else:
                 # recursively split
-                new_splits.extend(self._split(split, chunk_size=chunk_size))
+                new_splits.extend(
+                    self._split(split, split_start, split_end, chunk_size, counter)
+                )
+            split_start = split_end
         return new_splits
 
-    def _merge(self, splits: List[str], chunk_size: int) -> List[str]:
+    def _merge(
+        self,
+        splits: List[Tuple[str, int]],
+        chunk_size: int,
+        count: Optional[Callable[[str], int]] = None,
+    ) -> List[str]:
         """Merge splits into chunks.
 
         The high-level idea is to keep adding splits to a chunk until we
@@ -144,14 +220,24 @@ class TokenTextSplitter(BaseModel):
 
         When we start a new chunk, we pop off the first element of the previous
         chunk until the total length is less than the chunk size.
+
+        The tokens of the splits are counted separately, a chunk may have more
+        tokens when it is tokenized as a whole. So each chunk is counted again by
+        `count` if provided, and its last splits are moved to the next chunk until
+        it fits the chunk size.
         """
         chunks: List[str] = []
 
-        cur_chunk: List[str] = []
+        cur_chunk: Deque[Tuple[str, int]] = deque()
         cur_len = 0
-        for split in splits:
-            split_len = len(self.tokenizer(split))
-            if split_len > chunk_size:
+        # The number of the splits overlapped with the previous chunk
+        overlapped = 0
+        # The splits to merge in reverse order, the sentinel ends the last chunk
+        pending: List[Tuple[Optional[str], int]] = [(None, chunk_size + 1)]
+        pending.extend(reversed(splits))
+        while pending:
+            split, split_len = pending.pop()
+            if split_len > chunk_size and split is not None:
                 print(
                     f"Got a split of size {split_len}, ",
                     f"larger than chunk size {chunk_size}.",
@@ -161,7 +247,18 @@ class TokenTextSplitter(BaseModel):
             # we need to end the current chunk and start a new one
             if cur_len + split_len > chunk_size:
                 # end the previous chunk
-                chunk = "".join(cur_chunk).strip()
+                chunk = "".join(s for s, _ in cur_chunk).strip()
+                while count and len(cur_chunk) > 1 and count(chunk) > chunk_size:
+                    if len(cur_chunk) > overlapped + 1:
+                        # move the last split to the next chunk
+                        pending.append((split, split_len))
+                        split, split_len = cur_chunk.pop()
+                        cur_len -= split_len
+                    else:
+                        # drop the overlap, the chunk has a new split at least
+                        cur_len -= cur_chunk.popleft()[1]
+                        overlapped -= 1
+                    chunk = "".join(s for s, _ in cur_chunk).strip()
                 if chunk:
                     chunks.append(chunk)
 
@@ -169,17 +266,38 @@ class TokenTextSplitter(BaseModel):
                 # keep popping off the first element of the previous chunk until:
                 #   1. the current chunk length is less than chunk overlap
                 #   2. the total length is less than chunk size
-                while cur_len > self.chunk_overlap or cur_len + split_len > chunk_size:
+                #   3. the first element has tokens, the splits without tokens
+                #      are not repeated in the next chunk
+                while cur_chunk and (
+                    cur_len > self.chunk_overlap
+                    or cur_len + split_len > chunk_size
+                    or cur_chunk[0][1] == 0
+                ):
                     # pop off the first element
-                    first_chunk = cur_chunk.pop(0)
-                    cur_len -= len(self.tokenizer(first_chunk))
+                    cur_len -= cur_chunk.popleft()[1]
+                overlapped = len(cur_chunk)
 
-            cur_chunk.append(split)
+            if split is None:
+                break
+            cur_chunk.append((split, split_len))
             cur_len += split_len
 
-        # handle the last chunk
-        chunk = "".join(cur_chunk).strip()
-        if chunk:
-            chunks.append(chunk)
-
         return chunks
+
+
+class _TokenizerCounter:
+    """Count the tokens of the ranges of the text with the tokenizer."""
+
+    def __init__(self, text: str, tokenizer: Callable):
+        self._text = text
+        self._tokenizer = tokenizer
+
+    @staticmethod
+    def unit_length(text: str) -> int:
+        return len(text)
+
+    def count(self, start: int, end: int) -> int:
+        return len(self._tokenizer(self._text[start:end]))
+
+
+_Counter = Union[TokenOffsets, CharTokenOffsets, _TokenizerCounter]
@@ -0,0 +1,142 @@
+"""Token counting for the token-aware text splitting.
+
+A text is tokenized once, and the number of tokens of any range of it is computed
+from the token offsets with a binary search, instead of tokenizing every split piece
+of the text again.
+"""
+
+import bisect
+import math
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from dbgpt.util.global_helper import globals_helper
+
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+
+class TokenOffsets:
+    """The token offsets of a text tokenized by a tiktoken encoding.
+
+    The offsets are in UTF-8 bytes, a token is counted in every range its bytes
+    overlap. So a non-empty range has at least one token, and a token split by
+    adjacent ranges is counted in each of them, the counts of the ranges add up to no
+    less than the tokens of the text.
+    """
+
+    def __init__(self, text: str, encoding: Optional[Any] = None):
+        """Tokenize the text.
+
+        Args:
+            text (str): The text.
+            encoding (Optional[Any]): The tiktoken encoding, the cached gpt2
+                encoding is used if not provided.
+        """
+        encoding = encoding or globals_helper.encoding
+        tokens = encoding.encode(text, allowed_special="all")
+        ends = list(accumulate(map(len, encoding.decode_tokens_bytes(tokens))))
+        self._starts = [0] + ends[:-1] if ends else []
+        self._ends = ends
+
+    @staticmethod
+    def unit_length(text: str) -> int:
+        """Return the length of the text in the unit of the offsets."""
+        return len(text.encode("utf-8"))
+
+    def count(self, start: int, end: int) -> int:
+        """Return the number of the tokens overlapping the range [start, end)."""
+        if start >= end:
+            return 0
+        return bisect.bisect_left(self._starts, end) - bisect.bisect_right(
+            self._ends, start
+        )
+
+
+class CharTokenOffsets:
+    """The estimated token offsets of a text, a token every few characters.
+
+    It is much faster than the real tokenization, for the cases the exact token count
+    is not required.
+    """
+
+    def __init__(self, text: str, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN):
+        """Create a new CharTokenOffsets.
+
+        Args:
+            text (str): The text.
+            chars_per_token (float): The average number of characters of a token.
+        """
+        self._chars_per_token = chars_per_token
+
+    @staticmethod
+    def unit_length(text: str) -> int:
+        """Return the length of the text in the unit of the offsets."""
+        return len(text)
+
+    def count(self, start: int, end: int) -> int:
+        """Return the estimated number of the tokens in the range [start, end)."""
+        return math.floor(end / self._chars_per_token) - math.floor(
+            start / self._chars_per_token
+        )
+
+
+class TokenLengthFunction:
+    """The token length function for the `length_function` of the text splitters.
+
+    The texts are tokenized in batches with the cached tokenizer when the splitters
+    call :meth:`batch`, and the lengths are memoized.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Optional[Callable[[str], List]] = None,
+        encoding: Optional[Any] = None,
+        fast: bool = False,
+        chars_per_token: float = DEFAULT_CHARS_PER_TOKEN,
+        cache_size: int = 10000,
+    ):
+        """Create a new TokenLengthFunction.
+
+        Args:
+            tokenizer (Optional[Callable[[str], List]]): The tokenizer, the texts are
+                tokenized one by one with it.
+            encoding (Optional[Any]): The tiktoken encoding to tokenize the texts in
+                batches, the cached gpt2 encoding is used if neither the tokenizer
+                nor the encoding is provided.
+            fast (bool): Estimate the tokens by the characters instead of the
+                tokenization.
+            chars_per_token (float): The average number of characters of a token
+                in the fast mode.
+            cache_size (int): The maximum number of the memoized lengths.
+        """
+        self._tokenizer = tokenizer
+        self._encoding = encoding
+        self._fast = fast
+        self._chars_per_token = chars_per_token
+        self._cache_size = cache_size
+        self._cache: Dict[str, int] = {}
+
+    def __call__(self, text: str) -> int:
+        """Return the number of the tokens of the text."""
+        return self.batch([text])[0]
+
+    def batch(self, texts: Sequence[str]) -> List[int]:
+        """Return the numbers of the tokens of the texts."""
+        if self._fast:
+            return [math.ceil(len(text) / self._chars_per_token) for text in texts]
+        missing = list({text for text in texts if text not in self._cache})
+        if missing:
+            if len(self._cache) + len(missing) > self._cache_size:
+                self._cache.clear()
+            for text, length in zip(missing, self._tokenize(missing)):
+                self._cache[text] = length
+        return [self._cache[text] for text in texts]
+
+    def _tokenize(self, texts: List[str]) -> List[int]:
+        if self._tokenizer is not None:
+            return [len(self._tokenizer(text)) for text in texts]
+        encoding = self._encoding or globals_helper.encoding
+        return [
+            len(tokens)
+            for tokens in encoding.encode_batch(texts, allowed_special="all")
+        ]
@@ -1,6 +1,5 @@
 """GraphExtractor class."""
 
-import asyncio
 import logging
 import re
 from typing import Dict, List, Optional
@@ -84,41 +83,24 @@ class GraphExtractor(LLMExtractor):
         # 1. Load chunk context
         text_context_map = await self.aload_chunk_context(texts)
 
-        # Pre-allocate results list to maintain order
-        graphs_list: List[List[Graph]] = [None] * len(texts)
-
-        n_texts = len(texts)
-
-        for batch_idx in range(0, n_texts, batch_size):
-            start_idx = batch_idx
-            end_idx = min(start_idx + batch_size, n_texts)
-            batch_texts = texts[start_idx:end_idx]
-
-            # 2. Create tasks with their original indices
-            extraction_tasks = [
-                (
-                    idx,
-                    self._extract(text, text_context_map[text], limit),
-                )
-                for idx, text in enumerate(batch_texts, start=start_idx)
-            ]
-
-            # 3. Process extraction in parallel while keeping track of indices
-            batch_results = await asyncio.gather(
-                *(task for _, task in extraction_tasks), return_exceptions=True
+        # 2. Extract in a sliding window, the results keep the order of the texts
+        try:
+            graphs_list: List[List[Graph]] = await self._run_concurrently(
+                [
+                    lambda text=text: self._extract(text, text_context_map[text], limit)
+                    for text in texts
+                ],
+                batch_size,
             )
-
-            # 4. Place results in the correct positions
-            for (idx, _), graphs in zip(extraction_tasks, batch_results):
-                if isinstance(graphs, Exception):
-                    raise RuntimeError(f"Failed to extract graph: {graphs}")
-                if not isinstance(graphs, list) or not all(
-                    isinstance(g, Graph) for g in graphs
-                ):
-                    raise RuntimeError(f"Invalid graph extraction result: {graphs}")
-                graphs_list[idx] = graphs
-
-        assert all(x is not None for x in graphs_list), "All positions should be filled"
+        except Exception as e:
+            raise RuntimeError(f"Failed to extract graph: {e}") from e
+
+        # 3. Check the results
+        for graphs in graphs_list:
+            if not isinstance(graphs, list) or not all(
+                isinstance(g, Graph) for g in graphs
+            ):
+                raise RuntimeError(f"Invalid graph extraction result: {graphs}")
         return graphs_list
 
     def _parse_response(self, text: str, limit: Optional[int] = None) -> List[Graph]:
@@ -3,22 +3,71 @@
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, List, Optional
 
 from dbgpt.core import HumanPromptTemplate, LLMClient, ModelMessage, ModelRequest
 from dbgpt.rag.transformer.base import ExtractorBase
+from dbgpt.storage.cache.extraction_cache import ExtractionResultCache
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_RETRIES = 2
+
 
 class LLMExtractor(ExtractorBase, ABC):
-    """LLMExtractor class."""
+    """LLMExtractor class.
+
+    The texts of :meth:`batch_extract` are extracted by a sliding window of
+    concurrent LLM calls, a call is started as soon as any running call finishes.
+    Each call is retried on errors and timeouts, and the responses are cached by the
+    text, the prompt template and the model if an extraction cache is provided.
+    """
 
-    def __init__(self, llm_client: LLMClient, model_name: str, prompt_template: str):
-        """Initialize the LLMExtractor."""
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        model_name: str,
+        prompt_template: str,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: Optional[float] = None,
+        extraction_cache: Optional[ExtractionResultCache] = None,
+    ):
+        """Initialize the LLMExtractor.
+
+        Args:
+            llm_client (LLMClient): The LLM client.
+            model_name (str): The model name, the first available model is used if
+                not provided.
+            prompt_template (str): The prompt template of the extraction.
+            max_retries (int): The max number of retries of a failed extraction.
+            timeout (Optional[float]): The timeout in seconds of an LLM call, no
+                timeout if it is None.
+            extraction_cache (Optional[ExtractionResultCache]): The cache of the LLM
+                responses, no cache if it is None.
+        """
         self._llm_client = llm_client
         self._model_name = model_name
         self._prompt_template = prompt_template
+        self._max_retries = max_retries
+        self._timeout = timeout
+        self._extraction_cache = extraction_cache
+
+    def set_extraction_options(
+        self,
+        max_retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        extraction_cache: Optional[ExtractionResultCache] = None,
+    ) -> None:
+        """Set the retry, timeout and cache options of the extraction.
+
+        The options not provided are kept unchanged.
+        """
+        if max_retries is not None:
+            self._max_retries = max_retries
+        if timeout is not None:
+            self._timeout = timeout
+        if extraction_cache is not None:
+            self._extraction_cache = extraction_cache
 
     async def extract(self, text: str, limit: Optional[int] = None) -> List:
         """Extract by LLM."""
@@ -30,38 +79,50 @@ class LLMExtractor(ExtractorBase, ABC):
         batch_size: int = 1,
         limit: Optional[int] = None,
     ) -> List:
-        """Batch extract by LLM."""
-        if batch_size < 1:
-            raise ValueError("batch_size >= 1")
+        """Batch extract by LLM.
+
+        Args:
+            texts (List[str]): The texts to extract from.
+            batch_size (int): The max number of the concurrent extractions.
+            limit (Optional[int]): The max number of the results of each text.
+
+        Returns:
+            List: The results in the same order as the texts.
+        """
+        return await self._run_concurrently(
+            [lambda text=text: self._extract(text, None, limit) for text in texts],
+            batch_size,
+        )
 
-        results = []
+    @staticmethod
+    async def _run_concurrently(
+        tasks: List[Callable[[], Awaitable[Any]]], concurrency: int
+    ) -> List:
+        """Run the tasks with a bounded concurrency, keep the order of the results.
 
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i : i + batch_size]
+        The first error cancels the remaining tasks and is raised.
+        """
+        if concurrency < 1:
+            raise ValueError("batch_size >= 1")
 
-            # Create tasks for current batch
-            extraction_tasks = [
-                self._extract(text, None, limit) for text in batch_texts
-            ]
+        semaphore = asyncio.Semaphore(concurrency)
 
-            # Execute batch concurrently and wait for all to complete
-            batch_results = await asyncio.gather(*extraction_tasks)
-            results.extend(batch_results)
+        async def run(task: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                return await task()
 
-        return results
+        futures = [asyncio.ensure_future(run(task)) for task in tasks]
+        try:
+            return await asyncio.gather(*futures)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
 
     async def _extract(
-        self, text: str, history: str = None, limit: Optional[int] = None
+        self, text: str, history: Optional[str] = None, limit: Optional[int] = None
     ) -> List:
         """Inner extract by LLM."""
-        template = HumanPromptTemplate.from_template(self._prompt_template)
-
-        messages = (
-            template.format_messages(text=text, history=history)
-            if history is not None
-            else template.format_messages(text=text)
-        )
-
         # use default model if needed
         if not self._model_name:
             models = await self._llm_client.models()
@@ -70,18 +131,59 @@ class LLMExtractor(ExtractorBase, ABC):
             self._model_name = models[0].model
             logger.info(f"Using model {self._model_name} to extract")
 
+        if limit and limit < 1:
+            ValueError("optional argument limit >= 1")
+
+        cache = self._extraction_cache
+        if cache:
+            cached = await cache.get(text, self._prompt_template, self._model_name)
+            if cached is not None:
+                return self._parse_response(cached, limit)
+
+        template = HumanPromptTemplate.from_template(self._prompt_template)
+        messages = (
+            template.format_messages(text=text, history=history)
+            if history is not None
+            else template.format_messages(text=text)
+        )
         model_messages = ModelMessage.from_base_messages(messages)
         request = ModelRequest(model=self._model_name, messages=model_messages)
-        response = await self._llm_client.generate(request=request)
 
-        if not response.success:
+        for attempt in range(self._max_retries + 1):
+            last_attempt = attempt == self._max_retries
+            try:
+                response = await asyncio.wait_for(
+                    self._llm_client.generate(request=request), self._timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"request llm timeout after {self._timeout}s, "
+                    f"attempt {attempt + 1}/{self._max_retries + 1}"
+                )
+                if last_attempt:
+                    raise
+                continue
+            except Exception as e:
+                logger.warning(
+                    f"request llm error: {e}, "
+                    f"attempt {attempt + 1}/{self._max_retries + 1}"
+                )
+                if last_attempt:
+                    raise
+                continue
+
+            if response.success:
+                break
             code = str(response.error_code)
             reason = response.text
             logger.error(f"request llm failed ({code}) {reason}")
-            return []
+            if last_attempt:
+                return []
 
-        if limit and limit < 1:
-            ValueError("optional argument limit >= 1")
+        if cache:
+            await cache.set(
+                text, self._prompt_template, self._model_name, response.text
+            )
         return self._parse_response(response.text, limit)
 
     def truncate(self):
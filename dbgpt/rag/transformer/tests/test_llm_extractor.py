@@ -0,0 +1,113 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from dbgpt.core import ModelOutput
+from dbgpt.storage.cache.extraction_cache import ExtractionResultCache
+from dbgpt.storage.cache.manager import LocalCacheManager
+from dbgpt.storage.cache.storage.base import MemoryCacheStorage
+from dbgpt.util.serialization.json_serialization import JsonSerializer
+
+from ..keyword_extractor import KeywordExtractor
+
+
+class _LLMClient:
+    """The LLM client returns the text of the prompt after the delay."""
+
+    def __init__(self, delays=None, failures=0):
+        self.delays = delays or {}
+        self.failures = failures
+        self.calls = []
+        self.finished = []
+        self.running = 0
+        self.max_running = 0
+
+    async def generate(self, request):
+        text = request.messages[-1].content.rsplit("Text: ", 1)[1].split("\n")[0]
+        self.calls.append(text)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays.get(text, 0.01))
+        finally:
+            self.running -= 1
+            self.finished.append(text)
+        if self.failures > 0:
+            self.failures -= 1
+            return ModelOutput(text="error", error_code=1)
+        return ModelOutput(text=text, error_code=0)
+
+
+@pytest.fixture
+def extraction_cache():
+    cache_manager = LocalCacheManager(None, JsonSerializer(), MemoryCacheStorage())
+    return ExtractionResultCache(cache_manager)
+
+
+@pytest.mark.asyncio
+async def test_batch_extract_in_sliding_window():
+    # The slow text does not block the others
+    llm_client = _LLMClient(delays={"a": 0.2})
+    extractor = KeywordExtractor(llm_client, "test_model")
+    texts = ["a", "b", "c", "d", "e"]
+    results = await extractor.batch_extract(texts, batch_size=2)
+    assert results == [[t] for t in texts]
+    assert llm_client.max_running == 2
+    assert llm_client.finished[-1] == "a"
+
+    with pytest.raises(ValueError):
+        await extractor.batch_extract(texts, batch_size=0)
+
+
+@pytest.mark.asyncio
+async def test_extract_retry_and_timeout():
+    llm_client = _LLMClient(failures=2)
+    extractor = KeywordExtractor(llm_client, "test_model")
+    assert await extractor.extract("a") == ["a"]
+    assert llm_client.calls == ["a", "a", "a"]
+
+    llm_client = _LLMClient(failures=3)
+    extractor = KeywordExtractor(llm_client, "test_model")
+    assert await extractor.extract("a") == []
+
+    llm_client = _LLMClient(delays={"a": 1})
+    extractor = KeywordExtractor(llm_client, "test_model")
+    extractor.set_extraction_options(max_retries=1, timeout=0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        await extractor.extract("a")
+    assert llm_client.calls == ["a", "a"]
+
+
+@pytest.mark.asyncio
+async def test_extract_with_cache(extraction_cache):
+    llm_client = _LLMClient()
+    extractor = KeywordExtractor(llm_client, "test_model")
+    extractor.set_extraction_options(extraction_cache=extraction_cache)
+    assert await extractor.batch_extract(["a", "b"], batch_size=2) == [["a"], ["b"]]
+    assert await extractor.batch_extract(["a", "b", "c"]) == [["a"], ["b"], ["c"]]
+    assert sorted(llm_client.calls) == ["a", "b", "c"]
+
+    # The cache key contains the model and the prompt
+    other_model = KeywordExtractor(llm_client, "other_model")
+    other_model.set_extraction_options(extraction_cache=extraction_cache)
+    await other_model.extract("a")
+    assert len(llm_client.calls) == 4
+
+    # The failed responses are not cached
+    llm_client.failures = 3
+    other_model.set_extraction_options(max_retries=0)
+    assert await other_model.extract("d") == []
+    assert await other_model.extract("d") == []
+    assert llm_client.calls[-2:] == ["d", "d"]
+    assert await extraction_cache.get("d", "prompt", "other_model") is None
+
+
+@pytest.mark.asyncio
+async def test_extraction_cache_errors_are_ignored():
+    cache_manager = MagicMock()
+    cache_manager.sync_get.side_effect = RuntimeError("broken")
+    cache_manager.sync_set.side_effect = RuntimeError("broken")
+    extraction_cache = ExtractionResultCache(cache_manager)
+    assert await extraction_cache.get("a", "prompt", "model") is None
+    assert not await extraction_cache.set("a", "prompt", "model", "response")
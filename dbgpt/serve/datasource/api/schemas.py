@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from dbgpt._private.pydantic import BaseModel, ConfigDict, Field
 
@@ -18,6 +18,11 @@ class DatasourceServeRequest(BaseModel):
     db_user: str = Field("", description="Database user.")
     db_pwd: str = Field("", description="Database password.")
     comment: str = Field("", description="Comment for the database.")
+    ext_config: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Extended config of the database, e.g. the connection pool "
+        "settings pool_size, max_overflow and pool_recycle.",
+    )
 
 
 class DatasourceServeResponse(BaseModel):
@@ -37,3 +42,8 @@ class DatasourceServeResponse(BaseModel):
     db_user: str = Field("", description="Database user.")
     db_pwd: str = Field("", description="Database password.")
     comment: str = Field("", description="Comment for the database.")
+    ext_config: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Extended config of the database, e.g. the connection pool "
+        "settings pool_size, max_overflow and pool_recycle.",
+    )
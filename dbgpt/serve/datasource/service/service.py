@@ -13,10 +13,8 @@ from dbgpt.datasource.manages.connect_config_db import (
     ConnectConfigEntity,
 )
 from dbgpt.serve.core import BaseService
-from dbgpt.serve.rag.connector import VectorStoreConnector
 from dbgpt.storage.metadata import BaseDao
 from dbgpt.storage.schema import DBType
-from dbgpt.storage.vector_store.base import VectorStoreConfig
 from dbgpt.util.executor_utils import ExecutorFactory
 
 from ..api.schemas import DatasourceServeRequest, DatasourceServeResponse
@@ -42,7 +40,6 @@ class Service(
         self._dao: ConnectConfigDao = dao
         self._dag_manager: Optional[DAGManager] = None
         self._db_summary_client = None
-        self._vector_connector = None
 
         super().__init__(system_app)
 
@@ -163,14 +160,11 @@ class Service(
             DatasourceServeResponse: The data after deletion
         """
         db_config = self._dao.get_one({"id": datasource_id})
-        vector_name = db_config.db_name + "_profile"
-        vector_store_config = VectorStoreConfig(name=vector_name)
-        self._vector_connector = VectorStoreConnector(
-            vector_store_type=CFG.VECTOR_STORE_TYPE,
-            vector_store_config=vector_store_config,
-        )
-        self._vector_connector.delete_vector_name(vector_name)
         if db_config:
+            # Delete the profile with its indexed summaries, the datasource added
+            # again with the same name is embedded from scratch
+            self._db_summary_client.delete_db_profile(db_config.db_name)
+            CFG.local_db_manager.invalidate_connector(db_config.db_name)
             self._dao.delete({"id": datasource_id})
         return db_config
 
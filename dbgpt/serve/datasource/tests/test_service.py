@@ -0,0 +1,50 @@
+from unittest.mock import Mock
+
+import pytest
+
+from dbgpt.component import SystemApp
+from dbgpt.rag.summary.db_summary_client import DBSummaryClient
+from dbgpt.rag.summary.tests.test_db_summary_client import (
+    MockConnector,
+    MockVectorConnector,
+    _sync,
+)
+from dbgpt.serve.core.tests.conftest import system_app
+
+from ..service.service import CFG, Service
+
+
+@pytest.fixture
+def summary_client(tmp_path):
+    client = DBSummaryClient(
+        Mock(), manifest_path=str(tmp_path / "db_summary_index.json")
+    )
+    client.vector_connector = MockVectorConnector()
+    client._new_vector_connector = lambda dbname: client.vector_connector
+    return client
+
+
+@pytest.fixture
+def service(system_app: SystemApp, summary_client, monkeypatch):
+    monkeypatch.setattr(type(CFG), "local_db_manager", Mock())
+    dao = Mock()
+    dao.get_one.return_value = Mock(db_name="test_db")
+    instance = Service(system_app, dao=dao)
+    instance._db_summary_client = summary_client
+    return instance
+
+
+def test_delete_and_add_again(service: Service, summary_client):
+    connector = MockConnector({"user": ["id", "name"]})
+    vector_connector = summary_client.vector_connector
+    _sync(summary_client, connector, vector_connector)
+    assert list(vector_connector.chunks.values()) == ["user(id, name)"]
+
+    service.delete("1")
+    assert not vector_connector.chunks
+    assert summary_client._manifest.get("test_db") is None
+    service._dao.delete.assert_called_once_with({"id": "1"})
+
+    # The datasource added again with the same name is embedded again
+    _sync(summary_client, connector, vector_connector)
+    assert list(vector_connector.chunks.values()) == ["user(id, name)"]
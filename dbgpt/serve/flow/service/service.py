@@ -91,6 +91,10 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         schedule.every(self._serve_config.load_dbgpts_interval).seconds.do(
             self.load_dag_from_dbgpts
         )
+        # Pick up the new, changed and removed DAG files in the DAG directories
+        schedule.every(self._serve_config.load_dbgpts_interval).seconds.do(
+            self.dag_manager.reload_dags
+        )
 
     @property
     def dao(self) -> BaseDao[ServeEntity, ServeRequest, ServerResponse]:
@@ -562,11 +566,11 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         if not flow:
             raise HTTPException(status_code=404, detail=f"Flow {flow_uid} not found")
         dag_id = flow.dag_id
-        if not dag_id or dag_id not in self.dag_manager.dag_map:
+        dag = self.dag_manager.get_dag(dag_id) if dag_id else None
+        if not dag:
             raise HTTPException(
                 status_code=404, detail=f"Flow {flow_uid}'s dag id not found"
             )
-        dag = self.dag_manager.dag_map[dag_id]
         # if (
         #     flow.flow_category != FlowCategory.CHAT_FLOW
         #     and self._parse_flow_category(dag) != FlowCategory.CHAT_FLOW
@@ -15,10 +15,12 @@ from fastapi.security.http import HTTPAuthorizationCredentials, HTTPBearer
 
 from dbgpt.component import SystemApp
 from dbgpt.rag.chunk_manager import ChunkParameters
-from dbgpt.serve.core import Result
+from dbgpt.serve.core import Result, blocking_func_to_async
 from dbgpt.serve.rag.api.schemas import (
+    ChunkCursorResponse,
     DocumentServeRequest,
     DocumentServeResponse,
+    DocumentSyncProgressResponse,
     KnowledgeRetrieveRequest,
     KnowledgeSyncRequest,
     SpaceServeRequest,
@@ -292,6 +294,40 @@ async def query_page(
     return Result.succ(service.get_document_list({}, page, page_size))
 
 
+@router.get(
+    "/documents/{document_id}/chunks",
+    dependencies=[Depends(check_api_key)],
+    response_model=Result[ChunkCursorResponse],
+)
+async def query_document_chunks(
+    document_id: int,
+    after_id: Optional[int] = Query(
+        default=None, description="The id of the last chunk of the previous page"
+    ),
+    page_size: int = Query(default=20, ge=1, le=1000, description="page size"),
+    service: Service = Depends(get_service),
+) -> Result[ChunkCursorResponse]:
+    """Query the chunks of the document page by page
+
+    Args:
+        document_id (int): The document id
+        after_id (Optional[int]): The next_after_id of the previous page
+        page_size (int): The page size
+        service (Service): The service
+    Returns:
+        ServerResponse: The response
+    """
+    return Result.succ(
+        await blocking_func_to_async(
+            global_system_app,
+            service.get_chunk_list_after,
+            document_id,
+            after_id,
+            page_size,
+        )
+    )
+
+
 @router.post("/documents/chunks/add")
 async def add_documents_chunks(
     doc_name: str = Form(...),
@@ -314,7 +350,7 @@ async def sync_documents(
     Returns:
         ServerResponse: The response
     """
-    return Result.succ(service.sync_document(requests))
+    return Result.succ(await service.sync_document(requests))
 
 
 @router.post("/documents/batch_sync")
@@ -330,7 +366,7 @@ async def sync_documents(
     Returns:
         ServerResponse: The response
     """
-    return Result.succ(service.sync_document(requests))
+    return Result.succ(await service.sync_document(requests))
 
 
 @router.post("/documents/{document_id}/sync")
@@ -350,7 +386,33 @@ async def sync_document(
     request.doc_id = document_id
     if request.chunk_parameters is None:
         request.chunk_parameters = ChunkParameters(chunk_strategy="Automatic")
-    return Result.succ(service.sync_document([request]))
+    return Result.succ(await service.sync_document([request]))
+
+
+@router.get(
+    "/documents/{document_id}/sync_progress",
+    dependencies=[Depends(check_api_key)],
+    response_model=Result[DocumentSyncProgressResponse],
+)
+async def document_sync_progress(
+    document_id: int, service: Service = Depends(get_service)
+) -> Result[DocumentSyncProgressResponse]:
+    """Get the sync progress of the document
+
+    Args:
+        document_id (int): The document id
+        service (Service): The service
+    Returns:
+        ServerResponse: The response
+    """
+    progress = await blocking_func_to_async(
+        global_system_app, service.get_document_sync_progress, document_id
+    )
+    if progress is None:
+        raise HTTPException(
+            status_code=404, detail=f"Document {document_id} is not synced"
+        )
+    return Result.succ(progress)
 
 
 @router.delete(
@@ -74,6 +74,8 @@ class DocumentServeResponse(BaseModel):
     chunk_size: Optional[int] = Field(None, description="chunk size")
     """questions: questions"""
     questions: Optional[str] = Field(None, description="questions")
+    """content_hash: the hash of the document content"""
+    content_hash: Optional[str] = Field(None, description="content hash")
 
 
 class ChunkServeRequest(BaseModel):
@@ -84,6 +86,8 @@ class ChunkServeRequest(BaseModel):
     content: Optional[str] = Field(None, description="chunk content")
     meta_info: Optional[str] = Field(None, description="chunk meta info")
     questions: Optional[List[str]] = Field(None, description="chunk questions")
+    content_hash: Optional[str] = Field(None, description="chunk content hash")
+    vector_id: Optional[str] = Field(None, description="chunk vector id")
     gmt_created: Optional[str] = Field(None, description="chunk create time")
     gmt_modified: Optional[str] = Field(None, description="chunk modify time")
 
@@ -96,6 +100,37 @@ class ChunkServeResponse(BaseModel):
     content: Optional[str] = Field(None, description="chunk content")
     meta_info: Optional[str] = Field(None, description="chunk meta info")
     questions: Optional[str] = Field(None, description="chunk questions")
+    content_hash: Optional[str] = Field(None, description="chunk content hash")
+    vector_id: Optional[str] = Field(None, description="chunk vector id")
+
+
+class ChunkCursorResponse(BaseModel):
+    """A page of the chunks by the keyset pagination"""
+
+    items: List[ChunkServeResponse] = Field(
+        default_factory=list, description="The chunks"
+    )
+    next_after_id: Optional[int] = Field(
+        None,
+        description="The after_id to query the next page, None if it is the last "
+        "page",
+    )
+
+
+class DocumentSyncProgressResponse(BaseModel):
+    """The sync progress of a document"""
+
+    doc_id: int = Field(..., description="The doc id")
+    status: str = Field(
+        ..., description="The job status, QUEUED,RUNNING,FAILED,FINISHED"
+    )
+    progress: int = Field(0, description="The progress percentage")
+    queue_position: Optional[int] = Field(
+        None,
+        description="The position in the queue, 0 if it is running, None if it is "
+        "not scheduled",
+    )
+    gmt_modified: Optional[str] = Field(None, description="modified time")
 
 
 class KnowledgeSyncRequest(BaseModel):
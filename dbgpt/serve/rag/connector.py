@@ -73,6 +73,11 @@ class VectorStoreConnector:
         for key, value in vector_store_config.model_extra.items():
             if value is not None:
                 config_dict[key] = value
+        if (
+            "cache_manager" in self.config_class.model_fields
+            and "cache_manager" not in config_dict
+        ):
+            config_dict["cache_manager"] = self.__extraction_cache_manager()
         config = self.config_class(**config_dict)
         try:
             if vector_store_type in pools and config.name in pools[vector_store_type]:
@@ -84,6 +89,17 @@ class VectorStoreConnector:
             logger.error("connect vector store failed: %s", e)
             raise e
 
+    def __extraction_cache_manager(self):
+        """Return the cache manager to cache the knowledge graph extraction."""
+        if not CFG.KNOWLEDGE_GRAPH_EXTRACTION_CACHE_ENABLE or not CFG.SYSTEM_APP:
+            return None
+        from dbgpt.component import ComponentType
+        from dbgpt.storage.cache import CacheManager
+
+        return CFG.SYSTEM_APP.get_component(
+            ComponentType.MODEL_CACHE_MANAGER, CacheManager, default_component=None
+        )
+
     def __rewrite_index_store_type(self, index_store_type):
         # Rewrite Knowledge Graph Type
         if CFG.GRAPH_COMMUNITY_SUMMARY_ENABLED:
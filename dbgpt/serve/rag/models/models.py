@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Any, Dict, Union
+from typing import Any, Dict, List, Optional, Union
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, or_
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text, or_
 
 from dbgpt._private.pydantic import model_to_dict
 from dbgpt.app.knowledge.request.request import KnowledgeSpaceRequest
@@ -182,3 +182,89 @@ class KnowledgeSpaceDao(BaseDao):
             context=entity.context,
             domain_type=entity.domain_type,
         )
+
+
+class KnowledgeIngestionJobEntity(Model):
+    """The ingestion job of a knowledge document.
+
+    The jobs are persisted, so the queued and the interrupted jobs are resumed after
+    a restart.
+    """
+
+    __tablename__ = "knowledge_ingestion_job"
+    id = Column(Integer, primary_key=True)
+    document_id = Column(Integer, nullable=False, unique=True)
+    space_id = Column(String(100), nullable=False)
+    chunk_parameters = Column(Text)
+    content_hash = Column(String(64))
+    # The smaller documents are synced first
+    doc_size = Column(BigInteger)
+    status = Column(String(50), nullable=False)
+    progress = Column(Integer)
+    gmt_created = Column(DateTime)
+    gmt_modified = Column(DateTime)
+
+    def __repr__(self):
+        return (
+            f"KnowledgeIngestionJobEntity(id={self.id}, "
+            f"document_id={self.document_id}, space_id='{self.space_id}', "
+            f"status='{self.status}', progress={self.progress})"
+        )
+
+
+class KnowledgeIngestionJobDao(BaseDao):
+    def save_job(self, job: KnowledgeIngestionJobEntity) -> None:
+        """Create the job of the document or replace the previous one."""
+        with self.session() as session:
+            entry = (
+                session.query(KnowledgeIngestionJobEntity)
+                .filter(KnowledgeIngestionJobEntity.document_id == job.document_id)
+                .first()
+            )
+            if entry is None:
+                entry = KnowledgeIngestionJobEntity(
+                    document_id=job.document_id, gmt_created=datetime.now()
+                )
+            entry.space_id = job.space_id
+            entry.chunk_parameters = job.chunk_parameters
+            entry.content_hash = job.content_hash
+            entry.doc_size = job.doc_size
+            entry.status = job.status
+            entry.progress = job.progress
+            entry.gmt_modified = datetime.now()
+            session.add(entry)
+
+    def update_job(self, document_id: int, **kwargs) -> None:
+        """Update the fields of the job of the document."""
+        with self.session() as session:
+            session.query(KnowledgeIngestionJobEntity).filter(
+                KnowledgeIngestionJobEntity.document_id == document_id
+            ).update(
+                {**kwargs, "gmt_modified": datetime.now()}, synchronize_session=False
+            )
+
+    def get_jobs(
+        self,
+        document_ids: Optional[List[int]] = None,
+        status: Optional[List[str]] = None,
+    ) -> List[KnowledgeIngestionJobEntity]:
+        """Get the jobs by the document ids and status."""
+        session = self.get_raw_session()
+        try:
+            query = session.query(KnowledgeIngestionJobEntity)
+            if document_ids is not None:
+                query = query.filter(
+                    KnowledgeIngestionJobEntity.document_id.in_(document_ids)
+                )
+            if status is not None:
+                query = query.filter(KnowledgeIngestionJobEntity.status.in_(status))
+            return query.order_by(KnowledgeIngestionJobEntity.id.asc()).all()
+        finally:
+            session.close()
+
+    def delete_job(self, document_id: int) -> None:
+        """Delete the job of the document."""
+        with self.session() as session:
+            session.query(KnowledgeIngestionJobEntity).filter(
+                KnowledgeIngestionJobEntity.document_id == document_id
+            ).delete(synchronize_session=False)
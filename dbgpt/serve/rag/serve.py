@@ -54,7 +54,7 @@ class Serve(BaseServe):
         You can do some initialization here. You can't get other components here because they may be not initialized yet
         """
         # import your own module here to ensure the module is loaded before the application starts
-        from .models.models import KnowledgeSpaceEntity
+        from .models.models import KnowledgeIngestionJobEntity, KnowledgeSpaceEntity
 
     def before_start(self):
         """Called before the start of the application."""
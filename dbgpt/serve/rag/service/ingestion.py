@@ -0,0 +1,201 @@
+"""The bounded scheduler of the knowledge document ingestion jobs.
+
+The documents are parsed and embedded by a limited number of jobs at the same time,
+both globally and in each knowledge space, so uploading many files at once doesn't
+overload the embedding model. The small documents are scheduled first, so they are
+not stuck behind the big ones.
+
+The document files can be parsed in a process pool by :func:`parse_document`, so
+parsing many files scales with the CPU cores instead of competing for the GIL with
+the request handling. The chunks are passed back through a spill file batch by
+batch, instead of pickling the whole list of chunks between the processes.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import pickle
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from dbgpt.core import Chunk
+from dbgpt.rag.chunk_manager import ChunkManager, ChunkParameters
+from dbgpt.rag.knowledge import KnowledgeFactory, KnowledgeType
+
+logger = logging.getLogger(__name__)
+
+# The documents up to the size are scheduled before the bigger ones
+_DEFAULT_SMALL_DOC_SIZE = 1024 * 1024
+# The number of chunks written to the spill file at once
+_DEFAULT_PARSE_BATCH_SIZE = 200
+
+
+@dataclass
+class IngestionJob:
+    """The ingestion job of a knowledge document."""
+
+    document_id: int
+    space_id: str
+    run: Callable[[], Awaitable[None]] = field(repr=False)
+    doc_size: Optional[int] = None
+
+
+class IngestionScheduler:
+    """Run the ingestion jobs with the global and per-space concurrency limits.
+
+    The jobs are scheduled in the event loop, the waiting jobs are ordered by the
+    document size class first (the small documents are prior) and then the
+    submission order.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_space_concurrency: int = 2,
+        small_doc_size: int = _DEFAULT_SMALL_DOC_SIZE,
+    ):
+        """Create a new IngestionScheduler.
+
+        Args:
+            max_concurrency (int): The maximum number of the running jobs.
+            max_space_concurrency (int): The maximum number of the running jobs of
+                each knowledge space.
+            small_doc_size (int): The documents up to the size in bytes are
+                scheduled before the bigger ones.
+        """
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_space_concurrency = max(1, max_space_concurrency)
+        self._small_doc_size = small_doc_size
+        self._waiting: List[Tuple[int, int, IngestionJob]] = []
+        self._seq = itertools.count()
+        self._running: Dict[int, asyncio.Task] = {}
+        self._space_running: Dict[str, int] = defaultdict(int)
+
+    def submit(self, job: IngestionJob) -> bool:
+        """Submit the job, it is started when there is a free slot.
+
+        Returns:
+            bool: False if the job of the document is already waiting or running.
+        """
+        if self.contains(job.document_id):
+            return False
+        big = job.doc_size is None or job.doc_size > self._small_doc_size
+        heapq.heappush(self._waiting, (int(big), next(self._seq), job))
+        self._dispatch()
+        return True
+
+    def contains(self, document_id: int) -> bool:
+        """Whether the job of the document is waiting or running."""
+        return document_id in self._running or any(
+            job.document_id == document_id for _, _, job in self._waiting
+        )
+
+    def position(self, document_id: int) -> Optional[int]:
+        """Return the position of the waiting job in the queue, 0 if it is running.
+
+        Returns:
+            Optional[int]: The position, None if the job is not scheduled.
+        """
+        if document_id in self._running:
+            return 0
+        for i, (_, _, job) in enumerate(sorted(self._waiting, key=lambda x: x[:2])):
+            if job.document_id == document_id:
+                return i + 1
+        return None
+
+    @property
+    def running_count(self) -> int:
+        """Return the number of the running jobs."""
+        return len(self._running)
+
+    @property
+    def waiting_count(self) -> int:
+        """Return the number of the waiting jobs."""
+        return len(self._waiting)
+
+    async def join(self) -> None:
+        """Wait until all the jobs are finished."""
+        while self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        skipped = []
+        while self._waiting and len(self._running) < self._max_concurrency:
+            item = heapq.heappop(self._waiting)
+            job = item[2]
+            if self._space_running[job.space_id] >= self._max_space_concurrency:
+                skipped.append(item)
+                continue
+            self._space_running[job.space_id] += 1
+            self._running[job.document_id] = asyncio.create_task(self._run(job))
+        for item in skipped:
+            heapq.heappush(self._waiting, item)
+
+    async def _run(self, job: IngestionJob) -> None:
+        try:
+            await job.run()
+        except Exception as e:
+            logger.error(f"ingestion job of document {job.document_id} failed: {e}")
+        finally:
+            self._running.pop(job.document_id, None)
+            self._space_running[job.space_id] -= 1
+            if self._space_running[job.space_id] <= 0:
+                self._space_running.pop(job.space_id, None)
+            self._dispatch()
+
+
+def parse_document(
+    datasource: str,
+    knowledge_type: str,
+    chunk_parameters: str,
+    output_path: str,
+    batch_size: int = _DEFAULT_PARSE_BATCH_SIZE,
+) -> int:
+    """Load and split the document, it runs in a worker process of the parsing pool.
+
+    The document is loaded and split lazily, the chunks are pickled to the spill
+    file batch by batch, so neither the worker nor the result passed between the
+    processes holds all the chunks. Read them with :func:`read_chunk_batches`.
+
+    Args:
+        datasource (str): The file path, url or text of the document.
+        knowledge_type (str): The value of the knowledge type of the document.
+        chunk_parameters (str): The chunk parameters in JSON.
+        output_path (str): The spill file to write the chunk batches.
+        batch_size (int): The number of chunks of each batch.
+
+    Returns:
+        int: The number of the chunks of the document.
+    """
+    knowledge = KnowledgeFactory.create(
+        datasource=datasource,
+        knowledge_type=KnowledgeType.get_by_value(knowledge_type),
+    )
+    chunk_manager = ChunkManager(
+        knowledge=knowledge,
+        chunk_parameter=ChunkParameters(**json.loads(chunk_parameters)),
+    )
+    chunks = chunk_manager.iter_split(knowledge.iter_load())
+    count = 0
+    with open(output_path, "wb") as f:
+        while True:
+            batch = list(islice(chunks, batch_size))
+            if not batch:
+                break
+            pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+            count += len(batch)
+    return count
+
+
+def read_chunk_batches(path: str) -> Iterator[List[Chunk]]:
+    """Read the chunk batches written by :func:`parse_document` one by one."""
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
@@ -1,16 +1,21 @@
 import asyncio
+import hashlib
 import json
 import logging
 import os
 import shutil
 import tempfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, cast
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union, cast
 
 from fastapi import HTTPException
 
 from dbgpt._private.config import Config
+from dbgpt._private.pydantic import model_to_dict
 from dbgpt.app.knowledge.chunk_db import DocumentChunkDao, DocumentChunkEntity
 from dbgpt.app.knowledge.document_db import (
     KnowledgeDocumentDao,
@@ -23,7 +28,7 @@ from dbgpt.configs.model_config import (
     EMBEDDING_MODEL_CONFIG,
     KNOWLEDGE_UPLOAD_ROOT_PATH,
 )
-from dbgpt.core import LLMClient
+from dbgpt.core import Chunk, LLMClient
 from dbgpt.model import DefaultLLMClient
 from dbgpt.model.cluster import WorkerManagerFactory
 from dbgpt.rag.assembler import EmbeddingAssembler
@@ -35,21 +40,40 @@ from dbgpt.serve.rag.connector import VectorStoreConnector
 from dbgpt.storage.metadata import BaseDao
 from dbgpt.storage.metadata._base_dao import QUERY_SPEC
 from dbgpt.storage.vector_store.base import VectorStoreConfig
+from dbgpt.util.executor_utils import (
+    DefaultExecutorFactory,
+    ExecutorFactory,
+    blocking_func_to_async,
+    blocking_func_to_async_no_executor,
+)
 from dbgpt.util.pagination_utils import PaginationResult
 from dbgpt.util.string_utils import remove_trailing_punctuation
 from dbgpt.util.tracer import root_tracer, trace
 
 from ..api.schemas import (
+    ChunkCursorResponse,
     ChunkServeRequest,
     DocumentServeRequest,
     DocumentServeResponse,
+    DocumentSyncProgressResponse,
     DocumentVO,
     KnowledgeSyncRequest,
     SpaceServeRequest,
     SpaceServeResponse,
 )
 from ..config import SERVE_CONFIG_KEY_PREFIX, SERVE_SERVICE_COMPONENT_NAME, ServeConfig
-from ..models.models import KnowledgeSpaceDao, KnowledgeSpaceEntity
+from ..models.models import (
+    KnowledgeIngestionJobDao,
+    KnowledgeIngestionJobEntity,
+    KnowledgeSpaceDao,
+    KnowledgeSpaceEntity,
+)
+from .ingestion import (
+    IngestionJob,
+    IngestionScheduler,
+    parse_document,
+    read_chunk_batches,
+)
 
 logger = logging.getLogger(__name__)
 CFG = Config()
@@ -62,6 +86,66 @@ class SyncStatus(Enum):
     FINISHED = "FINISHED"
 
 
+class IngestionJobStatus(Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    FAILED = "FAILED"
+    FINISHED = "FINISHED"
+
+
+# The number of chunks embedded between two progress reports
+_PROGRESS_BATCH_SIZE = 200
+# The number of vectors deleted from the vector store at once
+_DELETE_BATCH_SIZE = 1000
+
+
+def _document_size(doc: KnowledgeDocumentEntity) -> Optional[int]:
+    """Return the size of the document file or text, None for the URL documents."""
+    if doc.doc_type == KnowledgeType.URL.name:
+        return None
+    content = doc.content or ""
+    if doc.doc_type == KnowledgeType.DOCUMENT.name and os.path.isfile(content):
+        return os.path.getsize(content)
+    return len(content.encode("utf-8"))
+
+
+def _hash_document(
+    doc: KnowledgeDocumentEntity, chunk_parameters: ChunkParameters
+) -> Optional[str]:
+    """Hash the document content with the chunk parameters and embedding model.
+
+    Returns None for the URL documents, the remote content may change.
+    """
+    if doc.doc_type == KnowledgeType.URL.name:
+        return None
+    sha = hashlib.sha256()
+    params = model_to_dict(chunk_parameters) if chunk_parameters else {}
+    sha.update(
+        json.dumps(
+            [doc.doc_type, CFG.EMBEDDING_MODEL, params], sort_keys=True, default=str
+        ).encode("utf-8")
+    )
+    content = doc.content or ""
+    if doc.doc_type == KnowledgeType.DOCUMENT.name and os.path.isfile(content):
+        with open(content, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(block)
+    else:
+        sha.update(content.encode("utf-8"))
+    return sha.hexdigest()
+
+
+def _hash_chunk(chunk: Chunk) -> str:
+    """Hash the chunk content and metadata with the embedding model."""
+    return hashlib.sha256(
+        json.dumps(
+            [CFG.EMBEDDING_MODEL, chunk.content, chunk.metadata],
+            sort_keys=True,
+            default=str,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
 class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeResponse]):
     """The service class for Flow"""
 
@@ -73,11 +157,18 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         dao: Optional[KnowledgeSpaceDao] = None,
         document_dao: Optional[KnowledgeDocumentDao] = None,
         chunk_dao: Optional[DocumentChunkDao] = None,
+        job_dao: Optional[KnowledgeIngestionJobDao] = None,
     ):
         self._system_app = system_app
         self._dao: KnowledgeSpaceDao = dao
         self._document_dao: KnowledgeDocumentDao = document_dao
         self._chunk_dao: DocumentChunkDao = chunk_dao
+        self._job_dao: KnowledgeIngestionJobDao = job_dao
+        self._scheduler = IngestionScheduler(
+            max_concurrency=CFG.KNOWLEDGE_SYNC_MAX_CONCURRENCY,
+            max_space_concurrency=CFG.KNOWLEDGE_SYNC_MAX_SPACE_CONCURRENCY,
+        )
+        self._parse_executor: Optional[ProcessPoolExecutor] = None
 
         super().__init__(system_app)
 
@@ -94,8 +185,19 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         self._dao = self._dao or KnowledgeSpaceDao()
         self._document_dao = self._document_dao or KnowledgeDocumentDao()
         self._chunk_dao = self._chunk_dao or DocumentChunkDao()
+        self._job_dao = self._job_dao or KnowledgeIngestionJobDao()
         self._system_app = system_app
 
+    async def async_after_start(self):
+        """Resume the ingestion jobs interrupted by the last shutdown."""
+        await self.resume_ingestion_jobs()
+
+    def before_stop(self):
+        """Shutdown the process pool of parsing the documents."""
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown(wait=False, cancel_futures=True)
+            self._parse_executor = None
+
     @property
     def dao(
         self,
@@ -108,6 +210,30 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         """Returns the internal ServeConfig."""
         return self._serve_config
 
+    @property
+    def executor(self):
+        """Return the shared executor to run the blocking functions."""
+        return self._system_app.get_component(
+            ComponentType.EXECUTOR_DEFAULT,
+            ExecutorFactory,
+            or_register_component=DefaultExecutorFactory,
+        ).create()
+
+    @property
+    def parse_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Return the process pool to parse the document files.
+
+        None if parsing in processes is disabled, the documents are parsed in the
+        threads then.
+        """
+        if CFG.KNOWLEDGE_SYNC_PARSE_PROCESSES <= 0:
+            return None
+        if self._parse_executor is None:
+            self._parse_executor = ProcessPoolExecutor(
+                max_workers=CFG.KNOWLEDGE_SYNC_PARSE_PROCESSES
+            )
+        return self._parse_executor
+
     @property
     def llm_client(self) -> LLMClient:
         worker_manager = self._system_app.get_component(
@@ -205,31 +331,39 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
     async def sync_document(self, requests: List[KnowledgeSyncRequest]) -> List:
         """Create a new document entity
 
+        The documents are looked up at once and all of them are checked before any
+        is queued, then they are queued to sync concurrently.
+
         Args:
             request (KnowledgeSpaceRequest): The request
 
         Returns:
             SpaceServeResponse: The response
         """
-        doc_ids = []
+        docs = await blocking_func_to_async_no_executor(
+            self._document_dao.documents_by_ids,
+            [sync_request.doc_id for sync_request in requests],
+        )
+        docs_by_id = {doc.id: doc for doc in docs}
+        space_contexts: Dict[str, Optional[dict]] = {}
+        syncs = []
         for sync_request in requests:
             space_id = sync_request.space_id
-            docs = self._document_dao.documents_by_ids([sync_request.doc_id])
-            if len(docs) == 0:
+            doc = docs_by_id.get(sync_request.doc_id)
+            if doc is None:
                 raise Exception(
                     f"there are document called, doc_id: {sync_request.doc_id}"
                 )
-            doc = docs[0]
-            if (
-                doc.status == SyncStatus.RUNNING.name
-                or doc.status == SyncStatus.FINISHED.name
-            ):
+            if doc.status == SyncStatus.RUNNING.name:
+                # The finished documents are re-synced incrementally
                 raise Exception(
                     f" doc:{doc.doc_name} status is {doc.status}, can not sync"
                 )
             chunk_parameters = sync_request.chunk_parameters
             if chunk_parameters.chunk_strategy != ChunkStrategy.CHUNK_BY_SIZE.name:
-                space_context = self.get_space_context(space_id)
+                if space_id not in space_contexts:
+                    space_contexts[space_id] = self.get_space_context(space_id)
+                space_context = space_contexts[space_id]
                 chunk_parameters.chunk_size = (
                     CFG.KNOWLEDGE_CHUNK_SIZE
                     if space_context is None
@@ -240,9 +374,14 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
                     if space_context is None
                     else int(space_context["embedding"]["chunk_overlap"])
                 )
-            await self._sync_knowledge_document(space_id, doc, chunk_parameters)
-            doc_ids.append(doc.id)
-        return doc_ids
+            syncs.append((space_id, doc, chunk_parameters))
+        await asyncio.gather(
+            *(
+                self._sync_knowledge_document(space_id, doc, chunk_parameters)
+                for space_id, doc, chunk_parameters in syncs
+            )
+        )
+        return [doc.id for _, doc, _ in syncs]
 
     def get(self, request: QUERY_SPEC) -> Optional[SpaceServeResponse]:
         """Get a Flow entity
@@ -301,6 +440,7 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         documents = self._document_dao.get_documents(document_query)
         for document in documents:
             self._chunk_dao.raw_delete(document.id)
+            self._job_dao.delete_job(document.id)
         # delete documents
         self._document_dao.raw_delete(document_query)
         # delete space
@@ -355,8 +495,8 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             raise Exception(f"invalid space name: {docuemnt.space}")
         space = spaces[0]
 
-        vector_ids = docuemnt.vector_ids
-        if vector_ids is not None:
+        vector_ids = self._document_vector_ids(docuemnt)
+        if vector_ids:
             config = VectorStoreConfig(
                 name=space.name, llm_client=self.llm_client, model_name=None
             )
@@ -364,9 +504,10 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
                 vector_store_type=space.vector_type, vector_store_config=config
             )
             # delete vector by ids
-            vector_store_connector.delete_by_ids(vector_ids)
+            self._delete_vectors(vector_store_connector, vector_ids)
         # delete chunks
         self._chunk_dao.raw_delete(docuemnt.id)
+        self._job_dao.delete_job(docuemnt.id)
         # delete document
         self._document_dao.raw_delete(docuemnt)
         return docuemnt
@@ -429,6 +570,28 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         """
         return self._chunk_dao.get_list(request)
 
+    def get_chunk_list_after(
+        self, document_id: int, after_id: Optional[int] = None, page_size: int = 20
+    ) -> ChunkCursorResponse:
+        """Get a page of the chunks of the document after the chunk id.
+
+        Args:
+            document_id (int): The document id.
+            after_id (Optional[int]): The id of the last chunk of the previous page,
+                None for the first page.
+            page_size (int): The page size.
+
+        Returns:
+            ChunkCursorResponse: The chunks and the cursor of the next page.
+        """
+        chunks = self._chunk_dao.get_document_chunks_after(
+            DocumentChunkEntity(document_id=document_id), after_id, page_size
+        )
+        return ChunkCursorResponse(
+            items=[self._chunk_dao.to_response(chunk) for chunk in chunks],
+            next_after_id=chunks[-1].id if len(chunks) == page_size else None,
+        )
+
     def update_chunk(self, request: ChunkServeRequest):
         """update knowledge document chunk"""
         if not request.id:
@@ -454,37 +617,9 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         Returns:
             - List[int]: document ids
         """
-        doc_ids = []
         for sync_request in sync_requests:
-            docs = self._document_dao.documents_by_ids([sync_request.doc_id])
-            if len(docs) == 0:
-                raise Exception(
-                    f"there are document called, doc_id: {sync_request.doc_id}"
-                )
-            doc = docs[0]
-            if (
-                doc.status == SyncStatus.RUNNING.name
-                or doc.status == SyncStatus.FINISHED.name
-            ):
-                raise Exception(
-                    f" doc:{doc.doc_name} status is {doc.status}, can not sync"
-                )
-            chunk_parameters = sync_request.chunk_parameters
-            if chunk_parameters.chunk_strategy != ChunkStrategy.CHUNK_BY_SIZE.name:
-                space_context = self.get_space_context(space_id)
-                chunk_parameters.chunk_size = (
-                    CFG.KNOWLEDGE_CHUNK_SIZE
-                    if space_context is None
-                    else int(space_context["embedding"]["chunk_size"])
-                )
-                chunk_parameters.chunk_overlap = (
-                    CFG.KNOWLEDGE_CHUNK_OVERLAP
-                    if space_context is None
-                    else int(space_context["embedding"]["chunk_overlap"])
-                )
-            await self._sync_knowledge_document(space_id, doc, chunk_parameters)
-            doc_ids.append(doc.id)
-        return doc_ids
+            sync_request.space_id = space_id
+        return await self.sync_document(sync_requests)
 
     async def _sync_knowledge_document(
         self,
@@ -492,16 +627,175 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         doc: KnowledgeDocumentEntity,
         chunk_parameters: ChunkParameters,
     ) -> None:
-        """sync knowledge document chunk into vector store"""
+        """sync knowledge document chunk into vector store
+
+        The document is queued as an ingestion job, which is persisted and run by
+        the bounded scheduler.
+        """
+        content_hash = await blocking_func_to_async_no_executor(
+            _hash_document, doc, chunk_parameters
+        )
+        if (
+            doc.status == SyncStatus.FINISHED.name
+            and content_hash is not None
+            and doc.content_hash == content_hash
+        ):
+            logger.info(f"document is not changed, skip sync, doc:{doc.doc_name}")
+            return
+        job = KnowledgeIngestionJobEntity(
+            document_id=doc.id,
+            space_id=str(space_id),
+            chunk_parameters=json.dumps(
+                model_to_dict(chunk_parameters, exclude_none=True)
+            ),
+            content_hash=content_hash,
+            doc_size=await blocking_func_to_async_no_executor(_document_size, doc),
+            status=IngestionJobStatus.QUEUED.name,
+            progress=0,
+        )
+        await blocking_func_to_async_no_executor(self._job_dao.save_job, job)
+        doc.status = SyncStatus.RUNNING.name
+
+        doc.gmt_modified = datetime.now()
+        self._document_dao.update_knowledge_document(doc)
+        self._submit_ingestion_job(job)
+        logger.info(f"document is queued to sync, doc:{doc.doc_name}")
+
+    def _submit_ingestion_job(self, job: KnowledgeIngestionJobEntity) -> None:
+        self._scheduler.submit(
+            IngestionJob(
+                document_id=job.document_id,
+                space_id=job.space_id,
+                run=partial(self._run_ingestion_job, job.document_id),
+                doc_size=job.doc_size,
+            )
+        )
+
+    async def resume_ingestion_jobs(self) -> int:
+        """Resume the queued and the interrupted ingestion jobs.
+
+        Returns:
+            int: The number of the resumed jobs.
+        """
+        jobs = await blocking_func_to_async_no_executor(
+            self._job_dao.get_jobs,
+            status=[IngestionJobStatus.QUEUED.name, IngestionJobStatus.RUNNING.name],
+        )
+        for job in jobs:
+            logger.info(f"resume the ingestion job of document {job.document_id}")
+            self._submit_ingestion_job(job)
+        return len(jobs)
+
+    async def _run_ingestion_job(self, document_id: int) -> None:
+        """Run the ingestion job of the document."""
+        jobs = await blocking_func_to_async_no_executor(
+            self._job_dao.get_jobs, [document_id]
+        )
+        docs = await blocking_func_to_async_no_executor(
+            self._document_dao.documents_by_ids, [document_id]
+        )
+        if not jobs or not docs:
+            # The document is deleted
+            await blocking_func_to_async_no_executor(
+                self._job_dao.delete_job, document_id
+            )
+            return
+        job, doc = jobs[0], docs[0]
+        update_job = partial(
+            blocking_func_to_async_no_executor, self._job_dao.update_job, document_id
+        )
+        await update_job(status=IngestionJobStatus.RUNNING.name, progress=0)
+        try:
+            space = await blocking_func_to_async_no_executor(
+                self.get, {"id": job.space_id}
+            )
+            if space is None:
+                raise Exception(f"space {job.space_id} not found")
+            chunk_parameters = ChunkParameters(**json.loads(job.chunk_parameters))
+            knowledge = None
+            parsed = None
+            if not space.domain_type or (
+                space.domain_type.lower() == BusinessFieldType.NORMAL.value.lower()
+            ):
+                parsed = await self._parse_in_process(doc, job.chunk_parameters)
+                if parsed is None:
+                    # Loaded and split by the assembler
+                    knowledge = KnowledgeFactory.create(
+                        datasource=doc.content,
+                        knowledge_type=KnowledgeType.get_by_value(doc.doc_type),
+                    )
+            chunk_batches = read_chunk_batches(parsed[0]) if parsed else None
+            try:
+                await self.async_doc_embedding(
+                    knowledge,
+                    chunk_parameters,
+                    self._create_vector_store_connector(space),
+                    doc,
+                    space,
+                    content_hash=job.content_hash,
+                    progress_callback=lambda progress: self._job_dao.update_job(
+                        document_id, progress=progress
+                    ),
+                    chunk_batches=chunk_batches,
+                    chunk_count=parsed[1] if parsed else None,
+                )
+            finally:
+                if parsed:
+                    chunk_batches.close()
+                    os.remove(parsed[0])
+        except Exception as e:
+            doc.status = SyncStatus.FAILED.name
+            doc.result = "document embedding failed" + str(e)
+            logger.error(f"document embedding, failed:{doc.doc_name}, {str(e)}")
+            await blocking_func_to_async_no_executor(
+                self._document_dao.update_knowledge_document, doc
+            )
+        if doc.status == SyncStatus.FINISHED.name:
+            await update_job(status=IngestionJobStatus.FINISHED.name, progress=100)
+        else:
+            await update_job(status=IngestionJobStatus.FAILED.name)
+
+    async def _parse_in_process(
+        self, doc: KnowledgeDocumentEntity, chunk_parameters: str
+    ) -> Optional[Tuple[str, int]]:
+        """Load and split the document file in the process pool.
+
+        The chunks are written to a spill file batch by batch, the caller reads them
+        with :func:`read_chunk_batches` and removes the file.
+
+        Returns:
+            Optional[Tuple[str, int]]: The spill file and the number of the chunks,
+                None if the document is not a file or parsing in processes is
+                disabled.
+        """
+        executor = self.parse_executor
+        if executor is None or doc.doc_type != KnowledgeType.DOCUMENT.name:
+            return None
+        fd, output_path = tempfile.mkstemp(suffix=".chunks")
+        os.close(fd)
+        loop = asyncio.get_running_loop()
+        try:
+            count = await loop.run_in_executor(
+                executor,
+                parse_document,
+                doc.content,
+                doc.doc_type,
+                chunk_parameters,
+                output_path,
+                _PROGRESS_BATCH_SIZE,
+            )
+        except BaseException:
+            os.remove(output_path)
+            raise
+        return output_path, count
+
+    def _create_vector_store_connector(self, space) -> VectorStoreConnector:
         embedding_factory = CFG.SYSTEM_APP.get_component(
             "embedding_factory", EmbeddingFactory
         )
         embedding_fn = embedding_factory.create(
             model_name=EMBEDDING_MODEL_CONFIG[CFG.EMBEDDING_MODEL]
         )
-        from dbgpt.storage.vector_store.base import VectorStoreConfig
-
-        space = self.get({"id": space_id})
         config = VectorStoreConfig(
             name=space.name,
             embedding_fn=embedding_fn,
@@ -509,31 +803,46 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             llm_client=self.llm_client,
             model_name=None,
         )
-        vector_store_connector = VectorStoreConnector(
+        return VectorStoreConnector(
             vector_store_type=space.vector_type, vector_store_config=config
         )
-        knowledge = None
-        if not space.domain_type or (
-            space.domain_type.lower() == BusinessFieldType.NORMAL.value.lower()
-        ):
-            knowledge = KnowledgeFactory.create(
-                datasource=doc.content,
-                knowledge_type=KnowledgeType.get_by_value(doc.doc_type),
-            )
-        doc.status = SyncStatus.RUNNING.name
 
-        doc.gmt_modified = datetime.now()
-        self._document_dao.update_knowledge_document(doc)
-        asyncio.create_task(
-            self.async_doc_embedding(
-                knowledge, chunk_parameters, vector_store_connector, doc, space
-            )
+    def get_document_sync_progress(
+        self, document_id: int
+    ) -> Optional[DocumentSyncProgressResponse]:
+        """Get the sync progress of the document.
+
+        Args:
+            document_id (int): The document id.
+
+        Returns:
+            Optional[DocumentSyncProgressResponse]: The progress, None if the
+                document has never been queued to sync.
+        """
+        jobs = self._job_dao.get_jobs([document_id])
+        if not jobs:
+            return None
+        job = jobs[0]
+        return DocumentSyncProgressResponse(
+            doc_id=document_id,
+            status=job.status,
+            progress=job.progress or 0,
+            queue_position=self._scheduler.position(document_id),
+            gmt_modified=str(job.gmt_modified) if job.gmt_modified else None,
         )
-        logger.info(f"begin save document chunks, doc:{doc.doc_name}")
 
     @trace("async_doc_embedding")
     async def async_doc_embedding(
-        self, knowledge, chunk_parameters, vector_store_connector, doc, space
+        self,
+        knowledge,
+        chunk_parameters,
+        vector_store_connector,
+        doc,
+        space,
+        content_hash: Optional[str] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        chunk_batches: Optional[Iterator[List[Chunk]]] = None,
+        chunk_count: Optional[int] = None,
     ):
         """async document embedding into vector db
         Args:
@@ -541,6 +850,15 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             - chunk_parameters: ChunkParameters
             - vector_store_connector: vector_store_connector
             - doc: doc
+            - space: space
+            - content_hash: the hash of the document content, it is saved when the
+                document is synced successfully
+            - progress_callback: the blocking function to report the progress
+                percentage, it is called in a thread
+            - chunk_batches: the batches of the chunks parsed in advance, the
+                knowledge is loaded and split lazily by the assembler if not
+                provided
+            - chunk_count: the number of the chunks of chunk_batches if known
         """
 
         logger.info(f"async doc persist sync, doc:{doc.doc_name}")
@@ -564,43 +882,242 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
                     db_name, chunk_docs = await end_task.call(
                         {"file_path": doc.content, "space": doc.space}
                     )
+                    # The chunks are persisted by the dag, replace the synced chunks
+                    synced_ids = await blocking_func_to_async_no_executor(
+                        self._document_vector_ids, doc
+                    )
+                    await blocking_func_to_async_no_executor(
+                        self._delete_vectors, vector_store_connector, synced_ids
+                    )
+                    await blocking_func_to_async_no_executor(
+                        self._chunk_dao.raw_delete, doc.id
+                    )
                     doc.chunk_size = len(chunk_docs)
-                    vector_ids = [chunk.chunk_id for chunk in chunk_docs]
+                    doc.vector_ids = None
+                    await blocking_func_to_async_no_executor(
+                        self._save_chunks,
+                        doc,
+                        chunk_docs,
+                        vector_ids=[chunk.chunk_id for chunk in chunk_docs],
+                    )
                 else:
-                    assembler = await EmbeddingAssembler.aload_from_knowledge(
-                        knowledge=knowledge,
-                        index_store=vector_store_connector.index_client,
-                        chunk_parameters=chunk_parameters,
+                    if chunk_batches is None:
+                        # The chunks are produced batch by batch as they are synced
+                        assembler = await EmbeddingAssembler.aload_from_knowledge(
+                            knowledge=knowledge,
+                            index_store=vector_store_connector.index_client,
+                            chunk_parameters=chunk_parameters,
+                            executor=self.executor,
+                            streaming=True,
+                        )
+                        chunk_batches = assembler.iter_chunk_batches()
+                        chunk_count = None
+                    await self._sync_document_chunks(
+                        doc,
+                        chunk_batches,
+                        vector_store_connector,
+                        progress_callback=progress_callback,
+                        chunk_count=chunk_count,
                     )
-
-                    chunk_docs = assembler.get_chunks()
-                    doc.chunk_size = len(chunk_docs)
-                    vector_ids = await assembler.apersist()
             doc.status = SyncStatus.FINISHED.name
             doc.result = "document persist into index store success"
-            if vector_ids is not None:
-                doc.vector_ids = ",".join(vector_ids)
+            doc.content_hash = content_hash
             logger.info(f"async document persist index store success:{doc.doc_name}")
-            # save chunk details
-            chunk_entities = [
-                DocumentChunkEntity(
-                    doc_name=doc.doc_name,
-                    doc_type=doc.doc_type,
-                    document_id=doc.id,
-                    content=chunk_doc.content,
-                    meta_info=str(chunk_doc.metadata),
-                    gmt_created=datetime.now(),
-                    gmt_modified=datetime.now(),
-                )
-                for chunk_doc in chunk_docs
-            ]
-            self._chunk_dao.create_documents_chunks(chunk_entities)
         except Exception as e:
             doc.status = SyncStatus.FAILED.name
             doc.result = "document embedding failed" + str(e)
             logger.error(f"document embedding, failed:{doc.doc_name}, {str(e)}")
         return self._document_dao.update_knowledge_document(doc)
 
+    async def _sync_document_chunks(
+        self,
+        doc: KnowledgeDocumentEntity,
+        chunks: Union[List[Chunk], Iterator[List[Chunk]]],
+        vector_store_connector: VectorStoreConnector,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        chunk_count: Optional[int] = None,
+    ) -> List[str]:
+        """Sync the chunks of the document into the vector store incrementally.
+
+        The chunks are compared with the synced chunks by the hash of their content
+        and metadata: just the new chunks are embedded and saved, the chunks not in
+        the document anymore are deleted, and the unchanged chunks are kept.
+
+        The chunks are consumed batch by batch, each batch is produced in the
+        executor, then its new chunks are embedded and saved before the next batch
+        is produced, so just one batch of chunks is kept in memory.
+
+        The documents synced before the chunk hashes were recorded are re-synced
+        entirely.
+
+        The progress is reported after each batch, the number of the chunks is
+        estimated by the last sync if it is unknown.
+
+        The vector id of each chunk is saved with the chunk, just the ids which can't
+        be mapped to the chunks are kept in `doc.vector_ids`.
+
+        Args:
+            doc (KnowledgeDocumentEntity): The document.
+            chunks (Union[List[Chunk], Iterator[List[Chunk]]]): The chunks or the
+                iterator of the chunk batches.
+            vector_store_connector (VectorStoreConnector): The vector store.
+            progress_callback (Optional[Callable[[int], None]]): The blocking
+                function to report the progress percentage.
+            chunk_count (Optional[int]): The number of the chunks if known.
+
+        Returns:
+            List[str]: The vector ids of all the chunks of the document.
+        """
+        if isinstance(chunks, list):
+            chunk_count = len(chunks)
+            chunks = iter(
+                [
+                    chunks[i : i + _PROGRESS_BATCH_SIZE]
+                    for i in range(0, len(chunks), _PROGRESS_BATCH_SIZE)
+                ]
+            )
+        total = chunk_count or doc.chunk_size
+        synced = await blocking_func_to_async_no_executor(
+            self._chunk_dao.get_chunk_fingerprints, doc.id
+        )
+        # Synced before the chunk hashes were recorded, re-sync entirely
+        legacy = any(
+            content_hash is None or not vector_id
+            for _, content_hash, vector_id in synced
+        )
+        # content hash -> [(chunk entity id, vector id)]
+        synced_chunks: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+        if not legacy:
+            for chunk_id, content_hash, vector_id in synced:
+                synced_chunks[content_hash].append((chunk_id, vector_id))
+
+        vector_ids: List[Optional[str]] = []
+        # The ids which can't be mapped to the chunks
+        unmapped_ids: List[str] = []
+        count = new_count = 0
+        while True:
+            batch = await blocking_func_to_async(self.executor, next, chunks, None)
+            if batch is None:
+                break
+            batch_ids: List[Optional[str]] = []
+            new_chunks: List[Chunk] = []
+            new_hashes: List[str] = []
+            for chunk in batch:
+                content_hash = _hash_chunk(chunk)
+                if synced_chunks.get(content_hash):
+                    # The chunk is not changed
+                    batch_ids.append(synced_chunks[content_hash].pop()[1])
+                else:
+                    batch_ids.append(None)
+                    new_chunks.append(chunk)
+                    new_hashes.append(content_hash)
+            new_vector_ids: List[Optional[str]] = []
+            if new_chunks:
+                loaded_ids = await vector_store_connector.aload_document(new_chunks)
+                if len(loaded_ids) == len(new_chunks):
+                    new_vector_ids.extend(loaded_ids)
+                else:
+                    # The document will be re-synced entirely next time
+                    logger.warning(
+                        f"vector store returns {len(loaded_ids)} ids for "
+                        f"{len(new_chunks)} chunks, doc:{doc.doc_name}"
+                    )
+                    new_vector_ids.extend([None] * len(new_chunks))
+                    unmapped_ids.extend(loaded_ids)
+                await blocking_func_to_async_no_executor(
+                    self._save_chunks, doc, new_chunks, new_hashes, new_vector_ids
+                )
+            new_ids = iter(new_vector_ids)
+            vector_ids.extend(
+                vector_id if vector_id is not None else next(new_ids)
+                for vector_id in batch_ids
+            )
+            count += len(batch)
+            new_count += len(new_chunks)
+            if progress_callback and total:
+                await blocking_func_to_async_no_executor(
+                    progress_callback, min(99, int(99 * count / total))
+                )
+
+        if legacy:
+            removed_ids = [chunk_id for chunk_id, _, _ in synced]
+            removed_vector_ids = self._document_vector_ids(
+                doc, [vector_id for _, _, vector_id in synced if vector_id]
+            )
+        else:
+            removed = [item for items in synced_chunks.values() for item in items]
+            removed_ids = [chunk_id for chunk_id, _ in removed]
+            removed_vector_ids = [vector_id for _, vector_id in removed]
+        logger.info(
+            f"sync document chunks, doc:{doc.doc_name}, "
+            f"unchanged:{count - new_count}, new:{new_count}, "
+            f"removed:{len(removed_ids)}"
+        )
+        if removed_vector_ids:
+            await blocking_func_to_async_no_executor(
+                self._delete_vectors, vector_store_connector, removed_vector_ids
+            )
+        if removed_ids:
+            await blocking_func_to_async_no_executor(
+                self._chunk_dao.delete_chunks, removed_ids
+            )
+
+        # Keep the ids can't be mapped, they are deleted with the document
+        doc.vector_ids = ",".join(unmapped_ids) if unmapped_ids else None
+        doc.chunk_size = count
+        all_ids = [vector_id for vector_id in vector_ids if vector_id is not None]
+        return all_ids + unmapped_ids
+
+    def _document_vector_ids(
+        self,
+        doc: KnowledgeDocumentEntity,
+        chunk_vector_ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Return the vector ids of the document.
+
+        They are the vector ids of the chunks and the ids which can't be mapped to
+        the chunks, the documents synced before the ids were saved with the chunks
+        have all the ids in `doc.vector_ids`.
+        """
+        if chunk_vector_ids is None:
+            chunk_vector_ids = self._chunk_dao.get_vector_ids(doc.id)
+        extra_ids = doc.vector_ids.split(",") if doc.vector_ids else []
+        return list(dict.fromkeys(chunk_vector_ids + extra_ids))
+
+    def _delete_vectors(
+        self, vector_store_connector: VectorStoreConnector, vector_ids: List[str]
+    ) -> None:
+        """Delete the vectors from the vector store in batches."""
+        for i in range(0, len(vector_ids), _DELETE_BATCH_SIZE):
+            vector_store_connector.delete_by_ids(
+                ",".join(vector_ids[i : i + _DELETE_BATCH_SIZE])
+            )
+
+    def _save_chunks(
+        self,
+        doc: KnowledgeDocumentEntity,
+        chunks: List[Chunk],
+        hashes: Optional[List[str]] = None,
+        vector_ids: Optional[List[Optional[str]]] = None,
+    ) -> None:
+        """Save the chunk details of the document."""
+        chunk_entities = [
+            DocumentChunkEntity(
+                doc_name=doc.doc_name,
+                doc_type=doc.doc_type,
+                document_id=doc.id,
+                content=chunk_doc.content,
+                meta_info=str(chunk_doc.metadata),
+                content_hash=hashes[i] if hashes else None,
+                vector_id=vector_ids[i] if vector_ids else None,
+                gmt_created=datetime.now(),
+                gmt_modified=datetime.now(),
+            )
+            for i, chunk_doc in enumerate(chunks)
+        ]
+        if chunk_entities:
+            self._chunk_dao.create_documents_chunks(chunk_entities)
+
     def get_space_context(self, space_id):
         """get space contect
         Args:
@@ -0,0 +1,87 @@
+import asyncio
+from collections import defaultdict
+
+import pytest
+
+from ..service.ingestion import IngestionJob, IngestionScheduler
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limits():
+    scheduler = IngestionScheduler(max_concurrency=3, max_space_concurrency=2)
+    running = defaultdict(int)
+    max_running = defaultdict(int)
+    finished = []
+
+    def make_job(document_id: int, space_id: str) -> IngestionJob:
+        async def run():
+            running[space_id] += 1
+            running["all"] += 1
+            max_running[space_id] = max(max_running[space_id], running[space_id])
+            max_running["all"] = max(max_running["all"], running["all"])
+            await asyncio.sleep(0.01)
+            running[space_id] -= 1
+            running["all"] -= 1
+            finished.append(document_id)
+
+        return IngestionJob(document_id=document_id, space_id=space_id, run=run)
+
+    for i in range(8):
+        assert scheduler.submit(make_job(i, "a" if i < 6 else "b"))
+    assert scheduler.running_count == 3
+    assert scheduler.waiting_count == 5
+    await scheduler.join()
+    assert sorted(finished) == list(range(8))
+    assert max_running["all"] == 3
+    assert max_running["a"] == 2
+    assert max_running["b"] == 1
+
+
+@pytest.mark.asyncio
+async def test_small_documents_first():
+    scheduler = IngestionScheduler(max_concurrency=1, small_doc_size=100)
+    started = []
+    blocker = asyncio.Event()
+
+    def make_job(document_id: int, doc_size: int) -> IngestionJob:
+        async def run():
+            started.append(document_id)
+            if document_id == 0:
+                await blocker.wait()
+
+        return IngestionJob(
+            document_id=document_id, space_id="a", run=run, doc_size=doc_size
+        )
+
+    scheduler.submit(make_job(0, 10))
+    scheduler.submit(make_job(1, 1000))
+    scheduler.submit(make_job(2, 2000))
+    scheduler.submit(make_job(3, 10))
+    assert scheduler.position(0) == 0
+    assert scheduler.position(3) == 1
+    assert scheduler.position(1) == 2
+    assert scheduler.position(4) is None
+    # The job of the document is already scheduled
+    assert not scheduler.submit(make_job(1, 1000))
+
+    blocker.set()
+    await scheduler.join()
+    assert started == [0, 3, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_releases_slot():
+    scheduler = IngestionScheduler(max_concurrency=1)
+    finished = []
+
+    async def fail():
+        raise ValueError("failed")
+
+    async def run():
+        finished.append(2)
+
+    scheduler.submit(IngestionJob(document_id=1, space_id="a", run=fail))
+    scheduler.submit(IngestionJob(document_id=2, space_id="a", run=run))
+    await scheduler.join()
+    assert finished == [2]
+    assert scheduler.running_count == 0
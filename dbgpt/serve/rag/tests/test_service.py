@@ -0,0 +1,295 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import pytest
+
+from dbgpt._private.pydantic import model_to_dict
+from dbgpt.app.knowledge.chunk_db import DocumentChunkEntity
+from dbgpt.app.knowledge.document_db import KnowledgeDocumentEntity
+from dbgpt.component import SystemApp
+from dbgpt.core import Chunk
+from dbgpt.rag.chunk_manager import ChunkParameters
+from dbgpt.serve.core.tests.conftest import system_app  # noqa: F401
+from dbgpt.storage.metadata import db
+
+from ..api.schemas import KnowledgeSyncRequest
+from ..models.models import KnowledgeIngestionJobEntity
+from ..service.ingestion import parse_document, read_chunk_batches
+from ..service.service import IngestionJobStatus, Service, _hash_document
+
+
+class MockVectorStoreConnector:
+    def __init__(self):
+        self.loaded: List[Chunk] = []
+        self.deleted: List[str] = []
+
+    async def aload_document(self, chunks: List[Chunk]) -> List[str]:
+        self.loaded.extend(chunks)
+        return [chunk.chunk_id for chunk in chunks]
+
+    def delete_by_ids(self, ids: str):
+        self.deleted.extend(ids.split(","))
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown(tmp_path):
+    # The chunks are synced in other threads, the in-memory database can't be shared
+    db.init_db(f"sqlite:///{tmp_path / 'test.db'}")
+    db.create_all()
+    yield
+
+
+@pytest.fixture
+def service(system_app: SystemApp):  # noqa: F811
+    instance = Service(system_app)
+    instance.init_app(system_app)
+    return instance
+
+
+@pytest.fixture
+def document(service: Service):
+    doc_id = service._document_dao.create_knowledge_document(
+        KnowledgeDocumentEntity(
+            doc_name="test.md", doc_type="DOCUMENT", space="test", status="TODO"
+        )
+    )
+    return service._document_dao.documents_by_ids([doc_id])[0]
+
+
+def _chunks(*contents: str) -> List[Chunk]:
+    return [
+        Chunk(content=content, metadata={"source": "test.md"}) for content in contents
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sync_document_chunks_incrementally(service: Service, document):
+    connector = MockVectorStoreConnector()
+    first = _chunks("a", "b", "c")
+    vector_ids = await service._sync_document_chunks(document, first, connector)
+    assert vector_ids == [chunk.chunk_id for chunk in first]
+    assert connector.loaded == first
+
+    connector = MockVectorStoreConnector()
+    second = _chunks("a", "c changed", "d")
+    progress = []
+    vector_ids = await service._sync_document_chunks(
+        document, second, connector, progress_callback=progress.append
+    )
+    assert progress == [99]
+    # Just the changed and the new chunks are embedded
+    assert [chunk.content for chunk in connector.loaded] == ["c changed", "d"]
+    assert sorted(connector.deleted) == sorted([first[1].chunk_id, first[2].chunk_id])
+    assert vector_ids == [first[0].chunk_id, second[1].chunk_id, second[2].chunk_id]
+
+    synced = service._chunk_dao.get_chunk_fingerprints(document.id)
+    assert sorted(vector_id for _, _, vector_id in synced) == sorted(vector_ids)
+    # The vector ids are mapped by the chunks
+    assert document.vector_ids is None
+    assert sorted(service._document_vector_ids(document)) == sorted(vector_ids)
+
+    connector = MockVectorStoreConnector()
+    await service._sync_document_chunks(
+        document, _chunks("a", "c changed", "d"), connector
+    )
+    assert connector.loaded == []
+    assert connector.deleted == []
+
+
+@pytest.mark.asyncio
+async def test_sync_document_chunk_batches(service: Service, document):
+    first = _chunks("a", "b", "c")
+    await service._sync_document_chunks(document, first, MockVectorStoreConnector())
+
+    connector = MockVectorStoreConnector()
+    batches = [_chunks("a", "d"), _chunks("c", "e"), _chunks("f")]
+    progress = []
+    vector_ids = await service._sync_document_chunks(
+        document,
+        iter(batches),
+        connector,
+        progress_callback=progress.append,
+        chunk_count=5,
+    )
+    # The progress is reported after each batch
+    assert progress == [39, 79, 99]
+    assert [chunk.content for chunk in connector.loaded] == ["d", "e", "f"]
+    assert connector.deleted == [first[1].chunk_id]
+    assert vector_ids == [
+        first[0].chunk_id,
+        batches[0][1].chunk_id,
+        first[2].chunk_id,
+        batches[1][1].chunk_id,
+        batches[2][0].chunk_id,
+    ]
+    assert document.chunk_size == 5
+    assert len(service._chunk_dao.get_chunk_fingerprints(document.id)) == 5
+
+
+@pytest.mark.asyncio
+async def test_sync_legacy_document_chunks(service: Service, document):
+    # The chunks synced without the hashes
+    service._chunk_dao.create_documents_chunks(
+        [
+            DocumentChunkEntity(
+                doc_name=document.doc_name,
+                doc_type=document.doc_type,
+                document_id=document.id,
+                content="a",
+                meta_info="",
+            )
+        ]
+    )
+    document.vector_ids = "old-1,old-2"
+    connector = MockVectorStoreConnector()
+    chunks = _chunks("a", "b")
+    await service._sync_document_chunks(document, chunks, connector)
+    assert connector.loaded == chunks
+    assert connector.deleted == ["old-1", "old-2"]
+    assert document.vector_ids is None
+    assert len(service._chunk_dao.get_chunk_fingerprints(document.id)) == 2
+
+
+def test_hash_document(tmp_path):
+    file_path = tmp_path / "test.md"
+    file_path.write_text("hello")
+    doc = KnowledgeDocumentEntity(doc_type="DOCUMENT", content=str(file_path))
+    params = ChunkParameters(chunk_size=100)
+    content_hash = _hash_document(doc, params)
+    assert content_hash == _hash_document(doc, params)
+    assert content_hash != _hash_document(doc, ChunkParameters(chunk_size=200))
+    file_path.write_text("hello world")
+    assert content_hash != _hash_document(doc, params)
+
+    url_doc = KnowledgeDocumentEntity(doc_type="URL", content="https://example.com")
+    assert _hash_document(url_doc, params) is None
+
+
+@pytest.mark.asyncio
+async def test_resume_ingestion_jobs(service: Service):
+    for document_id, status in enumerate(IngestionJobStatus):
+        service._job_dao.save_job(
+            KnowledgeIngestionJobEntity(
+                document_id=document_id,
+                space_id="1",
+                status=status.name,
+                doc_size=100,
+            )
+        )
+    resumed = []
+
+    async def run(document_id: int):
+        resumed.append(document_id)
+
+    service._run_ingestion_job = run
+    assert await service.resume_ingestion_jobs() == 2
+    await service._scheduler.join()
+    assert sorted(resumed) == [0, 1]
+    progress = service.get_document_sync_progress(0)
+    assert progress.status == IngestionJobStatus.QUEUED.name
+    assert progress.queue_position is None
+
+
+@pytest.mark.asyncio
+async def test_run_ingestion_job_of_deleted_document(service: Service):
+    service._job_dao.save_job(
+        KnowledgeIngestionJobEntity(
+            document_id=100, space_id="1", status=IngestionJobStatus.QUEUED.name
+        )
+    )
+    await service._run_ingestion_job(100)
+    assert service._job_dao.get_jobs([100]) == []
+    assert service.get_document_sync_progress(100) is None
+
+
+@pytest.mark.asyncio
+async def test_sync_documents_in_batch(service: Service, tmp_path):
+    doc_ids = []
+    for i, status in enumerate(["TODO", "FAILED", "RUNNING"]):
+        file_path = tmp_path / f"test{i}.txt"
+        file_path.write_text(f"hello {i}")
+        doc_ids.append(
+            service._document_dao.create_knowledge_document(
+                KnowledgeDocumentEntity(
+                    doc_name=file_path.name,
+                    doc_type="DOCUMENT",
+                    space="test",
+                    status=status,
+                    content=str(file_path),
+                )
+            )
+        )
+    synced = []
+
+    async def run(document_id: int):
+        synced.append(document_id)
+
+    service._run_ingestion_job = run
+
+    def requests(ids):
+        return [
+            KnowledgeSyncRequest(
+                doc_id=doc_id,
+                space_id="1",
+                chunk_parameters=ChunkParameters(chunk_strategy="CHUNK_BY_SIZE"),
+            )
+            for doc_id in ids
+        ]
+
+    # All the documents are checked before any of them is queued
+    with pytest.raises(Exception, match="can not sync"):
+        await service.sync_document(requests(doc_ids))
+    assert service._job_dao.get_jobs() == []
+
+    assert await service.sync_document(requests(doc_ids[:2])) == doc_ids[:2]
+    await service._scheduler.join()
+    assert sorted(synced) == doc_ids[:2]
+    docs = service._document_dao.documents_by_ids(doc_ids[:2])
+    assert [doc.status for doc in docs] == ["RUNNING", "RUNNING"]
+
+
+def test_parse_document_in_process(tmp_path):
+    file_path = tmp_path / "test.txt"
+    file_path.write_text("hello\nworld")
+    chunk_parameters = json.dumps(
+        model_to_dict(
+            ChunkParameters(chunk_strategy="CHUNK_BY_SIZE"), exclude_none=True
+        )
+    )
+    output_path = str(tmp_path / "test.chunks")
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        count = executor.submit(
+            parse_document, str(file_path), "DOCUMENT", chunk_parameters, output_path
+        ).result()
+    assert count == 1
+    batches = list(read_chunk_batches(output_path))
+    assert [[chunk.content for chunk in batch] for batch in batches] == [
+        ["hello\nworld"]
+    ]
+    assert batches[0][0].metadata == {"source": str(file_path)}
+
+
+def test_get_chunk_list_after(service: Service, document):
+    service._save_chunks(
+        document,
+        _chunks(*[str(i) for i in range(5)]),
+        vector_ids=[f"v{i}" for i in range(5)],
+    )
+    pages = []
+    after_id = None
+    while True:
+        page = service.get_chunk_list_after(document.id, after_id, page_size=2)
+        pages.append([chunk.content for chunk in page.items])
+        after_id = page.next_after_id
+        if after_id is None:
+            break
+    assert pages == [["0", "1"], ["2", "3"], ["4"]]
+    assert service.get_chunk_list_after(document.id + 1).items == []
+    assert service._chunk_dao.get_vector_ids(document.id) == [f"v{i}" for i in range(5)]
+    assert [
+        chunk.content
+        for chunk in service._chunk_dao.iter_document_chunks(
+            DocumentChunkEntity(document_id=document.id), batch_size=2
+        )
+    ] == [str(i) for i in range(5)]
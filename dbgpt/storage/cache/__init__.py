@@ -1,12 +1,18 @@
 """Module for cache storage."""
+from .extraction_cache import ExtractionCacheClient, ExtractionResultCache  # noqa: F401
 from .llm_cache import LLMCacheClient, LLMCacheKey, LLMCacheValue  # noqa: F401
 from .manager import CacheManager, initialize_cache  # noqa: F401
+from .sql_cache import SQLCacheClient, SQLResultCache  # noqa: F401
 from .storage.base import MemoryCacheStorage  # noqa: F401
 
 __all__ = [
     "LLMCacheKey",
     "LLMCacheValue",
     "LLMCacheClient",
+    "SQLCacheClient",
+    "SQLResultCache",
+    "ExtractionCacheClient",
+    "ExtractionResultCache",
     "CacheManager",
     "initialize_cache",
     "MemoryCacheStorage",
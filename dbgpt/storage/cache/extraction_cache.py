@@ -0,0 +1,271 @@
+"""Cache client for the LLM extraction results.
+
+The responses of the LLM extractors (e.g. the triplets, graphs and keywords of the
+knowledge graph) are cached, so re-ingesting a document does not call the LLM again
+for the chunks it has seen. The cache key contains the hash of the text, the hash of
+the prompt template of the extractor and the model name.
+"""
+
+import hashlib
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional, cast
+
+from dbgpt.core.interface.cache import CacheClient, CacheConfig, CacheKey, CacheValue
+from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
+
+from .manager import CacheManager
+
+logger = logging.getLogger(__name__)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ExtractionCacheKeyData:
+    """Cache key data for the LLM extraction results."""
+
+    text_hash: str
+    prompt_hash: str
+    model_name: str
+
+
+@dataclass
+class ExtractionCacheValueData:
+    """Cache value data for the LLM extraction results."""
+
+    response: str
+    created_at: float = field(default_factory=time.time)
+
+    @staticmethod
+    def from_dict(**kwargs) -> "ExtractionCacheValueData":
+        """Create ExtractionCacheValueData object from dict."""
+        return ExtractionCacheValueData(**kwargs)
+
+    def to_dict(self) -> Dict:
+        """Convert to dict."""
+        return asdict(self)
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"response: {self.response[:50]}"
+
+
+class ExtractionCacheKey(CacheKey[ExtractionCacheKeyData]):
+    """Cache key for the LLM extraction results."""
+
+    def __init__(self, **kwargs) -> None:
+        """Create a new instance of ExtractionCacheKey."""
+        super().__init__()
+        self.config = ExtractionCacheKeyData(**kwargs)
+
+    def __hash__(self) -> int:
+        """Return the hash value of the object."""
+        serialize_bytes = self.serialize()
+        return int(hashlib.sha256(serialize_bytes).hexdigest(), 16)
+
+    def __eq__(self, other: Any) -> bool:
+        """Check equality with another key."""
+        if not isinstance(other, ExtractionCacheKey):
+            return False
+        return self.config == other.config
+
+    def get_hash_bytes(self) -> bytes:
+        """Return the byte array of hash value.
+
+        Returns:
+            bytes: The byte array of hash value.
+        """
+        serialize_bytes = self.serialize()
+        return hashlib.sha256(serialize_bytes).digest()
+
+    def to_dict(self) -> Dict:
+        """Convert to dict."""
+        return asdict(self.config)
+
+    def get_value(self) -> ExtractionCacheKeyData:
+        """Return the real object of current cache key."""
+        return self.config
+
+
+class ExtractionCacheValue(CacheValue[ExtractionCacheValueData]):
+    """Cache value for the LLM extraction results."""
+
+    def __init__(self, **kwargs) -> None:
+        """Create a new instance of ExtractionCacheValue."""
+        super().__init__()
+        self.value = ExtractionCacheValueData.from_dict(**kwargs)
+
+    def to_dict(self) -> Dict:
+        """Convert to dict."""
+        return self.value.to_dict()
+
+    def get_value(self) -> ExtractionCacheValueData:
+        """Return the underlying real value."""
+        return self.value
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"value: {str(self.value)}"
+
+
+class ExtractionCacheClient(
+    CacheClient[ExtractionCacheKeyData, ExtractionCacheValueData]
+):
+    """Cache client for the LLM extraction results."""
+
+    def __init__(self, cache_manager: CacheManager) -> None:
+        """Create a new instance of ExtractionCacheClient."""
+        super().__init__()
+        self._cache_manager: CacheManager = cache_manager
+
+    async def get(
+        self,
+        key: ExtractionCacheKey,  # type: ignore
+        cache_config: Optional[CacheConfig] = None,
+    ) -> Optional[ExtractionCacheValue]:
+        """Retrieve a value from the cache using the provided key.
+
+        Args:
+            key (ExtractionCacheKey): The key to get cache
+            cache_config (Optional[CacheConfig]): Cache config
+
+        Returns:
+            Optional[ExtractionCacheValue]: The value retrieved according to key. If
+                cache key not exist, return None.
+        """
+        return cast(
+            ExtractionCacheValue,
+            await self._cache_manager.get(key, ExtractionCacheValue, cache_config),
+        )
+
+    async def set(
+        self,
+        key: ExtractionCacheKey,  # type: ignore
+        value: ExtractionCacheValue,  # type: ignore
+        cache_config: Optional[CacheConfig] = None,
+    ) -> None:
+        """Set a value in the cache for the provided key."""
+        return await self._cache_manager.set(key, value, cache_config)
+
+    async def exists(
+        self,
+        key: ExtractionCacheKey,  # type: ignore
+        cache_config: Optional[CacheConfig] = None,
+    ) -> bool:
+        """Check if a key exists in the cache."""
+        return await self.get(key, cache_config) is not None
+
+    def sync_get(
+        self, key: ExtractionCacheKey, cache_config: Optional[CacheConfig] = None
+    ) -> Optional[ExtractionCacheValue]:
+        """Retrieve a value from the cache synchronously."""
+        return cast(
+            ExtractionCacheValue,
+            self._cache_manager.sync_get(key, ExtractionCacheValue, cache_config),
+        )
+
+    def sync_set(
+        self,
+        key: ExtractionCacheKey,
+        value: ExtractionCacheValue,
+        cache_config: Optional[CacheConfig] = None,
+    ) -> None:
+        """Set a value in the cache synchronously."""
+        self._cache_manager.sync_set(key, value, cache_config)
+
+    def new_key(self, **kwargs) -> ExtractionCacheKey:  # type: ignore
+        """Create a cache key with params."""
+        key = ExtractionCacheKey(**kwargs)
+        key.set_serializer(self._cache_manager.serializer)
+        return key
+
+    def new_value(self, **kwargs) -> ExtractionCacheValue:  # type: ignore
+        """Create a cache value with params."""
+        value = ExtractionCacheValue(**kwargs)
+        value.set_serializer(self._cache_manager.serializer)
+        return value
+
+
+class ExtractionResultCache:
+    """The cache of the LLM responses of the extractors.
+
+    The raw responses are cached instead of the parsed results, so the cached
+    responses can be parsed with any limit. The errors of the cache are logged and
+    ignored, the extraction falls back to the LLM.
+
+    Examples:
+        .. code-block:: python
+
+            extraction_cache = ExtractionResultCache(cache_manager)
+            response = await extraction_cache.get(text, prompt_template, model_name)
+            if response is None:
+                response = await call_llm(text)
+                await extraction_cache.set(text, prompt_template, model_name, response)
+    """
+
+    def __init__(self, cache_manager: CacheManager, ttl: Optional[float] = None):
+        """Create a new ExtractionResultCache.
+
+        Args:
+            cache_manager (CacheManager): The cache manager.
+            ttl (Optional[float]): The seconds the responses are valid, never expired
+                if it is None.
+        """
+        self._client = ExtractionCacheClient(cache_manager)
+        self._ttl = ttl
+
+    def _new_key(self, text: str, prompt: str, model_name: str) -> ExtractionCacheKey:
+        return self._client.new_key(
+            text_hash=_sha256(text),
+            prompt_hash=_sha256(prompt),
+            model_name=model_name,
+        )
+
+    async def get(self, text: str, prompt: str, model_name: str) -> Optional[str]:
+        """Get the cached response of the text.
+
+        Args:
+            text (str): The text to extract from.
+            prompt (str): The prompt template of the extractor.
+            model_name (str): The name of the model.
+
+        Returns:
+            Optional[str]: The cached response, None if not cached or expired.
+        """
+        try:
+            key = self._new_key(text, prompt, model_name)
+            value = await blocking_func_to_async_no_executor(self._client.sync_get, key)
+        except Exception as e:
+            logger.warning(f"Get extraction cache error: {e}")
+            return None
+        if not value:
+            return None
+        data = value.get_value()
+        if self._ttl is not None and time.time() - data.created_at > self._ttl:
+            return None
+        return data.response
+
+    async def set(self, text: str, prompt: str, model_name: str, response: str) -> bool:
+        """Cache the response of the text.
+
+        Args:
+            text (str): The text to extract from.
+            prompt (str): The prompt template of the extractor.
+            model_name (str): The name of the model.
+            response (str): The response of the LLM.
+
+        Returns:
+            bool: True if the response is cached.
+        """
+        try:
+            key = self._new_key(text, prompt, model_name)
+            value = self._client.new_value(response=response)
+            await blocking_func_to_async_no_executor(self._client.sync_set, key, value)
+        except Exception as e:
+            logger.warning(f"Set extraction cache error: {e}")
+            return False
+        return True
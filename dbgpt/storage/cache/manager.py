@@ -46,6 +46,28 @@ class CacheManager(BaseComponent, ABC):
     ) -> Optional[CacheValue[V]]:
         """Retrieve cache with key."""
 
+    def sync_set(
+        self,
+        key: CacheKey[K],
+        value: CacheValue[V],
+        cache_config: Optional[CacheConfig] = None,
+    ):
+        """Set cache with key synchronously.
+
+        It is used by the callers running in a worker thread, e.g. the datasource
+        queries.
+        """
+        raise NotImplementedError
+
+    def sync_get(
+        self,
+        key: CacheKey[K],
+        cls: Type[Serializable],
+        cache_config: Optional[CacheConfig] = None,
+    ) -> Optional[CacheValue[V]]:
+        """Retrieve cache with key synchronously."""
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def serializer(self) -> Serializer:
@@ -103,6 +125,29 @@ class LocalCacheManager(CacheManager):
             CacheValue[V], self._serializer.deserialize(item_bytes.value_data, cls)
         )
 
+    def sync_set(
+        self,
+        key: CacheKey[K],
+        value: CacheValue[V],
+        cache_config: Optional[CacheConfig] = None,
+    ):
+        """Set cache with key synchronously."""
+        self._storage.set(key, value, cache_config)
+
+    def sync_get(
+        self,
+        key: CacheKey[K],
+        cls: Type[Serializable],
+        cache_config: Optional[CacheConfig] = None,
+    ) -> Optional[CacheValue[V]]:
+        """Retrieve cache with key synchronously."""
+        item_bytes = self._storage.get(key, cache_config)
+        if not item_bytes:
+            return None
+        return cast(
+            CacheValue[V], self._serializer.deserialize(item_bytes.value_data, cls)
+        )
+
     @property
     def serializer(self) -> Serializer:
         """Return serializer to serialize/deserialize cache value."""
@@ -0,0 +1,421 @@
+"""Cache client for the SQL query results.
+
+The results of the read only queries of the chat with datasource scenes (e.g. the
+charts of a dashboard) are cached, so repeated queries don't hit the database again.
+The cache key contains the datasource, the normalized SQL and the fingerprint of the
+schema, and the cached results expire after a TTL.
+"""
+
+import base64
+import datetime
+import decimal
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, cast
+
+from dbgpt.core.interface.cache import CacheClient, CacheConfig, CacheKey, CacheValue
+
+from .manager import CacheManager
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_sql(sql: str) -> str:
+    """Normalize the SQL to make the equivalent queries share the cache.
+
+    The comments are removed, the whitespaces outside the literals are collapsed and
+    the trailing semicolon is removed. The case of the SQL is kept, because the
+    identifiers may be case sensitive in some databases.
+
+    Args:
+        sql (str): The SQL to normalize.
+
+    Returns:
+        str: The normalized SQL.
+    """
+    import sqlparse
+
+    tokens: List[str] = []
+    for statement in sqlparse.parse(sqlparse.format(sql, strip_comments=True)):
+        for token in statement.flatten():
+            if token.is_whitespace:
+                if tokens and tokens[-1] != " ":
+                    tokens.append(" ")
+            else:
+                tokens.append(token.value)
+    return "".join(tokens).strip().rstrip(";").strip()
+
+
+def _encode_cell(value: Any) -> Any:
+    """Encode a cell of the result to a JSON serializable value with its type."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, decimal.Decimal):
+        return {"t": "decimal", "v": str(value)}
+    if isinstance(value, datetime.datetime):
+        return {"t": "datetime", "v": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"t": "date", "v": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {"t": "time", "v": value.isoformat()}
+    if isinstance(value, datetime.timedelta):
+        return {"t": "timedelta", "v": value.total_seconds()}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"t": "bytes", "v": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, (dict, list)):
+        return {"t": "json", "v": value}
+    return str(value)
+
+
+def _decode_cell(value: Any) -> Any:
+    """Decode a cell encoded by :func:`_encode_cell`."""
+    if not isinstance(value, dict):
+        return value
+    value_type, data = value.get("t"), value.get("v")
+    if value_type == "decimal":
+        return decimal.Decimal(data)
+    if value_type == "datetime":
+        return datetime.datetime.fromisoformat(data)
+    if value_type == "date":
+        return datetime.date.fromisoformat(data)
+    if value_type == "time":
+        return datetime.time.fromisoformat(data)
+    if value_type == "timedelta":
+        return datetime.timedelta(seconds=data)
+    if value_type == "bytes":
+        return base64.b64decode(data)
+    return data
+
+
+@dataclass
+class SQLCacheKeyData:
+    """Cache key data for the SQL query results."""
+
+    datasource: str
+    sql: str
+    schema_fingerprint: str = ""
+    # Changed when the data of the datasource is written
+    generation: int = 0
+    max_rows: Optional[int] = None
+    max_bytes: Optional[int] = None
+
+
+@dataclass
+class SQLCacheValueData:
+    """Cache value data for the SQL query results."""
+
+    columns: List[str]
+    rows: List[Sequence[Any]]
+    truncated: bool = False
+    created_at: float = field(default_factory=time.time)
+    _encoded: bool = False
+
+    @staticmethod
+    def from_dict(**kwargs) -> "SQLCacheValueData":
+        """Create SQLCacheValueData object from dict."""
+        if kwargs.pop("_encoded", False):
+            kwargs["rows"] = [
+                tuple(_decode_cell(cell) for cell in row) for row in kwargs["rows"]
+            ]
+        return SQLCacheValueData(**kwargs)
+
+    def to_dict(self) -> Dict:
+        """Convert to dict, the cells are encoded with their types."""
+        return {
+            "columns": list(self.columns),
+            "rows": [[_encode_cell(cell) for cell in row] for row in self.rows],
+            "truncated": self.truncated,
+            "created_at": self.created_at,
+            "_encoded": True,
+        }
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"columns: {self.columns}, rows: {len(self.rows)}"
+
+
+class SQLCacheKey(CacheKey[SQLCacheKeyData]):
+    """Cache key for the SQL query results."""
+
+    def __init__(self, **kwargs) -> None:
+        """Create a new instance of SQLCacheKey."""
+        super().__init__()
+        self.config = SQLCacheKeyData(**kwargs)
+
+    def __hash__(self) -> int:
+        """Return the hash value of the object."""
+        serialize_bytes = self.serialize()
+        return int(hashlib.sha256(serialize_bytes).hexdigest(), 16)
+
+    def __eq__(self, other: Any) -> bool:
+        """Check equality with another key."""
+        if not isinstance(other, SQLCacheKey):
+            return False
+        return self.config == other.config
+
+    def get_hash_bytes(self) -> bytes:
+        """Return the byte array of hash value.
+
+        Returns:
+            bytes: The byte array of hash value.
+        """
+        serialize_bytes = self.serialize()
+        return hashlib.sha256(serialize_bytes).digest()
+
+    def to_dict(self) -> Dict:
+        """Convert to dict."""
+        return asdict(self.config)
+
+    def get_value(self) -> SQLCacheKeyData:
+        """Return the real object of current cache key."""
+        return self.config
+
+
+class SQLCacheValue(CacheValue[SQLCacheValueData]):
+    """Cache value for the SQL query results."""
+
+    def __init__(self, **kwargs) -> None:
+        """Create a new instance of SQLCacheValue."""
+        super().__init__()
+        self.value = SQLCacheValueData.from_dict(**kwargs)
+
+    def to_dict(self) -> Dict:
+        """Convert to dict."""
+        return self.value.to_dict()
+
+    def get_value(self) -> SQLCacheValueData:
+        """Return the underlying real value."""
+        return self.value
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"value: {str(self.value)}"
+
+
+class SQLCacheClient(CacheClient[SQLCacheKeyData, SQLCacheValueData]):
+    """Cache client for the SQL query results."""
+
+    def __init__(self, cache_manager: CacheManager) -> None:
+        """Create a new instance of SQLCacheClient."""
+        super().__init__()
+        self._cache_manager: CacheManager = cache_manager
+
+    async def get(
+        self,
+        key: SQLCacheKey,  # type: ignore
+        cache_config: Optional[CacheConfig] = None,
+    ) -> Optional[SQLCacheValue]:
+        """Retrieve a value from the cache using the provided key.
+
+        Args:
+            key (SQLCacheKey): The key to get cache
+            cache_config (Optional[CacheConfig]): Cache config
+
+        Returns:
+            Optional[SQLCacheValue]: The value retrieved according to key. If cache key
+                not exist, return None.
+        """
+        return cast(
+            SQLCacheValue,
+            await self._cache_manager.get(key, SQLCacheValue, cache_config),
+        )
+
+    async def set(
+        self,
+        key: SQLCacheKey,  # type: ignore
+        value: SQLCacheValue,  # type: ignore
+        cache_config: Optional[CacheConfig] = None,
+    ) -> None:
+        """Set a value in the cache for the provided key."""
+        return await self._cache_manager.set(key, value, cache_config)
+
+    async def exists(
+        self,
+        key: SQLCacheKey,  # type: ignore
+        cache_config: Optional[CacheConfig] = None,
+    ) -> bool:
+        """Check if a key exists in the cache."""
+        return await self.get(key, cache_config) is not None
+
+    def sync_get(
+        self, key: SQLCacheKey, cache_config: Optional[CacheConfig] = None
+    ) -> Optional[SQLCacheValue]:
+        """Retrieve a value from the cache synchronously."""
+        return cast(
+            SQLCacheValue,
+            self._cache_manager.sync_get(key, SQLCacheValue, cache_config),
+        )
+
+    def sync_set(
+        self,
+        key: SQLCacheKey,
+        value: SQLCacheValue,
+        cache_config: Optional[CacheConfig] = None,
+    ) -> None:
+        """Set a value in the cache synchronously."""
+        self._cache_manager.sync_set(key, value, cache_config)
+
+    def new_key(self, **kwargs) -> SQLCacheKey:  # type: ignore
+        """Create a cache key with params."""
+        key = SQLCacheKey(**kwargs)
+        key.set_serializer(self._cache_manager.serializer)
+        return key
+
+    def new_value(self, **kwargs) -> SQLCacheValue:  # type: ignore
+        """Create a cache value with params."""
+        value = SQLCacheValue(**kwargs)
+        value.set_serializer(self._cache_manager.serializer)
+        return value
+
+
+class SQLResultCache:
+    """The query result cache of a datasource.
+
+    It is called by the connectors in the query threads, so the cache is accessed
+    synchronously. The errors of the cache are logged and ignored, the query falls
+    back to the database.
+
+    Examples:
+        .. code-block:: python
+
+            result_cache = SQLResultCache(cache_manager, "my_db", ttl=600)
+            cached = result_cache.get(sql, schema_fingerprint)
+            if cached is None:
+                columns, rows = run_query(sql)
+                result_cache.set(sql, columns, rows, schema_fingerprint)
+    """
+
+    def __init__(
+        self,
+        cache_manager: CacheManager,
+        datasource: str,
+        ttl: Optional[float] = 600,
+        max_rows: Optional[int] = 10000,
+        max_bytes: Optional[int] = 8 * 1024 * 1024,
+    ):
+        """Create a new SQLResultCache.
+
+        Args:
+            cache_manager (CacheManager): The cache manager.
+            datasource (str): The name of the datasource.
+            ttl (Optional[float]): The seconds the results are valid, never expired
+                if it is None.
+            max_rows (Optional[int]): The results with more rows are not cached.
+            max_bytes (Optional[int]): The results with more estimated bytes are not
+                cached.
+        """
+        self._client = SQLCacheClient(cache_manager)
+        self._datasource = datasource
+        self._ttl = ttl
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        # The results cached before the restart may be stale, the writes are not
+        # tracked across restarts
+        self._generation = time.time_ns()
+        self._lock = threading.Lock()
+
+    @property
+    def datasource(self) -> str:
+        """Return the name of the datasource."""
+        return self._datasource
+
+    def _new_key(
+        self,
+        sql: str,
+        schema_fingerprint: str,
+        max_rows: Optional[int],
+        max_bytes: Optional[int],
+    ) -> SQLCacheKey:
+        return self._client.new_key(
+            datasource=self._datasource,
+            sql=normalize_sql(sql),
+            schema_fingerprint=schema_fingerprint,
+            generation=self._generation,
+            max_rows=max_rows,
+            max_bytes=max_bytes,
+        )
+
+    def get(
+        self,
+        sql: str,
+        schema_fingerprint: str = "",
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Optional[SQLCacheValueData]:
+        """Get the cached result of the query.
+
+        Args:
+            sql (str): The SQL of the query.
+            schema_fingerprint (str): The fingerprint of the schema.
+            max_rows (Optional[int]): The row limit of the query.
+            max_bytes (Optional[int]): The byte limit of the query.
+
+        Returns:
+            Optional[SQLCacheValueData]: The cached result, None if not cached or
+                expired.
+        """
+        try:
+            key = self._new_key(sql, schema_fingerprint, max_rows, max_bytes)
+            value = self._client.sync_get(key)
+        except Exception as e:
+            logger.warning(f"Get SQL result cache error: {e}")
+            return None
+        if not value:
+            return None
+        data = value.get_value()
+        if self._ttl is not None and time.time() - data.created_at > self._ttl:
+            return None
+        logger.info(f"Hit SQL result cache of datasource {self._datasource}")
+        return data
+
+    def set(
+        self,
+        sql: str,
+        columns: List[str],
+        rows: List[Sequence[Any]],
+        schema_fingerprint: str = "",
+        truncated: bool = False,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> bool:
+        """Cache the result of the query.
+
+        Args:
+            sql (str): The SQL of the query.
+            columns (List[str]): The column names of the result.
+            rows (List[Sequence[Any]]): The rows of the result.
+            schema_fingerprint (str): The fingerprint of the schema.
+            truncated (bool): Whether the result is truncated by the limits.
+            max_rows (Optional[int]): The row limit of the query.
+            max_bytes (Optional[int]): The byte limit of the query.
+
+        Returns:
+            bool: True if the result is cached, the results exceed the size limits
+                are not cached.
+        """
+        if self._max_rows is not None and len(rows) > self._max_rows:
+            return False
+        try:
+            key = self._new_key(sql, schema_fingerprint, max_rows, max_bytes)
+            value = self._client.new_value(
+                columns=list(columns), rows=list(rows), truncated=truncated
+            )
+            if self._max_bytes is not None and len(value.serialize()) > self._max_bytes:
+                return False
+            self._client.sync_set(key, value)
+        except Exception as e:
+            logger.warning(f"Set SQL result cache error: {e}")
+            return False
+        return True
+
+    def invalidate(self) -> None:
+        """Invalidate all the cached results of the datasource.
+
+        It is called after the data or the schema of the datasource is changed, the
+        old results can't be hit any more and will be evicted by the cache storage.
+        """
+        with self._lock:
+            self._generation = max(self._generation + 1, time.time_ns())
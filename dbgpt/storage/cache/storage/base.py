@@ -1,5 +1,6 @@
 """Base cache storage class."""
 import logging
+import threading
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from dataclasses import dataclass
@@ -198,6 +199,7 @@ class MemoryCacheStorage(CacheStorage):
         self.cache: OrderedDict = OrderedDict()
         self.max_memory = max_memory_mb * 1024 * 1024
         self.current_memory_usage = 0
+        self._lock = threading.Lock()
 
     def check_config(
         self,
@@ -223,13 +225,16 @@ class MemoryCacheStorage(CacheStorage):
         self.check_config(cache_config, raise_error=True)
         # Exact match retrieval
         key_hash = hash(key)
-        item: Optional[StorageItem] = self.cache.get(key_hash)
-        logger.debug(f"MemoryCacheStorage get key {key}, hash {key_hash}, item: {item}")
-
-        if not item:
-            return None
-        # Move the item to the end of the OrderedDict to signify recent use.
-        self.cache.move_to_end(key_hash)
+        with self._lock:
+            item: Optional[StorageItem] = self.cache.get(key_hash)
+            logger.debug(
+                f"MemoryCacheStorage get key {key}, hash {key_hash}, item: {item}"
+            )
+            if not item:
+                return None
+            if not cache_config or cache_config.cache_policy != CachePolicy.FIFO:
+                # Move the item to the end of the OrderedDict to signify recent use.
+                self.cache.move_to_end(key_hash)
         return item
 
     def set(
@@ -243,13 +248,20 @@ class MemoryCacheStorage(CacheStorage):
         item = StorageItem.build_from_kv(key, value)
         # Calculate memory size of the new entry
         new_entry_size = _get_object_bytes(item)
-        # Evict entries if necessary
-        while self.current_memory_usage + new_entry_size > self.max_memory:
-            self._apply_cache_policy(cache_config)
-
-        # Store the item in the cache.
-        self.cache[key_hash] = item
-        self.current_memory_usage += new_entry_size
+        with self._lock:
+            old_item = self.cache.pop(key_hash, None)
+            if old_item is not None:
+                self.current_memory_usage -= _get_object_bytes(old_item)
+            # Evict entries if necessary
+            while (
+                self.cache
+                and self.current_memory_usage + new_entry_size > self.max_memory
+            ):
+                self._apply_cache_policy(cache_config)
+
+            # Store the item in the cache.
+            self.cache[key_hash] = item
+            self.current_memory_usage += new_entry_size
         logger.debug(f"MemoryCacheStorage set key {key}, hash {key_hash}, item: {item}")
 
     def exists(
@@ -259,8 +271,7 @@ class MemoryCacheStorage(CacheStorage):
         return self.get(key, cache_config) is not None
 
     def _apply_cache_policy(self, cache_config: Optional[CacheConfig] = None):
-        # Remove the oldest/newest item based on the cache policy.
-        if cache_config and cache_config.cache_policy == CachePolicy.FIFO:
-            self.cache.popitem(last=False)
-        else:  # Default is LRU
-            self.cache.popitem(last=True)
+        # Remove the first item, it is the least recently used one with the LRU
+        # policy (the used items are moved to the end) or the oldest one with FIFO.
+        _, item = self.cache.popitem(last=False)
+        self.current_memory_usage -= _get_object_bytes(item)
@@ -0,0 +1,77 @@
+import datetime
+import decimal
+
+import pytest
+
+from dbgpt.util.serialization.json_serialization import JsonSerializer
+
+from ..manager import LocalCacheManager
+from ..sql_cache import SQLResultCache, normalize_sql
+from ..storage.base import MemoryCacheStorage
+
+
+@pytest.fixture
+def cache_manager():
+    return LocalCacheManager(None, JsonSerializer(), MemoryCacheStorage())
+
+
+def test_normalize_sql():
+    sql = "SELECT  id,\n  name -- the name\nFROM user WHERE name = 'a  b';"
+    assert normalize_sql(sql) == "SELECT id, name FROM user WHERE name = 'a  b'"
+    assert normalize_sql("select *\tfrom t") == "select * from t"
+
+
+def test_get_set(cache_manager):
+    cache = SQLResultCache(cache_manager, "test_db")
+    rows = [
+        (1, "a", decimal.Decimal("1.50"), datetime.date(2024, 1, 2), None),
+        (2, "b", decimal.Decimal("2.00"), datetime.date(2024, 1, 3), b"\x00"),
+    ]
+    columns = ["id", "name", "price", "day", "data"]
+    assert cache.get("SELECT * FROM t", "fp") is None
+    assert cache.set("SELECT * FROM t", columns, rows, "fp")
+
+    cached = cache.get("SELECT *  FROM t;", "fp")
+    assert cached.columns == columns
+    assert cached.rows == rows
+    assert not cached.truncated
+    # Different schema, limits or datasource
+    assert cache.get("SELECT * FROM t", "other_fp") is None
+    assert cache.get("SELECT * FROM t", "fp", max_rows=1) is None
+    assert SQLResultCache(cache_manager, "other_db").get("SELECT * FROM t") is None
+
+
+def test_invalidate(cache_manager):
+    cache = SQLResultCache(cache_manager, "test_db")
+    cache.set("SELECT 1", ["1"], [(1,)])
+    assert cache.get("SELECT 1") is not None
+    cache.invalidate()
+    assert cache.get("SELECT 1") is None
+
+
+def test_ttl(cache_manager):
+    cache = SQLResultCache(cache_manager, "test_db", ttl=-1)
+    cache.set("SELECT 1", ["1"], [(1,)])
+    assert cache.get("SELECT 1") is None
+
+
+def test_size_limits(cache_manager):
+    cache = SQLResultCache(cache_manager, "test_db", max_rows=2, max_bytes=1024)
+    assert not cache.set("SELECT 1", ["id"], [(1,), (2,), (3,)])
+    assert not cache.set("SELECT 2", ["name"], [("a" * 2048,)])
+    assert cache.set("SELECT 3", ["id"], [(1,), (2,)])
+    assert cache.get("SELECT 1") is None
+    assert cache.get("SELECT 2") is None
+    assert cache.get("SELECT 3").rows == [(1,), (2,)]
+
+
+def test_memory_storage_eviction():
+    storage = MemoryCacheStorage(max_memory_mb=1)
+    cache_manager = LocalCacheManager(None, JsonSerializer(), storage)
+    cache = SQLResultCache(cache_manager, "test_db", max_bytes=None)
+    for i in range(20):
+        cache.set(f"SELECT {i}", ["name"], [("a" * 100 * 1024,)])
+    assert storage.current_memory_usage <= storage.max_memory
+    # The least recently used results are evicted first
+    assert cache.get("SELECT 0") is None
+    assert cache.get("SELECT 19") is not None
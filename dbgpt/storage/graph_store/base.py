@@ -40,3 +40,8 @@ class GraphStoreBase(ABC):
     @abstractmethod
     def get_config(self) -> GraphStoreConfig:
         """Get the graph store config."""
+
+    @property
+    def graph_id(self) -> str:
+        """Return the identity of the graph, the stores of the same id share it."""
+        return f"{type(self).__name__}:{self.get_config().name}"
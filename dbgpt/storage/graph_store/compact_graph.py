@@ -0,0 +1,904 @@
+"""Compact array-backed graph.
+
+An alternative engine of :class:`MemoryGraph` for large graphs. The vertex ids and
+edge labels are interned to integers, the edges are kept in integer columns with a
+CSR (compressed sparse row) adjacency index, and the properties are kept in columns
+keyed by the vertex or edge index, instead of a Python object per vertex and edge.
+
+The graph can be saved to a snapshot directory, and the columns and the adjacency
+index of a loaded snapshot are memory mapped, so they are paged in by the operating
+system on demand instead of being loaded into memory. The vertex ids, the vertex
+names and each property are saved as an offsets column and a bytes column of the
+encoded values, the vertices are found by binary search in the sorted order of their
+ids, and just the labels and the property keys are kept in the metadata file. The
+snapshot uses the native byte order of the machine.
+
+Each save writes a new version directory in the snapshot directory and switches the
+pointer file to it, so the files of the mapped version are never renamed or
+overwritten, which the memory mapped files don't allow on Windows.
+"""
+
+import itertools
+import json
+import logging
+import mmap
+import os
+import shutil
+from array import array
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .graph import Direction, Edge, Graph, IdVertex, MemoryGraph, Vertex
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_VERSION = 2
+_META_FILE = "meta.json"
+_CURRENT_FILE = "CURRENT"
+_VERSION_PREFIX = "v"
+_INDEX_TYPECODE = "q"
+_LABEL_TYPECODE = "i"
+_BYTES_TYPECODE = "B"
+# the marker of the values deleted from the snapshot
+_DELETED = object()
+# Rebuild the adjacency index when the edges appended after the last build exceed
+# the ratio of the indexed edges
+_CSR_REBUILD_RATIO = 0.25
+_CSR_REBUILD_MIN_EDGES = 1024
+
+
+class _Column:
+    """An integer column of a read-only base and an appendable tail.
+
+    The base is a memory mapped column of a snapshot or an array, the new values
+    are appended to the tail.
+    """
+
+    def __init__(self, typecode: str, base: Optional[Any] = None):
+        self.typecode = typecode
+        self.base = base if base is not None else array(typecode)
+        self._base_len = len(self.base)
+        self.tail = array(typecode)
+
+    def __len__(self) -> int:
+        return self._base_len + len(self.tail)
+
+    def __getitem__(self, index: int) -> int:
+        if index < self._base_len:
+            return self.base[index]
+        return self.tail[index - self._base_len]
+
+    def append(self, value: int) -> None:
+        self.tail.append(value)
+
+
+class _StrColumn:
+    """A string column of a read-only base and an appendable tail.
+
+    The base is the offsets of the strings in the UTF-8 encoded bytes, both memory
+    mapped from a snapshot, the new strings are appended to the tail.
+    """
+
+    def __init__(self, offsets: Optional[Any] = None, data: Optional[Any] = None):
+        self._offsets = offsets
+        self._data = data
+        self._base_len = len(offsets) - 1 if offsets is not None else 0
+        self.tail: List[str] = []
+
+    def __len__(self) -> int:
+        return self._base_len + len(self.tail)
+
+    def __getitem__(self, index: int) -> str:
+        if index < self._base_len:
+            return self.raw(index).decode("utf-8")
+        return self.tail[index - self._base_len]
+
+    def raw(self, index: int) -> bytes:
+        """Return the encoded string at the index."""
+        if index < self._base_len:
+            return bytes(self._data[self._offsets[index] : self._offsets[index + 1]])
+        return self.tail[index - self._base_len].encode("utf-8")
+
+    def append(self, value: str) -> None:
+        self.tail.append(value)
+
+
+class _ValueColumn:
+    """The values of a property keyed by the vertex or edge index.
+
+    The base is the offsets of the values in the JSON encoded bytes, both memory
+    mapped from a snapshot, an empty value means no value at the index. The values
+    set or deleted later are kept in the changes.
+    """
+
+    def __init__(self, offsets: Optional[Any] = None, data: Optional[Any] = None):
+        self._offsets = offsets
+        self._data = data
+        self._base_len = len(offsets) - 1 if offsets is not None else 0
+        self._changes: Dict[int, Any] = {}
+
+    def _base_raw(self, index: int) -> bytes:
+        if index >= self._base_len:
+            return b""
+        return bytes(self._data[self._offsets[index] : self._offsets[index + 1]])
+
+    def __contains__(self, index: int) -> bool:
+        if index in self._changes:
+            return self._changes[index] is not _DELETED
+        return (
+            index < self._base_len and self._offsets[index] != self._offsets[index + 1]
+        )
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        self._changes[index] = value
+
+    def get(self, index: int, default: Any = None) -> Any:
+        if index in self._changes:
+            value = self._changes[index]
+            return default if value is _DELETED else value
+        raw = self._base_raw(index)
+        return json.loads(raw) if raw else default
+
+    def discard(self, index: int) -> None:
+        if index < self._base_len:
+            self._changes[index] = _DELETED
+        else:
+            self._changes.pop(index, None)
+
+    def items(self) -> Iterator[Tuple[int, Any]]:
+        for index in range(self._base_len):
+            if index not in self._changes and index in self:
+                yield index, json.loads(self._base_raw(index))
+        for index, value in self._changes.items():
+            if value is not _DELETED:
+                yield index, value
+
+    def raw(self, index: int) -> bytes:
+        """Return the encoded value at the index, empty if no value."""
+        if index in self._changes:
+            value = self._changes[index]
+            return b"" if value is _DELETED else _encode_value(value)
+        return self._base_raw(index)
+
+
+def _encode_value(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _zeros(typecode: str, size: int) -> array:
+    return array(typecode, bytes(array(typecode).itemsize * size))
+
+
+class CompactGraph(Graph):
+    """Compact array-backed graph.
+
+    It has the same interface as :class:`MemoryGraph`, but the vertices and edges
+    returned are new objects built from the columns, changing them does not change
+    the graph.
+    """
+
+    def __init__(self):
+        """Create an empty CompactGraph."""
+        self._mapped: List[Tuple[memoryview, mmap.mmap]] = []
+        # the snapshot directory saved or loaded, and whether the graph is changed
+        # since then
+        self._path: Optional[str] = None
+        self._changed = False
+        self._init_data()
+
+    def _init_data(self) -> None:
+        # vertices, the vertices added after the snapshot was loaded are indexed by
+        # their ids, the vertices of the snapshot are found in the sorted order of
+        # their ids
+        self._vids = _StrColumn()
+        self._vid_index: Dict[str, int] = {}
+        self._vid_order: Any = array(_INDEX_TYPECODE)
+        self._id_only = _ValueColumn()
+        self._deleted_vertices: Set[int] = set()
+        self._vertex_names = _ValueColumn()
+        self._vertex_props: Dict[str, _ValueColumn] = {}
+
+        # edges
+        self._labels: List[str] = []
+        self._label_index: Dict[str, int] = {}
+        self._src = _Column(_INDEX_TYPECODE)
+        self._dst = _Column(_INDEX_TYPECODE)
+        self._label = _Column(_LABEL_TYPECODE)
+        self._edge_props: Dict[str, _ValueColumn] = {}
+        self._deleted_edges: Set[int] = set()
+        self._edge_count = 0
+
+        # adjacency index of the edges [0, _csr_edges), the edges appended later
+        # are indexed in the tails
+        self._out_offsets: Any = array(_INDEX_TYPECODE, [0])
+        self._out_edges: Any = array(_INDEX_TYPECODE)
+        self._in_offsets: Any = array(_INDEX_TYPECODE, [0])
+        self._in_edges: Any = array(_INDEX_TYPECODE)
+        self._csr_vertices = 0
+        self._csr_edges = 0
+        self._out_tail: Dict[int, List[int]] = {}
+        self._in_tail: Dict[int, List[int]] = {}
+
+    @property
+    def vertex_count(self) -> int:
+        """Return the number of vertices in the graph."""
+        return len(self._vids) - len(self._deleted_vertices)
+
+    @property
+    def edge_count(self) -> int:
+        """Return the count of edges in the graph."""
+        return self._edge_count
+
+    def _find_vertex(self, vid: str) -> Optional[int]:
+        """Return the index of the vertex, None if not found."""
+        index = self._vid_index.get(vid)
+        if index is None:
+            index = self._find_snapshot_vertex(vid)
+        if index is None or index in self._deleted_vertices:
+            return None
+        return index
+
+    def _find_snapshot_vertex(self, vid: str) -> Optional[int]:
+        """Binary search the vertex in the sorted order of the snapshot vertex ids."""
+        order = self._vid_order
+        key = vid.encode("utf-8")
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._vids.raw(order[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(order) and self._vids.raw(order[lo]) == key:
+            return order[lo]
+        return None
+
+    def _intern_vertex(self, vid: str) -> Tuple[int, bool]:
+        """Return the index of the vertex, and whether it is new."""
+        index = self._find_vertex(vid)
+        if index is not None:
+            return index, False
+        self._changed = True
+        index = len(self._vids)
+        self._vids.append(vid)
+        self._vid_index[vid] = index
+        return index, True
+
+    def _intern_label(self, label: str) -> int:
+        index = self._label_index.get(label)
+        if index is None:
+            index = len(self._labels)
+            self._labels.append(label)
+            self._label_index[label] = index
+        return index
+
+    def _set_props(
+        self, columns: Dict[str, _ValueColumn], index: int, props: Dict[str, Any]
+    ) -> None:
+        for key, value in props.items():
+            if key not in columns:
+                columns[key] = _ValueColumn()
+            columns[key][index] = value
+
+    def _get_props(
+        self, columns: Dict[str, _ValueColumn], index: int
+    ) -> Dict[str, Any]:
+        return {key: col.get(index) for key, col in columns.items() if index in col}
+
+    def _del_props(self, columns: Dict[str, _ValueColumn], index: int) -> None:
+        for col in columns.values():
+            col.discard(index)
+
+    def upsert_vertex(self, vertex: Vertex):
+        """Insert or update a vertex based on its ID."""
+        self._changed = True
+        index, is_new = self._intern_vertex(vertex.vid)
+        if isinstance(vertex, IdVertex):
+            if is_new:
+                self._id_only[index] = True
+            return
+        if is_new or index in self._id_only:
+            self._id_only.discard(index)
+            if vertex._name:
+                self._vertex_names[index] = vertex._name
+        self._set_props(self._vertex_props, index, vertex.props)
+
+    def upsert_graph(self, graph: Graph):
+        """Upsert a graph."""
+        for vertex in graph.vertices():
+            self.upsert_vertex(vertex)
+
+        for edge in graph.edges():
+            self.append_edge(edge)
+
+    def _adjacent(self, index: int, out: bool) -> Iterator[int]:
+        """Return the ids of the edges of the vertex."""
+        if out:
+            offsets, edges, tail = self._out_offsets, self._out_edges, self._out_tail
+        else:
+            offsets, edges, tail = self._in_offsets, self._in_edges, self._in_tail
+        deleted = self._deleted_edges
+        if index < self._csr_vertices:
+            for k in range(offsets[index], offsets[index + 1]):
+                e = edges[k]
+                if e not in deleted:
+                    yield e
+        for e in tail.get(index, ()):
+            if e not in deleted:
+                yield e
+
+    def append_edge(self, edge: Edge) -> bool:
+        """Append an edge if it doesn't exist; requires edge label."""
+        sid, new_sid = self._intern_vertex(edge.sid)
+        if new_sid:
+            self._id_only[sid] = True
+        tid, new_tid = self._intern_vertex(edge.tid)
+        if new_tid:
+            self._id_only[tid] = True
+        label = self._intern_label(edge.name)
+
+        if not new_sid and not new_tid:
+            for e in self._adjacent(sid, True):
+                if self._dst[e] == tid and self._label[e] == label:
+                    return False
+
+        self._changed = True
+        e = len(self._src)
+        self._src.append(sid)
+        self._dst.append(tid)
+        self._label.append(label)
+        self._set_props(self._edge_props, e, edge.props)
+        self._out_tail.setdefault(sid, []).append(e)
+        self._in_tail.setdefault(tid, []).append(e)
+        self._edge_count += 1
+
+        tail_edges = len(self._src) - self._csr_edges
+        if tail_edges > max(
+            _CSR_REBUILD_MIN_EDGES, self._csr_edges * _CSR_REBUILD_RATIO
+        ):
+            self._build_csr()
+        return True
+
+    def _build_csr(self) -> None:
+        """Build the adjacency index of all the edges."""
+        n_vertices = len(self._vids)
+        n_edges = len(self._src)
+        deleted = self._deleted_edges
+        out_offsets = _zeros(_INDEX_TYPECODE, n_vertices + 1)
+        in_offsets = _zeros(_INDEX_TYPECODE, n_vertices + 1)
+        for e in range(n_edges):
+            if e not in deleted:
+                out_offsets[self._src[e] + 1] += 1
+                in_offsets[self._dst[e] + 1] += 1
+        for i in range(n_vertices):
+            out_offsets[i + 1] += out_offsets[i]
+            in_offsets[i + 1] += in_offsets[i]
+
+        n_alive = out_offsets[n_vertices]
+        out_edges = _zeros(_INDEX_TYPECODE, n_alive)
+        in_edges = _zeros(_INDEX_TYPECODE, n_alive)
+        out_pos = array(_INDEX_TYPECODE, out_offsets[:n_vertices])
+        in_pos = array(_INDEX_TYPECODE, in_offsets[:n_vertices])
+        for e in range(n_edges):
+            if e in deleted:
+                continue
+            s, t = self._src[e], self._dst[e]
+            out_edges[out_pos[s]] = e
+            out_pos[s] += 1
+            in_edges[in_pos[t]] = e
+            in_pos[t] += 1
+
+        self._out_offsets, self._out_edges = out_offsets, out_edges
+        self._in_offsets, self._in_edges = in_offsets, in_edges
+        self._csr_vertices = n_vertices
+        self._csr_edges = n_edges
+        self._out_tail = {}
+        self._in_tail = {}
+
+    def has_vertex(self, vid: str) -> bool:
+        """Retrieve a vertex by ID."""
+        return self._find_vertex(vid) is not None
+
+    def _make_vertex(self, index: int) -> Vertex:
+        vid = self._vids[index]
+        if index in self._id_only:
+            return IdVertex(vid)
+        return Vertex(
+            vid,
+            self._vertex_names.get(index),
+            **self._get_props(self._vertex_props, index),
+        )
+
+    def _make_edge(self, e: int) -> Edge:
+        return Edge(
+            self._vids[self._src[e]],
+            self._vids[self._dst[e]],
+            self._labels[self._label[e]],
+            **self._get_props(self._edge_props, e),
+        )
+
+    def edge_index(self) -> Tuple[List[str], array, array]:
+        """Return the vertex ids, and the source and target indexes of the edges.
+
+        The graph is compacted first, so the vertices are indexed by the positions
+        of their ids.
+        """
+        self.compact()
+
+        def to_array(column: _Column) -> array:
+            data = array(column.typecode)
+            data.frombytes(memoryview(column.base).cast("B"))
+            data.extend(column.tail)
+            return data
+
+        vids = [self._vids[i] for i in range(len(self._vids))]
+        return vids, to_array(self._src), to_array(self._dst)
+
+    def get_vertex(self, vid: str) -> Vertex:
+        """Retrieve a vertex by ID."""
+        index = self._find_vertex(vid)
+        if index is None:
+            raise KeyError(vid)
+        return self._make_vertex(index)
+
+    def _neighbor_edge_ids(self, index: int, direction: Direction) -> Iterator[int]:
+        if direction == Direction.OUT:
+            return self._adjacent(index, True)
+        elif direction == Direction.IN:
+            return self._adjacent(index, False)
+        elif direction == Direction.BOTH:
+            # merge the out and in edges, the self loops are returned once
+            tuples = itertools.zip_longest(
+                self._adjacent(index, True), self._adjacent(index, False)
+            )
+            seen: Set[int] = set()
+            return (
+                e
+                for t in tuples
+                for e in t
+                if e is not None and not (e in seen or seen.add(e))  # type: ignore
+            )
+        else:
+            raise ValueError(f"Invalid direction: {direction}")
+
+    def get_neighbor_edges(
+        self,
+        vid: str,
+        direction: Direction = Direction.OUT,
+        limit: Optional[int] = None,
+    ) -> Iterator[Edge]:
+        """Get edges connected to a vertex by direction."""
+        index = self._find_vertex(vid)
+        if index is None:
+            return iter(())
+        es = map(self._make_edge, self._neighbor_edge_ids(index, direction))
+        return itertools.islice(es, limit) if limit else es
+
+    def vertices(
+        self, filter_fn: Optional[Callable[[Vertex], bool]] = None
+    ) -> Iterator[Vertex]:
+        """Return vertices."""
+        all_vertices = (
+            self._make_vertex(i)
+            for i in range(len(self._vids))
+            if i not in self._deleted_vertices
+        )
+        return all_vertices if filter_fn is None else filter(filter_fn, all_vertices)
+
+    def edges(
+        self, filter_fn: Optional[Callable[[Edge], bool]] = None
+    ) -> Iterator[Edge]:
+        """Return edges."""
+        all_edges = (
+            self._make_edge(e)
+            for e in range(len(self._src))
+            if e not in self._deleted_edges
+        )
+        return all_edges if filter_fn is None else filter(filter_fn, all_edges)
+
+    def _delete_edge(self, e: int) -> None:
+        if e not in self._deleted_edges:
+            self._changed = True
+            self._deleted_edges.add(e)
+            self._del_props(self._edge_props, e)
+            self._edge_count -= 1
+
+    def del_vertices(self, *vids: str):
+        """Delete specified vertices."""
+        for vid in vids:
+            index = self._find_vertex(vid)
+            if index is None:
+                continue
+            for e in list(self._neighbor_edge_ids(index, Direction.BOTH)):
+                self._delete_edge(e)
+            self._changed = True
+            self._vid_index.pop(vid, None)
+            self._deleted_vertices.add(index)
+            self._id_only.discard(index)
+            self._vertex_names.discard(index)
+            self._del_props(self._vertex_props, index)
+
+    def del_edges(self, sid: str, tid: str, name: str, **props):
+        """Delete edges."""
+        s, t = self._find_vertex(sid), self._find_vertex(tid)
+        if s is None or t is None:
+            return
+        label = self._label_index.get(name) if name else None
+        if name and label is None:
+            return
+        for e in list(self._adjacent(s, True)):
+            if self._dst[e] != t or (label is not None and self._label[e] != label):
+                continue
+            edge_props = self._get_props(self._edge_props, e)
+            if all(edge_props.get(k) == v for k, v in props.items()):
+                self._delete_edge(e)
+
+    def del_neighbor_edges(self, vid: str, direction: Direction = Direction.OUT):
+        """Delete all neighbor edges."""
+        index = self._find_vertex(vid)
+        if index is None:
+            return
+        for e in list(self._neighbor_edge_ids(index, direction)):
+            self._delete_edge(e)
+
+    def search(
+        self,
+        vids: List[str],
+        direct: Direction = Direction.OUT,
+        depth: Optional[int] = None,
+        fan: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> MemoryGraph:
+        """Search the graph from the vertices by breadth first.
+
+        Args:
+            vids (List[str]): The ids of the vertices to start from.
+            direct (Direction): The direction of the edges to follow.
+            depth (Optional[int]): The max depth of the vertices to expand.
+            fan (Optional[int]): The max number of the edges of each vertex.
+            limit (Optional[int]): The max number of the edges of the subgraph.
+
+        Returns:
+            MemoryGraph: The subgraph searched.
+        """
+        subgraph = MemoryGraph()
+
+        for vid in vids:
+            start = self._find_vertex(vid)
+            if start is None:
+                continue
+            visited: Set[int] = set()
+            queue = deque([(start, 0)])
+            while queue:
+                index, _depth = queue.popleft()
+                if index in visited or depth and _depth >= depth:
+                    continue
+                subgraph.upsert_vertex(self._make_vertex(index))
+                visited.add(index)
+
+                edge_ids = self._neighbor_edge_ids(index, direct)
+                for e in itertools.islice(edge_ids, fan) if fan else edge_ids:
+                    if limit and subgraph.edge_count >= limit:
+                        return subgraph
+                    # append edge success then visit new vertex
+                    if subgraph.append_edge(self._make_edge(e)):
+                        s, t = self._src[e], self._dst[e]
+                        nid = t if s == index else s
+                        if nid not in visited:
+                            subgraph.upsert_vertex(self._make_vertex(nid))
+                            queue.append((nid, _depth + 1))
+
+        return subgraph
+
+    def schema(self) -> Dict[str, Any]:
+        """Return schema."""
+        return {
+            "schema": [
+                {
+                    "type": "VERTEX",
+                    "properties": [{"name": k} for k in self._vertex_props],
+                },
+                {
+                    "type": "EDGE",
+                    "properties": [{"name": k} for k in self._edge_props],
+                },
+            ]
+        }
+
+    def format(self, entities_only: Optional[bool] = False) -> str:
+        """Format graph to string."""
+        vs_str = "\n".join(v.format() for v in self.vertices())
+        es_str = "\n".join(
+            f"{self.get_vertex(e.sid).format(concise=True)}"
+            f"{e.format()}"
+            f"{self.get_vertex(e.tid).format(concise=True)}"
+            for e in self.edges()
+        )
+        if entities_only:
+            return f"Entities:\n{vs_str}" if vs_str else ""
+        else:
+            return (
+                f"Entities:\n{vs_str}\n\nRelationships:\n{es_str}"
+                if (vs_str or es_str)
+                else ""
+            )
+
+    def truncate(self):
+        """Truncate graph."""
+        self._init_data()
+        self._close_mapped()
+        self._changed = True
+
+    def close(self) -> None:
+        """Release the memory mapped snapshot, the graph is emptied."""
+        self.truncate()
+
+    def compact(self) -> None:
+        """Drop the deleted vertices and edges, and rebuild the adjacency index."""
+        if not self._deleted_vertices and not self._deleted_edges:
+            self._build_csr()
+            return
+
+        vertex_map = _zeros(_INDEX_TYPECODE, len(self._vids))
+        vids = _StrColumn()
+        for i in range(len(self._vids)):
+            if i not in self._deleted_vertices:
+                vertex_map[i] = len(vids)
+                vids.append(self._vids[i])
+
+        def remap(column: _ValueColumn, index_map) -> _ValueColumn:
+            remapped = _ValueColumn()
+            for i, v in column.items():
+                remapped[index_map[i]] = v
+            return remapped
+
+        src, dst, label = (
+            _Column(_INDEX_TYPECODE),
+            _Column(_INDEX_TYPECODE),
+            _Column(_LABEL_TYPECODE),
+        )
+        edge_map: Dict[int, int] = {}
+        for e in range(len(self._src)):
+            if e in self._deleted_edges:
+                continue
+            edge_map[e] = len(src)
+            src.append(vertex_map[self._src[e]])
+            dst.append(vertex_map[self._dst[e]])
+            label.append(self._label[e])
+
+        vertex_names = remap(self._vertex_names, vertex_map)
+        vertex_props = {k: remap(c, vertex_map) for k, c in self._vertex_props.items()}
+        id_only = remap(self._id_only, vertex_map)
+        edge_props = {k: remap(c, edge_map) for k, c in self._edge_props.items()}
+        labels = self._labels
+
+        self._init_data()
+        self._close_mapped()
+        self._vids = vids
+        self._vid_index = {vid: i for i, vid in enumerate(vids.tail)}
+        self._id_only = id_only
+        self._vertex_names = vertex_names
+        self._vertex_props = vertex_props
+        self._labels = labels
+        self._label_index = {name: i for i, name in enumerate(labels)}
+        self._src, self._dst, self._label = src, dst, label
+        self._edge_props = edge_props
+        self._edge_count = len(src)
+        self._build_csr()
+
+    def save(self, path: str) -> None:
+        """Save a snapshot of the graph to the directory.
+
+        The graph is compacted first, and the saved snapshot is memory mapped
+        afterward. Nothing is written if the graph is not changed since it was saved
+        to or loaded from the directory.
+
+        Args:
+            path (str): The directory of the snapshot, replaced if it exists.
+        """
+        if not self._changed and self._path == os.path.abspath(path):
+            return
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        current = _current_version(path)
+        version = f"{_VERSION_PREFIX}{int(current[1:]) + 1 if current else 1:06d}"
+        version_path = os.path.join(path, version)
+        # the leftover of a failed save, it was never loaded
+        shutil.rmtree(version_path, ignore_errors=True)
+        os.makedirs(version_path)
+
+        columns = {
+            "src": self._src,
+            "dst": self._dst,
+            "label": self._label,
+        }
+        for name, column in columns.items():
+            with open(os.path.join(version_path, f"{name}.bin"), "wb") as f:
+                f.write(column.base)
+                f.write(column.tail)
+        indexes = {
+            "out_offsets": self._out_offsets,
+            "out_edges": self._out_edges,
+            "in_offsets": self._in_offsets,
+            "in_edges": self._in_edges,
+        }
+        for name, data in indexes.items():
+            with open(os.path.join(version_path, f"{name}.bin"), "wb") as f:
+                f.write(data)
+
+        n_vertices, n_edges = len(self._vids), len(self._src)
+        vids = self._vids
+        _write_bytes(version_path, "vids", (vids.raw(i) for i in range(n_vertices)))
+        with open(os.path.join(version_path, "vid_order.bin"), "wb") as f:
+            f.write(array(_INDEX_TYPECODE, sorted(range(n_vertices), key=vids.raw)))
+        value_columns = [
+            ("names", self._vertex_names, n_vertices),
+            ("id_only", self._id_only, n_vertices),
+        ]
+        value_columns.extend(
+            (f"vertex_prop_{i}", column, n_vertices)
+            for i, column in enumerate(self._vertex_props.values())
+        )
+        value_columns.extend(
+            (f"edge_prop_{i}", column, n_edges)
+            for i, column in enumerate(self._edge_props.values())
+        )
+        for name, column, size in value_columns:
+            _write_bytes(version_path, name, (column.raw(i) for i in range(size)))
+
+        meta = {
+            "version": _SNAPSHOT_VERSION,
+            "labels": self._labels,
+            "vertex_props": list(self._vertex_props),
+            "edge_props": list(self._edge_props),
+        }
+        with open(os.path.join(version_path, _META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        # switch to the new version atomically
+        pointer_path = os.path.join(path, _CURRENT_FILE)
+        with open(pointer_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(pointer_path + ".tmp", pointer_path)
+
+        # map the new version, then remove the old versions released. The versions
+        # still mapped by the other graphs may fail to be removed on Windows, they
+        # are removed by the later saves.
+        self._load(path)
+        for name in os.listdir(path):
+            file_path = os.path.join(path, name)
+            is_version = name.startswith(_VERSION_PREFIX) and name[1:].isdigit()
+            if is_version and name != version:
+                shutil.rmtree(file_path, ignore_errors=True)
+            elif name == _META_FILE or name.endswith(".bin"):
+                # the snapshot saved without versions
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        """Whether there is a snapshot in the directory."""
+        return _current_version(path) is not None or os.path.exists(
+            os.path.join(path, _META_FILE)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "CompactGraph":
+        """Load the graph from a snapshot directory.
+
+        Args:
+            path (str): The directory of the snapshot.
+        """
+        graph = cls()
+        graph._load(path)
+        return graph
+
+    def _load(self, path: str) -> None:
+        current = _current_version(path)
+        version_path = os.path.join(path, current) if current else path
+        with open(os.path.join(version_path, _META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != _SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported graph snapshot version {meta['version']}")
+
+        previous, self._mapped = self._mapped, []
+        mapped = {
+            name: self._map(os.path.join(version_path, f"{name}.bin"), typecode)
+            for name, typecode in [
+                ("src", _INDEX_TYPECODE),
+                ("dst", _INDEX_TYPECODE),
+                ("label", _LABEL_TYPECODE),
+                ("out_offsets", _INDEX_TYPECODE),
+                ("out_edges", _INDEX_TYPECODE),
+                ("in_offsets", _INDEX_TYPECODE),
+                ("in_edges", _INDEX_TYPECODE),
+                ("vid_order", _INDEX_TYPECODE),
+            ]
+        }
+
+        def map_bytes(name: str) -> Tuple[Any, Any]:
+            return (
+                self._map(
+                    os.path.join(version_path, f"{name}.offsets.bin"), _INDEX_TYPECODE
+                ),
+                self._map(
+                    os.path.join(version_path, f"{name}.data.bin"), _BYTES_TYPECODE
+                ),
+            )
+
+        vids = _StrColumn(*map_bytes("vids"))
+        vertex_names = _ValueColumn(*map_bytes("names"))
+        id_only = _ValueColumn(*map_bytes("id_only"))
+        vertex_props = {
+            key: _ValueColumn(*map_bytes(f"vertex_prop_{i}"))
+            for i, key in enumerate(meta["vertex_props"])
+        }
+        edge_props = {
+            key: _ValueColumn(*map_bytes(f"edge_prop_{i}"))
+            for i, key in enumerate(meta["edge_props"])
+        }
+        self._init_data()
+
+        self._vids = vids
+        self._vid_order = mapped["vid_order"]
+        self._id_only = id_only
+        self._vertex_names = vertex_names
+        self._vertex_props = vertex_props
+        self._labels = meta["labels"]
+        self._label_index = {name: i for i, name in enumerate(self._labels)}
+        self._edge_props = edge_props
+        self._src = _Column(_INDEX_TYPECODE, mapped["src"])
+        self._dst = _Column(_INDEX_TYPECODE, mapped["dst"])
+        self._label = _Column(_LABEL_TYPECODE, mapped["label"])
+        self._edge_count = len(self._src)
+        self._out_offsets = mapped["out_offsets"]
+        self._out_edges = mapped["out_edges"]
+        self._in_offsets = mapped["in_offsets"]
+        self._in_edges = mapped["in_edges"]
+        self._csr_vertices = len(self._vids)
+        self._csr_edges = len(self._src)
+        self._release(previous)
+        self._path = os.path.abspath(path)
+        self._changed = False
+
+    def _map(self, file_path: str, typecode: str) -> Any:
+        """Memory map the integer column of the file."""
+        if os.path.getsize(file_path) == 0:
+            return array(typecode)
+        with open(file_path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm).cast(typecode)
+        self._mapped.append((view, mm))
+        return view
+
+    def _close_mapped(self) -> None:
+        mapped, self._mapped = self._mapped, []
+        self._release(mapped)
+
+    @staticmethod
+    def _release(mapped: List[Tuple[memoryview, mmap.mmap]]) -> None:
+        for view, mm in mapped:
+            view.release()
+            mm.close()
+
+
+def _write_bytes(path: str, name: str, values: Iterator[bytes]) -> None:
+    """Write the values as the data file and the offsets file of the values."""
+    offsets = array(_INDEX_TYPECODE, [0])
+    with open(os.path.join(path, f"{name}.data.bin"), "wb") as f:
+        for value in values:
+            f.write(value)
+            offsets.append(offsets[-1] + len(value))
+    with open(os.path.join(path, f"{name}.offsets.bin"), "wb") as f:
+        f.write(offsets)
+
+
+def _current_version(path: str) -> Optional[str]:
+    """Return the current version of the snapshot directory, None if no version."""
+    try:
+        with open(os.path.join(path, _CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
@@ -1,10 +1,15 @@
 """Memory graph store."""
 
 import logging
+import os
+import shutil
+import uuid
+from typing import Optional
 
-from dbgpt._private.pydantic import ConfigDict
+from dbgpt._private.pydantic import ConfigDict, Field
 from dbgpt.storage.graph_store.base import GraphStoreBase, GraphStoreConfig
-from dbgpt.storage.graph_store.graph import MemoryGraph
+from dbgpt.storage.graph_store.compact_graph import CompactGraph
+from dbgpt.storage.graph_store.graph import Graph, MemoryGraph
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +19,16 @@ class MemoryGraphStoreConfig(GraphStoreConfig):
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    graph_engine: str = Field(
+        default="memory",
+        description="The engine of the graph, memory or compact.",
+    )
+    persist_path: Optional[str] = Field(
+        default=None,
+        description="The directory to persist the graph snapshots, only the compact "
+        "engine supports it.",
+    )
+
 
 class MemoryGraphStore(GraphStoreBase):
     """Memory graph store."""
@@ -21,8 +36,62 @@ class MemoryGraphStore(GraphStoreBase):
     def __init__(self, graph_store_config: MemoryGraphStoreConfig):
         """Initialize MemoryGraphStore with a memory graph."""
         self._graph_store_config = graph_store_config
-        self._graph = MemoryGraph()
+        self._graph_engine = os.getenv(
+            "MEMORY_GRAPH_ENGINE", graph_store_config.graph_engine
+        ).lower()
+        persist_path = os.getenv(
+            "MEMORY_GRAPH_PERSIST_PATH", graph_store_config.persist_path
+        )
+        self._snapshot_path = (
+            os.path.join(persist_path, graph_store_config.name)
+            if persist_path
+            else None
+        )
+        self._graph: Graph = self._create_graph()
+        self._graph_id = uuid.uuid4().hex
+
+    def _create_graph(self) -> Graph:
+        if self._graph_engine == "memory":
+            return MemoryGraph()
+        elif self._graph_engine == "compact":
+            if self._snapshot_path and CompactGraph.exists(self._snapshot_path):
+                logger.info(f"Load graph snapshot from {self._snapshot_path}")
+                return CompactGraph.load(self._snapshot_path)
+            return CompactGraph()
+        else:
+            raise ValueError(f"Graph engine {self._graph_engine} not supported")
 
     def get_config(self):
         """Get the graph store config."""
         return self._graph_store_config
+
+    @property
+    def persistent(self) -> bool:
+        """Whether the graph is persisted, and shared by the stores of its name."""
+        return bool(self._snapshot_path) and self._graph_engine == "compact"
+
+    @property
+    def graph_id(self) -> str:
+        """Return the identity of the graph.
+
+        The persisted graph is identified by its snapshot, the others are owned by
+        the store.
+        """
+        if self.persistent:
+            return f"{type(self).__name__}:{os.path.abspath(self._snapshot_path)}"
+        return f"{type(self).__name__}:{self._graph_id}"
+
+    def save(self) -> None:
+        """Save the snapshot of the graph if the persist path is configured."""
+        if not self._snapshot_path or not isinstance(self._graph, CompactGraph):
+            return
+        os.makedirs(os.path.dirname(self._snapshot_path) or ".", exist_ok=True)
+        self._graph.save(self._snapshot_path)
+
+    def drop(self) -> None:
+        """Drop the graph and its snapshot."""
+        if isinstance(self._graph, CompactGraph):
+            self._graph.close()
+        self._graph = None  # type: ignore
+        if self._snapshot_path:
+            shutil.rmtree(self._snapshot_path, ignore_errors=True)
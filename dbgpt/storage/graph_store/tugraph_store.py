@@ -102,6 +102,14 @@ class TuGraphStore(GraphStoreBase):
         """Get the TuGraph store config."""
         return self._config
 
+    @property
+    def graph_id(self) -> str:
+        """Return the identity of the graph, with the server connected."""
+        return (
+            f"{type(self).__name__}:{self._username}@{self._host}:{self._port}/"
+            f"{self._graph_name}"
+        )
+
     def _add_vertex_index(self, field_name):
         """Add an index to the vertex table."""
         # TODO: Not used in the current implementation.
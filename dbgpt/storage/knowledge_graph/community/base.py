@@ -2,8 +2,19 @@
 
 import logging
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import AsyncGenerator, Dict, Iterator, List, Literal, Optional, Union
+from typing import (
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from dbgpt.storage.graph_store.base import GraphStoreBase
 from dbgpt.storage.graph_store.graph import (
@@ -18,6 +29,37 @@ from dbgpt.storage.knowledge_graph.base import ParagraphChunk
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_UPSERT_BATCH_SIZE = 1000
+
+# edge_type -> (label, source vertex label, target vertex label)
+_EDGE_LABELS: Dict[str, Tuple[str, str, str]] = {
+    GraphElemType.DOCUMENT_INCLUDE_CHUNK.value: (
+        GraphElemType.INCLUDE.value,
+        GraphElemType.DOCUMENT.value,
+        GraphElemType.CHUNK.value,
+    ),
+    GraphElemType.CHUNK_INCLUDE_CHUNK.value: (
+        GraphElemType.INCLUDE.value,
+        GraphElemType.CHUNK.value,
+        GraphElemType.CHUNK.value,
+    ),
+    GraphElemType.CHUNK_INCLUDE_ENTITY.value: (
+        GraphElemType.INCLUDE.value,
+        GraphElemType.CHUNK.value,
+        GraphElemType.ENTITY.value,
+    ),
+    GraphElemType.CHUNK_NEXT_CHUNK.value: (
+        GraphElemType.NEXT.value,
+        GraphElemType.CHUNK.value,
+        GraphElemType.CHUNK.value,
+    ),
+    GraphElemType.RELATION.value: (
+        GraphElemType.RELATION.value,
+        GraphElemType.ENTITY.value,
+        GraphElemType.ENTITY.value,
+    ),
+}
+
 
 @dataclass
 class Community:
@@ -26,6 +68,8 @@ class Community:
     id: str
     data: Optional[Graph] = None
     summary: Optional[str] = None
+    # the signature of the vertices and edges the summary is generated from
+    signature: Optional[str] = None
 
 
 @dataclass
@@ -111,6 +155,17 @@ class GraphStoreAdapter(ABC):
     def upsert_graph(self, graph: Graph) -> None:
         """Insert graph."""
 
+    def batch_upsert(
+        self, batch_size: int = DEFAULT_UPSERT_BATCH_SIZE
+    ) -> "GraphUpsertBatch":
+        """Return a batch to upsert the vertices and edges with fewer writes.
+
+        Args:
+            batch_size (int): The number of the pending vertices and edges to
+                flush the batch.
+        """
+        return GraphUpsertBatch(self, batch_size)
+
     @abstractmethod
     def upsert_doc_include_chunk(
         self,
@@ -139,6 +194,9 @@ class GraphStoreAdapter(ABC):
     ) -> None:
         """Convert chunk to chunk include entity."""
 
+    def persist(self) -> None:
+        """Persist the written graph if the graph store does not persist it."""
+
     @abstractmethod
     def delete_document(self, chunk_id: str) -> None:
         """Delete document in graph store."""
@@ -217,6 +275,36 @@ class CommunityMetastore(ABC):
     async def save(self, communities: List[Community]):
         """Save communities."""
 
+    @abstractmethod
+    async def delete(self, community_ids: List[str]) -> bool:
+        """Delete communities by ids.
+
+        Returns:
+            bool: False if the communities can't be deleted by ids, the metastore
+                must be truncated to replace them.
+        """
+
+    async def upsert(self, communities: List[Community]) -> bool:
+        """Replace the communities with the same ids, save the new ones.
+
+        Returns:
+            bool: False if the communities can't be deleted by ids, nothing is
+                saved.
+        """
+        if not await self.delete([c.id for c in communities]):
+            return False
+        await self.save(communities)
+        return True
+
+    async def load(self, community_ids: List[str]) -> List[Community]:
+        """Load the saved communities with their summaries and signatures.
+
+        Returns:
+            List[Community]: The saved communities of the ids, the communities
+                saved without the signatures are not loaded.
+        """
+        return []
+
     @abstractmethod
     async def truncate(self):
         """Truncate all communities."""
@@ -224,3 +312,180 @@ class CommunityMetastore(ABC):
     @abstractmethod
     def drop(self):
         """Drop community metastore."""
+
+
+class GraphUpsertBatch:
+    """The batch to upsert the vertices and edges of a graph store.
+
+    The vertices and edges are accumulated by their labels, and written with one
+    upsert of the adapter per label when the batch is flushed, instead of one
+    upsert per vertex or edge. The batch is flushed when the pending vertices and
+    edges reach the batch size, and when the context exits. The vertices are
+    always written before the edges of the same flush.
+
+    Examples:
+        .. code-block:: python
+
+            with adapter.batch_upsert() as batch:
+                batch.upsert_chunks(chunks)
+                for chunk in chunks:
+                    batch.upsert_doc_include_chunk(chunk)
+    """
+
+    def __init__(
+        self,
+        adapter: GraphStoreAdapter,
+        batch_size: int = DEFAULT_UPSERT_BATCH_SIZE,
+    ):
+        """Create a new GraphUpsertBatch."""
+        if batch_size < 1:
+            raise ValueError("batch_size >= 1")
+        self._adapter = adapter
+        self._batch_size = batch_size
+        # vertex label -> id -> vertex, the latest upsert of an id wins
+        self._vertices: Dict[
+            str, Dict[str, Union[Vertex, ParagraphChunk]]
+        ] = defaultdict(dict)
+        # (label, src label, dst label) -> (sid, tid, name) -> edge
+        self._edges: Dict[
+            Tuple[str, str, str], Dict[Tuple[str, str, str], Edge]
+        ] = defaultdict(dict)
+        self._pending = 0
+
+    def __enter__(self) -> "GraphUpsertBatch":
+        """Enter the batch context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Flush the batch if no error is raised."""
+        if exc_type is None:
+            self.flush()
+
+    @property
+    def pending_count(self) -> int:
+        """Return the number of the pending vertices and edges."""
+        return self._pending
+
+    def _add_vertex(self, label: str, vertex: Union[Vertex, ParagraphChunk]) -> None:
+        vid = vertex.chunk_id if isinstance(vertex, ParagraphChunk) else vertex.vid
+        vertices = self._vertices[label]
+        if vid not in vertices:
+            self._pending += 1
+        vertices[vid] = vertex
+        self._flush_if_full()
+
+    def _add_edge(self, labels: Tuple[str, str, str], edge: Edge) -> None:
+        edges = self._edges[labels]
+        key = (edge.sid, edge.tid, edge.name)
+        if key not in edges:
+            self._pending += 1
+        edges[key] = edge
+        self._flush_if_full()
+
+    def _flush_if_full(self) -> None:
+        if self._pending >= self._batch_size:
+            self.flush()
+
+    def upsert_entities(self, entities: Iterable[Vertex]) -> None:
+        """Upsert entities."""
+        for entity in entities:
+            self._add_vertex(GraphElemType.ENTITY.value, entity)
+
+    def upsert_chunks(self, chunks: Iterable[Union[Vertex, ParagraphChunk]]) -> None:
+        """Upsert chunks."""
+        for chunk in chunks:
+            self._add_vertex(GraphElemType.CHUNK.value, chunk)
+
+    def upsert_documents(
+        self, documents: Iterable[Union[Vertex, ParagraphChunk]]
+    ) -> None:
+        """Upsert documents."""
+        for document in documents:
+            self._add_vertex(GraphElemType.DOCUMENT.value, document)
+
+    def upsert_edge(
+        self, edges: Iterable[Edge], edge_type: str, src_type: str, dst_type: str
+    ) -> None:
+        """Upsert edges."""
+        for edge in edges:
+            self._add_edge((edge_type, src_type, dst_type), edge)
+
+    def upsert_graph(self, graph: Graph) -> None:
+        """Upsert the vertices and edges of the graph by their types."""
+        vertex_labels = {
+            GraphElemType.DOCUMENT.value,
+            GraphElemType.CHUNK.value,
+            GraphElemType.ENTITY.value,
+        }
+        for vertex in graph.vertices():
+            label = vertex.get_prop("vertex_type")
+            if label in vertex_labels:
+                self._add_vertex(label, vertex)
+        for edge in graph.edges():
+            labels = _EDGE_LABELS.get(edge.get_prop("edge_type"))
+            if labels:
+                self._add_edge(labels, edge)
+
+    def upsert_doc_include_chunk(self, chunk: ParagraphChunk) -> None:
+        """Upsert the edge of document include chunk."""
+        assert (
+            chunk.chunk_parent_id and chunk.chunk_parent_name
+        ), "Chunk parent ID and name are required (document_include_chunk)"
+        self._add_structure_edge(
+            chunk.chunk_parent_id,
+            chunk.chunk_id,
+            GraphElemType.DOCUMENT_INCLUDE_CHUNK.value,
+        )
+
+    def upsert_chunk_include_chunk(self, chunk: ParagraphChunk) -> None:
+        """Upsert the edge of chunk include chunk."""
+        assert (
+            chunk.chunk_parent_id and chunk.chunk_parent_name
+        ), "Chunk parent ID and name are required (chunk_include_chunk)"
+        self._add_structure_edge(
+            chunk.chunk_parent_id,
+            chunk.chunk_id,
+            GraphElemType.CHUNK_INCLUDE_CHUNK.value,
+        )
+
+    def upsert_chunk_next_chunk(
+        self, chunk: ParagraphChunk, next_chunk: ParagraphChunk
+    ) -> None:
+        """Upsert the edge of chunk next chunk."""
+        self._add_structure_edge(
+            chunk.chunk_id, next_chunk.chunk_id, GraphElemType.CHUNK_NEXT_CHUNK.value
+        )
+
+    def upsert_chunk_include_entity(
+        self, chunk: ParagraphChunk, entity: Vertex
+    ) -> None:
+        """Upsert the edge of chunk include entity."""
+        self._add_structure_edge(
+            chunk.chunk_id, entity.vid, GraphElemType.CHUNK_INCLUDE_ENTITY.value
+        )
+
+    def _add_structure_edge(self, sid: str, tid: str, edge_type: str) -> None:
+        labels = _EDGE_LABELS[edge_type]
+        self._add_edge(labels, Edge(sid, tid, labels[0], edge_type=edge_type))
+
+    def flush(self) -> None:
+        """Write the pending vertices and edges to the graph store."""
+        if not self._pending:
+            return
+        vertices, self._vertices = self._vertices, defaultdict(dict)
+        edges, self._edges = self._edges, defaultdict(dict)
+        self._pending = 0
+
+        adapter = self._adapter
+        upsert_vertices = {
+            GraphElemType.ENTITY.value: adapter.upsert_entities,
+            GraphElemType.CHUNK.value: adapter.upsert_chunks,
+            GraphElemType.DOCUMENT.value: adapter.upsert_documents,
+        }
+        for label, upsert in upsert_vertices.items():
+            if vertices.get(label):
+                upsert(iter(vertices[label].values()))
+        for (edge_type, src_type, dst_type), label_edges in edges.items():
+            adapter.upsert_edge(
+                iter(label_edges.values()), edge_type, src_type, dst_type
+            )
@@ -0,0 +1,222 @@
+"""In-process community detection.
+
+The Louvain method vectorized with numpy, for the graph stores without the community
+detection of the graph database. In each round of the local moving phase, the gains
+of moving every vertex to the communities of its neighbors are computed at once, and
+a random subset of the vertices that can improve the modularity is moved together.
+The communities are then aggregated into vertices, until they don't change. Like
+Leiden, the disconnected communities are finally split into their connected
+components.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOLUTION = 1.0
+DEFAULT_SEED = 42
+DEFAULT_MAX_LEVELS = 10
+# The max rounds of the local moving phase of a level, the level also ends when few
+# vertices can move, the remaining moves are mostly made by the next levels
+_MAX_ROUNDS = 16
+_MIN_MOVE_RATIO = 0.001
+# The probability a vertex is moved in a round, halved when a round does not improve
+# the modularity, to break the oscillation of the vertices moved together
+_MOVE_PROB = 0.5
+_MIN_MOVE_PROB = 0.01
+_EPSILON = 1e-12
+
+
+def louvain(
+    src: np.ndarray,
+    dst: np.ndarray,
+    num_vertices: int,
+    weights: Optional[np.ndarray] = None,
+    resolution: float = DEFAULT_RESOLUTION,
+    seed: int = DEFAULT_SEED,
+    max_levels: int = DEFAULT_MAX_LEVELS,
+) -> np.ndarray:
+    """Detect the communities of the graph, the edges are taken as undirected.
+
+    Args:
+        src (np.ndarray): The source vertices of the edges, the vertices are
+            numbered from 0.
+        dst (np.ndarray): The target vertices of the edges.
+        num_vertices (int): The number of the vertices.
+        weights (Optional[np.ndarray]): The weights of the edges, 1 if not provided.
+        resolution (float): The resolution of the modularity, the higher the
+            smaller communities.
+        seed (int): The seed of the random moves, the result is the same for the
+            same graph and seed.
+        max_levels (int): The max levels of the aggregation.
+
+    Returns:
+        np.ndarray: The community of each vertex, the communities are numbered from
+            0 by their smallest vertices.
+    """
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    w = (
+        np.ones(len(src), dtype=np.float64)
+        if weights is None
+        else np.asarray(weights, dtype=np.float64)
+    )
+    membership = np.arange(num_vertices, dtype=np.int64)
+    if len(src) == 0:
+        return membership
+
+    # The arcs of both directions, a self loop is an arc of the double weight
+    loop = src == dst
+    arc_src = np.concatenate([src, dst[~loop]])
+    arc_dst = np.concatenate([dst, src[~loop]])
+    arc_w = np.concatenate([np.where(loop, 2 * w, w), w[~loop]])
+
+    rng = np.random.default_rng(seed)
+    n = num_vertices
+    for level in range(max_levels):
+        comm = _move_vertices(arc_src, arc_dst, arc_w, n, resolution, rng)
+        _, comm = np.unique(comm, return_inverse=True)
+        num_comm = int(comm.max()) + 1
+        logger.debug(f"Louvain level {level}: {n} vertices to {num_comm} communities")
+        membership = comm[membership]
+        if num_comm == n:
+            break
+        arc_src, arc_dst, arc_w = _aggregate(
+            comm[arc_src], comm[arc_dst], arc_w, num_comm
+        )
+        n = num_comm
+
+    return _split_disconnected(membership, src, dst)
+
+
+def _modularity(
+    comm: np.ndarray,
+    src: np.ndarray,
+    dst: np.ndarray,
+    w: np.ndarray,
+    loop_weight: float,
+    degree: np.ndarray,
+    resolution: float,
+) -> float:
+    two_m = degree.sum()
+    internal = loop_weight + w[comm[src] == comm[dst]].sum()
+    sigma = np.bincount(comm, weights=degree, minlength=len(degree))
+    return internal / two_m - resolution * np.sum((sigma / two_m) ** 2)
+
+
+def _move_vertices(
+    src: np.ndarray,
+    dst: np.ndarray,
+    w: np.ndarray,
+    n: int,
+    resolution: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Move the vertices between the communities, return the communities."""
+    degree = np.bincount(src, weights=w, minlength=n)
+    two_m = degree.sum()
+    loop = src == dst
+    loop_weight = w[loop].sum()
+    # Sorted by the source vertices, so the keys of the pairs are almost sorted
+    order = np.argsort(src[~loop], kind="stable")
+    src, dst, w = src[~loop][order], dst[~loop][order], w[~loop][order]
+
+    comm = np.arange(n, dtype=np.int64)
+    quality = _modularity(comm, src, dst, w, loop_weight, degree, resolution)
+    prob = _MOVE_PROB
+    # Only the vertices whose neighbors moved are considered in the next round
+    active = np.ones(n, dtype=bool)
+    for round_ in range(_MAX_ROUNDS):
+        selected = active[src]
+        if not selected.any():
+            break
+        sigma = np.bincount(comm, weights=degree, minlength=n)
+        # The weights from each active vertex to each community of its neighbors
+        pairs, weight_to = _sum_by_key(
+            src[selected] * n + comm[dst[selected]], w[selected]
+        )
+        v, c = pairs // n, pairs % n
+        own = comm[v] == c
+
+        # The gains of moving the vertices out of their communities to each
+        # community, and of staying in their own communities
+        gain = (
+            weight_to
+            - resolution * degree[v] * (sigma[c] - np.where(own, degree[v], 0)) / two_m
+        )
+        stay = -resolution * degree * (sigma[comm] - degree) / two_m
+        stay[v[own]] += weight_to[own]
+
+        better = ~own & (gain > stay[v] + _EPSILON)
+        if not better.any() or round_ and better.sum() < n * _MIN_MOVE_RATIO:
+            break
+        v, c, gain = v[better], c[better], gain[better]
+        order = np.lexsort((-gain, v))
+        v, c = v[order], c[order]
+        best = np.ones(len(v), dtype=bool)
+        best[1:] = v[1:] != v[:-1]
+        v, c = v[best], c[best]
+
+        moved = rng.random(len(v)) < prob
+        new_comm = comm.copy()
+        new_comm[v[moved]] = c[moved]
+        new_quality = _modularity(
+            new_comm, src, dst, w, loop_weight, degree, resolution
+        )
+        if new_quality > quality + _EPSILON:
+            comm, quality = new_comm, new_quality
+            changed = np.zeros(n, dtype=bool)
+            changed[v[moved]] = True
+            active = np.zeros(n, dtype=bool)
+            active[dst[changed[src]]] = True
+            active[v[~moved]] = True
+        else:
+            active = np.zeros(n, dtype=bool)
+            active[v] = True
+            prob /= 2
+            if prob < _MIN_MOVE_PROB:
+                break
+    return comm
+
+
+def _sum_by_key(keys: np.ndarray, w: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the unique keys and the sums of the weights of each key."""
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+    return keys[starts], np.add.reduceat(w[order], starts)
+
+
+def _aggregate(
+    src: np.ndarray, dst: np.ndarray, w: np.ndarray, n: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Merge the arcs between the same vertices."""
+    pairs, weights = _sum_by_key(src * n + dst, w)
+    return pairs // n, pairs % n, weights
+
+
+def _split_disconnected(
+    membership: np.ndarray, src: np.ndarray, dst: np.ndarray
+) -> np.ndarray:
+    """Split the communities into their connected components."""
+    inside = membership[src] == membership[dst]
+    src, dst = src[inside], dst[inside]
+    labels = np.arange(len(membership), dtype=np.int64)
+    while True:
+        # Propagate the smallest vertex of the components, with pointer jumping
+        prev = labels
+        labels = labels.copy()
+        np.minimum.at(labels, src, prev[dst])
+        np.minimum.at(labels, dst, prev[src])
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels, prev):
+            break
+    _, components = np.unique(labels, return_inverse=True)
+    return components
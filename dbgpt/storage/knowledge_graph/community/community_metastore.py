@@ -1,17 +1,35 @@
 """Builtin Community metastore."""
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from dbgpt.core import Chunk
 from dbgpt.datasource.rdbms.base import RDBMSConnector
 from dbgpt.storage.knowledge_graph.community.base import Community, CommunityMetastore
 from dbgpt.storage.vector_store.base import VectorStoreBase
+from dbgpt.storage.vector_store.filters import (
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
 
 logger = logging.getLogger(__name__)
 
+_COMMUNITY_ID = "community_id"
+_SIGNATURE = "signature"
+# The query to load the saved summaries, they are selected by the filters
+_LOAD_QUERY = "community summary"
+
 
 class BuiltinCommunityMetastore(CommunityMetastore):
-    """Builtin Community metastore."""
+    """Builtin Community metastore.
+
+    The vector stores may assign their own ids to the saved chunks, so the ids of
+    the summary of each community are recorded when it is saved, and the summaries
+    are deleted by them.
+
+    The community id and the signature are saved in the metadata of the summary,
+    so the summaries can be loaded with their ids after restart.
+    """
 
     def __init__(
         self, vector_store: VectorStoreBase, rdb_store: Optional[RDBMSConnector] = None
@@ -26,6 +44,10 @@ class BuiltinCommunityMetastore(CommunityMetastore):
         self._max_threads = config.max_threads
         self._topk = config.topk
         self._score_threshold = config.score_threshold
+        # community id -> the id of its summary in the vector store
+        self._vector_ids: Dict[str, str] = {}
+        # whether the ids of all the saved summaries are recorded
+        self._ids_complete = True
 
     def get(self, community_id: str) -> Community:
         """Get community."""
@@ -40,24 +62,121 @@ class BuiltinCommunityMetastore(CommunityMetastore):
         chunks = await self._vector_store.asimilar_search_with_scores(
             query, self._topk, self._score_threshold
         )
-        return [Community(id=chunk.chunk_id, summary=chunk.content) for chunk in chunks]
+        return [
+            Community(id=chunk.chunk_id, summary=chunk.content)
+            for chunk in chunks
+            if not self._is_removed(chunk)
+        ]
+
+    def _is_removed(self, chunk: Chunk) -> bool:
+        """Whether the summary is of a community removed before it was loaded.
+
+        The summaries of the communities removed across restart are not loaded,
+        they can't be deleted by ids until the metastore is truncated.
+        """
+        community_id = chunk.metadata.get(_COMMUNITY_ID)
+        return (
+            community_id is not None
+            and self._ids_complete
+            and bool(self._vector_ids)
+            and community_id not in self._vector_ids
+        )
+
+    async def load(self, community_ids: List[str]) -> List[Community]:
+        """Load the saved communities with their summaries and signatures.
+
+        The ids of the loaded summaries are recorded, so they can be deleted by ids.
+
+        Returns:
+            List[Community]: The saved communities of the ids, the communities
+                saved without the signatures are not loaded.
+        """
+        if not community_ids or not self._vector_store.vector_name_exists():
+            return []
+        filters = MetadataFilters(
+            filters=[
+                MetadataFilter(
+                    key=_COMMUNITY_ID, operator=FilterOperator.IN, value=community_ids
+                )
+            ]
+        )
+        try:
+            chunks = await self._vector_store.asimilar_search(
+                _LOAD_QUERY, len(community_ids), filters
+            )
+        except Exception as e:
+            logger.warning(f"Load the saved communities error: {e}")
+            return []
+        communities = []
+        for chunk in chunks:
+            community_id = chunk.metadata.get(_COMMUNITY_ID)
+            signature = chunk.metadata.get(_SIGNATURE)
+            if not signature or community_id in self._vector_ids:
+                continue
+            self._vector_ids[community_id] = chunk.chunk_id
+            communities.append(
+                Community(id=community_id, summary=chunk.content, signature=signature)
+            )
+        logger.info(f"Load {len(communities)} communities")
+        return communities
 
     async def save(self, communities: List[Community]):
         """Save communities."""
         chunks = [
-            Chunk(id=c.id, content=c.summary, metadata={"total": len(communities)})
+            Chunk(
+                chunk_id=c.id,
+                content=c.summary,
+                metadata={
+                    "total": len(communities),
+                    _COMMUNITY_ID: c.id,
+                    _SIGNATURE: c.signature or "",
+                },
+            )
             for c in communities
         ]
-        await self._vector_store.aload_document_with_limit(
+        if not chunks:
+            return
+        ids = await self._vector_store.aload_document_with_limit(
             chunks, self._max_chunks_once_load, self._max_threads
         )
+        if ids is not None and len(ids) == len(chunks):
+            for community, vector_id in zip(communities, ids):
+                self._vector_ids[community.id] = str(vector_id)
+        else:
+            logger.warning(
+                "The ids of the saved communities are unknown, they can't be "
+                "deleted by ids until the metastore is truncated"
+            )
+            self._ids_complete = False
         logger.info(f"Save {len(communities)} communities")
 
+    async def delete(self, community_ids: List[str]) -> bool:
+        """Delete communities by ids.
+
+        The communities not saved are skipped.
+
+        Returns:
+            bool: False if the ids of the saved summaries are unknown, nothing is
+                deleted.
+        """
+        if not self._ids_complete:
+            return False
+        saved = [cid for cid in community_ids if cid in self._vector_ids]
+        ids = [self._vector_ids.pop(cid) for cid in saved]
+        if ids:
+            self._vector_store.delete_by_ids(",".join(ids))
+            logger.info(f"Delete {len(ids)} communities")
+        return True
+
     async def truncate(self):
         """Truncate community metastore."""
         self._vector_store.truncate()
+        self._vector_ids.clear()
+        self._ids_complete = True
 
     def drop(self):
         """Drop community metastore."""
+        self._vector_ids.clear()
+        self._ids_complete = True
         if self._vector_store.vector_name_exists():
             self._vector_store.delete_vector_name(self._vector_space)
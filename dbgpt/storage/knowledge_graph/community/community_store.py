@@ -1,10 +1,13 @@
 """Define the CommunityStore class."""
 
 import asyncio
+import hashlib
+import json
 import logging
-from typing import List, Optional
+from typing import Dict, List, Tuple
 
 from dbgpt.rag.transformer.community_summarizer import CommunitySummarizer
+from dbgpt.storage.graph_store.graph import Graph
 from dbgpt.storage.knowledge_graph.community.base import Community, GraphStoreAdapter
 from dbgpt.storage.knowledge_graph.community.community_metastore import (
     BuiltinCommunityMetastore,
@@ -13,6 +16,8 @@ from dbgpt.storage.vector_store.base import VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
+_COMMUNITY_ID = "_community_id"
+
 
 class CommunityStore:
     """CommunityStore Class."""
@@ -27,37 +32,102 @@ class CommunityStore:
         self._graph_store_adapter = graph_store_adapter
         self._community_summarizer = community_summarizer
         self._meta_store = BuiltinCommunityMetastore(vector_store)
+        # community id -> (signature, summary) of the last build
+        self._community_summaries: Dict[str, Tuple[str, str]] = {}
+        self._synced = False
 
     async def build_communities(self, batch_size: int = 1):
-        """Discover communities."""
+        """Discover communities, summarize the changed ones.
+
+        The communities are rediscovered on the whole graph, and a community is
+        summarized again only if its vertices or edges are changed since the last
+        build, the summaries of the unchanged communities are kept in the
+        metastore. The signatures are saved with the summaries, and loaded before
+        the first build, so the communities are not summarized again after restart.
+        """
         community_ids = await self._graph_store_adapter.discover_communities()
-
-        # summarize communities
-        communities = []
+        if not self._synced:
+            await self._load_summaries(community_ids)
         n_communities = len(community_ids)
 
+        communities: List[Community] = []
         for i in range(0, n_communities, batch_size):
             batch_ids = community_ids[i : i + batch_size]
             batch_results = await asyncio.gather(
-                *[self._summary_community(cid) for cid in batch_ids]
+                *[self._graph_store_adapter.get_community(cid) for cid in batch_ids]
+            )
+            for cid, community in zip(batch_ids, batch_results):
+                if community is None or community.data is None:
+                    logger.warning(f"Community {cid} is empty")
+                    continue
+                communities.append(community)
+
+        # the summaries of the unchanged communities, by the signatures, so a
+        # renumbered community does not need to be summarized again
+        summaries = {
+            signature: summary
+            for signature, summary in self._community_summaries.values()
+        }
+        signatures = {}
+        changed: List[Community] = []
+        pending: List[Community] = []
+        for community in communities:
+            signature = _community_signature(community.data)
+            signatures[community.id] = signature
+            community.signature = signature
+            known = self._community_summaries.get(community.id)
+            if known and known[0] == signature:
+                community.summary = known[1]
+                continue
+            changed.append(community)
+            if signature in summaries:
+                community.summary = summaries[signature]
+            else:
+                pending.append(community)
+
+        # summarize the new and changed communities
+        for i in range(0, len(pending), batch_size):
+            await asyncio.gather(
+                *[self._summary_community(c) for c in pending[i : i + batch_size]]
             )
-            # filter out None returns
-            communities.extend([c for c in batch_results if c is not None])
-
-        # truncate then save new summaries
-        await self._meta_store.truncate()
-        await self._meta_store.save(communities)
 
-    async def _summary_community(self, community_id: str) -> Optional[Community]:
+        removed = [cid for cid in self._community_summaries if cid not in signatures]
+        replaced = (
+            self._synced
+            and await self._meta_store.delete(removed)
+            and await self._meta_store.upsert(changed)
+        )
+        if not replaced:
+            # the summaries saved before are unknown or can't be deleted by ids,
+            # so replace all of them
+            await self._meta_store.truncate()
+            await self._meta_store.save(communities)
+            removed = []
+            self._synced = True
+        logger.info(
+            f"Build {n_communities} communities, {len(pending)} summarized, "
+            f"{len(changed)} saved, {len(removed)} removed"
+        )
+
+        self._community_summaries = {
+            c.id: (signatures[c.id], c.summary or "") for c in communities
+        }
+
+    async def _load_summaries(self, community_ids: List[str]):
+        """Load the summaries and the signatures saved before."""
+        loaded = await self._meta_store.load(community_ids)
+        if not loaded:
+            return
+        self._community_summaries = {
+            c.id: (c.signature or "", c.summary or "") for c in loaded
+        }
+        self._synced = True
+
+    async def _summary_community(self, community: Community) -> Community:
         """Summarize single community."""
-        community = await self._graph_store_adapter.get_community(community_id)
-        if community is None or community.data is None:
-            logger.warning(f"Community {community_id} is empty")
-            return None
-
         graph = community.data.format()
         community.summary = await self._community_summarizer.summarize(graph=graph)
-        logger.info(f"Summarize community {community_id}: {community.summary[:50]}...")
+        logger.info(f"Summarize community {community.id}: {community.summary[:50]}...")
         return community
 
     async def search_communities(self, query: str) -> List[Community]:
@@ -66,6 +136,9 @@ class CommunityStore:
 
     def truncate(self):
         """Truncate community store."""
+        self._community_summaries.clear()
+        self._synced = False
+
         logger.info("Truncate community metastore")
         self._meta_store.truncate()
 
@@ -77,6 +150,9 @@ class CommunityStore:
 
     def drop(self):
         """Drop community store."""
+        self._community_summaries.clear()
+        self._synced = False
+
         logger.info("Remove community metastore")
         self._meta_store.drop()
 
@@ -85,3 +161,31 @@ class CommunityStore:
 
         logger.info("Remove graph")
         self._graph_store_adapter.drop()
+
+
+def _community_signature(graph: Graph) -> str:
+    """Return the signature of the vertices and edges of a community.
+
+    The community id property of the vertices is excluded, so the signature does
+    not change when the community is renumbered by the discovery.
+    """
+    vertices = sorted(
+        json.dumps(
+            [v.vid, v.name, {k: p for k, p in v.props.items() if k != _COMMUNITY_ID}],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        for v in graph.vertices()
+    )
+    edges = sorted(
+        json.dumps(
+            [e.sid, e.tid, e.name, e.props],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        for e in graph.edges()
+    )
+    content = "\n".join(vertices + edges)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
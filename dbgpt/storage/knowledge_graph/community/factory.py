@@ -3,8 +3,12 @@
 import logging
 
 from dbgpt.storage.graph_store.base import GraphStoreBase
+from dbgpt.storage.graph_store.memgraph_store import MemoryGraphStore
 from dbgpt.storage.graph_store.tugraph_store import TuGraphStore
 from dbgpt.storage.knowledge_graph.community.base import GraphStoreAdapter
+from dbgpt.storage.knowledge_graph.community.memgraph_store_adapter import (
+    MemGraphStoreAdapter,
+)
 from dbgpt.storage.knowledge_graph.community.tugraph_store_adapter import (
     TuGraphStoreAdapter,
 )
@@ -24,6 +28,10 @@ class GraphStoreAdapterFactory:
         """
         if isinstance(graph_store, TuGraphStore):
             return TuGraphStoreAdapter(graph_store)
+        elif isinstance(graph_store, MemoryGraphStore):
+            return MemGraphStoreAdapter(
+                graph_store.get_config().enable_summary, graph_store
+            )
         else:
             raise Exception(
                 "create community store adapter for %s failed",
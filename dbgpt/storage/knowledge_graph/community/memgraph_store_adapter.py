@@ -4,6 +4,9 @@ import json
 import logging
 from typing import AsyncGenerator, Dict, Iterator, List, Literal, Optional, Tuple, Union
 
+import numpy as np
+
+from dbgpt.storage.graph_store.compact_graph import CompactGraph
 from dbgpt.storage.graph_store.graph import (
     Direction,
     Edge,
@@ -18,6 +21,11 @@ from dbgpt.storage.graph_store.memgraph_store import (
 )
 from dbgpt.storage.knowledge_graph.base import ParagraphChunk
 from dbgpt.storage.knowledge_graph.community.base import Community, GraphStoreAdapter
+from dbgpt.storage.knowledge_graph.community.community_detection import (
+    DEFAULT_RESOLUTION,
+    DEFAULT_SEED,
+    louvain,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +35,20 @@ class MemGraphStoreAdapter(GraphStoreAdapter):
 
     MAX_HIERARCHY_LEVEL = 3
 
-    def __init__(self, enable_summary: bool = False):
+    def __init__(
+        self,
+        enable_summary: bool = False,
+        graph_store: Optional[MemoryGraphStore] = None,
+        community_resolution: float = DEFAULT_RESOLUTION,
+        community_seed: int = DEFAULT_SEED,
+    ):
         """Initialize MemGraph Community Store Adapter."""
-        self._graph_store = MemoryGraphStore(MemoryGraphStoreConfig())
+        self._graph_store = graph_store or MemoryGraphStore(MemoryGraphStoreConfig())
         self._enable_summary = enable_summary
+        self._community_resolution = community_resolution
+        self._community_seed = community_seed
+        # The vertex ids of the communities discovered
+        self._communities: Dict[str, List[str]] = {}
 
         super().__init__(self._graph_store)
 
@@ -38,12 +56,54 @@ class MemGraphStoreAdapter(GraphStoreAdapter):
         self.create_graph(self._graph_store.get_config().name)
 
     async def discover_communities(self, **kwargs) -> List[str]:
-        """Run community discovery with leiden."""
-        []
+        """Run community discovery with louvain in process."""
+        vids, src, dst = self._edge_index()
+        membership = louvain(
+            src,
+            dst,
+            len(vids),
+            resolution=self._community_resolution,
+            seed=self._community_seed,
+        )
+        communities: Dict[str, List[str]] = {}
+        for vid, community_id in zip(vids, membership.tolist()):
+            communities.setdefault(str(community_id), []).append(vid)
+        self._communities = communities
+        logger.info(f"Discovered {len(communities)} communities.")
+        return list(communities)
+
+    def _edge_index(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Return the vertex ids, and the source and target indexes of the edges."""
+        graph = self._graph_store._graph
+        if isinstance(graph, CompactGraph):
+            vids, src, dst = graph.edge_index()
+            return (
+                vids,
+                np.frombuffer(src, dtype=np.int64),
+                np.frombuffer(dst, dtype=np.int64),
+            )
+
+        vids = [vertex.vid for vertex in graph.vertices()]
+        index = {vid: i for i, vid in enumerate(vids)}
+        src = np.fromiter((index[e.sid] for e in graph.edges()), dtype=np.int64)
+        dst = np.fromiter((index[e.tid] for e in graph.edges()), dtype=np.int64)
+        return vids, src, dst
 
     async def get_community(self, community_id: str) -> Community:
         """Get community."""
-        raise NotImplementedError("Memory graph store does not have community")
+        graph = self._graph_store._graph
+        vids = [
+            vid
+            for vid in self._communities.get(community_id, [])
+            if graph.has_vertex(vid)
+        ]
+        community_graph = MemoryGraph()
+        for vid in vids:
+            community_graph.upsert_vertex(graph.get_vertex(vid))
+        for vid in vids:
+            for edge in graph.get_neighbor_edges(vid, Direction.BOTH):
+                community_graph.append_edge(edge)
+        return Community(id=community_id, data=community_graph)
 
     def get_graph_config(self):
         """Get the graph store config."""
@@ -89,13 +149,17 @@ class MemGraphStoreAdapter(GraphStoreAdapter):
 
     def upsert_entities(self, entities: Iterator[Vertex]) -> None:
         """Upsert entities."""
-        pass
+        for entity in entities:
+            self._graph_store._graph.upsert_vertex(entity)
 
     def upsert_edge(
         self, edges: Iterator[Edge], edge_type: str, src_type: str, dst_type: str
     ) -> None:
-        """Upsert edges."""
-        pass
+        """Upsert edges, only the relations between entities are kept."""
+        if edge_type != GraphElemType.RELATION.value:
+            return
+        for edge in edges:
+            self._graph_store._graph.append_edge(edge)
 
     def upsert_chunks(
         self, chunks: Union[Iterator[Vertex], Iterator[ParagraphChunk]]
@@ -155,6 +219,10 @@ class MemGraphStoreAdapter(GraphStoreAdapter):
         for edge in graph.edges():
             self._graph_store._graph.append_edge(edge)
 
+    def persist(self) -> None:
+        """Save the snapshot of the graph."""
+        self._graph_store.save()
+
     def delete_document(self, chunk_ids: str) -> None:
         """Delete document in the graph."""
         pass
@@ -165,7 +233,8 @@ class MemGraphStoreAdapter(GraphStoreAdapter):
 
     def drop(self):
         """Delete Graph."""
-        self._graph_store._graph = None
+        self._graph_store.drop()
+        self._communities = {}
 
     def create_graph(self, graph_name: str):
         """Create a graph."""
@@ -186,6 +255,8 @@ class MemGraphStoreAdapter(GraphStoreAdapter):
     def truncate(self):
         """Truncate Graph."""
         self._graph_store._graph.truncate()
+        self._communities = {}
+        self.persist()
 
     def check_label(self, graph_elem_type: GraphElemType) -> bool:
         """Check if the label exists in the graph.
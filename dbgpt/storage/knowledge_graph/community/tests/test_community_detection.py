@@ -0,0 +1,89 @@
+import itertools
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from dbgpt.storage.graph_store.memgraph_store import (
+    MemoryGraphStore,
+    MemoryGraphStoreConfig,
+)
+from dbgpt.storage.knowledge_graph.community.community_detection import louvain
+from dbgpt.storage.knowledge_graph.community.memgraph_store_adapter import (
+    MemGraphStoreAdapter,
+)
+
+
+def _cliques(count: int, size: int):
+    """The cliques joined by a bridge edge between the neighbor cliques."""
+    edges = []
+    for k in range(count):
+        vertices = range(k * size, (k + 1) * size)
+        edges.extend(itertools.combinations(vertices, 2))
+        if k:
+            edges.append((k * size - 1, k * size))
+    return np.array(edges)
+
+
+def test_louvain_cliques():
+    edges = _cliques(4, 6)
+    membership = louvain(edges[:, 0], edges[:, 1], 24)
+    assert membership.tolist() == [k for k in range(4) for _ in range(6)]
+
+    # Deterministic for the same seed
+    edges = np.array(nx.karate_club_graph().edges())
+    first = louvain(edges[:, 0], edges[:, 1], 34, seed=7)
+    assert (first == louvain(edges[:, 0], edges[:, 1], 34, seed=7)).all()
+
+
+def test_louvain_modularity():
+    graph = nx.karate_club_graph()
+    edges = np.array(graph.edges())
+    membership = louvain(edges[:, 0], edges[:, 1], graph.number_of_nodes())
+    communities = [
+        set(np.flatnonzero(membership == c)) for c in range(membership.max() + 1)
+    ]
+    expected = nx.community.modularity(
+        graph, nx.community.louvain_communities(graph, seed=1)
+    )
+    assert nx.community.modularity(graph, communities) >= expected - 0.02
+
+    # The higher resolution, the smaller communities
+    small = louvain(edges[:, 0], edges[:, 1], 34, resolution=3.0)
+    assert small.max() > membership.max()
+
+
+def test_louvain_isolated_and_weighted():
+    assert louvain(np.array([]), np.array([]), 3).tolist() == [0, 1, 2]
+
+    # The self loops and the isolated vertices
+    membership = louvain(np.array([0, 1, 2]), np.array([0, 1, 2]), 4)
+    assert len(set(membership.tolist())) == 4
+
+    # The heavy edges hold the pairs together
+    src, dst = np.array([0, 1, 2, 0]), np.array([1, 2, 3, 3])
+    weights = np.array([10.0, 1.0, 10.0, 1.0])
+    membership = louvain(src, dst, 4, weights=weights)
+    assert membership[0] == membership[1] != membership[2] == membership[3]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("graph_engine", ["memory", "compact"])
+async def test_memgraph_adapter_communities(graph_engine):
+    adapter = MemGraphStoreAdapter(
+        graph_store=MemoryGraphStore(MemoryGraphStoreConfig(graph_engine=graph_engine))
+    )
+    for sid, tid in _cliques(2, 4).tolist():
+        adapter.insert_triplet(f"v{sid}", "relates", f"v{tid}")
+
+    community_ids = await adapter.discover_communities()
+    assert len(community_ids) == 2
+    communities = [await adapter.get_community(cid) for cid in community_ids]
+    members = [sorted(v.vid for v in c.data.vertices()) for c in communities]
+    assert ["v0", "v1", "v2", "v3"] == members[0][:4]
+    # The bridge edge is in both communities
+    assert communities[0].data.edge_count == 7
+    assert communities[1].data.edge_count == 7
+
+    adapter.truncate()
+    assert (await adapter.get_community(community_ids[0])).data.vertex_count == 0
@@ -0,0 +1,170 @@
+import itertools
+from typing import Dict, List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from dbgpt.core import Chunk
+from dbgpt.storage.graph_store.graph import Edge, MemoryGraph, Vertex
+from dbgpt.storage.knowledge_graph.community.base import Community
+from dbgpt.storage.knowledge_graph.community.community_store import CommunityStore
+
+
+class _Adapter:
+    """The graph store adapter with the given communities."""
+
+    def __init__(self):
+        self.communities: Dict[str, List[tuple]] = {}
+
+    async def discover_communities(self) -> List[str]:
+        return list(self.communities)
+
+    async def get_community(self, community_id: str) -> Community:
+        graph = MemoryGraph()
+        for sid, tid in self.communities[community_id]:
+            graph.upsert_vertex(Vertex(sid, _community_id=community_id))
+            graph.upsert_vertex(Vertex(tid, _community_id=community_id))
+            graph.append_edge(Edge(sid, tid, "relates"))
+        return Community(id=community_id, data=graph)
+
+    def truncate(self):
+        self.communities = {}
+
+
+@pytest.fixture
+def store():
+    vector_store = MagicMock()
+    # The vector store assigns its own ids to the chunks
+    ids = itertools.count(100)
+    vector_store.aload_document_with_limit = AsyncMock(
+        side_effect=lambda chunks, *args: [next(ids) for _ in chunks]
+    )
+    # Nothing saved before
+    vector_store.asimilar_search = AsyncMock(return_value=[])
+    summarizer = MagicMock()
+    summarizer.summarize = AsyncMock(side_effect=lambda graph: f"summary of {graph}")
+    return CommunityStore(_Adapter(), summarizer, vector_store)
+
+
+def _saved_ids(vector_store) -> List[str]:
+    chunks = vector_store.aload_document_with_limit.call_args[0][0]
+    return sorted(chunk.chunk_id for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_build_communities_incrementally(store):
+    adapter = store._graph_store_adapter
+    summarizer = store._community_summarizer
+    vector_store = store._meta_store._vector_store
+
+    adapter.communities = {"0": [("a", "b")], "1": [("c", "d")]}
+    await store.build_communities(batch_size=2)
+    assert summarizer.summarize.call_count == 2
+    vector_store.truncate.assert_called_once()
+    assert _saved_ids(vector_store) == ["0", "1"]
+
+    # only the changed community is summarized again
+    adapter.communities = {"0": [("a", "b"), ("b", "e")], "1": [("c", "d")]}
+    await store.build_communities(batch_size=2)
+    assert summarizer.summarize.call_count == 3
+    vector_store.truncate.assert_called_once()
+    vector_store.delete_by_ids.assert_called_once_with("100")
+    assert _saved_ids(vector_store) == ["0"]
+
+    # unchanged graph, nothing to do
+    vector_store.reset_mock()
+    await store.build_communities()
+    assert summarizer.summarize.call_count == 3
+    vector_store.delete_by_ids.assert_not_called()
+    vector_store.aload_document_with_limit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_build_communities_renumbered_and_removed(store):
+    adapter = store._graph_store_adapter
+    summarizer = store._community_summarizer
+    vector_store = store._meta_store._vector_store
+
+    adapter.communities = {"0": [("a", "b")], "1": [("c", "d")]}
+    await store.build_communities()
+    summary = (await adapter.get_community("1")).data.format()
+
+    # community 1 is renumbered, community 0 is removed
+    vector_store.reset_mock()
+    adapter.communities = {"2": [("c", "d")]}
+    await store.build_communities()
+    assert summarizer.summarize.call_count == 2
+    deleted = [c.args[0] for c in vector_store.delete_by_ids.call_args_list]
+    assert deleted == ["100,101"]
+    chunks = vector_store.aload_document_with_limit.call_args[0][0]
+    assert [c.chunk_id for c in chunks] == ["2"]
+    assert chunks[0].content == f"summary of {summary}"
+
+    # truncate forgets the summaries
+    store.truncate()
+    adapter.communities = {"2": [("c", "d")]}
+    vector_store.reset_mock()
+    await store.build_communities()
+    assert summarizer.summarize.call_count == 3
+    vector_store.truncate.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_build_communities_without_vector_ids(store):
+    adapter = store._graph_store_adapter
+    vector_store = store._meta_store._vector_store
+    vector_store.aload_document_with_limit = AsyncMock(return_value=[])
+
+    adapter.communities = {"0": [("a", "b")], "1": [("c", "d")]}
+    await store.build_communities()
+
+    # the summaries can't be deleted by ids, so all of them are replaced
+    adapter.communities = {"0": [("a", "b"), ("b", "e")], "1": [("c", "d")]}
+    await store.build_communities()
+    vector_store.delete_by_ids.assert_not_called()
+    assert vector_store.truncate.call_count == 2
+    assert _saved_ids(vector_store) == ["0", "1"]
+
+
+@pytest.mark.asyncio
+async def test_build_communities_after_restart(store):
+    adapter = store._graph_store_adapter
+    vector_store = store._meta_store._vector_store
+
+    adapter.communities = {"0": [("a", "b")], "1": [("c", "d")], "2": [("e", "f")]}
+    await store.build_communities()
+    saved_chunks = vector_store.aload_document_with_limit.call_args[0][0]
+    # The summaries are loaded from the vector store by the community ids
+    saved = [
+        Chunk(chunk_id=str(100 + i), content=c.content, metadata=c.metadata)
+        for i, c in enumerate(saved_chunks)
+    ]
+    vector_store.asimilar_search = AsyncMock(
+        side_effect=lambda query, topk, filters: [
+            c for c in saved if c.metadata["community_id"] in filters.filters[0].value
+        ]
+    )
+
+    summarizer = MagicMock()
+    summarizer.summarize = AsyncMock(side_effect=lambda graph: f"summary of {graph}")
+    vector_store.reset_mock()
+    restarted = CommunityStore(adapter, summarizer, vector_store)
+    # Community 1 is changed, community 2 is removed
+    adapter.communities = {"0": [("a", "b")], "1": [("c", "d"), ("d", "g")]}
+    await restarted.build_communities()
+    filters = vector_store.asimilar_search.call_args[0][2]
+    assert filters.filters[0].value == ["0", "1"]
+    assert summarizer.summarize.call_count == 1
+    vector_store.truncate.assert_not_called()
+    vector_store.delete_by_ids.assert_called_once_with("101")
+    assert _saved_ids(vector_store) == ["1"]
+
+    # The summary of the community removed across restart is not searched
+    vector_store.asimilar_search_with_scores = AsyncMock(
+        return_value=[
+            Chunk(chunk_id="100", content="a", metadata={"community_id": "0"}),
+            Chunk(chunk_id="102", content="e", metadata={"community_id": "2"}),
+        ]
+    )
+    communities = await restarted.search_communities("query")
+    assert [c.summary for c in communities] == ["a"]
@@ -0,0 +1,86 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from dbgpt.storage.graph_store.graph import Edge, MemoryGraph, Vertex
+from dbgpt.storage.knowledge_graph.base import ParagraphChunk
+from dbgpt.storage.knowledge_graph.community.base import GraphUpsertBatch
+
+
+def _chunk(chunk_id: str, parent_id: str = "doc") -> ParagraphChunk:
+    return ParagraphChunk(
+        chunk_id=chunk_id,
+        chunk_name=chunk_id,
+        chunk_parent_id=parent_id,
+        chunk_parent_name=parent_id,
+        parent_is_document=parent_id == "doc",
+    )
+
+
+def _calls(adapter, method: str):
+    return [
+        (list(c.args[0]), *c.args[1:]) for c in getattr(adapter, method).call_args_list
+    ]
+
+
+def test_upsert_by_label():
+    adapter = MagicMock()
+    chunks = [_chunk(f"c{i}") for i in range(3)]
+    with GraphUpsertBatch(adapter) as batch:
+        batch.upsert_documents([ParagraphChunk(chunk_id="doc", chunk_name="doc")])
+        batch.upsert_chunks(chunks)
+        for i, chunk in enumerate(chunks):
+            batch.upsert_doc_include_chunk(chunk)
+            if i:
+                batch.upsert_chunk_next_chunk(chunks[i - 1], chunk)
+        adapter.upsert_edge.assert_not_called()
+
+    assert [
+        [c.chunk_id for c in call[0]] for call in _calls(adapter, "upsert_chunks")
+    ] == [["c0", "c1", "c2"]]
+    edge_calls = _calls(adapter, "upsert_edge")
+    assert [(len(edges), *labels) for edges, *labels in edge_calls] == [
+        (3, "include", "document", "chunk"),
+        (2, "next", "chunk", "chunk"),
+    ]
+    # The vertices are written before the edges
+    names = [name for name, *_ in adapter.method_calls]
+    assert names == ["upsert_chunks", "upsert_documents", "upsert_edge", "upsert_edge"]
+
+
+def test_upsert_graph_and_flush_by_size():
+    adapter = MagicMock()
+    batch = GraphUpsertBatch(adapter, batch_size=4)
+    graph = MemoryGraph()
+    graph.upsert_vertex(Vertex("a", vertex_type="entity"))
+    graph.upsert_vertex(Vertex("b", vertex_type="entity"))
+    graph.append_edge(Edge("a", "b", "knows", edge_type="relation"))
+    batch.upsert_graph(graph)
+    assert batch.pending_count == 3
+    # The same vertex is written once, the latest wins
+    batch.upsert_entities([Vertex("a", description="new")])
+    assert batch.pending_count == 3
+
+    batch.upsert_chunk_include_entity(_chunk("c0"), graph.get_vertex("a"))
+    assert batch.pending_count == 0
+    entities = _calls(adapter, "upsert_entities")[0][0]
+    assert [v.vid for v in entities] == ["a", "b"]
+    assert entities[0].get_prop("description") == "new"
+    assert [labels for _, *labels in _calls(adapter, "upsert_edge")] == [
+        ["relation", "entity", "entity"],
+        ["include", "chunk", "entity"],
+    ]
+
+    batch.flush()
+    assert len(adapter.method_calls) == 3
+    with pytest.raises(ValueError):
+        GraphUpsertBatch(adapter, batch_size=0)
+
+
+def test_no_flush_on_error():
+    adapter = MagicMock()
+    with pytest.raises(RuntimeError):
+        with GraphUpsertBatch(adapter) as batch:
+            batch.upsert_chunks([_chunk("c0")])
+            raise RuntimeError("failed")
+    assert not adapter.method_calls
@@ -148,6 +148,8 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
             }
             for entity in entities
         ]
+        if not entity_list:
+            return
         entity_query = (
             f"CALL db.upsertVertex("
             f'"{GraphElemType.ENTITY.value}", '
@@ -170,6 +172,8 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
             }
             for edge in edges
         ]
+        if not edge_list:
+            return
         relation_query = f"""CALL db.upsertEdge("{edge_type}",
             {{type:"{src_type}", key:"sid"}},
             {{type:"{dst_type}", key:"tid"}},
@@ -193,6 +197,8 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
             for chunk in chunks
         ]
 
+        if not chunk_list:
+            return
         chunk_query = (
             f"CALL db.upsertVertex("
             f'"{GraphElemType.CHUNK.value}", '
@@ -219,6 +225,8 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
             for document in documents
         ]
 
+        if not document_list:
+            return
         document_query = (
             "CALL db.upsertVertex("
             f'"{GraphElemType.DOCUMENT.value}", '
@@ -72,7 +72,7 @@ class CommunitySummaryKnowledgeGraphConfig(BuiltinKnowledgeGraphConfig):
     )
     knowledge_graph_extraction_batch_size: int = Field(
         default=20,
-        description="Batch size of triplets extraction from the text",
+        description="Max concurrency of triplets extraction from the text",
     )
     community_summary_batch_size: int = Field(
         default=20,
@@ -159,6 +159,7 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
                 extractor_configure,
             ),
         )
+        self._configure_extractor(self._graph_extractor)
 
         def community_store_configure(name: str, cfg: VectorStoreConfig):
             cfg.name = name
@@ -188,6 +189,8 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
         """Extract and persist graph from the document file."""
         await self._aload_document_graph(chunks)
         await self._aload_triplet_graph(chunks)
+        self._graph_store_apdater.persist()
+        self._subgraph_explorer.invalidate()
         await self._community_store.build_communities(
             batch_size=self._community_summary_batch_size
         )
@@ -207,23 +210,24 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
         ]
         documment_chunk, paragraph_chunks = self._load_chunks(_chunks)
 
-        # upsert the document and chunks vertices
-        self._graph_store_apdater.upsert_documents(iter([documment_chunk]))
-        self._graph_store_apdater.upsert_chunks(iter(paragraph_chunks))
-
-        # upsert the document structure
-        for chunk_index, chunk in enumerate(paragraph_chunks):
-            # document -> include -> chunk
-            if chunk.parent_is_document:
-                self._graph_store_apdater.upsert_doc_include_chunk(chunk=chunk)
-            else:  # chunk -> include -> chunk
-                self._graph_store_apdater.upsert_chunk_include_chunk(chunk=chunk)
-
-            # chunk -> next -> chunk
-            if chunk_index >= 1:
-                self._graph_store_apdater.upsert_chunk_next_chunk(
-                    chunk=paragraph_chunks[chunk_index - 1], next_chunk=chunk
-                )
+        # upsert the document and chunks vertices, and the document structure in
+        # batches
+        with self._graph_store_apdater.batch_upsert() as batch:
+            batch.upsert_documents(iter([documment_chunk]))
+            batch.upsert_chunks(iter(paragraph_chunks))
+
+            for chunk_index, chunk in enumerate(paragraph_chunks):
+                # document -> include -> chunk
+                if chunk.parent_is_document:
+                    batch.upsert_doc_include_chunk(chunk=chunk)
+                else:  # chunk -> include -> chunk
+                    batch.upsert_chunk_include_chunk(chunk=chunk)
+
+                # chunk -> next -> chunk
+                if chunk_index >= 1:
+                    batch.upsert_chunk_next_chunk(
+                        chunk=paragraph_chunks[chunk_index - 1], next_chunk=chunk
+                    )
 
     async def _aload_triplet_graph(self, chunks: List[Chunk]) -> None:
         """Load the knowledge graph from the chunks.
@@ -244,24 +248,25 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
         if not graphs_list:
             raise ValueError("No graphs extracted from the chunks")
 
-        # Upsert the graphs into the graph store
-        for idx, graphs in enumerate(graphs_list):
-            for graph in graphs:
-                if document_graph_enabled:
-                    # Append the chunk id to the edge
-                    for edge in graph.edges():
-                        edge.set_prop("_chunk_id", chunks[idx].chunk_id)
-                        graph.append_edge(edge=edge)
-
-                # Upsert the graph
-                self._graph_store_apdater.upsert_graph(graph)
-
-                # chunk -> include -> entity
-                if document_graph_enabled:
-                    for vertex in graph.vertices():
-                        self._graph_store_apdater.upsert_chunk_include_entity(
-                            chunk=chunks[idx], entity=vertex
-                        )
+        # Upsert the graphs into the graph store in batches
+        with self._graph_store_apdater.batch_upsert() as batch:
+            for idx, graphs in enumerate(graphs_list):
+                for graph in graphs:
+                    if document_graph_enabled:
+                        # Append the chunk id to the edge
+                        for edge in graph.edges():
+                            edge.set_prop("_chunk_id", chunks[idx].chunk_id)
+                            graph.append_edge(edge=edge)
+
+                    # Upsert the graph
+                    batch.upsert_graph(graph)
+
+                    # chunk -> include -> entity
+                    if document_graph_enabled:
+                        for vertex in graph.vertices():
+                            batch.upsert_chunk_include_entity(
+                                chunk=chunks[idx], entity=vertex
+                            )
 
     def _load_chunks(
         self, chunks: List[ParagraphChunk]
@@ -333,7 +338,7 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
         ]
         context = "\n".join(summaries) if summaries else ""
 
-        keywords: List[str] = await self._keyword_extractor.extract(text)
+        keywords: List[str] = await self._extract_keywords(text)
         subgraph = None
         subgraph_for_doc = None
 
@@ -342,8 +347,8 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
         document_graph_enabled = self._document_graph_enabled
 
         if triplet_graph_enabled:
-            subgraph = self._graph_store_apdater.explore(
-                subs=keywords, limit=topk, search_scope="knowledge_graph"
+            subgraph = await self._subgraph_explorer.explore_each(
+                keywords, limit=topk, search_scope="knowledge_graph"
             )
 
             if document_graph_enabled:
@@ -351,14 +356,14 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
                 for vertex in subgraph.vertices():
                     keywords_for_document_graph.append(vertex.name)
 
-                subgraph_for_doc = self._graph_store_apdater.explore(
+                subgraph_for_doc = await self._subgraph_explorer.explore(
                     subs=keywords_for_document_graph,
                     limit=self._knowledge_graph_chunk_search_top_size,
                     search_scope="document_graph",
                 )
         else:
             if document_graph_enabled:
-                subgraph_for_doc = self._graph_store_apdater.explore(
+                subgraph_for_doc = await self._subgraph_explorer.explore(
                     subs=keywords,
                     limit=self._knowledge_graph_chunk_search_top_size,
                     search_scope="document_graph",
@@ -386,6 +391,7 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
         """Truncate knowledge graph."""
         logger.info("Truncate community store")
         self._community_store.truncate()
+        self._subgraph_explorer.invalidate()
         logger.info("Truncate keyword extractor")
         self._keyword_extractor.truncate()
         logger.info("Truncate triplet extractor")
@@ -396,6 +402,7 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
         """Delete knowledge graph."""
         logger.info("Drop community store")
         self._community_store.drop()
+        self._subgraph_explorer.invalidate()
 
         logger.info("Drop keyword extractor")
         self._keyword_extractor.drop()
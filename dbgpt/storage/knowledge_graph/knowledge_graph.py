@@ -3,11 +3,12 @@
 import asyncio
 import logging
 import os
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from dbgpt._private.pydantic import ConfigDict, Field
 from dbgpt.core import Chunk, LLMClient
 from dbgpt.rag.transformer.keyword_extractor import KeywordExtractor
+from dbgpt.rag.transformer.llm_extractor import LLMExtractor
 from dbgpt.rag.transformer.triplet_extractor import TripletExtractor
 from dbgpt.storage.graph_store.base import GraphStoreBase, GraphStoreConfig
 from dbgpt.storage.graph_store.factory import GraphStoreFactory
@@ -15,10 +16,16 @@ from dbgpt.storage.graph_store.graph import Graph
 from dbgpt.storage.knowledge_graph.base import KnowledgeGraphBase, KnowledgeGraphConfig
 from dbgpt.storage.knowledge_graph.community.base import GraphStoreAdapter
 from dbgpt.storage.knowledge_graph.community.factory import GraphStoreAdapterFactory
+from dbgpt.storage.knowledge_graph.subgraph_explorer import (
+    SubgraphExplorer,
+    retrieval_cache,
+)
 from dbgpt.storage.vector_store.filters import MetadataFilters
 
 logger = logging.getLogger(__name__)
 
+_KEYWORDS_NAMESPACE = "keywords"
+
 
 class BuiltinKnowledgeGraphConfig(KnowledgeGraphConfig):
     """Builtin knowledge graph config."""
@@ -33,6 +40,17 @@ class BuiltinKnowledgeGraphConfig(KnowledgeGraphConfig):
         default="TuGraph", description="The type of graph store."
     )
 
+    cache_manager: Optional[Any] = Field(
+        default=None,
+        description="The cache manager to cache the LLM responses of the extraction.",
+    )
+    extraction_max_retries: int = Field(
+        default=2, description="The max number of retries of a failed extraction."
+    )
+    extraction_timeout: Optional[float] = Field(
+        default=None, description="The timeout in seconds of an extraction LLM call."
+    )
+
 
 class BuiltinKnowledgeGraph(KnowledgeGraphBase):
     """Builtin knowledge graph class."""
@@ -49,8 +67,34 @@ class BuiltinKnowledgeGraph(KnowledgeGraphBase):
         self._model_name = config.model_name
         self._triplet_extractor = TripletExtractor(self._llm_client, self._model_name)
         self._keyword_extractor = KeywordExtractor(self._llm_client, self._model_name)
+        self._configure_extractor(self._triplet_extractor)
+        self._configure_extractor(self._keyword_extractor)
         self._graph_store: GraphStoreBase = self.__init_graph_store(config)
         self._graph_store_apdater: GraphStoreAdapter = self.__init_graph_store_adapter()
+        # The cached subgraphs are shared by the knowledge graphs of the same graph
+        self._subgraph_explorer = SubgraphExplorer(
+            self._graph_store_apdater, self._graph_store.graph_id
+        )
+
+    def _configure_extractor(self, extractor: LLMExtractor) -> None:
+        """Set the retry, timeout and cache options of the extractor."""
+        config = self._config
+        timeout = os.getenv("KNOWLEDGE_GRAPH_EXTRACTION_TIMEOUT")
+        extraction_cache = None
+        if config.cache_manager:
+            from dbgpt.storage.cache.extraction_cache import ExtractionResultCache
+
+            extraction_cache = ExtractionResultCache(config.cache_manager)
+        extractor.set_extraction_options(
+            max_retries=int(
+                os.getenv(
+                    "KNOWLEDGE_GRAPH_EXTRACTION_MAX_RETRIES",
+                    config.extraction_max_retries,
+                )
+            ),
+            timeout=float(timeout) if timeout else config.extraction_timeout,
+            extraction_cache=extraction_cache,
+        )
 
     def __init_graph_store(self, config: BuiltinKnowledgeGraphConfig) -> GraphStoreBase:
         def configure(cfg: GraphStoreConfig):
@@ -63,6 +107,17 @@ class BuiltinKnowledgeGraph(KnowledgeGraphBase):
     def __init_graph_store_adapter(self):
         return GraphStoreAdapterFactory.create(self._graph_store)
 
+    async def _extract_keywords(self, text: str) -> List[str]:
+        """Extract the keywords of the text, cached by the model and the text."""
+        cache = retrieval_cache()
+        key = (self._model_name, text)
+        keywords = cache.get(_KEYWORDS_NAMESPACE, key)
+        if keywords is None:
+            keywords = tuple(await self._keyword_extractor.extract(text))
+            if keywords:
+                cache.set(_KEYWORDS_NAMESPACE, key, keywords)
+        return list(keywords)
+
     def get_config(self) -> BuiltinKnowledgeGraphConfig:
         """Get the knowledge graph config."""
         return self._config
@@ -83,6 +138,8 @@ class BuiltinKnowledgeGraph(KnowledgeGraphBase):
         asyncio.set_event_loop(loop)
         result = loop.run_until_complete(asyncio.gather(*tasks))
         loop.close()
+        self._graph_store_apdater.persist()
+        self._subgraph_explorer.invalidate()
         return result
 
     async def aload_document(self, chunks: List[Chunk]) -> List[str]:  # type: ignore
@@ -98,6 +155,8 @@ class BuiltinKnowledgeGraph(KnowledgeGraphBase):
             for triplet in triplets:
                 self._graph_store_apdater.insert_triplet(*triplet)
             logger.info(f"load {len(triplets)} triplets from chunk {chunk.chunk_id}")
+        self._graph_store_apdater.persist()
+        self._subgraph_explorer.invalidate()
         return [chunk.chunk_id for chunk in chunks]
 
     def similar_search_with_scores(
@@ -122,8 +181,10 @@ class BuiltinKnowledgeGraph(KnowledgeGraphBase):
             logger.info("Filters on knowledge graph not supported yet")
 
         # extract keywords and explore graph store
-        keywords = await self._keyword_extractor.extract(text)
-        subgraph = self._graph_store_apdater.explore(keywords, limit=topk).format()
+        keywords = await self._extract_keywords(text)
+        subgraph = (
+            await self._subgraph_explorer.explore_each(keywords, limit=topk)
+        ).format()
 
         logger.info(f"Search subgraph from {len(keywords)} keywords")
 
@@ -161,6 +222,7 @@ class BuiltinKnowledgeGraph(KnowledgeGraphBase):
         """Truncate knowledge graph."""
         logger.info(f"Truncate graph {self._config.name}")
         self._graph_store_apdater.truncate()
+        self._subgraph_explorer.invalidate()
 
         logger.info("Truncate keyword extractor")
         self._keyword_extractor.truncate()
@@ -174,6 +236,7 @@ class BuiltinKnowledgeGraph(KnowledgeGraphBase):
         """Delete vector name."""
         logger.info(f"Drop graph {index_name}")
         self._graph_store_apdater.drop()
+        self._subgraph_explorer.invalidate()
 
         logger.info("Drop keyword extractor")
         self._keyword_extractor.drop()
@@ -184,4 +247,5 @@ class BuiltinKnowledgeGraph(KnowledgeGraphBase):
     def delete_by_ids(self, ids: str) -> List[str]:
         """Delete by ids."""
         self._graph_store_apdater.delete_document(chunk_id=ids)
+        self._subgraph_explorer.invalidate()
         return []
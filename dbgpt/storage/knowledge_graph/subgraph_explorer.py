@@ -0,0 +1,217 @@
+"""Cached and concurrent subgraph exploration for the knowledge graph retrieval.
+
+The knowledge graph instances are created per retrieval, so the caches are shared by
+the instances of the process: the explored subgraphs are cached by the graph and the
+exploration arguments, and invalidated when the knowledge graph writes the graph. The
+entries also expire after a ttl, which bounds the staleness after the writes of the
+other processes to the same graph store.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Hashable, List, Optional, Sequence
+
+import cachetools
+
+from dbgpt.storage.graph_store.graph import IdVertex, MemoryGraph
+from dbgpt.storage.graph_store.memgraph_store import MemoryGraphStore
+from dbgpt.storage.knowledge_graph.community.base import GraphStoreAdapter
+from dbgpt.util.executor_utils import blocking_func_to_async
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 600
+DEFAULT_EXPLORE_CONCURRENCY = 8
+
+
+class RetrievalCache:
+    """The thread-safe LRU cache of the retrieval results by namespace.
+
+    The values must not be modified after they are cached.
+    """
+
+    def __init__(
+        self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL
+    ):
+        """Create a new RetrievalCache.
+
+        Args:
+            maxsize (int): The max number of the cached values.
+            ttl (float): The seconds the values are valid.
+        """
+        self._cache: cachetools.TTLCache = cachetools.TTLCache(maxsize, ttl)
+        self._generations: dict = {}
+        self._lock = threading.Lock()
+
+    def generation(self, namespace: str) -> int:
+        """Return the generation of the namespace, increased by the invalidations."""
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Any]:
+        """Return the cached value, None if not cached or expired."""
+        with self._lock:
+            return self._cache.get((namespace, key))
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Cache the value.
+
+        Args:
+            namespace (str): The namespace of the value.
+            key (Hashable): The key of the value.
+            value (Any): The value.
+            generation (Optional[int]): The generation of the namespace when the
+                value was computed, the value is not cached if the namespace has
+                been invalidated since.
+        """
+        with self._lock:
+            if generation is None or generation == self._generations.get(namespace, 0):
+                self._cache[(namespace, key)] = value
+
+    def invalidate(self, namespace: str) -> None:
+        """Remove the cached values of the namespace."""
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for key in [key for key in self._cache.keys() if key[0] == namespace]:
+                self._cache.pop(key, None)
+
+
+_retrieval_cache = RetrievalCache()
+_explore_executor: Optional[Executor] = None
+_explore_executor_lock = threading.Lock()
+
+
+def retrieval_cache() -> RetrievalCache:
+    """Return the retrieval cache shared by the knowledge graphs of the process."""
+    return _retrieval_cache
+
+
+def _default_executor() -> Executor:
+    """Return the executor shared by the explorations, its workers bound them."""
+    global _explore_executor
+    with _explore_executor_lock:
+        if _explore_executor is None:
+            _explore_executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_EXPLORE_CONCURRENCY,
+                thread_name_prefix="kg_explore",
+            )
+        return _explore_executor
+
+
+class SubgraphExplorer:
+    """Explore the subgraphs of a graph store adapter for the retrieval.
+
+    The explorations run in an executor instead of the event loop, and the executor
+    shared by the process bounds the concurrent explorations of all the requests.
+
+    The in-memory graphs are written on the event loop without a lock, so they are
+    explored on the calling thread instead, their explorations don't block on the
+    network either.
+    """
+
+    def __init__(
+        self,
+        graph_store_adapter: GraphStoreAdapter,
+        namespace: str,
+        cache: Optional[RetrievalCache] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """Create a new SubgraphExplorer.
+
+        Args:
+            graph_store_adapter (GraphStoreAdapter): The graph store adapter.
+            namespace (str): The namespace of the cached subgraphs, identifies the
+                graph.
+            cache (Optional[RetrievalCache]): The cache, the shared cache if not
+                provided.
+            executor (Optional[Executor]): The executor to run the explorations,
+                the shared executor if not provided.
+        """
+        self._adapter = graph_store_adapter
+        self._namespace = namespace
+        self._cache = cache or retrieval_cache()
+        self._executor = executor or _default_executor()
+        self._in_memory = isinstance(graph_store_adapter.graph_store, MemoryGraphStore)
+
+    @property
+    def cache(self) -> RetrievalCache:
+        """Return the cache of the explorer."""
+        return self._cache
+
+    def invalidate(self) -> None:
+        """Invalidate the cached subgraphs after the graph is written."""
+        self._cache.invalidate(self._namespace)
+
+    async def explore(self, subs: Sequence[str], **kwargs) -> MemoryGraph:
+        """Explore the graph from the subjects, see `GraphStoreAdapter.explore`.
+
+        The returned subgraph may be cached, it must not be modified.
+        """
+        key = (tuple(subs), tuple(sorted(kwargs.items())))
+        subgraph = self._cache.get(self._namespace, key)
+        if subgraph is not None:
+            return subgraph
+
+        generation = self._cache.generation(self._namespace)
+        if self._in_memory:
+            subgraph = self._adapter.explore(list(subs), **kwargs)
+        else:
+            subgraph = await blocking_func_to_async(
+                self._executor, self._adapter.explore, list(subs), **kwargs
+            )
+        self._cache.set(self._namespace, key, subgraph, generation)
+        return subgraph
+
+    async def explore_each(
+        self, subs: Sequence[str], limit: Optional[int] = None, **kwargs
+    ) -> MemoryGraph:
+        """Explore the graph from each subject concurrently.
+
+        Each subject is explored and cached separately, so the subjects shared by
+        different questions hit the cache. The subgraphs are merged in the order of
+        the subjects, until the merged subgraph has `limit` edges. The merged
+        subgraph has the subjects and the vertices of its edges only.
+
+        Args:
+            subs (Sequence[str]): The subjects to explore from.
+            limit (Optional[int]): The max number of the edges of the merged
+                subgraph, and of each subgraph explored.
+            **kwargs: The other arguments of `GraphStoreAdapter.explore`.
+
+        Returns:
+            MemoryGraph: The merged subgraph.
+        """
+        unique_subs = list(dict.fromkeys(subs))
+        subgraphs: List[MemoryGraph] = await asyncio.gather(
+            *(self.explore([sub], limit=limit, **kwargs) for sub in unique_subs)
+        )
+        merged = MemoryGraph()
+
+        def add_vertex(subgraph: MemoryGraph, vid: str) -> None:
+            # The cached vertices are not updated in place by the merged subgraph
+            if subgraph.has_vertex(vid) and (
+                not merged.has_vertex(vid)
+                or isinstance(merged.get_vertex(vid), IdVertex)
+            ):
+                merged.upsert_vertex(subgraph.get_vertex(vid))
+
+        for sub, subgraph in zip(unique_subs, subgraphs):
+            if limit and merged.edge_count >= limit:
+                break
+            add_vertex(subgraph, sub)
+            for edge in subgraph.edges():
+                if limit and merged.edge_count >= limit:
+                    break
+                add_vertex(subgraph, edge.sid)
+                add_vertex(subgraph, edge.tid)
+                merged.append_edge(edge)
+        return merged
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from dbgpt.core import LLMClient
+from dbgpt.storage.graph_store.graph import Edge, MemoryGraph, Vertex
+from dbgpt.storage.graph_store.memgraph_store import (
+    MemoryGraphStore,
+    MemoryGraphStoreConfig,
+)
+from dbgpt.storage.graph_store.tugraph_store import TuGraphStore
+from dbgpt.storage.knowledge_graph.knowledge_graph import (
+    BuiltinKnowledgeGraph,
+    BuiltinKnowledgeGraphConfig,
+)
+from dbgpt.storage.knowledge_graph.subgraph_explorer import (
+    RetrievalCache,
+    SubgraphExplorer,
+)
+
+
+def _explore(subs, limit=None, **kwargs):
+    graph = MemoryGraph()
+    for sub in subs:
+        graph.upsert_vertex(Vertex(sub, seed=True))
+        graph.upsert_vertex(Vertex(f"{sub}_isolated"))
+        for i in range(3):
+            graph.append_edge(Edge(sub, f"{sub}{i}", "relates"))
+    return graph
+
+
+@pytest.fixture
+def adapter():
+    adapter = MagicMock()
+    adapter.explore.side_effect = _explore
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_explore_cached(adapter):
+    explorer = SubgraphExplorer(adapter, "kg", RetrievalCache())
+    first = await explorer.explore(["a", "b"], limit=5)
+    assert await explorer.explore(["a", "b"], limit=5) is first
+    await explorer.explore(["a", "b"], limit=6)
+    assert adapter.explore.call_count == 2
+
+    # The other graphs are not invalidated
+    other = SubgraphExplorer(adapter, "other", explorer.cache)
+    await other.explore(["a"])
+    explorer.invalidate()
+    await other.explore(["a"])
+    await explorer.explore(["a", "b"], limit=5)
+    assert adapter.explore.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_explore_invalidated_while_exploring(adapter):
+    started, written = threading.Event(), threading.Event()
+
+    def explore(subs, **kwargs):
+        started.set()
+        written.wait(5)
+        return _explore(subs)
+
+    adapter.explore.side_effect = explore
+    explorer = SubgraphExplorer(adapter, "kg", RetrievalCache())
+    task = asyncio.create_task(explorer.explore(["a"]))
+    await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+    explorer.invalidate()
+    written.set()
+    await task
+
+    # The subgraph explored before the write is not cached
+    await explorer.explore(["a"])
+    assert adapter.explore.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_explore_in_memory_graph_on_calling_thread(adapter):
+    threads = []
+
+    def explore(subs, **kwargs):
+        threads.append(threading.get_ident())
+        return _explore(subs)
+
+    adapter.explore.side_effect = explore
+    await SubgraphExplorer(adapter, "kg", RetrievalCache()).explore(["a"])
+    assert threads[-1] != threading.get_ident()
+
+    # The in-memory graph is written on the event loop without a lock
+    adapter.graph_store = MemoryGraphStore(MemoryGraphStoreConfig())
+    await SubgraphExplorer(adapter, "kg", RetrievalCache()).explore(["a"])
+    assert threads[-1] == threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_explore_each(adapter):
+    explorer = SubgraphExplorer(adapter, "kg", RetrievalCache())
+    subgraph = await explorer.explore_each(["a", "b", "a", "c"], limit=5)
+    assert [e.sid for e in subgraph.edges()] == ["a"] * 3 + ["b"] * 2
+    assert adapter.explore.call_count == 3
+    # Only the subjects and the vertices of the merged edges
+    vids = {"a", "a0", "a1", "a2", "b", "b0", "b1"}
+    assert {v.vid for v in subgraph.vertices()} == vids
+    assert subgraph.get_vertex("b").get_prop("seed")
+
+    # The keywords shared by the questions hit the cache
+    subgraph = await explorer.explore_each(["c", "d"], limit=5)
+    assert [e.sid for e in subgraph.edges()] == ["c"] * 3 + ["d"] * 2
+    assert adapter.explore.call_count == 4
+    assert (await explorer.explore_each([])).edge_count == 0
+
+
+@pytest.mark.asyncio
+async def test_keywords_cached():
+    config = BuiltinKnowledgeGraphConfig(
+        name="test_keywords_cached",
+        llm_client=MagicMock(spec=LLMClient),
+        graph_store_type="Memory",
+    )
+    knowledge_graph = BuiltinKnowledgeGraph(config)
+    knowledge_graph._keyword_extractor.extract = AsyncMock(return_value=["a", "b"])
+
+    keywords = await knowledge_graph._extract_keywords("question")
+    keywords.append("c")
+    assert await knowledge_graph._extract_keywords("question") == ["a", "b"]
+    assert knowledge_graph._keyword_extractor.extract.call_count == 1
+
+
+def test_graph_ids(tmp_path):
+    def memory_store(name, persist_path=None):
+        config = MemoryGraphStoreConfig(
+            name=name, graph_engine="compact", persist_path=persist_path
+        )
+        return MemoryGraphStore(config)
+
+    # The persisted graphs are identified by the snapshots
+    store = memory_store("kg", str(tmp_path / "a"))
+    assert store.graph_id == memory_store("kg", str(tmp_path / "a")).graph_id
+    assert store.graph_id != memory_store("kg", str(tmp_path / "b")).graph_id
+    assert memory_store("kg").graph_id != memory_store("kg").graph_id
+
+    # The TuGraph graphs are identified by the servers too
+    def tugraph_store(host):
+        store = TuGraphStore.__new__(TuGraphStore)
+        store._host, store._port, store._username = host, 7687, "admin"
+        store._graph_name = "kg"
+        return store
+
+    assert tugraph_store("host1").graph_id == "TuGraphStore:admin@host1:7687/kg"
+    assert tugraph_store("host1").graph_id != tugraph_store("host2").graph_id
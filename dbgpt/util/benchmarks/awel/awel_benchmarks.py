@@ -0,0 +1,424 @@
+"""Performance benchmarks for AWEL.
+
+Measure the overhead of the AWEL runtime itself (runner, task outputs and tracing),
+without any model or storage in the DAGs.
+
+Run all benchmarks and save the results:
+
+.. code-block:: shell
+
+    python -m dbgpt.util.benchmarks.awel.awel_benchmarks \\
+        --output pilot/data/awel_benchmarks.json
+
+Compare with the baseline committed next to this module, exit with code 1 if any
+metric regresses more than 20%:
+
+.. code-block:: shell
+
+    python -m dbgpt.util.benchmarks.awel.awel_benchmarks \\
+        --baseline dbgpt/util/benchmarks/awel/awel_benchmarks_baseline.json \\
+        --max_regression 0.2
+
+The baseline is measured on a developer machine, update it with ``--output`` when
+the runtime is intentionally changed.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from dbgpt._version import version
+from dbgpt.core.awel import (
+    DAG,
+    BranchJoinOperator,
+    BranchOperator,
+    DefaultWorkflowRunner,
+    JoinOperator,
+    MapOperator,
+    StreamifyAbsOperator,
+    TransformStreamAbsOperator,
+)
+from dbgpt.core.awel.operators.base import initialize_runner
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class BenchmarkResult:
+    """The result of one benchmark metric."""
+
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = False
+    params: Dict[str, Any] = dataclasses.field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """Return the unique key of the metric, used to compare with baseline."""
+        if not self.params:
+            return self.name
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{params}]"
+
+
+class _TokenProducerOperator(StreamifyAbsOperator[int, int]):
+    async def streamify(self, n: int) -> AsyncIterator[int]:
+        for i in range(n):
+            yield i
+
+
+class _PassThroughStreamOperator(TransformStreamAbsOperator[int, int]):
+    async def transform_stream(self, data: AsyncIterator[int]) -> AsyncIterator[int]:
+        async for i in data:
+            yield i
+
+
+def _build_chain_dag(dag_id: str, num_operators: int) -> MapOperator:
+    with DAG(dag_id):
+        last = MapOperator(lambda x: x)
+        for _ in range(num_operators - 1):
+            task = MapOperator(lambda x: x)
+            last >> task
+            last = task
+    return last
+
+
+async def _timeit(func: Callable, iterations: int, warmup: int = 10) -> float:
+    """Run the async function and return the average seconds of each run."""
+    for _ in range(warmup):
+        await func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    return (time.perf_counter() - start) / iterations
+
+
+async def bench_operator_overhead(
+    num_operators: int = 10, iterations: int = 500
+) -> List[BenchmarkResult]:
+    """Measure the overhead of one operator in a chain of no-op map operators."""
+    end_node = _build_chain_dag("bench_operator_overhead", num_operators)
+
+    async def _run():
+        await end_node.call(1)
+
+    avg_seconds = await _timeit(_run, iterations)
+    params = {"num_operators": num_operators}
+    return [
+        BenchmarkResult(
+            "dag_call_latency", avg_seconds * 1000, "ms", params=dict(params)
+        ),
+        BenchmarkResult(
+            "operator_overhead",
+            avg_seconds * 1_000_000 / num_operators,
+            "us",
+            params=dict(params),
+        ),
+    ]
+
+
+async def bench_map_join_throughput(
+    width: int = 8, iterations: int = 300
+) -> List[BenchmarkResult]:
+    """Measure the throughput of a DAG fanning out to maps and joining them."""
+    with DAG("bench_map_join_throughput"):
+        root = MapOperator(lambda x: x)
+        join_node = JoinOperator(lambda *xs: sum(xs))
+        for i in range(width):
+            root >> MapOperator(lambda x, i=i: x + i) >> join_node
+
+    async def _run():
+        await join_node.call(1)
+
+    avg_seconds = await _timeit(_run, iterations)
+    return [
+        BenchmarkResult(
+            "map_join_throughput",
+            1 / avg_seconds,
+            "runs/s",
+            higher_is_better=True,
+            params={"width": width},
+        )
+    ]
+
+
+async def bench_branch_throughput(iterations: int = 300) -> List[BenchmarkResult]:
+    """Measure the throughput of a DAG with a branch and a branch join."""
+    with DAG("bench_branch_throughput"):
+        root = MapOperator(lambda x: x)
+        odd_node = MapOperator(lambda x: x, task_name="odd_node")
+        even_node = MapOperator(lambda x: x, task_name="even_node")
+        branch_node = BranchOperator(
+            {lambda x: x % 2 == 1: odd_node, lambda x: x % 2 == 0: even_node}
+        )
+        join_node = BranchJoinOperator()
+        root >> branch_node
+        branch_node >> odd_node >> join_node
+        branch_node >> even_node >> join_node
+
+    counter = 0
+
+    async def _run():
+        nonlocal counter
+        counter += 1
+        await join_node.call(counter)
+
+    avg_seconds = await _timeit(_run, iterations)
+    return [
+        BenchmarkResult(
+            "branch_throughput", 1 / avg_seconds, "runs/s", higher_is_better=True
+        )
+    ]
+
+
+async def bench_streaming_latency(
+    num_operators: int = 10, num_tokens: int = 500, iterations: int = 20
+) -> List[BenchmarkResult]:
+    """Measure the token latency through a chain of streaming operators."""
+    with DAG("bench_streaming_latency"):
+        last = _TokenProducerOperator()
+        for _ in range(num_operators):
+            task = _PassThroughStreamOperator()
+            last >> task
+            last = task
+    end_node = last
+
+    first_token_seconds = 0.0
+    per_token_seconds = 0.0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        first_token_time = None
+        count = 0
+        async for _ in await end_node.call_stream(num_tokens):
+            if first_token_time is None:
+                first_token_time = time.perf_counter()
+            count += 1
+        end = time.perf_counter()
+        first_token_seconds += (first_token_time or end) - start
+        per_token_seconds += (end - start) / max(count, 1)
+    params = {"num_operators": num_operators, "num_tokens": num_tokens}
+    return [
+        BenchmarkResult(
+            "stream_first_token_latency",
+            first_token_seconds * 1000 / iterations,
+            "ms",
+            params=dict(params),
+        ),
+        BenchmarkResult(
+            "stream_token_latency",
+            per_token_seconds * 1_000_000 / iterations,
+            "us",
+            params=dict(params),
+        ),
+    ]
+
+
+async def bench_http_trigger(
+    num_requests: int = 500, concurrency: int = 16
+) -> List[BenchmarkResult]:
+    """Measure the requests per second of a DAG triggered by http."""
+    from fastapi import APIRouter, FastAPI
+    from httpx import ASGITransport, AsyncClient
+
+    from dbgpt.core.awel import HttpTrigger
+
+    app = FastAPI()
+    router = APIRouter()
+    with DAG("bench_http_trigger"):
+        trigger = HttpTrigger("/bench", methods="POST", request_body=dict)
+        trigger >> MapOperator(lambda x: {"value": x.get("value")})
+    trigger.mount_to_router(router)
+    app.include_router(router)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def _request(i: int):
+            async with semaphore:
+                response = await client.post("/bench", json={"value": i})
+                response.raise_for_status()
+
+        await asyncio.gather(*[_request(i) for i in range(concurrency)])
+        start = time.perf_counter()
+        await asyncio.gather(*[_request(i) for i in range(num_requests)])
+        cost = time.perf_counter() - start
+    return [
+        BenchmarkResult(
+            "http_trigger_throughput",
+            num_requests / cost,
+            "req/s",
+            higher_is_better=True,
+            params={"concurrency": concurrency},
+        )
+    ]
+
+
+async def bench_memory_per_run(
+    concurrency: int = 100, num_operators: int = 10
+) -> List[BenchmarkResult]:
+    """Measure the peak memory of each concurrent DAG run."""
+    end_node = _build_chain_dag("bench_memory_per_run", num_operators)
+
+    async def _run():
+        await asyncio.sleep(0)
+        return await end_node.call(1)
+
+    await asyncio.gather(*[_run() for _ in range(10)])
+    gc.collect()
+    tracemalloc.start()
+    try:
+        await asyncio.gather(*[_run() for _ in range(concurrency)])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return [
+        BenchmarkResult(
+            "memory_per_run",
+            peak / 1024 / concurrency,
+            "KiB",
+            params={"concurrency": concurrency, "num_operators": num_operators},
+        )
+    ]
+
+
+async def run_benchmarks(quick: bool = False) -> List[BenchmarkResult]:
+    """Run all AWEL benchmarks.
+
+    Args:
+        quick (bool, optional): Run fewer iterations, just for smoke testing.
+            Defaults to False.
+    """
+    scale = 0.1 if quick else 1.0
+
+    def _n(value: int) -> int:
+        return max(int(value * scale), 1)
+
+    initialize_runner(DefaultWorkflowRunner())
+    results: List[BenchmarkResult] = []
+    for num_operators in [1, 10]:
+        results += await bench_operator_overhead(num_operators, _n(500))
+    results += await bench_map_join_throughput(8, _n(300))
+    results += await bench_branch_throughput(_n(300))
+    for num_operators in [1, 10]:
+        results += await bench_streaming_latency(num_operators, 500, _n(20))
+    results += await bench_http_trigger(_n(500), 16)
+    results += await bench_memory_per_run(100, 10)
+    return results
+
+
+def save_results(results: List[BenchmarkResult], output_file: str) -> None:
+    """Save the results to a JSON file, which can be used as a baseline."""
+    data = {
+        "dbgpt_version": version,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now().isoformat(),
+        "results": [dataclasses.asdict(r) for r in results],
+    }
+    dir_name = os.path.dirname(output_file)
+    if dir_name:
+        os.makedirs(dir_name, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_results(input_file: str) -> List[BenchmarkResult]:
+    """Load the results from a JSON file."""
+    with open(input_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [BenchmarkResult(**r) for r in data["results"]]
+
+
+def compare_with_baseline(
+    results: List[BenchmarkResult],
+    baseline: List[BenchmarkResult],
+    max_regression: float = 0.2,
+) -> List[str]:
+    """Compare the results with the baseline.
+
+    Args:
+        results (List[BenchmarkResult]): The current results.
+        baseline (List[BenchmarkResult]): The baseline results.
+        max_regression (float, optional): The max allowed regression ratio.
+            Defaults to 0.2.
+
+    Returns:
+        List[str]: The description of the regressed metrics.
+    """
+    baseline_map = {r.key: r for r in baseline}
+    regressions = []
+    for r in results:
+        base = baseline_map.get(r.key)
+        if not base or not base.value:
+            continue
+        if r.higher_is_better:
+            ratio = (base.value - r.value) / base.value
+        else:
+            ratio = (r.value - base.value) / base.value
+        if ratio > max_regression:
+            regressions.append(
+                f"{r.key}: {r.value:.3f}{r.unit}, baseline {base.value:.3f}{r.unit}, "
+                f"regression {ratio:.1%}"
+            )
+    return regressions
+
+
+def _print_results(results: List[BenchmarkResult]) -> None:
+    for r in results:
+        print(f"{r.key:<70} {r.value:>14.3f} {r.unit}")
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Run the AWEL benchmarks from command line."""
+    parser = argparse.ArgumentParser(description="AWEL performance benchmarks")
+    parser.add_argument(
+        "--output", type=str, default=None, help="The file to save the results"
+    )
+    parser.add_argument(
+        "--baseline", type=str, default=None, help="The baseline file to compare"
+    )
+    parser.add_argument(
+        "--max_regression",
+        type=float,
+        default=0.2,
+        help="The max allowed regression ratio compared with the baseline",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Run fewer iterations for smoke test"
+    )
+    parsed = parser.parse_args(args)
+
+    results = asyncio.run(run_benchmarks(quick=parsed.quick))
+    _print_results(results)
+    if parsed.output:
+        save_results(results, parsed.output)
+        print(f"Save benchmark results to {parsed.output}")
+    if parsed.baseline:
+        regressions = compare_with_baseline(
+            results, load_results(parsed.baseline), parsed.max_regression
+        )
+        if regressions:
+            print("Performance regressions found:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No performance regression found")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from ..awel_benchmarks import (
+    BenchmarkResult,
+    compare_with_baseline,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+_BASELINE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "awel_benchmarks_baseline.json"
+)
+
+
+def _latency(value: float) -> BenchmarkResult:
+    return BenchmarkResult("latency", value, "ms", params={"num_operators": 10})
+
+
+def _throughput(value: float) -> BenchmarkResult:
+    return BenchmarkResult("throughput", value, "runs/s", higher_is_better=True)
+
+
+def test_result_key():
+    assert _throughput(1).key == "throughput"
+    assert _latency(1).key == "latency[num_operators=10]"
+    result = BenchmarkResult("latency", 1, "ms", params={"b": 2, "a": 1})
+    assert result.key == "latency[a=1,b=2]"
+
+
+@pytest.mark.parametrize(
+    "latency, throughput, regressed",
+    [
+        (10.0, 100.0, []),
+        # Faster than the baseline is never a regression
+        (1.0, 1000.0, []),
+        # Exactly at the threshold is allowed
+        (12.0, 80.0, []),
+        (12.1, 80.0, ["latency[num_operators=10]"]),
+        (12.0, 79.0, ["throughput"]),
+        (20.0, 10.0, ["latency[num_operators=10]", "throughput"]),
+    ],
+)
+def test_compare_with_baseline(latency, throughput, regressed):
+    baseline = [_latency(10.0), _throughput(100.0)]
+    results = [_latency(latency), _throughput(throughput)]
+    regressions = compare_with_baseline(results, baseline, max_regression=0.2)
+    assert [r.split(":")[0] for r in regressions] == regressed
+
+
+def test_compare_with_baseline_skip_unknown_metrics():
+    baseline = [_latency(0.0)]
+    results = [_latency(100.0), _throughput(1.0)]
+    # Missing or zero baseline metrics can't be compared
+    assert compare_with_baseline(results, baseline) == []
+
+
+def test_save_and_load_results(tmp_path):
+    results = [_latency(10.0), _throughput(100.0)]
+    output_file = str(tmp_path / "results" / "awel.json")
+    save_results(results, output_file)
+    assert load_results(output_file) == results
+
+
+@pytest.mark.asyncio
+async def test_baseline_covers_all_metrics():
+    baseline = load_results(_BASELINE_FILE)
+    results = await run_benchmarks(quick=True)
+    assert {r.key for r in baseline} == {r.key for r in results}
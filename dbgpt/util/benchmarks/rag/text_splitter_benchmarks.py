@@ -0,0 +1,302 @@
+"""Performance benchmarks for the text splitters.
+
+Compare the splitters with the previous implementations, which merge the pieces by
+slicing the window list and re-scan all the separators on each recursion level. The
+outputs of both implementations are checked to be the same.
+
+.. code-block:: shell
+
+    python -m dbgpt.util.benchmarks.rag.text_splitter_benchmarks --size_mb 4
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from typing import Callable, List, Optional, Tuple, cast
+
+from dbgpt.core import Chunk
+from dbgpt.rag.text_splitter.text_splitter import (
+    CharacterTextSplitter,
+    MarkdownHeaderTextSplitter,
+    RecursiveCharacterTextSplitter,
+    TextSplitter,
+)
+
+logger = logging.getLogger(__name__)
+
+_WORDS = (
+    "the data model query index vector chunk table column graph knowledge agent "
+    "embedding retrieval database schema document token prompt answer question"
+).split()
+
+
+def _legacy_merge_splits(
+    splitter: TextSplitter,
+    splits,
+    separator: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+) -> List[str]:
+    """Merge the splits like the previous implementation."""
+    if chunk_size is None:
+        chunk_size = splitter._chunk_size
+    if chunk_overlap is None:
+        chunk_overlap = splitter._chunk_overlap
+    if separator is None:
+        separator = splitter._separator
+    separator_len = splitter._length_function(separator)
+
+    docs = []
+    current_doc: List[str] = []
+    total = 0
+    for d in splits:
+        _len = splitter._length_function(d)
+        if total + _len + (separator_len if len(current_doc) > 0 else 0) > chunk_size:
+            if total > chunk_size:
+                logger.warning(
+                    f"Created a chunk of size {total}, "
+                    f"which is longer than the specified {chunk_size}"
+                )
+            if len(current_doc) > 0:
+                doc = splitter._join_docs(current_doc, separator)
+                if doc is not None:
+                    docs.append(doc)
+                while total > chunk_overlap or (
+                    total + _len + (separator_len if len(current_doc) > 0 else 0)
+                    > chunk_size
+                    and total > 0
+                ):
+                    total -= splitter._length_function(current_doc[0]) + (
+                        separator_len if len(current_doc) > 1 else 0
+                    )
+                    current_doc = current_doc[1:]
+        current_doc.append(d)
+        total += _len + (separator_len if len(current_doc) > 1 else 0)
+    doc = splitter._join_docs(current_doc, separator)
+    if doc is not None:
+        docs.append(doc)
+    return docs
+
+
+class _LegacyCharacterTextSplitter(CharacterTextSplitter):
+    def _merge_splits(
+        self, splits, separator=None, chunk_size=None, chunk_overlap=None
+    ):
+        return _legacy_merge_splits(self, splits, separator, chunk_size, chunk_overlap)
+
+
+class _LegacyRecursiveCharacterTextSplitter(RecursiveCharacterTextSplitter):
+    def _merge_splits(
+        self, splits, separator=None, chunk_size=None, chunk_overlap=None
+    ):
+        return _legacy_merge_splits(self, splits, separator, chunk_size, chunk_overlap)
+
+    def split_text(self, text: str, separator: Optional[str] = None, **kwargs):
+        final_chunks = []
+        separator = self._separators[-1]
+        for _s in self._separators:
+            if _s == "" or _s in text:
+                separator = _s
+                break
+        splits = text.split(separator) if separator else list(text)
+        _good_splits: List[str] = []
+        for s in splits:
+            if self._length_function(s) < self._chunk_size:
+                _good_splits.append(s)
+            else:
+                if _good_splits:
+                    final_chunks.extend(self._merge_splits(_good_splits, separator))
+                    _good_splits = []
+                final_chunks.extend(self.split_text(s))
+        if _good_splits:
+            final_chunks.extend(self._merge_splits(_good_splits, separator))
+        return final_chunks
+
+
+class _LegacyMarkdownHeaderTextSplitter(MarkdownHeaderTextSplitter):
+    def _merge_splits(
+        self, documents, separator=None, chunk_size=None, chunk_overlap=None
+    ):
+        if separator is None:
+            separator = self._separator
+        splits = []
+        for _doc in documents:
+            dict_doc = cast(dict, _doc)
+            if dict_doc["metadata"] != {}:
+                head = sorted(
+                    dict_doc["metadata"].items(), key=lambda x: x[0], reverse=True
+                )[0][1]
+                splits.append(head + separator + dict_doc["page_content"])
+            else:
+                splits.append(dict_doc["page_content"])
+        return _legacy_merge_splits(self, splits, separator, chunk_size, chunk_overlap)
+
+    def aggregate_lines_to_chunks(self, lines):
+        aggregated_chunks: List[dict] = []
+        for line in lines:
+            if (
+                aggregated_chunks
+                and aggregated_chunks[-1]["metadata"] == line["metadata"]
+            ):
+                aggregated_chunks[-1]["content"] += "  \n" + line["content"]
+            else:
+                subtitles = "-".join((list(line["metadata"].values())))
+                line["content"] = f'"{subtitles}": ' + line["content"]
+                aggregated_chunks.append(line)
+        return [
+            Chunk(content=chunk["content"], metadata=chunk["metadata"])
+            for chunk in aggregated_chunks
+        ]
+
+
+def _generate_text(size: int, seed: int = 0) -> str:
+    """Generate the text of paragraphs and lines of random words."""
+    rnd = random.Random(seed)
+    paragraphs = []
+    length = 0
+    while length < size:
+        lines = []
+        for _ in range(rnd.randint(1, 8)):
+            lines.append(" ".join(rnd.choices(_WORDS, k=rnd.randint(3, 30))))
+        paragraph = "\n".join(lines)
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
+
+
+def _generate_markdown(size: int, seed: int = 0) -> str:
+    """Generate the markdown text with headers."""
+    rnd = random.Random(seed)
+    sections = []
+    length = 0
+    i = 0
+    while length < size:
+        header = "#" * rnd.randint(1, 3) + f" section {i}"
+        section = header + "\n" + _generate_text(rnd.randint(1000, 200000), seed + i)
+        sections.append(section)
+        length += len(section) + 2
+        i += 1
+    return "\n\n".join(sections)
+
+
+def _contents(output: List) -> List:
+    return [(c.content, c.metadata) if isinstance(c, Chunk) else c for c in output]
+
+
+def _timeit(func: Callable[[], List], repeat: int) -> Tuple[float, List]:
+    """Return the best seconds of the runs and the output."""
+    best = float("inf")
+    output: List = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func()
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def run_benchmarks(
+    size_mb: float = 4, repeat: int = 3
+) -> List[Tuple[str, float, float]]:
+    """Run the benchmarks.
+
+    Args:
+        size_mb (float): The size of the generated texts in MB.
+        repeat (int): The number of runs of each case, the best time is reported.
+
+    Returns:
+        List[Tuple[str, float, float]]: The case name, the seconds of the previous
+            and the current implementation.
+    """
+    size = int(size_mb * 1024 * 1024)
+    text = _generate_text(size)
+    markdown = _generate_markdown(size)
+    headers = [("#", "Header 1"), ("##", "Header 2"), ("###", "Header 3")]
+    cases = [
+        (
+            "character_by_line",
+            lambda cls: cls(separator="\n", chunk_size=512, chunk_overlap=64),
+            (_LegacyCharacterTextSplitter, CharacterTextSplitter),
+            text,
+        ),
+        (
+            "character_by_word",
+            lambda cls: cls(separator=" ", chunk_size=4000, chunk_overlap=400),
+            (_LegacyCharacterTextSplitter, CharacterTextSplitter),
+            text,
+        ),
+        (
+            "recursive_character",
+            lambda cls: cls(chunk_size=512, chunk_overlap=64),
+            (_LegacyRecursiveCharacterTextSplitter, RecursiveCharacterTextSplitter),
+            text,
+        ),
+        (
+            "markdown_header",
+            lambda cls: cls(headers_to_split_on=headers),
+            (_LegacyMarkdownHeaderTextSplitter, MarkdownHeaderTextSplitter),
+            markdown,
+        ),
+    ]
+    results = []
+    for name, create, (legacy_cls, current_cls), data in cases:
+        legacy = create(legacy_cls)
+        current = create(current_cls)
+        legacy_seconds, legacy_output = _timeit(lambda: legacy.split_text(data), repeat)
+        current_seconds, current_output = _timeit(
+            lambda: current.split_text(data), repeat
+        )
+        if _contents(legacy_output) != _contents(current_output):
+            raise ValueError(f"The outputs of {name} are different")
+        results.append((name, legacy_seconds, current_seconds))
+
+    # Merge the header sections of the markdown text
+    legacy = _LegacyMarkdownHeaderTextSplitter(
+        headers_to_split_on=headers, chunk_size=512, chunk_overlap=64
+    )
+    current = MarkdownHeaderTextSplitter(
+        headers_to_split_on=headers, chunk_size=512, chunk_overlap=64
+    )
+    sections = [
+        {"metadata": chunk.metadata, "page_content": chunk.content}
+        for chunk in MarkdownHeaderTextSplitter(
+            headers_to_split_on=headers, return_each_line=True
+        ).split_text(markdown)
+    ]
+    legacy_seconds, legacy_output = _timeit(
+        lambda: legacy._merge_splits(sections), repeat
+    )
+    current_seconds, current_output = _timeit(
+        lambda: current._merge_splits(sections), repeat
+    )
+    if legacy_output != current_output:
+        raise ValueError("The outputs of markdown_merge are different")
+    results.append(("markdown_merge", legacy_seconds, current_seconds))
+    return results
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Run the text splitter benchmarks from command line."""
+    parser = argparse.ArgumentParser(description="Text splitter benchmarks")
+    parser.add_argument(
+        "--size_mb", type=float, default=4, help="The size of the texts in MB"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="The number of runs of each case"
+    )
+    parsed = parser.parse_args(args)
+    print(f"{'case':<24} {'previous':>12} {'current':>12} {'speedup':>8}")
+    for name, legacy_seconds, current_seconds in run_benchmarks(
+        parsed.size_mb, parsed.repeat
+    ):
+        print(
+            f"{name:<24} {legacy_seconds:>11.3f}s {current_seconds:>11.3f}s "
+            f"{legacy_seconds / current_seconds:>7.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.ERROR)
+    sys.exit(main())
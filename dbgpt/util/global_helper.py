@@ -36,13 +36,14 @@ class GlobalsHelper:
 
     """
 
+    _encoding: Optional[Any] = None
     _tokenizer: Optional[Callable[[str], List]] = None
     _stopwords: Optional[List[str]] = None
 
     @property
-    def tokenizer(self) -> Callable[[str], List]:
-        """Get tokenizer."""
-        if self._tokenizer is None:
+    def encoding(self) -> Any:
+        """Get the tiktoken encoding of the tokenizer."""
+        if self._encoding is None:
             tiktoken_import_err = (
                 "`tiktoken` package not found, please run `pip install tiktoken`"
             )
@@ -50,7 +51,14 @@ class GlobalsHelper:
                 import tiktoken
             except ImportError:
                 raise ImportError(tiktoken_import_err)
-            enc = tiktoken.get_encoding("gpt2")
+            self._encoding = tiktoken.get_encoding("gpt2")
+        return self._encoding
+
+    @property
+    def tokenizer(self) -> Callable[[str], List]:
+        """Get tokenizer."""
+        if self._tokenizer is None:
+            enc = self.encoding
             self._tokenizer = cast(Callable[[str], List], enc.encode)
             self._tokenizer = partial(self._tokenizer, allowed_special="all")
         return self._tokenizer  # type: ignore
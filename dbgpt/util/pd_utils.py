@@ -1,4 +1,13 @@
+"""Utilities for the tabular data of pandas.
+
+The type of each text column is inferred once from a sample of its values, then
+the whole column is converted with the vectorized kernels of pandas, instead of
+calling Python functions for every cell.
+"""
+
 import math
+from enum import Enum
+from typing import Dict, List, Optional
 
 # def csv_colunm_foramt(val):
 #     if str(val).find("$") >= 0:
@@ -8,8 +17,14 @@ import math
 #     return val
 import pandas as pd
 
+_DEFAULT_SAMPLE_SIZE = 1000
+_CURRENCY_SYMBOLS = r"[$¥]"
+# The max magnitude of the integral floats formatted through int64 exactly
+_MAX_EXACT_INT = 2**53
+
 
 def csv_colunm_foramt(val):
+    """Convert the currency value like "$1,200" to a number."""
     try:
         if pd.isna(val):
             return math.nan
@@ -20,3 +35,182 @@ def csv_colunm_foramt(val):
         return val
     except ValueError:
         return val
+
+
+class ColumnType(str, Enum):
+    """The inferred type of a column."""
+
+    NUMBER = "number"
+    # The numbers with currency symbols and thousands separators, e.g. "$1,200"
+    CURRENCY = "currency"
+    DATETIME = "datetime"
+    STRING = "string"
+    # The column is already typed by the reader, e.g. int64 or datetime64
+    TYPED = "typed"
+
+
+def _guess_datetime_format(value: str) -> Optional[str]:
+    try:
+        from pandas._libs.tslibs.parsing import guess_datetime_format
+    except ImportError:
+        return None
+    return guess_datetime_format(value)
+
+
+def _to_text(series: pd.Series) -> pd.Series:
+    """Convert the values to the stripped text, the empty text is NaN."""
+    text = series[series.notna()].astype(str).str.strip()
+    return text[text != ""].reindex(series.index)
+
+
+def _sample(text: pd.Series, sample_size: int) -> pd.Series:
+    """Sample the non-null values evenly from the whole column."""
+    values = text.dropna()
+    if len(values) <= sample_size:
+        return values
+    return values.iloc[:: len(values) // sample_size].iloc[:sample_size]
+
+
+def _clean_currency(text: pd.Series) -> pd.Series:
+    has_symbol = text.str.contains(_CURRENCY_SYMBOLS, regex=True, na=False)
+    return text.where(
+        ~has_symbol, text.str.replace(r"[$¥,]", "", regex=True).str.strip()
+    )
+
+
+def _to_datetime(text: pd.Series, date_format: Optional[str] = None) -> pd.Series:
+    values = text.dropna()
+    if date_format is None and len(values) > 0:
+        date_format = _guess_datetime_format(values.iloc[0])
+    if date_format:
+        converted = pd.to_datetime(text, errors="coerce", format=date_format)
+        if converted.notna().sum() == len(values):
+            return converted
+    return pd.to_datetime(text, errors="coerce", format="mixed")
+
+
+def infer_column_type(
+    series: pd.Series, sample_size: int = _DEFAULT_SAMPLE_SIZE
+) -> ColumnType:
+    """Infer the type of the column from a sample of its values.
+
+    Args:
+        series (pd.Series): The column.
+        sample_size (int): The maximum number of values to sample.
+
+    Returns:
+        ColumnType: The inferred type, the numbers are preferred to the dates.
+    """
+    if series.dtype != object:
+        return ColumnType.TYPED
+    sample = _sample(_to_text(series), sample_size)
+    if len(sample) == 0:
+        return ColumnType.STRING
+    if pd.to_numeric(sample, errors="coerce").notna().all():
+        return ColumnType.NUMBER
+    if pd.to_numeric(_clean_currency(sample), errors="coerce").notna().all():
+        return ColumnType.CURRENCY
+    if _to_datetime(sample).notna().all():
+        return ColumnType.DATETIME
+    return ColumnType.STRING
+
+
+def convert_column(
+    series: pd.Series, column_type: ColumnType, date_format: Optional[str] = None
+) -> pd.Series:
+    """Convert the column to the type with the vectorized kernels.
+
+    If some values outside the sample can't be converted, the column is kept as
+    text, so no values are lost.
+
+    Args:
+        series (pd.Series): The column.
+        column_type (ColumnType): The type inferred by :func:`infer_column_type`.
+        date_format (Optional[str]): Format the dates as text with the format if
+            provided, e.g. "%Y-%m-%d".
+
+    Returns:
+        pd.Series: The converted column.
+    """
+    if column_type == ColumnType.TYPED:
+        return series
+    text = _to_text(series)
+    if column_type == ColumnType.NUMBER:
+        converted = pd.to_numeric(text, errors="coerce")
+    elif column_type == ColumnType.CURRENCY:
+        converted = pd.to_numeric(_clean_currency(text), errors="coerce")
+    elif column_type == ColumnType.DATETIME:
+        converted = _to_datetime(text)
+    else:
+        return text
+    if converted.notna().sum() < text.notna().sum():
+        return text
+    if column_type == ColumnType.DATETIME and date_format:
+        return converted.dt.strftime(date_format)
+    return converted
+
+
+def infer_column_types(
+    df: pd.DataFrame,
+    sample_size: int = _DEFAULT_SAMPLE_SIZE,
+    date_format: Optional[str] = None,
+) -> Dict[str, ColumnType]:
+    """Infer the types of the text columns and convert them in place.
+
+    Args:
+        df (pd.DataFrame): The DataFrame.
+        sample_size (int): The maximum number of values to sample of each column.
+        date_format (Optional[str]): Format the dates as text with the format if
+            provided.
+
+    Returns:
+        Dict[str, ColumnType]: The inferred types of the columns.
+    """
+    column_types = {}
+    for column in df.columns:
+        column_type = infer_column_type(df[column], sample_size)
+        if column_type != ColumnType.TYPED:
+            df[column] = convert_column(df[column], column_type, date_format)
+        column_types[column] = column_type
+    return column_types
+
+
+def _format_column(series: pd.Series) -> pd.Series:
+    """Format the values as text, the null values are NaN."""
+    values = series[series.notna()]
+    if pd.api.types.is_float_dtype(values) and (values % 1 == 0).all():
+        # The integer columns with null values are read as float
+        if (values.abs() <= _MAX_EXACT_INT).all():
+            text = values.astype("int64").astype(str)
+        else:
+            text = values.map("{:.0f}".format)
+    elif (
+        pd.api.types.is_datetime64_any_dtype(values)
+        and (values == values.dt.normalize()).all()
+    ):
+        text = values.dt.strftime("%Y-%m-%d")
+    else:
+        text = values.astype(str).str.strip()
+    return text.reindex(series.index)
+
+
+def format_text_rows(df: pd.DataFrame) -> List[str]:
+    """Format each row as the text lines of "column: value".
+
+    The columns are formatted with the vectorized kernels, the null values and the
+    columns without name are skipped.
+
+    Args:
+        df (pd.DataFrame): The DataFrame.
+
+    Returns:
+        List[str]: The text of each row.
+    """
+    lines = []
+    for i, column in enumerate(df.columns):
+        if column is None:
+            continue
+        text = _format_column(df.iloc[:, i])
+        line = f"{str(column).strip()}: " + text
+        lines.append(line.where(line.notna(), None).tolist())
+    return ["\n".join(v for v in row if v is not None) for row in zip(*lines)]
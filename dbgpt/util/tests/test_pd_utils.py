@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from dbgpt.util.pd_utils import (
+    ColumnType,
+    convert_column,
+    format_text_rows,
+    infer_column_type,
+    infer_column_types,
+)
+
+
+def test_infer_column_type():
+    assert infer_column_type(pd.Series(["1", " 2.5 ", None, ""])) == ColumnType.NUMBER
+    assert infer_column_type(pd.Series(["$1,200", "¥3", "4"])) == ColumnType.CURRENCY
+    assert (
+        infer_column_type(pd.Series(["2023/01/05", "2023/02/01", None]))
+        == ColumnType.DATETIME
+    )
+    assert infer_column_type(pd.Series(["a", "1", "2023-01-01"])) == ColumnType.STRING
+    assert infer_column_type(pd.Series([None, None], dtype=object)) == ColumnType.STRING
+    assert infer_column_type(pd.Series([1, 2])) == ColumnType.TYPED
+
+
+def test_infer_column_type_samples_column():
+    series = pd.Series([str(i) for i in range(10000)])
+    assert infer_column_type(series, sample_size=100) == ColumnType.NUMBER
+
+
+def test_convert_column_keeps_text_if_not_all_converted():
+    # The text value is out of the sample
+    series = pd.Series(["1"] * 100 + ["abc"])
+    column_type = infer_column_type(series, sample_size=10)
+    assert column_type == ColumnType.NUMBER
+    converted = convert_column(series, column_type)
+    assert converted.tolist() == series.tolist()
+
+
+def test_infer_column_types():
+    df = pd.DataFrame(
+        {
+            "amount": ["$1,200", "¥3", None],
+            "date": ["2023/01/05", "2023/02/01", "2023/03/04"],
+            "name": [" a ", 1, "b"],
+            "count": [1, 2, 3],
+        }
+    )
+    column_types = infer_column_types(df, date_format="%Y-%m-%d")
+    assert column_types == {
+        "amount": ColumnType.CURRENCY,
+        "date": ColumnType.DATETIME,
+        "name": ColumnType.STRING,
+        "count": ColumnType.TYPED,
+    }
+    assert df["amount"].tolist()[:2] == [1200.0, 3.0]
+    assert np.isnan(df["amount"].tolist()[2])
+    assert df["date"].tolist() == ["2023-01-05", "2023-02-01", "2023-03-04"]
+    assert df["name"].tolist() == ["a", "1", "b"]
+
+
+def test_format_text_rows():
+    df = pd.DataFrame(
+        {
+            "id": [1.0, None],
+            "price": [1.5, 2.0],
+            "day": pd.to_datetime(["2023-01-01", "2023-01-02"]),
+            " name ": [" John ", ""],
+        }
+    )
+    assert format_text_rows(df) == [
+        "id: 1\nprice: 1.5\nday: 2023-01-01\nname: John",
+        "price: 2.0\nday: 2023-01-02\nname: ",
+    ]
+
+
+def test_format_text_rows_large_floats():
+    df = pd.DataFrame({"a": [1e20, 2.0, None], "b": [-(2.0**53), 2.0**53, 1.0]})
+    assert format_text_rows(df) == [
+        "a: 100000000000000000000\nb: -9007199254740992",
+        "a: 2\nb: 9007199254740992",
+        "b: 1",
+    ]
+
+
+def test_format_text_rows_skips_unnamed_columns():
+    df = pd.DataFrame([{"a": "1", None: ["extra"]}, {"a": "2"}])
+    assert format_text_rows(df) == ["a: 1", "a: 2"]
+    assert format_text_rows(pd.DataFrame()) == []
@@ -0,0 +1,256 @@
+import json
+import os
+
+import pytest
+
+from dbgpt.storage.graph_store import compact_graph
+from dbgpt.storage.graph_store.compact_graph import CompactGraph
+from dbgpt.storage.graph_store.graph import (
+    Direction,
+    Edge,
+    IdVertex,
+    MemoryGraph,
+    Vertex,
+)
+from dbgpt.storage.graph_store.memgraph_store import (
+    MemoryGraphStore,
+    MemoryGraphStoreConfig,
+)
+
+_EDGES = [
+    ("A", "A", "0"),
+    ("A", "A", "1"),
+    ("A", "B", "2"),
+    ("B", "C", "3"),
+    ("B", "D", "4"),
+    ("C", "D", "5"),
+    ("B", "E", "6"),
+    ("F", "E", "7"),
+    ("E", "F", "8"),
+]
+
+
+def _build(graph):
+    for sid, tid, name in _EDGES:
+        graph.append_edge(Edge(sid, tid, name, weight=int(name)))
+    graph.upsert_vertex(Vertex("G"))
+    return graph
+
+
+@pytest.fixture(params=["memory", "snapshot"])
+def g(request, tmp_path):
+    graph = _build(CompactGraph())
+    if request.param == "snapshot":
+        graph.save(str(tmp_path / "graph"))
+        graph = CompactGraph.load(str(tmp_path / "graph"))
+    yield graph
+    graph.close()
+
+
+def _summary(graph):
+    return (
+        sorted((v.vid, v.name, v.props) for v in graph.vertices()),
+        sorted((e.sid, e.tid, e.name, sorted(e.props.items())) for e in graph.edges()),
+    )
+
+
+@pytest.mark.parametrize(
+    "action",
+    [
+        lambda g: g.del_vertices("G", "G"),
+        lambda g: g.del_vertices("C"),
+        lambda g: g.del_vertices("A", "G"),
+        lambda g: g.del_edges("A", "A", None),
+        lambda g: g.del_edges("A", "A", "0"),
+        lambda g: g.del_edges("E", "F", "9"),
+        lambda g: g.del_edges("E", "F", "8", weight=8),
+        lambda g: g.del_edges("E", "F", "8", weight=1),
+        lambda g: g.del_neighbor_edges("A", Direction.IN),
+        lambda g: g.del_neighbor_edges("B", Direction.BOTH),
+    ],
+)
+def test_delete_same_as_memory_graph(g, action):
+    expected = _build(MemoryGraph())
+    action(expected)
+    action(g)
+    assert g.vertex_count == expected.vertex_count
+    assert g.edge_count == expected.edge_count
+    assert _summary(g) == _summary(expected)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(vids=["B"], direct=Direction.OUT),
+        dict(vids=["A"], direct=Direction.IN),
+        dict(vids=["B"], direct=Direction.BOTH),
+        dict(vids=["A", "G"], direct=Direction.BOTH),
+        dict(vids=["B"], direct=Direction.BOTH, limit=5),
+        dict(vids=["B"], direct=Direction.OUT, fan=2),
+        dict(vids=["A"], direct=Direction.OUT, depth=2),
+        dict(vids=["B"], direct=Direction.BOTH, depth=1),
+        dict(vids=["X"], direct=Direction.BOTH),
+    ],
+)
+def test_search_same_as_memory_graph(g, kwargs):
+    subgraph = g.search(**kwargs)
+    expected = _build(MemoryGraph()).search(**kwargs)
+    assert isinstance(subgraph, MemoryGraph)
+    assert subgraph.edge_count == expected.edge_count
+    # The edges kept by the limit depend on the order of the edge sets of MemoryGraph
+    if "limit" not in kwargs:
+        assert subgraph.vertex_count == expected.vertex_count
+
+
+def test_upsert(g):
+    assert not g.append_edge(Edge("A", "B", "2"))
+    assert isinstance(g.get_vertex("A"), IdVertex)
+
+    g.upsert_vertex(Vertex("A", "a", age=1))
+    g.upsert_vertex(Vertex("A", "b", role="x"))
+    g.upsert_vertex(IdVertex("A"))
+    vertex = g.get_vertex("A")
+    assert vertex.name == "a"
+    assert vertex.props == {"age": 1, "role": "x"}
+
+    assert g.append_edge(Edge("A", "H", "9"))
+    assert [e.tid for e in g.get_neighbor_edges("A", Direction.OUT, limit=2)] == [
+        "A",
+        "A",
+    ]
+    assert {e.sid for e in g.get_neighbor_edges("H", Direction.IN)} == {"A"}
+    assert list(g.get_neighbor_edges("X")) == []
+    assert len(list(g.get_neighbor_edges("A", Direction.BOTH))) == 4
+    assert [p["name"] for p in g.schema()["schema"][1]["properties"]] == ["weight"]
+
+
+def test_adjacency_rebuilt(monkeypatch):
+    monkeypatch.setattr(compact_graph, "_CSR_REBUILD_MIN_EDGES", 4)
+    graph = CompactGraph()
+    for i in range(20):
+        assert graph.append_edge(Edge(f"v{i % 5}", f"v{i}", "r"))
+    assert not graph.append_edge(Edge("v0", "v5", "r"))
+    assert graph._csr_edges > 0
+    assert graph.edge_count == 20
+    assert {e.tid for e in graph.get_neighbor_edges("v0")} == {
+        "v0",
+        "v5",
+        "v10",
+        "v15",
+    }
+
+
+def test_save_after_delete(g, tmp_path):
+    g.del_vertices("B")
+    g.append_edge(Edge("G", "A", "10"))
+    expected = _summary(g)
+
+    path = str(tmp_path / "other")
+    g.save(path)
+    assert _summary(g) == expected
+    loaded = CompactGraph.load(path)
+    assert _summary(loaded) == expected
+    assert loaded.search(["G"], Direction.OUT).edge_count == 3
+    loaded.close()
+
+    g.truncate()
+    assert g.vertex_count == 0 and g.edge_count == 0
+    g.save(path)
+    assert CompactGraph.load(path).vertex_count == 0
+
+
+def test_save_versions(tmp_path, monkeypatch):
+    # The mapped snapshot is never renamed, which Windows doesn't allow
+    monkeypatch.setattr(compact_graph.os, "rename", None)
+    path = str(tmp_path / "graph")
+    graph = _build(CompactGraph())
+    graph.save(path)
+    graph.append_edge(Edge("G", "A", "10"))
+    graph.save(path)
+    assert sorted(os.listdir(path)) == ["CURRENT", "v000002"]
+    assert CompactGraph.load(path).edge_count == len(_EDGES) + 1
+
+    # Nothing is written if the graph is not changed
+    assert not graph.append_edge(Edge("G", "A", "10"))
+    graph.save(path)
+    assert sorted(os.listdir(path)) == ["CURRENT", "v000002"]
+    graph.truncate()
+    graph.save(path)
+    assert CompactGraph.load(path).edge_count == 0
+
+
+def test_load_unversioned_snapshot(tmp_path):
+    path = str(tmp_path / "graph")
+    _build(CompactGraph()).save(path)
+    version_path = os.path.join(path, "v000001")
+    for name in os.listdir(version_path):
+        os.replace(os.path.join(version_path, name), os.path.join(path, name))
+    os.rmdir(version_path)
+    os.remove(os.path.join(path, "CURRENT"))
+
+    assert CompactGraph.exists(path)
+    graph = CompactGraph.load(path)
+    expected = _summary(graph)
+    graph.upsert_vertex(Vertex("H"))
+    graph.save(path)
+    assert sorted(os.listdir(path)) == ["CURRENT", "v000001"]
+    graph.del_vertices("H")
+    assert _summary(CompactGraph.load(path)) != expected == _summary(graph)
+
+
+def test_snapshot_columns_mapped(tmp_path):
+    path = str(tmp_path / "graph")
+    graph = _build(CompactGraph())
+    graph.upsert_vertex(Vertex("顶点", "名字", tags=["a", "b"], extra=None))
+    graph.upsert_vertex(Vertex("A", "a", info={"k": 1}))
+    graph.save(path)
+    graph.close()
+
+    graph = CompactGraph.load(path)
+    version_path = os.path.join(path, "v000001")
+    with open(os.path.join(version_path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    # The vertex ids and the properties are not in the metadata
+    assert sorted(meta) == ["edge_props", "labels", "version", "vertex_props"]
+    assert graph._vid_index == {}
+    assert graph._edge_props["weight"].get(0) == 0
+
+    vertex = graph.get_vertex("顶点")
+    assert (vertex.name, vertex.props) == ("名字", {"tags": ["a", "b"], "extra": None})
+    assert graph.get_vertex("A").props == {"info": {"k": 1}}
+    assert isinstance(graph.get_vertex("B"), IdVertex)
+    assert not graph.has_vertex("X")
+    with pytest.raises(KeyError):
+        graph.get_vertex("X")
+
+    # The vertex of the snapshot is deleted and added again
+    graph.del_vertices("A")
+    assert not graph.has_vertex("A")
+    graph.upsert_vertex(Vertex("A", "new", age=2))
+    assert graph.get_vertex("A").props == {"age": 2}
+    graph.upsert_vertex(Vertex("B", "b", age=3))
+    assert graph.vertex_count == 8
+    expected = _summary(graph)
+    graph.save(path)
+    assert _summary(graph) == expected
+    assert _summary(CompactGraph.load(path)) == expected
+
+
+def test_memory_graph_store_persist(tmp_path):
+    config = MemoryGraphStoreConfig(
+        name="kg", graph_engine="compact", persist_path=str(tmp_path)
+    )
+    store = MemoryGraphStore(config)
+    store._graph.append_edge(Edge("A", "B", "knows"))
+    store.save()
+
+    store = MemoryGraphStore(config)
+    assert [(e.sid, e.tid, e.name) for e in store._graph.edges()] == [
+        ("A", "B", "knows")
+    ]
+    store._graph.append_edge(Edge("B", "C", "knows"))
+    store.save()
+    assert MemoryGraphStore(config)._graph.edge_count == 2
+    store.drop()
+    assert not (tmp_path / "kg").exists()
+    assert isinstance(MemoryGraphStore(MemoryGraphStoreConfig())._graph, MemoryGraph)